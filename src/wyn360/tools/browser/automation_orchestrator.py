@@ -11,8 +11,11 @@ import logging
 from typing import Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
+from pathlib import Path
 import time
 
+from .routing_stats import RoutingStatsStore, routing_domain
+
 logger = logging.getLogger(__name__)
 
 
@@ -68,7 +71,9 @@ class AutomationOrchestrator:
     confidence scores, and historical performance.
     """
 
-    def __init__(self):
+    def __init__(self, routing_stats: Optional[RoutingStatsStore] = None):
+        # Per-domain outcome counters; in-memory unless a persistent store is passed
+        self.routing_stats = routing_stats or RoutingStatsStore()
         self.decision_history: List[Dict[str, Any]] = []
         self.approach_success_rates: Dict[AutomationApproach, float] = {
             AutomationApproach.DOM_ANALYSIS: 0.0,
@@ -196,7 +201,13 @@ class AutomationOrchestrator:
         return best_approach
 
     def _get_recent_failures(self, url: str, hours: int = 1) -> List[str]:
-        """Get recent failures for a specific URL"""
+        """Get approaches that recently failed for a URL's domain"""
+        if self.routing_stats.domains.get(routing_domain(url)):
+            return self.routing_stats.recent_failures(
+                url, [approach.value for approach in AutomationApproach], hours * 3600
+            )
+
+        # No recorded outcomes for this domain; fall back to in-session decisions
         current_time = time.time()
         cutoff_time = current_time - (hours * 3600)
 
@@ -219,6 +230,11 @@ class AutomationOrchestrator:
     ) -> None:
         """Record execution result for learning"""
         try:
+            self.routing_stats.record(
+                action_request.url, action_request.action_type, approach_used.value,
+                result.success, result.execution_time
+            )
+
             # Update success rates
             self.total_attempts[approach_used] += 1
 
@@ -346,5 +362,8 @@ class AutomationOrchestrator:
         return suggestions
 
 
+# Routing statistics shared by the global orchestrators (persist across sessions)
+routing_stats_store = RoutingStatsStore(Path.home() / ".wyn360" / "cache" / "routing_stats.json")
+
 # Global orchestrator instance
-automation_orchestrator = AutomationOrchestrator()
\ No newline at end of file
+automation_orchestrator = AutomationOrchestrator(routing_stats=routing_stats_store)
\ No newline at end of file
@@ -9,6 +9,8 @@ Key Features:
 - Structure DOM data for LLM analysis
 - Confidence scoring for action decisions
 - Element attribute preservation for better context
+- Optional CDP DOMSnapshot backend: one capture with layout, visibility
+  and accessibility roles instead of per-selector sweeps (Chromium only)
 """
 
 from typing import Dict, List, Optional, Any, Union
@@ -18,8 +20,13 @@ from dataclasses import dataclass
 from playwright.async_api import Page, ElementHandle
 import logging
 
+from .dom_snapshot import DOMSnapshotError, SnapshotDocument, capture_snapshot
+
 logger = logging.getLogger(__name__)
 
+# Extraction backends: per-selector sweeps, CDP snapshot, or CDP with fallback
+DOM_BACKENDS = ("selectors", "cdp", "auto")
+
 
 @dataclass
 class DOMElement:
@@ -32,6 +39,8 @@ class DOMElement:
     is_interactive: bool
     element_type: str  # button, input, link, form, etc.
     confidence: float  # How confident we are this element can be interacted with
+    bounding_box: Optional[Dict[str, float]] = None  # Layout box (snapshot backend only)
+    role: str = ''  # Computed accessibility role (snapshot backend only)
 
 
 @dataclass
@@ -45,12 +54,25 @@ class DOMAnalysis:
     content_elements: List[DOMElement]
     total_elements: int
     analysis_confidence: float
+    backend: str = "selectors"
 
 
 class DOMExtractor:
     """Extract and analyze DOM structure from web pages"""
 
-    def __init__(self):
+    def __init__(self, backend: str = "selectors"):
+        """
+        Initialize the extractor.
+
+        Args:
+            backend: "selectors" (query_selector_all sweeps), "cdp" (DOMSnapshot
+                over a CDP session, Chromium only) or "auto" (CDP, falling back
+                to selectors when the browser has no CDP support)
+        """
+        if backend not in DOM_BACKENDS:
+            raise ValueError(f"Unknown DOM extraction backend '{backend}', expected one of {DOM_BACKENDS}")
+        self.backend = backend
+
         self.interactive_selectors = [
             'button', 'input', 'select', 'textarea', 'a[href]',
             '[onclick]', '[role="button"]', '[role="link"]',
@@ -62,6 +84,8 @@ class DOMExtractor:
             '.menu', '.breadcrumb', 'header', 'footer'
         ]
 
+        self.content_selectors = ['main', 'article', '.content', '.main-content', 'section']
+
     async def extract_dom(self, page: Page) -> DOMAnalysis:
         """
         Extract comprehensive DOM analysis from a page
@@ -72,6 +96,14 @@ class DOMExtractor:
         Returns:
             DOMAnalysis object with structured DOM data
         """
+        if self.backend != "selectors":
+            try:
+                return await self.extract_dom_snapshot(page)
+            except DOMSnapshotError as e:
+                if self.backend == "cdp":
+                    raise
+                logger.info(f"DOM snapshot unavailable, using selector extraction: {e}")
+
         try:
             logger.info(f"Extracting DOM from page: {page.url}")
 
@@ -109,6 +141,146 @@ class DOMExtractor:
             logger.error(f"Error extracting DOM: {e}")
             raise
 
+    async def extract_dom_snapshot(self, page: Page) -> DOMAnalysis:
+        """
+        Extract DOM analysis from a single CDP DOMSnapshot capture
+
+        Matches the same selector groups as the selector backend, but skips
+        elements that are not rendered (display: none, visibility: hidden,
+        zero size or inside a transparent ancestor) and fills in layout boxes
+        and accessibility roles.
+
+        Args:
+            page: Playwright page instance (Chromium)
+
+        Returns:
+            DOMAnalysis object with structured DOM data
+
+        Raises:
+            DOMSnapshotError: If the snapshot cannot be captured
+        """
+        logger.info(f"Capturing DOM snapshot from page: {page.url}")
+        snapshot = await capture_snapshot(page)
+        analysis = self.analyze_snapshot(snapshot, url=page.url)
+        logger.info(f"DOM snapshot complete: {analysis.total_elements} elements, "
+                    f"confidence: {analysis.analysis_confidence:.2f}")
+        return analysis
+
+    def analyze_snapshot(self, snapshot: SnapshotDocument, url: str = '') -> DOMAnalysis:
+        """Build a DOMAnalysis from a decoded DOM snapshot"""
+        interactive = {}
+        for selector in self.interactive_selectors:
+            for index in snapshot.select(selector):
+                if index in interactive or not snapshot.visible[index]:
+                    continue
+                element = self._snapshot_element(snapshot, index)
+                element.is_interactive = True
+                element.element_type = self._determine_element_type(element)
+                element.confidence = self._calculate_element_confidence(element)
+                interactive[index] = element
+        interactive_elements = list(interactive.values())
+
+        navigation_elements = []
+        for selector in self.navigation_selectors:
+            for index in snapshot.select(selector):
+                if snapshot.visible[index]:
+                    element = self._snapshot_element(snapshot, index)
+                    element.element_type = 'navigation'
+                    element.confidence = 0.8
+                    navigation_elements.append(element)
+
+        content_elements = []
+        for selector in self.content_selectors:
+            for index in snapshot.select(selector):
+                if not snapshot.visible[index]:
+                    continue
+                element = self._snapshot_element(snapshot, index)
+                if len(element.text.strip()) > 50:
+                    element.element_type = 'content'
+                    element.confidence = 0.7
+                    content_elements.append(element)
+
+        forms = self._snapshot_forms(snapshot)
+
+        return DOMAnalysis(
+            url=url or snapshot.url,
+            title=snapshot.title,
+            interactive_elements=interactive_elements,
+            forms=forms,
+            navigation_elements=navigation_elements,
+            content_elements=content_elements,
+            total_elements=len(interactive_elements) + len(navigation_elements) + len(content_elements),
+            analysis_confidence=self._calculate_analysis_confidence(
+                interactive_elements, forms, navigation_elements
+            ),
+            backend="cdp"
+        )
+
+    def _snapshot_element(self, snapshot: SnapshotDocument, index: int) -> DOMElement:
+        """Create a DOMElement for a snapshot node"""
+        node_attributes = snapshot.attributes[index]
+        attributes = {}
+        for attr in ['id', 'class', 'name', 'type', 'role', 'aria-label', 'title', 'href', 'value']:
+            if node_attributes.get(attr):
+                attributes[attr] = node_attributes[attr]
+
+        role, name = snapshot.accessibility(index)
+        text = snapshot.text(index).strip()[:200] or name[:200]
+
+        return DOMElement(
+            tag=snapshot.tags[index],
+            text=text,
+            attributes=attributes,
+            xpath=snapshot.xpath(index),
+            selector=snapshot.css_selector(index),
+            is_interactive=False,
+            element_type='',
+            confidence=0.0,
+            bounding_box=snapshot.bounding_box(index),
+            role=role
+        )
+
+    def _snapshot_forms(self, snapshot: SnapshotDocument) -> List[Dict[str, Any]]:
+        """Extract rendered forms and their rendered fields from a snapshot"""
+        labels = {}
+        for index in snapshot.select('label'):
+            target = snapshot.attributes[index].get('for')
+            if target and target not in labels:
+                labels[target] = snapshot.text(index).strip()
+
+        forms = []
+        for form_index in snapshot.select('form'):
+            if not snapshot.visible[form_index]:
+                continue
+
+            form_info = {
+                'index': len(forms),
+                'action': snapshot.attributes[form_index].get('action', ''),
+                'method': snapshot.attributes[form_index].get('method') or 'get',
+                'fields': []
+            }
+            for selector in ['input', 'select', 'textarea', 'button[type="submit"]']:
+                for field in snapshot.select(selector, root=form_index):
+                    if not snapshot.visible[field]:
+                        continue
+                    attributes = snapshot.attributes[field]
+                    label = labels.get(attributes.get('id', '')) if attributes.get('id') else None
+                    if label is None:
+                        label_index = snapshot.ancestor(field, 'label')
+                        label = snapshot.text(label_index).strip() if label_index >= 0 else ''
+                    form_info['fields'].append({
+                        'tag': snapshot.tags[field],
+                        'type': attributes.get('type', ''),
+                        'name': attributes.get('name', ''),
+                        'id': attributes.get('id', ''),
+                        'placeholder': attributes.get('placeholder', ''),
+                        'required': 'required' in attributes,
+                        'label': label
+                    })
+            forms.append(form_info)
+
+        return forms
+
     async def _extract_interactive_elements(self, page: Page) -> List[DOMElement]:
         """Extract all interactive elements from the page"""
         elements = []
@@ -205,9 +377,7 @@ class DOMExtractor:
     async def _extract_content_elements(self, page: Page) -> List[DOMElement]:
         """Extract main content elements"""
         elements = []
-        content_selectors = ['main', 'article', '.content', '.main-content', 'section']
-
-        for selector in content_selectors:
+        for selector in self.content_selectors:
             try:
                 element_handles = await page.query_selector_all(selector)
 
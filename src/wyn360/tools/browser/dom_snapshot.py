@@ -0,0 +1,321 @@
+"""
+CDP DOM Snapshot Backend for DOM Analysis
+
+Captures a whole page in one round-trip with Chromium's
+DOMSnapshot.captureSnapshot (node tree, layout boxes and computed visibility
+styles) plus Accessibility.getFullAXTree (computed roles and names), instead
+of one query_selector_all sweep and several attribute round-trips per element.
+
+The decoded snapshot answers the questions DOMExtractor asks - which nodes
+match its simple selectors, their text, attributes, XPath and CSS selector -
+in Python, and additionally knows which elements are actually rendered.
+Only Chromium supports CDP sessions; callers fall back to selector sweeps
+elsewhere.
+"""
+
+import asyncio
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Computed styles requested per layout node (order matters: indexes below)
+SNAPSHOT_STYLES = ["visibility", "opacity"]
+
+ELEMENT_NODE = 1
+TEXT_NODE = 3
+
+# Characters of descendant text gathered before truncating
+TEXT_SCAN_LIMIT = 2000
+
+
+class DOMSnapshotError(Exception):
+    """Raised when a CDP DOM snapshot cannot be captured"""
+    pass
+
+
+_SIMPLE_SELECTOR = re.compile(
+    r'^(?P<tag>[a-zA-Z][\w-]*)?'
+    r'(?:\.(?P<cls>[\w-]+))?'
+    r'(?:\[(?P<attr>[\w-]+)(?:="(?P<value>[^"]*)")?\])?$'
+)
+
+
+def compile_selector(selector: str) -> Callable[[str, Dict[str, str]], bool]:
+    """
+    Compile a simple CSS selector into a predicate over (tag, attributes).
+
+    Supports the forms DOMExtractor uses: tag, .class, [attr], [attr="value"]
+    and tag[attr].
+
+    Raises:
+        ValueError: For selectors outside that subset
+    """
+    match = _SIMPLE_SELECTOR.match(selector.strip())
+    if not match or not any(match.groupdict().values()):
+        raise ValueError(f"Unsupported selector for DOM snapshot matching: {selector}")
+
+    tag = (match.group('tag') or '').lower()
+    cls, attr, value = match.group('cls'), match.group('attr'), match.group('value')
+
+    def matches(node_tag: str, attributes: Dict[str, str]) -> bool:
+        if tag and node_tag != tag:
+            return False
+        if cls and cls not in attributes.get('class', '').split():
+            return False
+        if attr:
+            if attr not in attributes:
+                return False
+            if value is not None and attributes[attr] != value:
+                return False
+        return True
+
+    return matches
+
+
+class SnapshotDocument:
+    """
+    Decoded main-frame document of a DOMSnapshot.captureSnapshot result
+
+    Node indexes follow the snapshot's document order, in which a parent
+    always precedes its children. Text, XPath and selectors are computed on
+    demand for the nodes DOMExtractor actually reports.
+    """
+
+    def __init__(self, snapshot: Dict[str, Any], ax_nodes: Optional[List[Dict[str, Any]]] = None):
+        """
+        Decode a snapshot.
+
+        Args:
+            snapshot: Result of DOMSnapshot.captureSnapshot requested with
+                SNAPSHOT_STYLES and includeDOMRects
+            ax_nodes: 'nodes' of Accessibility.getFullAXTree (optional)
+        """
+        strings = snapshot['strings']
+        document = snapshot['documents'][0]
+        nodes = document['nodes']
+
+        def string(index: int) -> str:
+            return strings[index] if 0 <= index < len(strings) else ''
+
+        self.url = string(document.get('documentURL', -1))
+        self.title = string(document.get('title', -1))
+
+        self.parents: List[int] = nodes['parentIndex']
+        self.node_types: List[int] = nodes['nodeType']
+        self.tags: List[str] = [string(i).lower() for i in nodes['nodeName']]
+        self.values: List[str] = [string(i) for i in nodes.get('nodeValue', [])]
+        self.backend_ids: List[int] = nodes.get('backendNodeId', [])
+        count = len(self.parents)
+
+        self.attributes: List[Dict[str, str]] = []
+        for flat in nodes.get('attributes', [[]] * count):
+            self.attributes.append({
+                string(flat[i]).lower(): string(flat[i + 1]) for i in range(0, len(flat) - 1, 2)
+            })
+
+        self.children: List[List[int]] = [[] for _ in range(count)]
+        for index, parent in enumerate(self.parents):
+            if parent >= 0:
+                self.children[parent].append(index)
+
+        # Layout: nodes without a layout object (display: none) are not rendered
+        self.bounds: Dict[int, Tuple[float, float, float, float]] = {}
+        invisible = set()
+        transparent = set()
+        layout = document.get('layout', {})
+        all_styles = layout.get('styles') or []
+        for position, node_index in enumerate(layout.get('nodeIndex', [])):
+            self.bounds[node_index] = tuple(layout['bounds'][position][:4])
+            styles = [string(i) for i in all_styles[position]] if position < len(all_styles) else []
+            if styles and styles[0] in ('hidden', 'collapse'):
+                invisible.add(node_index)
+            if len(styles) > 1 and styles[1] == '0':
+                transparent.add(node_index)
+
+        # visibility is inherited by computed style, opacity is not: a
+        # transparent ancestor hides its whole subtree
+        self.visible: List[bool] = [False] * count
+        hidden_by_ancestor = [False] * count
+        for index in range(count):
+            parent = self.parents[index]
+            hidden_by_ancestor[index] = index in transparent or (parent >= 0 and hidden_by_ancestor[parent])
+            rect = self.bounds.get(index)
+            self.visible[index] = (
+                rect is not None
+                and rect[2] > 0 and rect[3] > 0
+                and index not in invisible
+                and not hidden_by_ancestor[index]
+            )
+
+        self.ax_info: Dict[int, Tuple[str, str]] = {}
+        for ax_node in ax_nodes or []:
+            backend_id = ax_node.get('backendDOMNodeId')
+            if backend_id is None or ax_node.get('ignored'):
+                continue
+            role = (ax_node.get('role') or {}).get('value') or ''
+            name = (ax_node.get('name') or {}).get('value') or ''
+            self.ax_info[backend_id] = (str(role), str(name))
+
+        self._xpaths: Dict[int, str] = {}
+        self._elements = [i for i, node_type in enumerate(self.node_types) if node_type == ELEMENT_NODE]
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def elements(self) -> List[int]:
+        """Indexes of all element nodes in document order"""
+        return self._elements
+
+    def select(self, selector: str, root: int = -1) -> List[int]:
+        """Element indexes matching a simple selector, in document order"""
+        matches = compile_selector(selector)
+        candidates = self.elements() if root < 0 else self.descendants(root)
+        return [
+            i for i in candidates
+            if self.node_types[i] == ELEMENT_NODE and matches(self.tags[i], self.attributes[i])
+        ]
+
+    def descendants(self, index: int) -> List[int]:
+        """All descendant node indexes of a node, in document order"""
+        result = []
+        stack = list(reversed(self.children[index]))
+        while stack:
+            node = stack.pop()
+            result.append(node)
+            stack.extend(reversed(self.children[node]))
+        return result
+
+    def text(self, index: int, limit: int = TEXT_SCAN_LIMIT) -> str:
+        """Descendant text like Node.textContent (stops after `limit` characters)"""
+        parts = []
+        length = 0
+        stack = [index]
+        while stack and length < limit:
+            node = stack.pop()
+            if self.node_types[node] == TEXT_NODE:
+                parts.append(self.values[node])
+                length += len(self.values[node])
+            else:
+                stack.extend(reversed(self.children[node]))
+        return ''.join(parts)
+
+    def xpath(self, index: int) -> str:
+        """XPath in DOMExtractor's format (/html/body/div[2], [n] only when n > 1)"""
+        if index in self._xpaths:
+            return self._xpaths[index]
+
+        parent = self.parents[index]
+        if self.node_types[index] != ELEMENT_NODE:
+            path = ''
+        elif self.tags[index] == 'html':
+            path = '/html'
+        elif parent < 0:
+            path = ''
+        else:
+            tag = self.tags[index]
+            same_tag = [c for c in self.children[parent]
+                        if self.node_types[c] == ELEMENT_NODE and self.tags[c] == tag]
+            position = same_tag.index(index) + 1
+            path = self.xpath(parent) + '/' + tag + (f'[{position}]' if position > 1 else '')
+
+        self._xpaths[index] = path
+        return path
+
+    def css_selector(self, index: int) -> str:
+        """CSS selector in DOMExtractor's format (#id, or tag.classes with :nth-of-type)"""
+        attributes = self.attributes[index]
+        if attributes.get('id'):
+            return '#' + attributes['id']
+
+        tag = self.tags[index]
+        class_name = attributes.get('class', '')
+        selector = tag
+        if class_name:
+            selector += '.' + '.'.join(class_name.split())
+
+        parent = self.parents[index]
+        if parent >= 0:
+            siblings = [
+                c for c in self.children[parent]
+                if self.node_types[c] == ELEMENT_NODE and self.tags[c] == tag
+                and self.attributes[c].get('class', '') == class_name
+            ]
+            if len(siblings) > 1:
+                selector += f':nth-of-type({siblings.index(index) + 1})'
+
+        return selector
+
+    def bounding_box(self, index: int) -> Optional[Dict[str, float]]:
+        """Layout box in page coordinates, or None if the node is not rendered"""
+        rect = self.bounds.get(index)
+        if rect is None:
+            return None
+        return {'x': rect[0], 'y': rect[1], 'width': rect[2], 'height': rect[3]}
+
+    def accessibility(self, index: int) -> Tuple[str, str]:
+        """Computed (role, name) from the accessibility tree, or ('', '')"""
+        if index < len(self.backend_ids):
+            return self.ax_info.get(self.backend_ids[index], ('', ''))
+        return ('', '')
+
+    def ancestor(self, index: int, tag: str) -> int:
+        """Nearest ancestor-or-self with the given tag, or -1"""
+        while index >= 0:
+            if self.node_types[index] == ELEMENT_NODE and self.tags[index] == tag:
+                return index
+            index = self.parents[index]
+        return -1
+
+
+async def capture_snapshot(page, include_accessibility: bool = True) -> SnapshotDocument:
+    """
+    Capture and decode a DOM snapshot over a CDP session.
+
+    Args:
+        page: Playwright page (Chromium only)
+        include_accessibility: Also fetch the accessibility tree for roles and names
+
+    Returns:
+        SnapshotDocument for the page's main frame
+
+    Raises:
+        DOMSnapshotError: If the browser has no CDP support or the capture fails
+    """
+    try:
+        session = await page.context.new_cdp_session(page)
+    except Exception as e:
+        raise DOMSnapshotError(f"CDP session unavailable: {e}") from e
+
+    try:
+        capture = session.send("DOMSnapshot.captureSnapshot", {
+            "computedStyles": SNAPSHOT_STYLES,
+            "includeDOMRects": True,
+        })
+        if include_accessibility:
+            snapshot, ax_tree = await asyncio.gather(
+                capture,
+                session.send("Accessibility.getFullAXTree"),
+                return_exceptions=True
+            )
+        else:
+            snapshot, ax_tree = await capture, None
+
+        if isinstance(snapshot, BaseException):
+            raise DOMSnapshotError(f"DOMSnapshot.captureSnapshot failed: {snapshot}") from snapshot
+        if isinstance(ax_tree, BaseException):
+            logger.debug(f"Accessibility tree unavailable, continuing without roles: {ax_tree}")
+            ax_tree = None
+
+        try:
+            return SnapshotDocument(snapshot, (ax_tree or {}).get('nodes'))
+        except (KeyError, IndexError, TypeError) as e:
+            raise DOMSnapshotError(f"Unexpected DOM snapshot format: {e}") from e
+
+    finally:
+        try:
+            await session.detach()
+        except Exception:
+            pass
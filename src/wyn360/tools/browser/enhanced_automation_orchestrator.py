@@ -15,7 +15,8 @@ from .automation_orchestrator import (
     AutomationApproach,
     ActionRequest,
     ActionResult,
-    DecisionContext
+    DecisionContext,
+    routing_stats_store
 )
 from .stagehand_integration import (
     StagehandIntegration,
@@ -39,6 +40,7 @@ from .interactive_error_handler import (
     RecoveryAction,
     interactive_error_handler
 )
+from .routing_stats import ANY_ACTION, ApproachStats, RoutingStatsStore
 from . import browser_tools
 
 logger = logging.getLogger(__name__)
@@ -68,8 +70,20 @@ class EnhancedAutomationOrchestrator:
     5. Performance tracking and learning
     """
 
-    def __init__(self):
-        self.base_orchestrator = AutomationOrchestrator()
+    # Domain history overrides a routing decision when the chosen approach has
+    # at least this many (decayed) attempts on the domain and mostly fails there,
+    # while another approach reliably succeeds
+    DOMAIN_MIN_ATTEMPTS = 3.0
+    DOMAIN_FAILING_RATE = 0.5
+    DOMAIN_PREFERRED_RATE = 0.7
+    # Overall success rates (decayed, across all domains) start steering routing
+    # once this many attempts are recorded; approaches need a few attempts each
+    HISTORY_MIN_ATTEMPTS = 10.0
+    APPROACH_MIN_ATTEMPTS = 3.0
+
+    def __init__(self, routing_stats: Optional[RoutingStatsStore] = None):
+        self.routing_stats = routing_stats or RoutingStatsStore()
+        self.base_orchestrator = AutomationOrchestrator(routing_stats=self.routing_stats)
         self.stagehand_integration = stagehand_integration
         self.vision_integration = vision_fallback_integration
         self.unified_error_handler = unified_error_handler
@@ -634,9 +648,54 @@ class EnhancedAutomationOrchestrator:
 
         # Use enhanced approach if different, otherwise use base
         if enhanced_approach != base_approach:
-            return enhanced_approach, context, enhanced_reasoning
+            approach, reasoning = enhanced_approach, enhanced_reasoning
         else:
-            return base_approach, context, base_reasoning
+            approach, reasoning = base_approach, base_reasoning
+
+        # Finally, let this site's recorded outcomes override rules that keep failing here
+        learned = self._apply_domain_history(enhanced_request, approach, vision_available)
+        if learned:
+            return learned[0], context, learned[1]
+        return approach, context, reasoning
+
+    def _apply_domain_history(
+        self,
+        enhanced_request: EnhancedActionRequest,
+        approach: AutomationApproach,
+        vision_available: bool
+    ) -> Optional[Tuple[AutomationApproach, str]]:
+        """
+        Switch to the approach that works on this domain when the chosen one does not
+
+        Returns:
+            (approach, reasoning) to use instead, or None to keep the decision
+        """
+        allowed = [AutomationApproach.DOM_ANALYSIS]
+        if enhanced_request.enable_stagehand:
+            allowed.append(AutomationApproach.STAGEHAND)
+        if vision_available and enhanced_request.fallback_to_vision:
+            allowed.append(AutomationApproach.VISION_FALLBACK)
+
+        url, action_type = enhanced_request.url, enhanced_request.action_type
+        best = self.routing_stats.best_approach(
+            url, action_type, [a.value for a in allowed], self.DOMAIN_MIN_ATTEMPTS
+        )
+        if not best or best[0] == approach.value or best[1].success_rate < self.DOMAIN_PREFERRED_RATE:
+            return None
+
+        chosen = self.routing_stats.get(url, action_type, approach.value)
+        if chosen is None or not chosen.has_attempts(self.DOMAIN_MIN_ATTEMPTS):
+            chosen = self.routing_stats.get(url, ANY_ACTION, approach.value)
+        if chosen is None or not chosen.has_attempts(self.DOMAIN_MIN_ATTEMPTS):
+            return None
+        if chosen.success_rate >= self.DOMAIN_FAILING_RATE:
+            return None
+
+        preferred = AutomationApproach(best[0])
+        return preferred, (
+            f"Domain history: {approach.value} succeeds {chosen.success_rate:.0%} here, "
+            f"{preferred.value} {best[1].success_rate:.0%}"
+        )
 
     def _analyze_task_type(self, enhanced_request: EnhancedActionRequest) -> str:
         """
@@ -740,8 +799,9 @@ class EnhancedAutomationOrchestrator:
             return AutomationApproach.DOM_ANALYSIS, f"Content extraction with DOM analysis ({context.dom_confidence:.2f})"
 
         # Rule 3: Performance optimization based on history
-        if len(self.execution_history) >= 10:
-            success_rates = self._calculate_approach_success_rates()
+        overall = self.routing_stats.overall()
+        if sum(stats.attempts for stats in overall.values()) >= self.HISTORY_MIN_ATTEMPTS:
+            success_rates = self._calculate_approach_success_rates(overall)
 
             # If DOM has very high success rate for this confidence level, prefer it
             if (context.dom_confidence >= 0.5 and
@@ -798,33 +858,27 @@ class EnhancedAutomationOrchestrator:
         # Default: use base approach
         return base_approach, f"Base routing decision: {base_approach.value}"
 
-    def _calculate_approach_success_rates(self) -> Dict[str, float]:
+    def _calculate_approach_success_rates(
+        self,
+        overall: Optional[Dict[str, ApproachStats]] = None
+    ) -> Dict[str, float]:
         """
-        Calculate success rates for each approach from execution history
+        Success rate of each approach across all sites, from the decayed routing counters
+
+        Args:
+            overall: Counters from routing_stats.overall(), if already fetched
 
         Returns:
             Dict mapping approach names to success rates
         """
-        approach_stats = {}
-
-        for record in self.execution_history:
-            approach = record['approach_used']
-            success = record['success']
-
-            if approach not in approach_stats:
-                approach_stats[approach] = {'total': 0, 'successful': 0}
-
-            approach_stats[approach]['total'] += 1
-            if success:
-                approach_stats[approach]['successful'] += 1
-
-        # Convert to success rates
-        success_rates = {}
-        for approach, stats in approach_stats.items():
-            if stats['total'] >= 3:  # Only consider approaches with enough data
-                success_rates[approach] = stats['successful'] / stats['total']
-
-        return success_rates
+        if overall is None:
+            overall = self.routing_stats.overall()
+        # Only consider approaches with enough data
+        return {
+            approach: stats.success_rate
+            for approach, stats in overall.items()
+            if stats.has_attempts(self.APPROACH_MIN_ATTEMPTS)
+        }
 
     def _calculate_edge_case_score(
         self,
@@ -994,7 +1048,8 @@ class EnhancedAutomationOrchestrator:
                 'interactive_mode_enabled': self.interactive_mode,
                 'approach_performance': approach_performance,
                 'interactive_recovery_stats': interactive_recovery_stats,
-                'recent_executions': self.execution_history[-10:] if self.execution_history else []
+                'recent_executions': self.execution_history[-10:] if self.execution_history else [],
+                'routing_domains': len(self.routing_stats.domains)
             },
             'base_orchestrator_decisions': base_analytics,
             'stagehand_execution': stagehand_analytics,
@@ -1015,5 +1070,5 @@ class EnhancedAutomationOrchestrator:
         return count
 
 
-# Global enhanced orchestrator instance
-enhanced_automation_orchestrator = EnhancedAutomationOrchestrator()
\ No newline at end of file
+# Global enhanced orchestrator instance (routing statistics persist across sessions)
+enhanced_automation_orchestrator = EnhancedAutomationOrchestrator(routing_stats=routing_stats_store)
\ No newline at end of file
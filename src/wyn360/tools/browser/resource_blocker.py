@@ -0,0 +1,282 @@
+"""
+Request Interception for WYN360 CLI
+
+This module installs a Playwright route on browser contexts/pages that aborts
+requests for resources DOM-first automation and markdown extraction never use
+(images, fonts, media, ad and analytics scripts), and records how many
+requests and bytes each navigation saved.
+
+Phase 4.5: Resource-blocking request interception profiles
+"""
+
+import time
+import logging
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Callable, Iterable, Deque
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+# Typical transfer sizes per resource type, used when a blocked response's
+# size is unknown (aborted requests are never downloaded)
+ESTIMATED_RESOURCE_BYTES = {
+    'image': 45_000,
+    'media': 500_000,
+    'font': 35_000,
+    'stylesheet': 25_000,
+    'script': 40_000,
+    'texttrack': 5_000,
+    'manifest': 2_000,
+    'eventsource': 2_000,
+    'xhr': 5_000,
+    'fetch': 5_000,
+    'other': 5_000,
+}
+
+PolicyResolver = Callable[[str], Dict[str, Iterable[str]]]
+
+
+@dataclass
+class NavigationResourceStats:
+    """Request counters for a single navigation"""
+    url: str
+    started_at: float = field(default_factory=time.time)
+    requests_total: int = 0
+    requests_blocked: int = 0
+    bytes_saved: int = 0
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+    blocked_by_domain: int = 0
+
+    def record_blocked(self, resource_type: str, by_domain: bool, size: int) -> None:
+        """Record one aborted request"""
+        self.requests_total += 1
+        self.requests_blocked += 1
+        self.bytes_saved += size
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+        if by_domain:
+            self.blocked_by_domain += 1
+
+    def record_allowed(self) -> None:
+        """Record one request passed through to the network"""
+        self.requests_total += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'url': self.url,
+            'requests_total': self.requests_total,
+            'requests_blocked': self.requests_blocked,
+            'bytes_saved': self.bytes_saved,
+            'blocked_by_type': dict(self.blocked_by_type),
+            'blocked_by_domain': self.blocked_by_domain,
+        }
+
+
+class ResourceBlocker:
+    """
+    Abort requests matching a resource-type/domain policy
+
+    The policy can be fixed or resolved per navigation from the main-frame
+    document URL, so site profiles apply to whichever site a page is on.
+    Counters are kept per page and rolled into a bounded history whenever
+    that page starts a new top-level navigation. Per-page state is held
+    weakly, so pages that are closed without forget_page() do not leak.
+    """
+
+    def __init__(
+        self,
+        block_resource_types: Iterable[str] = (),
+        block_domains: Iterable[str] = (),
+        policy_resolver: Optional[PolicyResolver] = None,
+        history_size: int = 50
+    ):
+        """
+        Initialize the blocker
+
+        Args:
+            block_resource_types: Playwright resource types to abort
+            block_domains: Hostnames (and their subdomains) to abort
+            policy_resolver: Optional callable mapping a navigation URL to a
+                policy dict with "block_resource_types"/"block_domains"
+            history_size: Number of finished navigations to keep
+        """
+        self.default_policy = self._compile(block_resource_types, block_domains)
+        self.policy_resolver = policy_resolver
+        self.history: Deque[NavigationResourceStats] = deque(maxlen=history_size)
+        self._current: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._policies: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.totals = {'requests_total': 0, 'requests_blocked': 0, 'bytes_saved': 0, 'navigations': 0}
+
+    @staticmethod
+    def _compile(block_resource_types: Iterable[str], block_domains: Iterable[str]) -> Dict[str, Any]:
+        """Normalize a policy for fast lookups"""
+        return {
+            'types': frozenset(t.lower() for t in block_resource_types),
+            'domains': tuple(d.lower().lstrip('.') for d in block_domains),
+        }
+
+    @staticmethod
+    def _matches_domain(host: str, domains: tuple) -> bool:
+        """Check whether a host is one of (or a subdomain of) the blocked domains"""
+        for domain in domains:
+            if host == domain or host.endswith('.' + domain):
+                return True
+        return False
+
+    def should_block(self, resource_type: str, url: str, policy: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Decide whether a request should be aborted
+
+        Args:
+            resource_type: Playwright request.resource_type
+            url: Request URL
+            policy: Compiled policy (defaults to the blocker's default policy)
+
+        Returns:
+            "type" or "domain" if the request should be blocked, otherwise None
+        """
+        policy = policy or self.default_policy
+
+        if url.startswith(('data:', 'blob:', 'about:')):
+            return None
+
+        if resource_type in policy['types']:
+            return "type"
+
+        if policy['domains']:
+            host = (urlparse(url).hostname or '').lower()
+            if host and self._matches_domain(host, policy['domains']):
+                return "domain"
+
+        return None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any request could ever be blocked"""
+        return bool(
+            self.policy_resolver
+            or self.default_policy['types']
+            or self.default_policy['domains']
+        )
+
+    async def install(self, target: Any) -> bool:
+        """
+        Install the route handler on a BrowserContext or Page
+
+        Args:
+            target: Playwright BrowserContext or Page
+
+        Returns:
+            True if routing was installed
+        """
+        if not self.enabled:
+            return False
+
+        try:
+            await target.route("**/*", self._handle_route)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to install request interception: {e}")
+            return False
+
+    def begin_navigation(self, page: Any, url: str) -> NavigationResourceStats:
+        """
+        Start counting a new top-level navigation for a page
+
+        The previous navigation on the same page (if any) is moved to history.
+        Route handlers call this automatically for main-frame document
+        requests; callers may also call it before page.goto().
+        """
+        previous = self._current.get(page)
+        if previous is not None and previous.requests_total:
+            self._finish(previous)
+
+        stats = NavigationResourceStats(url=url)
+        self._current[page] = stats
+
+        if self.policy_resolver:
+            try:
+                resolved = self.policy_resolver(url)
+                self._policies[page] = self._compile(
+                    resolved.get('block_resource_types', ()),
+                    resolved.get('block_domains', ())
+                )
+            except Exception as e:
+                logger.debug(f"Resource policy resolution failed for {url}: {e}")
+                self._policies[page] = self.default_policy
+
+        return stats
+
+    def _finish(self, stats: NavigationResourceStats) -> None:
+        """Move a navigation's counters to history and running totals"""
+        self.history.append(stats)
+        self.totals['navigations'] += 1
+        self.totals['requests_total'] += stats.requests_total
+        self.totals['requests_blocked'] += stats.requests_blocked
+        self.totals['bytes_saved'] += stats.bytes_saved
+
+    def navigation_stats(self, page: Any) -> Optional[Dict[str, Any]]:
+        """Get counters for a page's current navigation"""
+        stats = self._current.get(page)
+        return stats.to_dict() if stats else None
+
+    def forget_page(self, page: Any) -> None:
+        """Finish and drop per-page state (call when a page is closed or reset)"""
+        stats = self._current.pop(page, None)
+        self._policies.pop(page, None)
+        if stats is not None and stats.requests_total:
+            self._finish(stats)
+
+    async def _handle_route(self, route: Any) -> None:
+        """Playwright route handler: abort or continue a request"""
+        request = route.request
+
+        page = None
+        try:
+            page = request.frame.page
+        except Exception:
+            # Service worker and some preflight requests have no frame
+            pass
+
+        if page is not None and request.is_navigation_request() and request.frame.parent_frame is None:
+            self.begin_navigation(page, request.url)
+
+        if page is not None:
+            policy = self._policies.get(page, self.default_policy)
+            stats = self._current.get(page)
+        else:
+            policy, stats = self.default_policy, None
+
+        resource_type = request.resource_type
+        reason = self.should_block(resource_type, request.url, policy)
+
+        if reason is None:
+            if stats is not None:
+                stats.record_allowed()
+            await route.continue_()
+            return
+
+        if stats is not None:
+            size = ESTIMATED_RESOURCE_BYTES.get(resource_type, ESTIMATED_RESOURCE_BYTES['other'])
+            stats.record_blocked(resource_type, reason == "domain", size)
+
+        try:
+            await route.abort("blockedbyclient")
+        except Exception as e:
+            logger.debug(f"Failed to abort request {request.url}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cumulative statistics, including navigations still in progress"""
+        totals = dict(self.totals)
+        for stats in list(self._current.values()):
+            totals['requests_total'] += stats.requests_total
+            totals['requests_blocked'] += stats.requests_blocked
+            totals['bytes_saved'] += stats.bytes_saved
+        totals['block_rate'] = (
+            totals['requests_blocked'] / totals['requests_total']
+            if totals['requests_total'] else 0.0
+        )
+        totals['recent'] = [s.to_dict() for s in list(self.history)[-5:]]
+        return totals
@@ -7,13 +7,14 @@ code generation with the automation orchestrator and DOM analysis system.
 
 import logging
 import asyncio
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 import time
 
 from .stagehand_generator import (
     StagehandCodeGenerator,
     StagehandExecutionResult,
+    StagehandPattern,
     stagehand_generator
 )
 from .automation_orchestrator import (
@@ -90,7 +91,7 @@ class StagehandIntegration:
 
         try:
             # Generate Stagehand code
-            code_success, actions_or_error = await self._generate_stagehand_code(
+            code_success, pattern_or_error = await self._generate_stagehand_code(
                 action_request, dom_analysis_result
             )
 
@@ -101,18 +102,19 @@ class StagehandIntegration:
                     confidence=0.0,
                     execution_time=time.time() - start_time,
                     result_data={},
-                    error_message=f"Code generation failed: {actions_or_error}",
+                    error_message=f"Code generation failed: {pattern_or_error}",
                     recommendation="Try DOM analysis approach"
                 )
+            actions = pattern_or_error.stagehand_actions
 
             # Execute with retries
             execution_result = await self._execute_with_retries(
-                action_request, actions_or_error, config
+                action_request, actions, config, pattern_id=pattern_or_error.pattern_id
             )
 
             # Calculate confidence based on execution success and pattern history
             confidence = self._calculate_execution_confidence(
-                action_request, execution_result, actions_or_error
+                action_request, execution_result, actions
             )
 
             # Create result
@@ -130,7 +132,7 @@ class StagehandIntegration:
             # Record for learning if enabled
             if config.enable_pattern_learning:
                 await self._record_execution_for_learning(
-                    action_request, actions_or_error, execution_result, result
+                    action_request, actions, execution_result, result
                 )
 
             # Log execution
@@ -154,12 +156,12 @@ class StagehandIntegration:
         self,
         action_request: ActionRequest,
         dom_analysis_result: Dict[str, Any]
-    ) -> Tuple[bool, List[Dict[str, Any]]]:
-        """Generate Stagehand code for the action request"""
+    ) -> Tuple[bool, Union[StagehandPattern, str]]:
+        """Get the cached or newly generated Stagehand pattern for the action request"""
         try:
             dom_context = dom_analysis_result.get('dom_analysis_text', '')
 
-            success, result = await self.stagehand_generator.generate_stagehand_code(
+            success, result = await self.stagehand_generator.get_or_generate_pattern(
                 url=action_request.url,
                 task_description=action_request.task_description,
                 dom_context=dom_context,
@@ -178,7 +180,8 @@ class StagehandIntegration:
         self,
         action_request: ActionRequest,
         actions: List[Dict[str, Any]],
-        config: StagehandExecutionPipeline
+        config: StagehandExecutionPipeline,
+        pattern_id: Optional[str] = None
     ) -> StagehandExecutionResult:
         """Execute Stagehand actions with retry logic"""
         last_error = None
@@ -191,7 +194,8 @@ class StagehandIntegration:
                 execution_task = self.stagehand_generator.execute_stagehand_actions(
                     url=action_request.url,
                     actions=actions,
-                    show_browser=config.show_browser
+                    show_browser=config.show_browser,
+                    pattern_id=pattern_id
                 )
 
                 result = await asyncio.wait_for(execution_task, timeout=config.timeout_seconds)
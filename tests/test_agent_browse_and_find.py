@@ -279,6 +279,63 @@ class TestFormatHelpers:
         assert 'Step 5:' not in result
 
 
+class TestBrowseManyTool:
+    """Test browse_many concurrent browsing tool."""
+
+    @pytest.mark.asyncio
+    async def test_browse_many_runs_batch(self):
+        """Test browse_many builds one sub-task per URL."""
+        agent = WYN360Agent(api_key="test_key")
+
+        with patch('wyn360_cli.agent.BrowserTaskExecutor') as MockExecutor:
+            mock_executor_instance = Mock()
+            MockExecutor.return_value = mock_executor_instance
+            mock_executor_instance.execute_tasks = AsyncMock(return_value={'status': 'success'})
+            mock_executor_instance.get_concurrent_summary = Mock(return_value="2 sites browsed")
+
+            result = await agent.browse_many(
+                ctx=None,
+                task="Find the price",
+                urls=["https://a.example", "https://b.example"],
+                max_concurrency=2,
+                headless=True
+            )
+
+            assert result == "2 sites browsed"
+            subtasks = mock_executor_instance.execute_tasks.call_args.args[0]
+            assert [s['url'] for s in subtasks] == ["https://a.example", "https://b.example"]
+            assert mock_executor_instance.execute_tasks.call_args.kwargs['max_concurrency'] == 2
+
+    @pytest.mark.asyncio
+    async def test_browse_many_disabled_in_bedrock(self):
+        """Test browse_many requires vision."""
+        agent = WYN360Agent(api_key="test_key")
+        agent.use_bedrock = True
+
+        result = await agent.browse_many(ctx=None, task="Find", urls=["https://a.example"])
+
+        assert 'Bedrock' in result
+
+    def test_vision_contexts_keep_images(self):
+        """Test the shared browser's vision contexts get a policy that does not block images."""
+        from types import SimpleNamespace
+        from wyn360_cli.config import WYN360Config
+
+        agent = SimpleNamespace(config=WYN360Config(browser_resource_profile="balanced"))
+        manager = Mock()
+
+        with patch('wyn360_cli.agent.browser_manager', manager), \
+             patch('wyn360_cli.agent.configure_fetch_resource_blocking'):
+            WYN360Agent._configure_resource_blocking(agent)
+
+        blocker = manager.configure_resource_blocking.call_args.args[0]
+        vision_blocker = manager.configure_resource_blocking.call_args.kwargs['vision_blocker']
+        dom_types = blocker.policy_resolver("https://shop.example/")['block_resource_types']
+        vision_types = vision_blocker.policy_resolver("https://shop.example/")['block_resource_types']
+        assert "image" in dom_types
+        assert "image" not in vision_types and "font" in vision_types
+
+
 class TestSystemPromptIntegration:
     """Test system prompt contains browse_and_find documentation."""
 
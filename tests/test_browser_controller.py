@@ -391,7 +391,7 @@ class TestBrowserScreenshot:
 
         # Verify
         assert screenshot == b'fake_screenshot_data'
-        mock_page.screenshot.assert_called_once_with(type='png', full_page=False)
+        mock_page.screenshot.assert_called_once_with(type='png', full_page=False, scale='css')
 
     @pytest.mark.asyncio
     async def test_take_screenshot_not_initialized(self):
@@ -401,6 +401,39 @@ class TestBrowserScreenshot:
         with pytest.raises(BrowserControllerError, match="not initialized"):
             await controller.take_screenshot()
 
+    @pytest.mark.asyncio
+    async def test_take_screenshot_crops_to_region_of_interest(self):
+        """Test roi_selector clips the capture to the padded, clamped element box."""
+        element = AsyncMock()
+        element.bounding_box = AsyncMock(return_value={'x': 10, 'y': 100, 'width': 300, 'height': 50})
+        controller = BrowserController()
+        controller._initialized = True
+        controller.page = AsyncMock()
+        controller.page.viewport_size = {'width': 1024, 'height': 768}
+        controller.page.query_selector = AsyncMock(return_value=element)
+        controller.page.screenshot = AsyncMock(return_value=b'fake_screenshot_data')
+
+        await controller.take_screenshot(roi_selector='#results')
+
+        controller.page.screenshot.assert_called_once_with(
+            type='png', full_page=False, scale='css',
+            clip={'x': 0.0, 'y': 84.0, 'width': 326.0, 'height': 82.0}
+        )
+        assert controller.last_screenshot_stats['cropped'] is True
+
+    @pytest.mark.asyncio
+    async def test_take_screenshot_missing_roi_captures_viewport(self):
+        """Test an element that cannot be found falls back to the full viewport."""
+        controller = BrowserController()
+        controller._initialized = True
+        controller.page = AsyncMock()
+        controller.page.query_selector = AsyncMock(return_value=None)
+        controller.page.screenshot = AsyncMock(return_value=b'fake_screenshot_data')
+
+        await controller.take_screenshot(roi_selector='#missing')
+
+        controller.page.screenshot.assert_called_once_with(type='png', full_page=False, scale='css')
+
 
 class TestBrowserPageState:
     """Test page state extraction."""
@@ -498,3 +531,26 @@ class TestBrowserElementFinding:
         # Verify
         assert element == mock_element
         mock_page.query_selector_all.assert_called_once_with('xpath=//div[@id="test"]')
+
+
+class TestBrowserControllerAttach:
+    """Test driving a page owned by a shared browser."""
+
+    @pytest.mark.asyncio
+    async def test_attach_and_cleanup_leave_page_open(self):
+        """Test cleanup after attach() does not close the borrowed page."""
+        mock_page = AsyncMock()
+        mock_page.set_default_timeout = Mock()
+
+        controller = BrowserController()
+        await controller.attach(mock_page)
+
+        assert controller._initialized is True
+        assert controller.page is mock_page
+        mock_page.add_init_script.assert_called_once()
+
+        await controller.cleanup()
+
+        assert controller._initialized is False
+        assert controller.page is None
+        mock_page.close.assert_not_called()
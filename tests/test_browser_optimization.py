@@ -6,11 +6,12 @@ Tests the integrated browser automation optimization system including:
 - Site-specific optimization profiles
 - Environment variable support
 - Browser controller integration
+- Adaptive page-stability waits
 """
 
 import os
 import pytest
-from unittest.mock import patch
+from unittest.mock import patch, AsyncMock, Mock
 
 from wyn360_cli.config import (
     WYN360Config,
@@ -18,7 +19,12 @@ from wyn360_cli.config import (
     get_site_profile,
     load_env_config
 )
-from wyn360_cli.browser_controller import BrowserConfig
+from wyn360_cli.browser_controller import (
+    BrowserConfig,
+    BrowserController,
+    PlaywrightTimeoutError,
+    STABILITY_PREDICATE
+)
 
 
 class TestProgressiveTimeouts:
@@ -251,5 +257,126 @@ class TestConfigurationDefaults:
         assert config.browser_auto_site_detection is True
 
 
+class TestAdaptiveStabilityWaits:
+    """Test event-driven page-stability waits (Phase 5.5)"""
+
+    def make_controller(self):
+        """Create an initialized controller around a mock page"""
+        with patch('wyn360_cli.browser_controller.HAS_PLAYWRIGHT', True):
+            controller = BrowserController()
+        controller.page = AsyncMock()
+        controller.page.url = "https://example.com"
+        controller._initialized = True
+        return controller
+
+    def test_stability_max_wait_site_override(self):
+        """Test stability caps come from config and site profiles"""
+        config = WYN360Config()
+        config.browser_stability_max_wait = 4.0
+        config.browser_stability_max_wait_action = 1.5
+
+        with patch.object(BrowserConfig, 'get_config', return_value=config):
+            assert BrowserConfig.get_stability_max_wait('navigation', 'https://example.com') == 4.0
+            assert BrowserConfig.get_stability_max_wait('navigation', 'https://amazon.com/dp/1') == 8.0
+            assert BrowserConfig.get_stability_max_wait('action', 'https://amazon.com/dp/1') == 1.5
+
+    def test_legacy_fallback_is_fixed(self):
+        """Test fixed waits are used when config cannot be loaded"""
+        with patch.object(BrowserConfig, 'get_config', return_value=None):
+            assert BrowserConfig.get_wait_mode() == 'fixed'
+
+    @pytest.mark.asyncio
+    async def test_adaptive_wait_returns_when_page_is_stable(self):
+        """Test adaptive waits poll the in-page predicate instead of sleeping"""
+        controller = self.make_controller()
+        config = WYN360Config()
+        config.browser_stability_quiet_ms = 300
+
+        with patch.object(BrowserConfig, 'get_config', return_value=config), \
+             patch('wyn360_cli.browser_controller.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            record = await controller.wait_for_page_stable('action')
+
+        mock_sleep.assert_not_called()
+        args, kwargs = controller.page.wait_for_function.call_args
+        assert args[0] == STABILITY_PREDICATE
+        assert kwargs['arg'] == 300
+        assert kwargs['timeout'] <= 2000
+        assert record['stable'] is True
+        assert record['mode'] == 'adaptive'
+        assert controller.wait_log == [record]
+
+    @pytest.mark.asyncio
+    async def test_adaptive_wait_is_capped(self):
+        """Test a page that never settles is released at the cap"""
+        controller = self.make_controller()
+        controller.page.wait_for_function = AsyncMock(side_effect=PlaywrightTimeoutError("timeout"))
+
+        with patch.object(BrowserConfig, 'get_config', return_value=WYN360Config()):
+            record = await controller.wait_for_page_stable('navigation')
+
+        assert record['stable'] is False
+        assert controller.page.wait_for_function.call_count == 1
+        assert controller.get_wait_stats()['capped'] == 1
+
+    @pytest.mark.asyncio
+    async def test_adaptive_wait_survives_navigation(self):
+        """Test the check is retried when an action navigates mid-wait"""
+        controller = self.make_controller()
+        controller.page.wait_for_function = AsyncMock(
+            side_effect=[Exception("Execution context was destroyed"), True]
+        )
+
+        with patch.object(BrowserConfig, 'get_config', return_value=WYN360Config()):
+            record = await controller.wait_for_page_stable('action')
+
+        assert record['stable'] is True
+        controller.page.wait_for_load_state.assert_called_once()
+        assert controller.page.wait_for_function.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fixed_mode_sleeps_configured_delay(self):
+        """Test fixed mode keeps the legacy wait_after_* sleeps"""
+        controller = self.make_controller()
+        config = WYN360Config()
+        config.browser_wait_mode = "fixed"
+        config.browser_wait_after_action = 0.75
+
+        with patch.object(BrowserConfig, 'get_config', return_value=config), \
+             patch('wyn360_cli.browser_controller.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            record = await controller.wait_for_page_stable('action')
+
+        mock_sleep.assert_called_once_with(0.75)
+        controller.page.wait_for_function.assert_not_called()
+        assert record['mode'] == 'fixed'
+
+    @pytest.mark.asyncio
+    async def test_execute_action_records_wait_time(self):
+        """Test actions report their settle time; extract skips the wait"""
+        controller = self.make_controller()
+        controller.page.query_selector_all = AsyncMock(return_value=[])
+
+        with patch.object(BrowserConfig, 'get_config', return_value=WYN360Config()):
+            scroll = await controller.execute_action({'type': 'scroll', 'direction': 'down'})
+            extract = await controller.execute_action({'type': 'extract', 'selector': '.price'})
+
+        assert 'wait_time' in scroll
+        assert extract['wait_time'] == 0.0
+        stats = controller.get_wait_stats()
+        assert stats['action']['count'] == 1
+
+    def test_stability_env_variables(self):
+        """Test stability settings from environment variables"""
+        with patch.dict(os.environ, {
+            'WYN360_WAIT_MODE': 'fixed',
+            'WYN360_STABILITY_QUIET_MS': '250',
+            'WYN360_STABILITY_MAX_WAIT': '3.5'
+        }):
+            env_config = load_env_config()
+
+        assert env_config["browser_wait_mode"] == "fixed"
+        assert env_config["browser_stability_quiet_ms"] == 250
+        assert env_config["browser_stability_max_wait"] == 3.5
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,373 @@
+"""
+Unit tests for the warm browser pool (Phase 4.4)
+
+Tests cover:
+- Pre-creating pooled pages
+- Hit/miss accounting and time-to-page stats
+- Reset-on-return semantics and recycling
+- UnifiedBrowserManager integration (get_page, close_page, acquire/release)
+- Named pages keeping a single lease, and pages outside a full pool being closed
+- Vision pages kept out of the pool, with their own interception policy
+- Idle shutdown waiting for held pages and in_use() blocks
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from wyn360_cli.tools.browser.browser_pool import BrowserPool, CLEAR_STORAGE_SCRIPT
+from wyn360_cli.tools.browser.browser_manager import UnifiedBrowserManager
+
+
+def make_context():
+    """Create a mock context whose new_page() returns a fresh mock page"""
+    context = AsyncMock()
+    context.set_default_timeout = Mock()
+    context.is_closed = Mock(return_value=False)
+    context.pages = []
+
+    async def new_page():
+        page = AsyncMock()
+        page.is_closed = Mock(return_value=False)
+        page.url = 'about:blank'
+        context.pages.append(page)
+        return page
+
+    context.new_page = new_page
+    return context
+
+
+async def context_factory():
+    return make_context()
+
+
+class TestBrowserPool:
+    """Test BrowserPool behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_fill_creates_configured_number_of_pages(self):
+        """Test that fill() pre-creates pages up to the pool size"""
+        pool = BrowserPool(size=3)
+
+        created = await pool.fill(context_factory)
+
+        assert created == 3
+        assert pool.idle_count() == 3
+        assert pool.get_stats()['warmups'] == 1
+
+        # Filling again is a no-op
+        assert await pool.fill(context_factory) == 0
+
+    @pytest.mark.asyncio
+    async def test_acquire_hit_and_miss_accounting(self):
+        """Test hit rate reflects warm hand-outs vs. misses"""
+        pool = BrowserPool(size=1)
+        await pool.fill(context_factory)
+
+        page = await pool.acquire()
+        assert page is not None
+        assert pool.owns(page)
+
+        # Pool is now empty
+        assert await pool.acquire() is None
+        pool.record_miss(0.5)
+
+        stats = pool.get_stats()
+        assert stats['acquisitions'] == 2
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+        assert stats['max_time_to_page_ms'] >= 500
+
+    @pytest.mark.asyncio
+    async def test_release_resets_page_instead_of_closing(self):
+        """Test reset-on-return clears storage/cookies and parks on about:blank"""
+        pool = BrowserPool(size=1)
+        await pool.fill(context_factory)
+        page = await pool.acquire()
+        page.url = 'https://example.com/account'
+        context = pool.leased[id(page)].context
+
+        returned = await pool.release(page)
+
+        assert returned is True
+        assert pool.idle_count() == 1
+        page.evaluate.assert_called_once_with(CLEAR_STORAGE_SCRIPT)
+        context.clear_cookies.assert_called_once()
+        page.goto.assert_called_once_with('about:blank')
+        page.close.assert_not_called()
+        context.close.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_release_closes_extra_tabs(self):
+        """Test popups opened in a pooled context are closed on release"""
+        pool = BrowserPool(size=1)
+        await pool.fill(context_factory)
+        page = await pool.acquire()
+        context = pool.leased[id(page)].context
+        popup = await context.new_page()
+
+        await pool.release(page)
+
+        popup.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_reset_discards_slot(self):
+        """Test a page that cannot be reset is discarded"""
+        pool = BrowserPool(size=1)
+        await pool.fill(context_factory)
+        page = await pool.acquire()
+        context = pool.leased[id(page)].context
+        page.goto.side_effect = Exception("target closed")
+
+        returned = await pool.release(page)
+
+        assert returned is False
+        assert pool.idle_count() == 0
+        assert pool.get_stats()['reset_failures'] == 1
+        context.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_page_recycled_after_max_uses(self):
+        """Test pooled pages are recycled after max_uses hand-outs"""
+        pool = BrowserPool(size=1, max_uses=2)
+        await pool.fill(context_factory)
+
+        page = await pool.acquire()
+        assert await pool.release(page) is True
+        page = await pool.acquire()
+        assert await pool.release(page) is False
+
+        assert pool.get_stats()['recycled'] == 1
+        assert pool.idle_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_closed_idle_pages_are_skipped(self):
+        """Test acquire() skips pages that were closed while idle"""
+        pool = BrowserPool(size=2)
+        await pool.fill(context_factory)
+        pool.idle[-1].page.is_closed.return_value = True
+
+        page = await pool.acquire()
+
+        assert page is not None
+        assert not page.is_closed()
+        assert pool.idle_count() == 0
+
+
+class TestUnifiedBrowserManagerPool:
+    """Test pool integration in UnifiedBrowserManager"""
+
+    def setup_method(self):
+        """Reset browser manager state before each test"""
+        self.manager = UnifiedBrowserManager()
+        self.manager.browser = AsyncMock()
+        self.manager.browser.new_context = AsyncMock(side_effect=lambda **kwargs: make_context())
+        self.manager.playwright = None
+        self.manager.contexts = {}
+        self.manager.pages = {}
+        self.manager.pool = BrowserPool(size=2)
+        self.manager._pooled_page_keys = set()
+
+    @pytest.mark.asyncio
+    async def test_get_page_uses_warm_pool(self):
+        """Test default-context pages come from the pool"""
+        await self.manager.pool.fill(self.manager._new_context)
+
+        page = await self.manager.get_page("dom_analysis")
+
+        assert self.manager.pool.owns(page)
+        assert self.manager.pool.get_stats()['hits'] == 1
+
+    @pytest.mark.asyncio
+    async def test_named_page_reuses_its_lease(self):
+        """Test asking for the same page twice does not lease another pooled page"""
+        await self.manager.pool.fill(self.manager._new_context)
+
+        first = await self.manager.get_page("dom_analysis")
+        second = await self.manager.get_page("dom_analysis")
+
+        assert second is first
+        assert self.manager.pool.leased_count() == 1
+
+    @pytest.mark.asyncio
+    async def test_closed_named_page_hands_back_its_lease(self):
+        """Test a page closed elsewhere is released before a new one is leased"""
+        await self.manager.pool.fill(self.manager._new_context)
+        first = await self.manager.get_page("dom_analysis")
+        first.is_closed.return_value = True
+
+        second = await self.manager.get_page("dom_analysis")
+
+        assert second is not first
+        assert self.manager.pool.leased_count() == 1
+        assert self.manager.pool.owns(second)
+
+    @pytest.mark.asyncio
+    async def test_page_outside_full_pool_is_closed(self):
+        """Test pages created once the pool is full are closed, not released"""
+        self.manager.configure_pool(size=1)
+        await self.manager.get_page("first")
+        overflow = await self.manager.get_page("second")
+
+        assert not self.manager.pool.owns(overflow)
+        assert 'default:second' not in self.manager._pooled_page_keys
+
+        await self.manager.close_page("second")
+        overflow.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_close_page_returns_pooled_page(self):
+        """Test closing a pooled page resets it back into the pool"""
+        await self.manager.pool.fill(self.manager._new_context)
+        page = await self.manager.get_page("dom_analysis")
+
+        await self.manager.close_page("dom_analysis")
+
+        page.close.assert_not_called()
+        assert 'default:dom_analysis' not in self.manager.pages
+        assert self.manager.pool.idle_count() == 2
+
+    @pytest.mark.asyncio
+    async def test_close_page_forgets_blocker_state(self):
+        """Test closing pooled and unpooled pages clears both blockers' per-page state"""
+        dom_blocker, vision_blocker = AsyncMock(), AsyncMock()
+        dom_blocker.forget_page, vision_blocker.forget_page = Mock(), Mock()
+        self.manager.configure_resource_blocking(dom_blocker, vision_blocker=vision_blocker)
+        pooled = await self.manager.get_page("dom_analysis")
+        vision = await self.manager.get_page("main", "browse-1", vision=True)
+
+        await self.manager.close_page("dom_analysis")
+        await self.manager.close_page("main", "browse-1")
+
+        for blocker in (dom_blocker, vision_blocker):
+            blocker.forget_page.assert_any_call(pooled)
+            blocker.forget_page.assert_any_call(vision)
+        self.manager.configure_resource_blocking(None)
+
+    @pytest.mark.asyncio
+    async def test_acquire_and_release_page(self):
+        """Test acquire_page() grows the pool on a miss and release_page() returns it"""
+        page = await self.manager.acquire_page()
+
+        stats = self.manager.pool.get_stats()
+        assert stats['misses'] == 1
+        assert self.manager.pool.owns(page)
+
+        await self.manager.release_page(page)
+        assert self.manager.pool.idle_count() == 1
+
+        await self.manager.acquire_page()
+        assert self.manager.pool.get_stats()['hits'] == 1
+
+    @pytest.mark.asyncio
+    async def test_vision_pages_use_vision_policy(self):
+        """Test vision pages skip the pool and get the vision blocker installed"""
+        dom_blocker, vision_blocker = AsyncMock(), AsyncMock()
+        self.manager.configure_resource_blocking(dom_blocker, vision_blocker=vision_blocker)
+        await self.manager.pool.fill(self.manager._new_context)
+        dom_blocker.install.reset_mock()
+
+        page = await self.manager.get_page("main", "browse-1", vision=True)
+
+        assert not self.manager.pool.owns(page)
+        assert self.manager.pool.idle_count() == 2
+        vision_blocker.install.assert_awaited_once_with(self.manager.contexts["browse-1"])
+        dom_blocker.install.assert_not_called()
+        self.manager.configure_resource_blocking(None)
+
+    @pytest.mark.asyncio
+    async def test_acquired_vision_page_gets_own_context(self):
+        """Test acquire_page(vision=True) bypasses the pool and closes its context on release"""
+        await self.manager.pool.fill(self.manager._new_context)
+
+        page = await self.manager.acquire_page(vision=True)
+        assert not self.manager.pool.owns(page)
+        assert self.manager.pool.idle_count() == 2
+
+        await self.manager.release_page(page)
+        page.context.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_pool_disabled_falls_back_to_named_context(self):
+        """Test size=0 keeps the original one-context-per-name behaviour"""
+        self.manager.configure_pool(size=0)
+
+        await self.manager.get_page("dom_analysis")
+
+        assert 'default' in self.manager.contexts
+        assert self.manager.pool.get_stats()['misses'] == 1
+
+    @pytest.mark.asyncio
+    async def test_browser_info_includes_pool_stats(self):
+        """Test pool stats are exposed through get_browser_info()"""
+        info = await self.manager.get_browser_info()
+
+        assert 'pool' in info
+        assert 'hit_rate' in info['pool']
+        assert 'avg_time_to_page_ms' in info['pool']
+
+
+class TestIdleWatchdog:
+    """Test idle shutdown of the shared browser"""
+
+    def setup_method(self):
+        """Manager with a mock browser and a short idle timeout"""
+        self.manager = UnifiedBrowserManager()
+        self.manager.browser = AsyncMock()
+        self.manager.browser.new_context = AsyncMock(side_effect=lambda **kwargs: make_context())
+        self.manager.playwright = None
+        self.manager.contexts = {}
+        self.manager.pages = {}
+        self.manager.pool = BrowserPool(size=0)
+        self.manager._pooled_page_keys = set()
+        self.manager._held_pages = set()
+        self.manager._in_use = 0
+        self.manager.configure_pool(idle_timeout=0.05)
+
+    def teardown_method(self):
+        self.manager.browser = None
+        self.manager.configure_pool(idle_timeout=300.0)
+
+    async def _run_watchdog(self):
+        """Let the watchdog run a few intervals; True if it shut the browser down"""
+        watchdog = asyncio.get_running_loop().create_task(self.manager._idle_watchdog())
+        await asyncio.sleep(0.2)
+        shut_down = watchdog.done()
+        watchdog.cancel()
+        return shut_down
+
+    @pytest.mark.asyncio
+    async def test_held_page_outside_pool_blocks_shutdown(self):
+        """Test a page leased in its own context (as execute_tasks does) keeps the browser up"""
+        page = await self.manager.acquire_page(vision=True)
+        self.manager.pool.last_activity -= 60  # Held far longer than idle_timeout
+
+        assert await self._run_watchdog() is False
+
+        await self.manager.release_page(page)
+        self.manager.pool.last_activity -= 60
+        assert await self._run_watchdog() is True
+        assert self.manager.pool.get_stats()['idle_shutdowns'] == 1
+
+    @pytest.mark.asyncio
+    async def test_in_use_blocks_shutdown_and_refreshes_activity(self):
+        """Test in_use() holds the browser and counts as activity when it ends"""
+        with self.manager.in_use():
+            self.manager.pool.last_activity -= 60
+            assert await self._run_watchdog() is False
+
+        assert time.time() - self.manager.pool.last_activity < 1
+        assert not self.manager.is_busy()
+
+    @pytest.mark.asyncio
+    async def test_get_page_refreshes_activity(self):
+        """Test reusing a named page counts as activity"""
+        await self.manager.get_page("dom_analysis")
+        self.manager.pool.last_activity -= 60
+
+        await self.manager.get_page("dom_analysis")
+
+        assert time.time() - self.manager.pool.last_activity < 1
@@ -1,5 +1,8 @@
 """Tests for BrowserTaskExecutor class."""
 
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 import json
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
@@ -519,3 +522,318 @@ class TestMetricsTracking:
         assert metrics['errors_encountered'] == 0
         assert 'total_duration' in metrics
         assert metrics['total_duration'] > 0
+
+
+def _png(color='white'):
+    """Create a small decodable PNG screenshot."""
+    import io
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (320, 240), color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class TestVisionCallSkipping:
+    """Test screenshot change detection skipping redundant vision calls."""
+
+    def _make_executor(self, screenshots, action_results):
+        executor = BrowserTaskExecutor(AsyncMock())
+        executor.controller.initialize = AsyncMock()
+        executor.controller.navigate = AsyncMock()
+        executor.controller.take_screenshot = AsyncMock(side_effect=screenshots)
+        executor.controller.get_page_state = AsyncMock(return_value={
+            'url': 'https://example.com',
+            'title': 'Example',
+            'loaded': True
+        })
+        executor.controller.execute_action = AsyncMock(side_effect=action_results)
+        executor.controller.cleanup = AsyncMock()
+        return executor
+
+    @pytest.mark.asyncio
+    async def test_unchanged_page_after_wait_skips_vision(self):
+        """Test a wait on an unchanged page is extended without a vision call."""
+        executor = self._make_executor(
+            screenshots=[_png(), _png(), _png('gray')],
+            action_results=[{'success': True}, {'success': True}]
+        )
+        executor.vision_engine.analyze_and_decide = AsyncMock(side_effect=[
+            {'status': 'continue', 'action': {'type': 'wait', 'seconds': 2}, 'reasoning': 'Loading', 'confidence': 70},
+            {'status': 'complete', 'action': {'type': 'extract'}, 'reasoning': 'Done', 'confidence': 90, 'extracted_data': {}}
+        ])
+
+        result = await executor.execute_task(task="Wait for results", url="https://example.com", max_steps=5)
+
+        metrics = result['metrics']
+        assert result['status'] == 'success'
+        assert metrics['vision_api_calls'] == 2
+        assert metrics['vision_calls_skipped'] == 1
+        assert metrics['vision_tokens_saved'] > 0
+        # Reused decision doubled the wait
+        assert result['history'][1]['action'] == {'type': 'wait', 'seconds': 4}
+
+    @pytest.mark.asyncio
+    async def test_failed_click_retried_by_text(self):
+        """Test a failed selector click on an unchanged page is retried by text."""
+        executor = self._make_executor(
+            screenshots=[_png(), _png(), _png('gray')],
+            action_results=[{'success': False, 'error': 'timeout'}, {'success': True}]
+        )
+        executor.vision_engine.analyze_and_decide = AsyncMock(side_effect=[
+            {'status': 'continue', 'action': {'type': 'click', 'selector': '#buy', 'text': 'Buy now'},
+             'reasoning': 'Click buy', 'confidence': 80},
+            {'status': 'complete', 'action': {'type': 'extract'}, 'reasoning': 'Done', 'confidence': 90, 'extracted_data': {}}
+        ])
+
+        result = await executor.execute_task(task="Buy", url="https://example.com", max_steps=5)
+
+        assert result['metrics']['vision_calls_skipped'] == 1
+        executor.controller.execute_action.assert_called_with({'type': 'click', 'text': 'Buy now'})
+
+    @pytest.mark.asyncio
+    async def test_changed_page_always_calls_vision(self):
+        """Test that a visible change always gets a fresh vision decision."""
+        executor = self._make_executor(
+            screenshots=[_png(), _png('gray'), _png('black')],
+            action_results=[{'success': True}, {'success': True}]
+        )
+        executor.vision_engine.analyze_and_decide = AsyncMock(side_effect=[
+            {'status': 'continue', 'action': {'type': 'wait', 'seconds': 2}, 'reasoning': 'Loading', 'confidence': 70},
+            {'status': 'continue', 'action': {'type': 'scroll', 'direction': 'down'}, 'reasoning': 'More', 'confidence': 70},
+            {'status': 'complete', 'action': {'type': 'extract'}, 'reasoning': 'Done', 'confidence': 90, 'extracted_data': {}}
+        ])
+
+        result = await executor.execute_task(task="Browse", url="https://example.com", max_steps=5)
+
+        assert result['metrics']['vision_api_calls'] == 3
+        assert result['metrics']['vision_calls_skipped'] == 0
+
+    @pytest.mark.asyncio
+    async def test_consecutive_skips_are_capped(self):
+        """Test a fresh vision look is forced after max_consecutive_skips reuses."""
+        executor = self._make_executor(
+            screenshots=[_png()] * 4 + [_png('gray')],
+            action_results=[{'success': True}] * 4
+        )
+        executor.vision_engine.analyze_and_decide = AsyncMock(side_effect=[
+            {'status': 'continue', 'action': {'type': 'wait', 'seconds': 1}, 'reasoning': 'Loading', 'confidence': 70},
+            {'status': 'continue', 'action': {'type': 'scroll', 'direction': 'down'}, 'reasoning': 'Try scrolling', 'confidence': 60},
+            {'status': 'complete', 'action': {'type': 'extract'}, 'reasoning': 'Done', 'confidence': 90, 'extracted_data': {}}
+        ])
+
+        result = await executor.execute_task(task="Wait", url="https://example.com", max_steps=6)
+
+        assert result['metrics']['vision_calls_skipped'] == 2
+        assert result['metrics']['vision_api_calls'] == 3
+
+
+class TestConcurrentExecution:
+    """Test independent sub-tasks running in isolated contexts of one browser."""
+
+    def _make_browser_manager(self):
+        manager = Mock()
+        manager.initialize = AsyncMock()
+        manager.acquire_page = AsyncMock(side_effect=lambda vision=False: Mock())
+        manager.release_page = AsyncMock()
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_subtasks_respect_concurrency_cap(self):
+        """Test no more than max_concurrency sub-tasks run at once."""
+        import asyncio
+
+        running = 0
+        peak = 0
+
+        async def fake_execute(self, task, url, max_steps=20, headless=False, page=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {'status': 'success', 'result': {'url': url}, 'steps_taken': 1, 'history': [],
+                    'reasoning': 'Done', 'metrics': {'total_duration': 0.01, 'vision_api_calls': 1}}
+
+        manager = self._make_browser_manager()
+        executor = BrowserTaskExecutor(AsyncMock())
+        subtasks = [{'task': 'Find price', 'url': f'https://shop{i}.example'} for i in range(5)]
+
+        with patch.object(BrowserTaskExecutor, 'execute_task', fake_execute):
+            batch = await executor.execute_tasks(subtasks, max_concurrency=2, browser_manager=manager)
+
+        assert peak == 2
+        assert batch['status'] == 'success'
+        assert [r['url'] for r in batch['results']] == [s['url'] for s in subtasks]
+        assert batch['metrics']['vision_api_calls'] == 5
+        # Every sub-task held its own page until it finished
+        pages = {id(call.args[0]) for call in manager.release_page.call_args_list}
+        assert len(pages) == 5
+        # Screenshots go to the vision model, so pages use the image-keeping policy
+        assert all(call.kwargs == {'vision': True} for call in manager.acquire_page.call_args_list)
+
+    @pytest.mark.asyncio
+    async def test_failures_are_isolated_per_subtask(self):
+        """Test one failing sub-task does not abort the others."""
+        calls = []
+
+        async def fake_execute(self, task, url, max_steps=20, headless=False, page=None):
+            calls.append((url, max_steps))
+            if 'broken' in url:
+                raise RuntimeError("page crashed")
+            return {'status': 'success', 'result': {}, 'steps_taken': 1, 'history': [],
+                    'reasoning': 'Done', 'metrics': {}}
+
+        manager = self._make_browser_manager()
+        executor = BrowserTaskExecutor(AsyncMock())
+        subtasks = [
+            {'task': 'Find price', 'url': 'https://good.example'},
+            {'task': 'Find price', 'url': 'https://broken.example', 'max_steps': 3},
+        ]
+
+        with patch.object(BrowserTaskExecutor, 'execute_task', fake_execute):
+            batch = await executor.execute_tasks(subtasks, max_steps=7, browser_manager=manager)
+
+        assert batch['status'] == 'partial'
+        assert batch['metrics']['status_counts'] == {'success': 1, 'failed': 1}
+        assert 'page crashed' in batch['results'][1]['reasoning']
+        assert sorted(calls) == [('https://broken.example', 3), ('https://good.example', 7)]
+        assert manager.release_page.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_first_step_decision_shared_between_subtasks(self):
+        """Test a second sub-task on an identical page reuses the first decision."""
+        from wyn360_cli.browser_task_executor import VisionDecisionCache
+
+        cache = VisionDecisionCache()
+        decision = {'status': 'complete', 'action': {'type': 'extract'}, 'reasoning': 'Done',
+                    'confidence': 90, 'extracted_data': {'price': '$5'}}
+        results = []
+
+        for _ in range(2):
+            executor = BrowserTaskExecutor(AsyncMock(), decision_cache=cache)
+            executor.controller.attach = AsyncMock()
+            executor.controller.navigate = AsyncMock()
+            executor.controller.take_screenshot = AsyncMock(return_value=_png())
+            executor.controller.get_page_state = AsyncMock(return_value={'url': 'https://example.com'})
+            executor.controller.cleanup = AsyncMock()
+            executor.vision_engine.analyze_and_decide = AsyncMock(return_value=decision)
+            results.append(await executor.execute_task("Find price", "https://example.com", page=Mock()))
+
+        assert results[0]['metrics']['vision_api_calls'] == 1
+        assert results[1]['metrics']['vision_api_calls'] == 0
+        assert results[1]['metrics']['vision_cache_hits'] == 1
+        assert results[1]['result'] == {'price': '$5'}
+        executor.controller.attach.assert_called_once()
+
+
+SITES = ("shop-a", "shop-b", "shop-c")
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """Serve one fixture site: a product page with a picture"""
+
+    site = ""
+    image_requests = None
+
+    def do_GET(self):
+        if self.path == "/logo.png":
+            self.image_requests.append(self.site)
+            body, content_type = _png('red'), "image/png"
+        else:
+            body = (f"<!doctype html><html><head><title>{self.site}</title></head><body>"
+                    f"<h1>{self.site}</h1><img id='logo' src='/logo.png'><p>Price: $5</p>"
+                    f"</body></html>").encode()
+            content_type = "text/html"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_sites():
+    """One local HTTP server per site, so every site is its own origin"""
+    image_requests = []
+    servers = []
+    for site in SITES:
+        handler = type(f"Handler_{site}", (_SiteHandler,), {'site': site, 'image_requests': image_requests})
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    yield {site: f"http://127.0.0.1:{server.server_port}/" for site, server in zip(SITES, servers)}, image_requests
+    for server in servers:
+        server.shutdown()
+
+
+async def _real_browser_manager():
+    """Fresh UnifiedBrowserManager on a real Chromium, with the agent's two blocking policies"""
+    pytest.importorskip("playwright.async_api")
+    from wyn360_cli.config import get_resource_policy
+    from wyn360_cli.tools.browser.browser_manager import UnifiedBrowserManager
+    from wyn360_cli.tools.browser.resource_blocker import ResourceBlocker
+
+    manager = object.__new__(UnifiedBrowserManager)
+    manager.__init__()
+    manager.configure_pool(size=0)
+    manager.configure_resource_blocking(
+        ResourceBlocker(policy_resolver=lambda url: get_resource_policy(url, "balanced")),
+        vision_blocker=ResourceBlocker(
+            policy_resolver=lambda url: get_resource_policy(url, "balanced", vision_mode=True)
+        )
+    )
+    try:
+        await manager.initialize(headless=True)
+    except Exception as e:
+        pytest.skip(f"Chromium not available: {e}")
+    return manager
+
+
+async def _image_width(page):
+    """Rendered width of the fixture page's picture (0 when it was blocked)"""
+    return await page.evaluate(
+        "() => { const img = document.getElementById('logo'); return img.complete ? img.naturalWidth : 0; }"
+    )
+
+
+class TestConcurrentExecutionRealPages:
+    """Test execute_tasks against real pages on several local sites."""
+
+    @pytest.mark.asyncio
+    async def test_vision_pages_keep_images(self, fixture_sites):
+        """Test pages handed to vision sub-tasks load images, while DOM pages still block them."""
+        urls, image_requests = fixture_sites
+        manager = await _real_browser_manager()
+        seen = {}
+
+        async def fake_execute(self, task, url, max_steps=20, headless=False, page=None):
+            await page.goto(url, wait_until="load")
+            seen[url] = (await page.title(), await _image_width(page), page.context)
+            return {'status': 'success', 'result': {}, 'steps_taken': 1, 'history': [],
+                    'reasoning': 'Done', 'metrics': {}}
+
+        try:
+            executor = BrowserTaskExecutor(AsyncMock())
+            subtasks = [{'task': 'Find price', 'url': url} for url in urls.values()]
+            with patch.object(BrowserTaskExecutor, 'execute_task', fake_execute):
+                batch = await executor.execute_tasks(subtasks, max_concurrency=2,
+                                                     browser_manager=manager)
+
+            assert batch['status'] == 'success'
+            assert {title for title, _, _ in seen.values()} == set(SITES)
+            assert all(width == 320 for _, width, _ in seen.values())
+            assert sorted(image_requests) == sorted(SITES)
+            # Each site ran in its own context, and every page was released afterwards
+            assert len({id(context) for _, _, context in seen.values()}) == len(SITES)
+            assert not manager.is_busy()
+
+            dom_page = await manager.get_page("dom_analysis", "dom")
+            await dom_page.goto(urls["shop-a"], wait_until="load")
+            assert await _image_width(dom_page) == 0
+            assert manager.get_resource_stats(dom_page)['blocked_by_type'].get('image') == 1
+        finally:
+            await manager.close()
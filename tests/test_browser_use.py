@@ -4,16 +4,21 @@ Unit tests for browser_use module (Phase 12.1, 12.2, 12.3)
 Tests cover:
 - URL validation
 - Token counting and truncation
-- WebsiteCache functionality
+- WebsiteCache functionality (SQLite index, LRU, stale-while-revalidate)
 - fetch_website_content integration
+- Shared crawler idle shutdown
 """
 
+import asyncio
+import json
+import os
 import pytest
 import tempfile
 import time
 from pathlib import Path
 from unittest.mock import Mock, patch, AsyncMock
 
+from wyn360_cli import browser_use
 from wyn360_cli.browser_use import (
     is_valid_url,
     count_tokens,
@@ -21,6 +26,10 @@ from wyn360_cli.browser_use import (
     WebsiteCache,
     fetch_website_content,
     check_playwright_installed,
+    configure_shared_crawler,
+    get_shared_crawler,
+    get_crawler_stats,
+    use_shared_crawler,
     HAS_CRAWL4AI
 )
 
@@ -196,6 +205,153 @@ class TestWebsiteCache:
             assert 'cache_dir' in stats
 
 
+class TestIndexedWebsiteCache:
+    """Test the SQLite index, LRU eviction and stale-while-revalidate (Phase 12.7)"""
+
+    @pytest.mark.asyncio
+    async def test_index_writes_are_batched(self, tmp_path):
+        """Index changes are written in one transaction per batch"""
+        cache = WebsiteCache(tmp_path, ttl=3600, flush_every=10, flush_interval=3600)
+
+        for n in range(9):
+            await cache.set(f"https://example.com/{n}", f"Content {n}")
+        assert cache.get_stats()['index_flushes'] == 0
+
+        await cache.set("https://example.com/9", "Content 9")
+        stats = cache.get_stats()
+        assert stats['index_flushes'] == 1
+        assert stats['pending_index_writes'] == 0
+
+    @pytest.mark.asyncio
+    async def test_index_persists_across_instances(self, tmp_path):
+        """Entries and access counts survive a restart after close()"""
+        cache = WebsiteCache(tmp_path, ttl=3600)
+        await cache.set("https://example.com/a", "Content A")
+        await cache.get("https://example.com/a")
+        cache.close()
+
+        reopened = WebsiteCache(tmp_path, ttl=3600)
+        assert await reopened.get("https://example.com/a") == "Content A"
+        assert list(reopened.index.values())[0]['hits'] == 2
+
+    @pytest.mark.asyncio
+    async def test_unflushed_files_are_reclaimed(self, tmp_path):
+        """Expired files whose index entry was never flushed are removed on load"""
+        cache = WebsiteCache(tmp_path, ttl=3600, flush_interval=3600)
+        await cache.set("https://example.com/a", "Content A")
+        expired = time.time() - 7200
+        for cache_file in tmp_path.glob("*.md.gz"):
+            os.utime(cache_file, (expired, expired))
+
+        WebsiteCache(tmp_path, ttl=3600)
+        assert list(tmp_path.glob("*.md.gz")) == []
+
+    @pytest.mark.asyncio
+    async def test_other_sessions_unflushed_files_are_kept(self, tmp_path):
+        """A live session's files survive another session opening the cache"""
+        cache = WebsiteCache(tmp_path, ttl=3600, flush_interval=3600)
+        await cache.set("https://example.com/a", "Content A")
+
+        WebsiteCache(tmp_path, ttl=3600)
+        assert await cache.get("https://example.com/a") == "Content A"
+
+        cache.close()
+        assert await WebsiteCache(tmp_path, ttl=3600).get("https://example.com/a") == "Content A"
+
+    @pytest.mark.asyncio
+    async def test_legacy_json_index_is_migrated(self, tmp_path):
+        """A cache_index.json from older versions is imported into SQLite"""
+        old = WebsiteCache(tmp_path, ttl=3600)
+        await old.set("https://example.com/a", "Content A")
+        entry = dict(old.index[old._get_cache_key("https://example.com/a")])
+        old.close()
+        (tmp_path / "cache_index.sqlite3").unlink()
+        (tmp_path / "cache_index.json").write_text(
+            json.dumps({old._get_cache_key("https://example.com/a"): {
+                'url': entry['url'], 'timestamp': entry['timestamp'], 'size': entry['size']}})
+        )
+
+        cache = WebsiteCache(tmp_path, ttl=3600)
+
+        assert await cache.get("https://example.com/a") == "Content A"
+        assert not (tmp_path / "cache_index.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_eviction_is_least_recently_used(self, tmp_path):
+        """Reading an entry protects it from eviction"""
+        cache = WebsiteCache(tmp_path, ttl=3600)
+        # Incompressible content so each entry has a predictable size
+        content = {name: os.urandom(360_000).hex() for name in "abc"}
+        await cache.set("https://example.com/a", content["a"])
+        await cache.set("https://example.com/b", content["b"])
+        await cache.get("https://example.com/a")
+
+        cache.max_size_mb = 1
+        await cache.set("https://example.com/c", content["c"])
+
+        assert await cache.get("https://example.com/b") is None
+        assert await cache.get("https://example.com/a") == content["a"]
+        assert cache.get_stats()['evictions'] == 1
+
+    @pytest.mark.asyncio
+    async def test_hit_miss_and_byte_counters(self, tmp_path):
+        """get() records hits, misses and bytes served"""
+        cache = WebsiteCache(tmp_path, ttl=3600)
+        await cache.set("https://example.com/a", "Content A")
+
+        await cache.get("https://example.com/a")
+        await cache.get("https://example.com/missing")
+
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses']) == (1, 1)
+        assert stats['hit_rate'] == 0.5
+        assert stats['bytes_read'] == stats['bytes_written'] > 0
+
+    @pytest.mark.asyncio
+    async def test_stale_content_served_while_refreshing(self, tmp_path):
+        """Expired entries inside the window are returned and refreshed in the background"""
+        cache = WebsiteCache(tmp_path, ttl=60, stale_while_revalidate=600)
+        await cache.set("https://example.com/a", "Old content")
+        cache.index[cache._get_cache_key("https://example.com/a")]['timestamp'] -= 120
+        refresh = AsyncMock(return_value="New content")
+
+        assert await cache.get("https://example.com/a", refresh=refresh) == "Old content"
+        assert await cache.get("https://example.com/a", refresh=refresh) == "Old content"
+        await cache.wait_for_revalidations()
+
+        refresh.assert_awaited_once()
+        assert await cache.get("https://example.com/a") == "New content"
+        stats = cache.get_stats()
+        assert (stats['stale_hits'], stats['revalidations']) == (2, 1)
+
+    @pytest.mark.asyncio
+    async def test_stale_window_limits(self, tmp_path):
+        """Without a refresher, or past the window, expired entries are misses"""
+        cache = WebsiteCache(tmp_path, ttl=60, stale_while_revalidate=600)
+        await cache.set("https://example.com/a", "Old content")
+        await cache.set("https://example.com/b", "Old content")
+        cache.index[cache._get_cache_key("https://example.com/a")]['timestamp'] -= 120
+        cache.index[cache._get_cache_key("https://example.com/b")]['timestamp'] -= 1000
+        refresh = AsyncMock(return_value="New content")
+
+        assert await cache.get("https://example.com/a") is None
+        assert await cache.get("https://example.com/b", refresh=refresh) is None
+        refresh.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_entry(self, tmp_path):
+        """A refresh that fails leaves the stale content in place"""
+        cache = WebsiteCache(tmp_path, ttl=60, stale_while_revalidate=600)
+        await cache.set("https://example.com/a", "Old content")
+        cache.index[cache._get_cache_key("https://example.com/a")]['timestamp'] -= 120
+
+        await cache.get("https://example.com/a", refresh=AsyncMock(side_effect=RuntimeError("offline")))
+        await cache.wait_for_revalidations()
+
+        assert cache.get_stats()['revalidation_failures'] == 1
+        assert await cache.get("https://example.com/a", refresh=AsyncMock(return_value=None)) == "Old content"
+
+
 class TestPlaywrightCheck:
     """Test Playwright installation checking"""
 
@@ -356,3 +512,42 @@ class TestFetchWebsiteContent:
         # Check that truncation happened (marker present or significant reduction)
         # Note: truncation adds marker which may make content slightly longer
         assert ("[Content truncated" in content) or (len(content) < len(large_content) * 0.9)
+
+
+class TestSharedCrawler:
+    """Test the shared crawler's idle shutdown"""
+
+    def teardown_method(self):
+        browser_use._shared_crawler = None
+        browser_use._crawler_idle_task = None
+        configure_shared_crawler(idle_timeout=300.0)
+
+    @pytest.mark.asyncio
+    @patch('wyn360_cli.browser_use.AsyncWebCrawler')
+    async def test_idle_crawler_is_closed(self, mock_crawler_class):
+        """Test the crawler's browser is closed once unused for idle_timeout"""
+        crawler = AsyncMock()
+        mock_crawler_class.return_value = crawler
+        configure_shared_crawler(idle_timeout=0.05)
+
+        await get_shared_crawler()
+        await asyncio.sleep(0.2)
+
+        crawler.close.assert_awaited_once()
+        assert get_crawler_stats()['running'] is False
+        assert get_crawler_stats()['idle_shutdowns'] >= 1
+
+    @pytest.mark.asyncio
+    @patch('wyn360_cli.browser_use.AsyncWebCrawler')
+    async def test_crawler_in_use_is_kept_open(self, mock_crawler_class):
+        """Test a fetch holding the crawler outlasting idle_timeout keeps it open"""
+        crawler = AsyncMock()
+        mock_crawler_class.return_value = crawler
+        configure_shared_crawler(idle_timeout=0.05)
+
+        async with use_shared_crawler():
+            await asyncio.sleep(0.2)
+            crawler.close.assert_not_called()
+
+        await asyncio.sleep(0.2)
+        crawler.close.assert_awaited_once()
@@ -0,0 +1,180 @@
+"""
+Unit tests for in-process code search
+
+Tests cover:
+- Ignore-aware candidate selection through the project file index
+- Binary file detection and file pattern filtering
+- Line numbers, context lines and literal fallback for invalid regexes
+- Early termination at the result cap, keeping the first matches by path and line
+- No phantom line for empty matches after the final newline
+- Streaming matches to async callers
+"""
+
+import pytest
+
+from wyn360_cli.code_search import (
+    format_matches,
+    scan_file,
+    compile_pattern,
+    search,
+    stream_search,
+)
+
+
+def _write(root, relative, content):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+    else:
+        path.write_text(content)
+    return path
+
+
+@pytest.fixture
+def project(tmp_path):
+    _write(tmp_path, "app/models.py", "import os\n\nclass User:\n    name = 'x'\n\nclass Admin(User):\n    pass\n")
+    _write(tmp_path, "app/views.py", "from .models import User\n\ndef show(user: User):\n    return user.name\n")
+    _write(tmp_path, "notes.txt", "TODO: class User docs\n")
+    _write(tmp_path, "node_modules/pkg/index.py", "class User: pass\n")
+    _write(tmp_path, ".git/objects/ab", "class User\n")
+    _write(tmp_path, "ignored/generated.py", "class User: pass\n")
+    _write(tmp_path, ".gitignore", "ignored/\n")
+    _write(tmp_path, "app/blob.py", b"class User\x00\x01\x02")
+    return tmp_path
+
+
+class TestSearch:
+    """Test blocking search"""
+
+    def test_finds_matches_in_indexed_files_only(self, project):
+        result = search("class User", str(project), file_pattern="*.py")
+
+        assert [(m.path, m.line_number) for m in result.matches] == [("app/models.py", 3)]
+        assert result.binary_skipped == 1
+        assert not result.truncated
+
+    def test_file_pattern_list(self, project):
+        result = search("User", str(project), file_pattern="*.txt, views.py")
+
+        assert {m.path for m in result.matches} == {"app/views.py", "notes.txt"}
+
+    def test_one_match_per_line_and_line_numbers(self, project):
+        result = search("User", str(project), file_pattern="views.py")
+
+        assert [m.line_number for m in result.matches] == [1, 3]
+        assert result.matches[1].line == "def show(user: User):"
+
+    def test_ignore_case(self, project):
+        assert search("CLASS USER", str(project), file_pattern="*.py").matches == []
+        assert len(search("CLASS USER", str(project), file_pattern="*.py", ignore_case=True).matches) == 1
+
+    def test_invalid_regex_is_matched_literally(self, project):
+        _write(project, "calc.py", "total = price * (1 + rate\n")
+
+        result = search("(1 + rate", str(project), file_pattern="*.py")
+
+        assert result.literal_fallback
+        assert [m.path for m in result.matches] == ["calc.py"]
+
+    def test_context_lines(self, project):
+        result = search("class Admin", str(project), file_pattern="models.py", context_lines=2)
+
+        match = result.matches[0]
+        assert match.before == ["    name = 'x'", ""]
+        assert match.after == ["    pass"]
+        assert format_matches(result.matches).splitlines() == [
+            "app/models.py-4-    name = 'x'",
+            "app/models.py-5-",
+            "app/models.py:6:class Admin(User):",
+            "app/models.py-7-    pass",
+        ]
+
+    def test_stops_at_result_cap(self, tmp_path):
+        for n in range(50):
+            _write(tmp_path, f"src/mod{n:02}.py", "hit\n" * 20)
+
+        result = search("hit", str(tmp_path), max_results=30, workers=4)
+
+        assert len(result.matches) == 30
+        assert result.truncated
+        assert result.files_scanned < 50
+
+    def test_capped_results_are_the_first_by_path_and_line(self, tmp_path):
+        # Long files so several scanner threads are mid-file at the cap
+        for n in range(30):
+            _write(tmp_path, f"src/mod{n:02}.py", "x = 1\n" * 20000 + "hit\n" * 7)
+
+        for _ in range(5):
+            result = search("hit", str(tmp_path), max_results=10, workers=8)
+
+            assert result.truncated
+            assert [(m.path, m.line_number) for m in result.matches] == \
+                [("src/mod00.py", 20000 + n) for n in range(1, 8)] + \
+                [("src/mod01.py", 20000 + n) for n in range(1, 4)]
+
+    def test_explicit_candidates(self, project):
+        result = search("class User", str(project), candidates=["ignored/generated.py"])
+
+        assert [m.path for m in result.matches] == ["ignored/generated.py"]
+
+
+class TestScanFile:
+    """Test single-file scanning"""
+
+    def test_empty_and_missing_files(self, tmp_path):
+        regex, _ = compile_pattern("x")
+        empty = _write(tmp_path, "empty.py", "")
+
+        assert scan_file(str(empty), "empty.py", regex) == []
+        assert scan_file(str(tmp_path / "missing.py"), "missing.py", regex) is None
+
+    def test_last_line_without_newline_and_crlf(self, tmp_path):
+        path = _write(tmp_path, "win.py", b"first\r\nsecond match")
+        regex, _ = compile_pattern("match")
+
+        matches = scan_file(str(path), "win.py", regex, context_lines=1)
+
+        assert matches[0].line_number == 2
+        assert matches[0].line == "second match"
+        assert matches[0].before == ["first"]
+
+
+    def test_empty_match_after_final_newline_ignored(self, tmp_path):
+        path = _write(tmp_path, "two.txt", "a\nb\n")
+        regex, _ = compile_pattern("^")
+
+        matches = scan_file(str(path), "two.txt", regex)
+
+        assert [(m.line_number, m.line) for m in matches] == [(1, "a"), (2, "b")]
+
+    def test_empty_match_on_unterminated_last_line(self, tmp_path):
+        path = _write(tmp_path, "two.txt", "a\nb")
+        regex, _ = compile_pattern("$")
+
+        matches = scan_file(str(path), "two.txt", regex)
+
+        assert [(m.line_number, m.line) for m in matches] == [(1, "a"), (2, "b")]
+
+
+class TestStreamSearch:
+    """Test async streaming"""
+
+    @pytest.mark.asyncio
+    async def test_streams_all_matches(self, project):
+        matches = [m async for m in stream_search("User", str(project), file_pattern="*.py")]
+
+        assert {m.path for m in matches} == {"app/models.py", "app/views.py"}
+
+    @pytest.mark.asyncio
+    async def test_consumer_can_stop_early(self, tmp_path):
+        for n in range(40):
+            _write(tmp_path, f"mod{n:02}.py", "hit\n" * 50)
+
+        received = []
+        async for match in stream_search("hit", str(tmp_path)):
+            received.append(match)
+            if len(received) == 5:
+                break
+
+        assert len(received) == 5
@@ -0,0 +1,133 @@
+"""
+Unit tests for the async command runner
+
+Tests cover:
+- Head+tail output buffering and dropped-byte accounting
+- Exit codes, stderr layout and streamed output callbacks
+- Timeouts and cancellation killing the whole process group
+- The event loop staying responsive while a command runs
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from wyn360_cli import command_runner
+from wyn360_cli.command_runner import OutputBuffer, run_command
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="uses POSIX shell and process groups")
+
+
+class TestOutputBuffer:
+    """Test the head+tail buffer"""
+
+    def test_small_output_is_kept_whole(self):
+        buffer = OutputBuffer(head_bytes=8, tail_bytes=8)
+        buffer.append(b"hello ")
+        buffer.append(b"world")
+
+        assert buffer.text() == "hello world"
+        assert buffer.dropped == 0
+
+    def test_middle_is_dropped(self):
+        buffer = OutputBuffer(head_bytes=4, tail_bytes=4)
+        for n in range(100):
+            buffer.append(f"{n:03d}\n".encode())
+
+        assert bytes(buffer.head) == b"000\n"
+        assert buffer.tail() == b"099\n"
+        assert buffer.total == 400
+        assert buffer.dropped == 392
+        assert "[... 392 bytes omitted ...]" in buffer.text()
+
+    def test_tail_memory_is_bounded(self):
+        buffer = OutputBuffer(head_bytes=0, tail_bytes=10)
+        for _ in range(1000):
+            buffer.append(b"x" * 7)
+
+        assert len(buffer._tail) <= 3
+        assert buffer.tail() == b"x" * 10
+
+
+@posix_only
+class TestRunCommand:
+    """Test running real shell commands"""
+
+    @pytest.mark.asyncio
+    async def test_success_and_stderr(self, tmp_path):
+        result = await run_command("echo out; echo err >&2", working_dir=str(tmp_path))
+
+        assert result.success
+        assert result.output() == "out\n\n\n[STDERR]\nerr\n"
+
+    @pytest.mark.asyncio
+    async def test_exit_code_and_empty_output(self):
+        result = await run_command("exit 3")
+
+        assert not result.success
+        assert result.return_code == 3
+        assert result.output() == "(No output)"
+
+    @pytest.mark.asyncio
+    async def test_large_output_is_bounded(self):
+        command = f"{sys.executable} -c \"import sys; sys.stdout.write('y' * 5000000 + 'END')\""
+        result = await run_command(command, head_bytes=100, tail_bytes=100)
+
+        assert result.success
+        assert result.total_bytes == 5000003
+        assert result.dropped_bytes == 5000003 - 200
+        assert result.stdout.endswith("END")
+
+    @pytest.mark.asyncio
+    async def test_output_is_streamed(self):
+        received = []
+        await run_command("echo one; echo two >&2", on_output=lambda stream, text: received.append((stream, text)))
+
+        assert ("stdout", "one\n") in received
+        assert ("stderr", "two\n") in received
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_process_group(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(command_runner, "KILL_GRACE_SECONDS", 0.5)
+        marker = tmp_path / "survived"
+
+        started = time.monotonic()
+        result = await run_command(f"echo started; (sleep 2; touch {marker}) & sleep 30", timeout=0.5)
+
+        assert result.timed_out
+        assert result.return_code == -1
+        assert "started" in result.stdout
+        assert time.monotonic() - started < 5
+        await asyncio.sleep(2.5)
+        assert not marker.exists()
+
+    @pytest.mark.asyncio
+    async def test_cancellation_kills_process_group(self, tmp_path):
+        marker = tmp_path / "survived"
+        task = asyncio.create_task(run_command(f"(sleep 1; touch {marker}) & sleep 30"))
+        await asyncio.sleep(0.3)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(1.5)
+        assert not marker.exists()
+
+    @pytest.mark.asyncio
+    async def test_event_loop_keeps_running(self):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.05)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await run_command("sleep 1")
+        task.cancel()
+
+        assert ticks >= 10
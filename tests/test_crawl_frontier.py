@@ -0,0 +1,212 @@
+"""
+Unit tests for batch fetching and the bounded crawl frontier (Phase 12.6)
+
+Tests cover:
+- URL normalization, link extraction and frontier deduplication/scope
+- Per-host and global concurrency limits of the scheduler
+- Same-site crawling against a local server through the HTTP fetch tier
+- Token budget allocation and the combined report
+"""
+
+import asyncio
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from wyn360_cli.browser_use import count_tokens, fetch_website_content
+from wyn360_cli.crawl_frontier import (
+    CrawlFrontier,
+    PageResult,
+    allocate_token_budget,
+    crawl,
+    extract_links,
+    format_batch_results,
+    normalize_url,
+)
+from wyn360_cli.http_fetch import close_http_client
+
+
+FILLER = " ".join(["This paragraph is long enough to count as real page content."] * 6)
+
+
+def _page(title, links):
+    anchors = "".join(f'<li><a href="{href}">{href}</a></li>' for href in links)
+    return f"<html><head><title>{title}</title></head><body><h1>{title}</h1><p>{FILLER}</p><ul>{anchors}</ul></body></html>"
+
+
+SITE = {
+    "/": _page("Home", ["/guide", "/api", "/guide#install", "https://elsewhere.example/", "/logo.png"]),
+    "/guide": _page("Guide", ["/", "/guide/advanced"]),
+    "/api": _page("API", ["/api/reference"]),
+    "/guide/advanced": _page("Advanced", []),
+    "/api/reference": _page("Reference", []),
+}
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """Serve a small linked site from memory"""
+
+    requests = []
+
+    def do_GET(self):
+        type(self).requests.append(self.path)
+        body = SITE.get(self.path, "").encode()
+        self.send_response(200 if self.path in SITE else 404)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site_server():
+    """Local HTTP/1.1 server with a five-page linked site"""
+    _SiteHandler.protocol_version = "HTTP/1.1"
+    _SiteHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SiteHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+async def _http_fetch(url):
+    success, content = await fetch_website_content(url, http_first=True)
+    return success, content, False
+
+
+class TestFrontier:
+    """Test URL normalization and frontier admission"""
+
+    def test_normalize_url(self):
+        assert normalize_url("HTTPS://Example.COM:443#top") == "https://example.com/"
+        assert normalize_url("http://example.com:8080/a?b=1#c") == "http://example.com:8080/a?b=1"
+
+    def test_extract_links_skips_images_and_files(self):
+        markdown = "[Guide](https://a.com/guide) ![logo](https://a.com/logo.png) [PDF](https://a.com/doc.pdf)"
+
+        assert extract_links(markdown) == ["https://a.com/guide"]
+
+    def test_duplicates_and_limits(self):
+        frontier = CrawlFrontier(max_pages=3, max_depth=1)
+
+        assert frontier.add_seed("https://www.a.com/")
+        assert not frontier.add_seed("https://www.a.com/#main")
+        assert frontier.add_link("https://a.com/docs", 1)
+        assert not frontier.add_link("https://b.com/", 1)
+        assert not frontier.add_link("https://a.com/deep", 2)
+        assert frontier.add_link("https://a.com/faq", 1)
+        assert not frontier.add_link("https://a.com/more", 1)
+        assert frontier.duplicates == 1
+        assert len(frontier) == 3
+
+    def test_pop_skips_busy_hosts(self):
+        frontier = CrawlFrontier(max_pages=5)
+        frontier.add_seed("https://a.com/1")
+        frontier.add_seed("https://b.com/1")
+
+        assert frontier.pop(lambda host: host != "a.com")[0] == "https://b.com/1"
+        assert frontier.pop(lambda host: host != "a.com") is None
+        assert frontier.pop()[0] == "https://a.com/1"
+
+
+class TestScheduler:
+    """Test concurrency limits with a fake fetcher"""
+
+    @pytest.mark.asyncio
+    async def test_per_host_and_global_limits(self):
+        active = {}
+        peak = {}
+
+        async def fetch(url):
+            host = url.split("/")[2]
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+            peak["total"] = max(peak.get("total", 0), sum(active.values()))
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+            return True, "content", False
+
+        urls = [f"https://{host}.com/{n}" for host in ("a", "b", "c") for n in range(4)]
+        pages = await crawl(urls, fetch, max_pages=12, max_concurrency=4, per_host_limit=2)
+
+        assert [page.url for page in pages] == urls
+        assert peak["a.com"] == peak["b.com"] == 2
+        assert peak["total"] == 4
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported(self):
+        async def fetch(url):
+            if "bad" in url:
+                raise RuntimeError("boom")
+            return True, "ok", False
+
+        pages = await crawl(["https://a.com/bad", "https://a.com/good"], fetch, max_pages=2)
+
+        assert not pages[0].success and "boom" in pages[0].content
+        assert pages[1].success
+
+
+class TestSameSiteCrawl:
+    """Test crawling a local site through the HTTP tier"""
+
+    @pytest.mark.asyncio
+    async def test_batch_without_crawl_fetches_each_url_once(self, site_server):
+        try:
+            pages = await crawl([f"{site_server}/guide", f"{site_server}/api", f"{site_server}/api#x"], _http_fetch, max_pages=3)
+        finally:
+            await close_http_client()
+
+        assert [page.success for page in pages] == [True, True]
+        assert sorted(_SiteHandler.requests) == ["/api", "/guide"]
+
+    @pytest.mark.asyncio
+    async def test_depth_one_crawl_stays_on_site(self, site_server):
+        try:
+            pages = await crawl([f"{site_server}/"], _http_fetch, max_depth=1, max_pages=10)
+        finally:
+            await close_http_client()
+
+        assert [page.url for page in pages] == [f"{site_server}/", f"{site_server}/guide", f"{site_server}/api"]
+        assert [page.depth for page in pages] == [0, 1, 1]
+        assert pages[0].links_found == 2
+        assert sorted(_SiteHandler.requests) == ["/", "/api", "/guide"]
+
+    @pytest.mark.asyncio
+    async def test_page_limit_bounds_deep_crawl(self, site_server):
+        try:
+            pages = await crawl([f"{site_server}/"], _http_fetch, max_depth=3, max_pages=4)
+        finally:
+            await close_http_client()
+
+        assert len(pages) == 4
+        assert len(_SiteHandler.requests) == 4
+
+
+class TestBudgetAndReport:
+    """Test token budget allocation and the combined output"""
+
+    def test_small_pages_keep_everything(self):
+        assert allocate_token_budget([100, 5000, 20000], 9000) == [100, 4450, 4450]
+        assert allocate_token_budget([10, 20], 1000) == [10, 20]
+        assert allocate_token_budget([], 1000) == []
+
+    def test_report_shares_budget(self):
+        pages = [
+            PageResult(url="https://a.com/", success=True, content="short page", elapsed=0.1),
+            PageResult(url="https://a.com/long", order=1, success=True, content="word " * 20000,
+                       from_cache=True, elapsed=0.0),
+            PageResult(url="https://a.com/missing", order=2, content="❌ Failed to fetch website: 404"),
+        ]
+
+        report = format_batch_results(pages, max_tokens=1000, wall_time=0.12)
+
+        assert report.startswith("📚 **Fetched 2 of 3 page(s)** (0.12s wall, 0.10s summed, 1 from cache)")
+        assert "| 2 | https://a.com/long | 0 | cached | 0.00s |" in report
+        assert "| 3 | https://a.com/missing | 0 | failed |" in report
+        assert "short page" in report and "❌ Failed to fetch website: 404" in report
+        assert count_tokens(report) < 1300
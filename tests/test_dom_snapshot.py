@@ -0,0 +1,318 @@
+"""
+Unit tests for the CDP DOM snapshot backend
+
+Tests cover:
+- Decoding DOMSnapshot.captureSnapshot results (visibility, text, XPath, selectors)
+- Mapping snapshots onto DOMAnalysis/DOMElement
+- Backend selection and fallback in DOMExtractor
+- Comparison with the selector backend on fixture pages (needs Chromium)
+
+Run directly for timings of both backends on the fixture pages:
+    PYTHONPATH=. python tests/test_dom_snapshot.py
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.wyn360.tools.browser.dom_analyzer import DOMExtractor
+from src.wyn360.tools.browser.dom_snapshot import (
+    DOMSnapshotError,
+    SnapshotDocument,
+    capture_snapshot,
+    compile_selector
+)
+
+
+def el(tag, attrs=None, *children, box=(0, 0, 100, 20), visibility='visible', opacity='1', display=True):
+    """Describe an element for build_snapshot(); str children become text nodes"""
+    return {'tag': tag, 'attrs': attrs or {}, 'children': children, 'box': box,
+            'visibility': visibility, 'opacity': opacity, 'display': display}
+
+
+def build_snapshot(root, title='Fixture', url='https://example.com/'):
+    """Build a DOMSnapshot.captureSnapshot-shaped result from an el() tree"""
+    strings = []
+
+    def intern(value):
+        if value not in strings:
+            strings.append(value)
+        return strings.index(value)
+
+    nodes = {'parentIndex': [], 'nodeType': [], 'nodeName': [], 'nodeValue': [],
+             'backendNodeId': [], 'attributes': []}
+    layout = {'nodeIndex': [], 'styles': [], 'bounds': []}
+
+    def add(spec, parent, rendered):
+        index = len(nodes['parentIndex'])
+        nodes['parentIndex'].append(parent)
+        nodes['backendNodeId'].append(index + 100)
+        if isinstance(spec, str):
+            nodes['nodeType'].append(3)
+            nodes['nodeName'].append(intern('#text'))
+            nodes['nodeValue'].append(intern(spec))
+            nodes['attributes'].append([])
+            return
+
+        nodes['nodeType'].append(1)
+        nodes['nodeName'].append(intern(spec['tag'].upper()))
+        nodes['nodeValue'].append(-1)
+        flat = []
+        for name, value in spec['attrs'].items():
+            flat += [intern(name), intern(value)]
+        nodes['attributes'].append(flat)
+
+        rendered = rendered and spec['display']
+        if rendered:
+            layout['nodeIndex'].append(index)
+            layout['styles'].append([intern(spec['visibility']), intern(spec['opacity'])])
+            layout['bounds'].append(list(spec['box']))
+        for child in spec['children']:
+            add(child, index, rendered)
+
+    # Real snapshots start with the #document node
+    nodes['parentIndex'].append(-1)
+    nodes['nodeType'].append(9)
+    nodes['nodeName'].append(intern('#document'))
+    nodes['nodeValue'].append(-1)
+    nodes['backendNodeId'].append(1)
+    nodes['attributes'].append([])
+    add(root, 0, True)
+    return {
+        'documents': [{'documentURL': intern(url), 'title': intern(title), 'nodes': nodes, 'layout': layout}],
+        'strings': strings
+    }
+
+
+def fixture_tree():
+    """Login page with hidden, transparent and zero-size distractors"""
+    return el('html', {},
+        el('body', {},
+            el('nav', {'class': 'navbar'}, el('a', {'href': '/home'}, 'Home'), el('a', {'href': '/about'}, 'About')),
+            el('main', {},
+                el('form', {'action': '/login', 'method': 'post'},
+                    el('label', {'for': 'user'}, 'Username'),
+                    el('input', {'id': 'user', 'name': 'username', 'type': 'text'}),
+                    el('label', {}, 'Password ', el('input', {'name': 'password', 'type': 'password'})),
+                    el('input', {'name': 'csrf', 'type': 'hidden'}, display=False),
+                    el('button', {'type': 'submit', 'class': 'btn'}, 'Sign in')),
+                el('button', {'class': 'btn'}, 'Hidden', visibility='hidden'),
+                el('div', {'style': 'opacity:0'}, el('button', {'class': 'btn'}, 'Ghost'), opacity='0'),
+                el('a', {'href': '/empty'}, box=(0, 0, 0, 0)),
+                el('div', {'role': 'button', 'aria-label': 'Close'}),
+                el('section', {}, 'Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod.'))))
+
+
+class TestSelectorMatching:
+    """Test the simple selector subset"""
+
+    def test_forms(self):
+        assert compile_selector('a[href]')('a', {'href': '/'})
+        assert not compile_selector('a[href]')('a', {})
+        assert compile_selector('[role="button"]')('div', {'role': 'button'})
+        assert not compile_selector('[role="button"]')('div', {'role': 'link'})
+        assert compile_selector('.nav')('ul', {'class': 'main nav'})
+        assert not compile_selector('.nav')('ul', {'class': 'navbar'})
+        assert compile_selector('button[type="submit"]')('button', {'type': 'submit'})
+
+    def test_unsupported_selector_rejected(self):
+        with pytest.raises(ValueError):
+            compile_selector('div > a')
+
+
+class TestSnapshotDocument:
+    """Test decoding of snapshot results"""
+
+    def setup_method(self):
+        self.doc = SnapshotDocument(build_snapshot(fixture_tree()))
+
+    def test_visibility(self):
+        visible = {self.doc.text(i) for i in self.doc.select('button') if self.doc.visible[i]}
+        assert visible == {'Sign in'}
+        # display: none, zero-size and visibility: hidden nodes are not rendered
+        assert not any(self.doc.visible[i] for i in self.doc.select('input[type="hidden"]'))
+        assert not self.doc.visible[self.doc.select('a[href="/empty"]')[0]]
+
+    def test_xpath_and_selector(self):
+        about = self.doc.select('a[href="/about"]')[0]
+        user = self.doc.select('input')[0]
+
+        assert self.doc.xpath(about) == '/html/body/nav/a[2]'
+        assert self.doc.css_selector(user) == '#user'
+        assert self.doc.css_selector(about) == 'a:nth-of-type(2)'
+
+    def test_metadata(self):
+        assert self.doc.title == 'Fixture'
+        assert self.doc.url == 'https://example.com/'
+        assert self.doc.bounding_box(self.doc.select('nav')[0]) == {'x': 0, 'y': 0, 'width': 100, 'height': 20}
+
+
+class TestSnapshotAnalysis:
+    """Test mapping onto DOMAnalysis"""
+
+    def test_hidden_elements_excluded(self):
+        extractor = DOMExtractor(backend="cdp")
+        analysis = extractor.analyze_snapshot(SnapshotDocument(build_snapshot(fixture_tree())))
+
+        texts = [e.text for e in analysis.interactive_elements]
+        assert 'Sign in' in texts
+        assert 'Hidden' not in texts and 'Ghost' not in texts
+        assert analysis.backend == "cdp"
+        # Like the selector backend, an element matching two navigation selectors is listed twice
+        assert {e.attributes['class'] for e in analysis.navigation_elements} == {'navbar'}
+        assert [e.tag for e in analysis.content_elements] == ['main', 'section']
+
+        submit = next(e for e in analysis.interactive_elements if e.text == 'Sign in')
+        assert submit.element_type == 'button'
+        assert submit.bounding_box is not None
+
+    def test_forms_use_labels_and_skip_hidden_fields(self):
+        extractor = DOMExtractor(backend="cdp")
+        analysis = extractor.analyze_snapshot(SnapshotDocument(build_snapshot(fixture_tree())))
+
+        fields = analysis.forms[0]['fields']
+        assert analysis.forms[0]['method'] == 'post'
+        assert [f['name'] for f in fields] == ['username', 'password', '']
+        assert fields[0]['label'] == 'Username'
+        assert fields[1]['label'].startswith('Password')
+
+    def test_accessible_name_fills_empty_text(self):
+        ax_nodes = [{'backendDOMNodeId': node_id, 'role': {'value': 'button'}, 'name': {'value': 'Close'}}
+                    for node_id in range(100, 200)]
+        snapshot = SnapshotDocument(build_snapshot(fixture_tree()), ax_nodes)
+        analysis = DOMExtractor(backend="cdp").analyze_snapshot(snapshot)
+
+        close = next(e for e in analysis.interactive_elements if e.attributes.get('aria-label') == 'Close')
+        assert close.text == 'Close'
+        assert close.role == 'button'
+
+
+class TestBackendSelection:
+    """Test DOMExtractor backend dispatch"""
+
+    def _page(self, session=None, error=None):
+        page = Mock()
+        page.url = 'https://example.com/'
+        if error:
+            page.context.new_cdp_session = AsyncMock(side_effect=error)
+        else:
+            page.context.new_cdp_session = AsyncMock(return_value=session)
+        return page
+
+    def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError):
+            DOMExtractor(backend="xpath")
+
+    @pytest.mark.asyncio
+    async def test_capture_uses_one_snapshot_call(self):
+        session = Mock()
+        session.send = AsyncMock(side_effect=[build_snapshot(fixture_tree()), {'nodes': []}])
+        session.detach = AsyncMock()
+
+        analysis = await DOMExtractor(backend="cdp").extract_dom(self._page(session))
+
+        assert analysis.backend == "cdp"
+        methods = [call.args[0] for call in session.send.call_args_list]
+        assert methods == ["DOMSnapshot.captureSnapshot", "Accessibility.getFullAXTree"]
+        session.detach.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_accessibility_tree_is_tolerated(self):
+        session = Mock()
+        session.send = AsyncMock(side_effect=[build_snapshot(fixture_tree()), RuntimeError("not supported")])
+        session.detach = AsyncMock()
+
+        snapshot = await capture_snapshot(self._page(session))
+
+        assert snapshot.ax_info == {}
+
+    @pytest.mark.asyncio
+    async def test_cdp_backend_raises_without_cdp(self):
+        page = self._page(error=RuntimeError("CDP session is only available in Chromium"))
+
+        with pytest.raises(DOMSnapshotError):
+            await DOMExtractor(backend="cdp").extract_dom(page)
+
+    @pytest.mark.asyncio
+    async def test_auto_backend_falls_back_to_selectors(self):
+        page = self._page(error=RuntimeError("CDP session is only available in Chromium"))
+        page.title = AsyncMock(return_value='Firefox page')
+        page.query_selector_all = AsyncMock(return_value=[])
+
+        analysis = await DOMExtractor(backend="auto").extract_dom(page)
+
+        assert analysis.backend == "selectors"
+        assert analysis.title == 'Firefox page'
+
+
+FIXTURE_HTML = """<!doctype html>
+<html><head><title>Fixture shop</title></head><body>
+<nav class="navbar"><a href="/">Home</a><a href="/deals">Deals</a></nav>
+<main>
+  <form action="/search" method="get">
+    <label for="q">Search</label><input id="q" name="q" type="search">
+    <input type="hidden" name="token" value="x">
+    <button type="submit">Go</button>
+  </form>
+  <div style="display:none"><button>Hidden menu</button><a href="/secret">Secret</a></div>
+  <button style="visibility:hidden">Invisible</button>
+  <div style="opacity:0"><button>Ghost</button></div>
+  %s
+  <section>Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor.</section>
+</main>
+</body></html>
+""" % "\n".join(
+    f'<article><a href="/item/{i}">Item {i}</a><button class="buy">Buy {i}</button></article>'
+    for i in range(40)
+)
+
+
+async def _extract_both(html):
+    """Run both backends on the same page; skips when Chromium is unavailable"""
+    playwright_api = pytest.importorskip("playwright.async_api")
+
+    async with playwright_api.async_playwright() as p:
+        try:
+            browser = await p.chromium.launch(headless=True)
+        except Exception as e:
+            pytest.skip(f"Chromium not available: {e}")
+
+        try:
+            page = await browser.new_page()
+            await page.set_content(html)
+
+            timings = {}
+            results = {}
+            for backend in ("selectors", "cdp"):
+                start = time.perf_counter()
+                results[backend] = await DOMExtractor(backend=backend).extract_dom(page)
+                timings[backend] = time.perf_counter() - start
+            return results, timings
+        finally:
+            await browser.close()
+
+
+class TestFixturePages:
+    """Compare both backends with a real browser"""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_drops_hidden_elements_and_is_faster(self):
+        results, timings = await _extract_both(FIXTURE_HTML)
+
+        selector_texts = {e.text for e in results["selectors"].interactive_elements}
+        snapshot_texts = {e.text for e in results["cdp"].interactive_elements}
+
+        assert {'Hidden menu', 'Invisible', 'Ghost'} <= selector_texts
+        assert not {'Hidden menu', 'Invisible', 'Ghost'} & snapshot_texts
+        assert {'Go', 'Buy 0', 'Item 39'} <= snapshot_texts
+        assert timings["cdp"] < timings["selectors"]
+
+
+if __name__ == "__main__":
+    results, timings = asyncio.run(_extract_both(FIXTURE_HTML))
+    for backend in ("selectors", "cdp"):
+        analysis = results[backend]
+        print(f"{backend:9s}: {timings[backend] * 1000:8.1f} ms, "
+              f"{len(analysis.interactive_elements)} interactive, {len(analysis.forms)} forms")
@@ -0,0 +1,154 @@
+"""
+Micro-benchmark for ErrorClassifier
+
+Compares the compiled single-pass matcher (and its signature cache) with the
+original per-pattern regex/keyword scan over a corpus of real Playwright
+error strings, and checks both produce the same classification.
+
+Run directly for timings:
+    PYTHONPATH=. python tests/test_error_classification_benchmark.py
+"""
+
+import re
+import time
+
+from wyn360_cli.tools.browser.error_classification import ErrorClassifier, ErrorCategory
+
+
+PLAYWRIGHT_ERRORS = [
+    "Timeout 30000ms exceeded.",
+    "page.goto: Timeout 45000ms exceeded.\nCall log:\n  - navigating to \"https://example.com/\", waiting until \"load\"",
+    "locator.click: Timeout 15000ms exceeded.\nCall log:\n  - waiting for locator(\"#submit\")\n"
+    "  -   locator resolved to <button id=\"submit\" disabled>Submit</button>\n"
+    "  - attempting click action\n  -   waiting for element to be visible, enabled and stable\n"
+    "  -   element is not enabled - waiting...",
+    "locator.click: Element is not attached to the DOM",
+    "page.wait_for_selector: Timeout 5000ms exceeded.\nCall log:\n  - waiting for locator(\".results\") to be visible",
+    "page.goto: net::ERR_NAME_NOT_RESOLVED at https://does-not-exist.invalid/",
+    "page.goto: net::ERR_CONNECTION_REFUSED at http://localhost:9999/",
+    "page.goto: net::ERR_CERT_AUTHORITY_INVALID at https://self-signed.badssl.com/",
+    "page.goto: Navigation failed because page crashed!",
+    "page.evaluate: ReferenceError: foo is not defined\n    at eval (eval at evaluate (:234:30), <anonymous>:1:1)",
+    "page.evaluate: SyntaxError: Unexpected token ')'",
+    "Execution context was destroyed, most likely because of a navigation",
+    "locator.click: Element is outside of the viewport",
+    "locator.click: <div class=\"overlay\"></div> intercepts pointer events",
+    "Click was intercepted by another element",
+    "Target page, context or browser has been closed",
+    "locator.fill: Error: Element is not an <input>, <textarea> or [contenteditable] element",
+    "Locator '.submit-button' not found",
+    "Element matching selector '#login' not found",
+    "strict mode violation: locator(\"button\") resolved to 3 elements",
+    "Blocked by Content Security Policy",
+    "Access to fetch at 'https://api.example.com' from origin 'https://app.example.com' has been blocked by CORS policy",
+    "Permission denied: cross-origin access",
+    "Network error: connection refused",
+    "DNS resolution failed for domain",
+    "Page load timeout exceeded",
+    "Wait condition timed out after 5 seconds",
+    "Navigation failed: URL unreachable",
+    "Some completely random error message",
+]
+
+
+def legacy_classify(error_text, error_type, error_patterns):
+    """The original per-pattern scan: (category, confidence, matched regexes)"""
+    best, highest = None, 0.0
+    for pattern in error_patterns:
+        confidence = 0.6 if error_type in pattern.exception_types else 0.0
+        matched = [p for p in pattern.patterns if re.search(p, error_text, re.IGNORECASE)]
+        if matched:
+            confidence += 0.5 * (len(matched) / len(pattern.patterns))
+        keywords = sum(1 for k in pattern.keywords if k.lower() in error_text.lower())
+        if keywords:
+            confidence += 0.4 * (keywords / len(pattern.keywords))
+        confidence = min(confidence, 1.0)
+        if confidence > highest:
+            best, highest = (pattern, matched), confidence
+
+    if highest < 0.2 or best is None:
+        return ErrorCategory.UNKNOWN_ERROR, highest, []
+    return best[0].category, highest, best[1]
+
+
+def time_per_call(func, iterations):
+    """Average wall time per call in microseconds"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+class TestErrorClassifierBenchmark:
+    """Parity and speed of the compiled matcher"""
+
+    def test_compiled_matcher_matches_legacy_scan(self):
+        """Test the single-pass matcher reproduces the per-pattern scan exactly"""
+        classifier = ErrorClassifier()
+
+        for message in PLAYWRIGHT_ERRORS:
+            category, confidence, matched = legacy_classify(message, "Error", classifier.error_patterns)
+            analysis = classifier.classify_error(Exception(message))
+
+            assert analysis.category == category, message
+            assert abs(analysis.confidence - confidence) < 1e-9, message
+            assert analysis.matched_patterns == matched, message
+
+    def test_repeated_errors_hit_signature_cache(self):
+        """Test errors differing only in numbers share a cache entry"""
+        classifier = ErrorClassifier()
+
+        classifier.classify_error(Exception("Timeout 30000ms exceeded."))
+        analysis = classifier.classify_error(Exception("Timeout 5000ms exceeded."))
+
+        assert analysis.original_error == "Timeout 5000ms exceeded."
+        assert classifier.get_cache_stats()['hits'] == 1
+
+    def test_cache_is_bounded(self):
+        """Test the LRU evicts old signatures"""
+        classifier = ErrorClassifier(cache_size=2)
+
+        for message in PLAYWRIGHT_ERRORS[:5]:
+            classifier.classify_error(Exception(message))
+
+        assert classifier.get_cache_stats()['size'] == 2
+
+    def test_cached_classification_is_faster_than_legacy(self):
+        """Test a warm classification beats the original scan"""
+        classifier = ErrorClassifier()
+        errors = [Exception(message) for message in PLAYWRIGHT_ERRORS]
+
+        def legacy():
+            for error in errors:
+                legacy_classify(str(error), "Exception", classifier.error_patterns)
+
+        def compiled_warm():
+            for error in errors:
+                classifier.classify_error(error)
+
+        compiled_warm()
+        assert time_per_call(compiled_warm, 20) < time_per_call(legacy, 20)
+
+
+if __name__ == "__main__":
+    classifier = ErrorClassifier()
+    patterns = classifier.error_patterns
+    errors = [Exception(message) for message in PLAYWRIGHT_ERRORS]
+    iterations = 200
+
+    def legacy():
+        for error in errors:
+            legacy_classify(str(error), "Exception", patterns)
+
+    def compiled_cold():
+        for error in errors:
+            classifier.matcher.score(str(error), "Exception")
+
+    def compiled_warm():
+        for error in errors:
+            classifier.classify_error(error)
+
+    print(f"{len(errors)} Playwright errors, {iterations} iterations (us per corpus pass)")
+    print(f"  legacy per-pattern scan: {time_per_call(legacy, iterations):10.1f}")
+    print(f"  compiled single pass:    {time_per_call(compiled_cold, iterations):10.1f}")
+    print(f"  compiled + LRU:          {time_per_call(compiled_warm, iterations):10.1f}")
@@ -0,0 +1,173 @@
+"""
+Unit tests for the project file index
+
+Tests cover:
+- Pruning of dependency/VCS directories and .gitignore handling
+- Incremental refresh (only changed directories are listed again)
+- Persistence under .wyn360/
+- scan_directory backed by the shared index
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from wyn360_cli import file_index
+from wyn360_cli.file_index import FileIndex, IgnoreRules, get_file_index
+from wyn360_cli.utils import scan_directory
+
+
+def _write(root: Path, relative: str, text: str = "x") -> Path:
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def _age(root: Path) -> None:
+    """Backdate every directory so it is outside the racy mtime window"""
+    old = time.time() - 60
+    for directory in [root, *[p for p in root.rglob("*") if p.is_dir()]]:
+        os.utime(directory, (old, old))
+
+
+@pytest.fixture
+def project(tmp_path):
+    _write(tmp_path, "app/main.py")
+    _write(tmp_path, "app/util.py")
+    _write(tmp_path, "README.md")
+    _write(tmp_path, "node_modules/lib/index.js")
+    _write(tmp_path, ".venv/lib/site.py")
+    _write(tmp_path, ".git/HEAD")
+    _write(tmp_path, "app/__pycache__/main.cpython-311.pyc")
+    _write(tmp_path, "build/out.bin")
+    _write(tmp_path, "logs/today.log")
+    _write(tmp_path, ".gitignore", "build/\n*.log\n!keep.log\n")
+    _age(tmp_path)
+    return tmp_path
+
+
+class TestIgnoreRules:
+    """Test .gitignore pattern matching"""
+
+    def test_patterns(self):
+        rules = IgnoreRules(["# comment", "*.log", "!keep.log", "/dist", "build/", "docs/**/*.tmp", "a?c"])
+
+        assert rules.match("x/app.log", False) is True
+        assert rules.match("keep.log", False) is False
+        assert rules.match("dist", True) is True
+        assert rules.match("src/dist", True) is None
+        assert rules.match("build", True) is True
+        assert rules.match("build", False) is None
+        assert rules.match("docs/a/b/c.tmp", False) is True
+        assert rules.match("abc", False) is True
+
+
+class TestFileIndex:
+    """Test walking and incremental refresh"""
+
+    def test_prunes_and_honours_gitignore(self, project):
+        index = FileIndex(str(project))
+        index.refresh()
+
+        assert index.files() == [".gitignore", "README.md", "app/main.py", "app/util.py"]
+
+    def test_nested_gitignore_and_negation(self, project):
+        _write(project, "logs/keep.log")
+        _write(project, "app/.gitignore", "util.py\n")
+        index = FileIndex(str(project))
+        index.refresh()
+
+        files = index.files()
+        assert "logs/keep.log" in files
+        assert "app/util.py" not in files
+
+    def test_unchanged_tree_lists_nothing(self, project):
+        index = FileIndex(str(project))
+        index.refresh()
+        listed = index.stats['dirs_listed']
+
+        assert index.refresh() is False
+        assert index.stats['dirs_listed'] == listed
+
+    def test_only_changed_directory_is_listed(self, project):
+        index = FileIndex(str(project))
+        index.refresh()
+        listed = index.stats['dirs_listed']
+
+        _write(project, "app/new.py")
+        assert index.refresh() is True
+
+        assert "app/new.py" in index.files()
+        assert index.stats['dirs_listed'] == listed + 1
+
+    def test_removed_directory_drops_subtree(self, project):
+        _write(project, "pkg/sub/mod.py")
+        index = FileIndex(str(project))
+        index.refresh()
+
+        for path in sorted((project / "pkg").rglob("*"), reverse=True):
+            path.unlink() if path.is_file() else path.rmdir()
+        (project / "pkg").rmdir()
+        index.refresh()
+
+        assert not any(f.startswith("pkg/") for f in index.files())
+        assert index.get_stats()['directories'] == 3  # root, app, logs
+
+    def test_gitignore_edit_rescans_subtree(self, project):
+        index = FileIndex(str(project))
+        index.refresh()
+        _age(project)
+
+        gitignore = project / ".gitignore"
+        gitignore.write_text("build/\n*.log\n!keep.log\napp/\n")
+        stamp = time.time() + 5
+        os.utime(gitignore, (stamp, stamp))
+        index.refresh()
+
+        assert index.files() == [".gitignore", "README.md"]
+
+    def test_persisted_snapshot_is_reused(self, project):
+        (project / ".wyn360").mkdir()
+        _age(project)
+        index = FileIndex(str(project), persist=True)
+        index.refresh()
+        assert (project / ".wyn360" / "file_index.json").exists()
+
+        reloaded = FileIndex(str(project), persist=True)
+        assert reloaded.stats['loaded_from_disk']
+        reloaded.refresh()
+
+        assert reloaded.files() == index.files()
+        assert reloaded.stats['dirs_listed'] == 0
+
+
+class TestScanDirectoryBacking:
+    """Test scan_directory through the shared index"""
+
+    def test_shared_index_sees_new_files(self, project):
+        assert get_file_index(str(project)) is get_file_index(str(project))
+
+        first = scan_directory(str(project))
+        _write(project, "app/extra.py")
+        second = scan_directory(str(project))
+
+        assert len(second['python']) == len(first['python']) + 1
+        assert not any("node_modules" in f for f in second['other'])
+
+    def test_extra_ignore_patterns(self, project):
+        files = scan_directory(str(project), ignore_patterns=["util"])
+
+        assert files['python'] == [str(project / "app/main.py")]
+
+    def test_configure_persistence(self, project):
+        file_index.configure_file_index(persist=True)
+        try:
+            index = get_file_index(str(project))
+        finally:
+            file_index.configure_file_index(persist=False)
+
+        assert index.persist
+        assert (project / ".wyn360" / "file_index.json").exists()
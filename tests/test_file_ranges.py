@@ -0,0 +1,141 @@
+"""
+Unit tests for ranged file reads
+
+Tests cover:
+- Line ranges across index checkpoints, head and tail reads
+- Byte ranges and regex windows around matches
+- Token-budget truncation with a continuation line
+- Incremental line-index extension when a file is appended to
+- Empty files and files without a trailing newline
+"""
+
+import pytest
+
+from wyn360_cli import file_ranges
+from wyn360_cli.file_ranges import read_byte_range, read_lines, read_matches, read_tail
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "server.log"
+    path.write_text("".join(f"line {n}\n" for n in range(1, 5001)))
+    return path
+
+
+class TestLineRanges:
+    """Test line-range, head and tail reads"""
+
+    def test_head(self, log_file):
+        result = read_lines(str(log_file), 1, 3)
+
+        assert result.text == " 1| line 1\n 2| line 2\n 3| line 3"
+        assert (result.first_line, result.last_line) == (1, 3)
+        assert not result.truncated
+
+    def test_range_across_checkpoints(self, log_file, monkeypatch):
+        monkeypatch.setattr(file_ranges, "CHECKPOINT_LINES", 16)
+
+        for start in (15, 16, 17, 33, 4990):
+            result = read_lines(str(log_file), start, start + 2)
+            assert result.text.splitlines()[0].endswith(f"| line {start}"), start
+            assert result.total_lines == 5000
+
+    def test_range_past_end(self, log_file):
+        result = read_lines(str(log_file), 4999, 9000)
+        assert (result.first_line, result.last_line) == (4999, 5000)
+
+        assert read_lines(str(log_file), 9000).text == ""
+
+    def test_tail(self, log_file):
+        result = read_tail(str(log_file), 2)
+
+        assert result.text == " 4999| line 4999\n 5000| line 5000"
+        assert (result.first_line, result.last_line) == (4999, 5000)
+
+
+class TestOtherModes:
+    """Test byte ranges and regex windows"""
+
+    def test_byte_range(self, log_file):
+        result = read_byte_range(str(log_file), 7, 14)
+
+        assert result.text == "line 2\nline 3\n"
+        assert (result.first_line, result.last_line) == (2, 3)
+
+    def test_matches_with_context(self, log_file):
+        result, shown = read_matches(str(log_file), r"line 42$", context_lines=1)
+
+        assert shown == 1
+        assert result.text == " 41| line 41\n>42| line 42\n 43| line 43"
+
+    def test_overlapping_windows_merge(self, log_file):
+        result, shown = read_matches(str(log_file), r"line (10|12|300)$", context_lines=1)
+
+        assert shown == 3
+        assert result.text.count("--") == 1
+        assert " 11| line 11" in result.text
+
+    def test_match_limit_marks_truncation(self, log_file):
+        result, shown = read_matches(str(log_file), "line", context_lines=0, max_matches=5)
+
+        assert shown == 5
+        assert result.truncated
+
+    def test_empty_match_after_final_newline_ignored(self, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_text("first\n\nlast\n")
+
+        result, shown = read_matches(str(path), r"^$", context_lines=0)
+
+        assert shown == 1
+        assert result.text == ">2| "
+        assert (result.first_line, result.last_line) == (2, 2)
+        assert not result.truncated
+
+
+class TestBudget:
+    """Test output budgets"""
+
+    def test_truncated_range_reports_next_line(self, log_file):
+        result = read_lines(str(log_file), 1, None, max_chars=200)
+
+        assert result.truncated
+        assert result.next_line == result.last_line + 1
+        assert len(result.text) <= 200
+
+        following = read_lines(str(log_file), result.next_line, result.next_line)
+        assert following.text.endswith(f"line {result.next_line}")
+
+
+class TestLineIndex:
+    """Test the cached line-offset index"""
+
+    def test_append_extends_index(self, log_file):
+        read_lines(str(log_file), 4000, 4000)
+        index = file_ranges._indexes[str(log_file)]
+        scans = index.scans
+
+        with open(log_file, "a") as f:
+            f.write("appended\n")
+        result = read_lines(str(log_file), 5001, 5001)
+
+        assert result.text == " 5001| appended"
+        assert index.scans == scans + 1
+        assert file_ranges._indexes[str(log_file)] is index
+
+    def test_rewrite_rebuilds_index(self, log_file):
+        read_lines(str(log_file), 4000, 4000)
+        log_file.write_text("first\nsecond\n")
+
+        assert read_lines(str(log_file), 2).text == " 2| second"
+
+    def test_empty_and_unterminated_files(self, tmp_path):
+        empty = tmp_path / "empty.txt"
+        empty.write_text("")
+        partial = tmp_path / "partial.txt"
+        partial.write_text("one\ntwo")
+
+        assert read_lines(str(empty)).text == ""
+        assert read_tail(str(empty)).text == ""
+        assert read_lines(str(partial), 2).text == " 2| two"
+        assert read_tail(str(partial), 1).total_lines == 2
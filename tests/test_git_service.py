@@ -0,0 +1,186 @@
+"""
+Unit tests for the structured git service
+
+Tests cover:
+- Parsing porcelain v2 status, numstat, log and branch output
+- Status/diff/log/branches against a real repository
+- Caching keyed on index/HEAD/ref mtimes, explicit invalidation and expiry
+- Compact summaries for status and large diffs
+"""
+
+import asyncio
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from wyn360_cli import git_service
+from wyn360_cli.git_service import (
+    GitError, GitService, format_diff_summary, format_status, parse_numstat, parse_status_v2
+)
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def _git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    for key, value in {"GIT_AUTHOR_NAME": "Ada", "GIT_AUTHOR_EMAIL": "ada@example.com",
+                       "GIT_COMMITTER_NAME": "Ada", "GIT_COMMITTER_EMAIL": "ada@example.com"}.items():
+        monkeypatch.setenv(key, value)
+    _git(tmp_path, "init", "-q", "-b", "main")
+    (tmp_path / "app.py").write_text("print('hello')\n")
+    (tmp_path / "README.md").write_text("# Demo\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "Initial commit")
+    return tmp_path
+
+
+class TestParsing:
+    """Test parsers on captured output"""
+
+    def test_status_v2(self):
+        data = (
+            b"# branch.oid 1234567890abcdef\0# branch.head main\0# branch.upstream origin/main\0"
+            b"# branch.ab +2 -1\0"
+            b"1 M. N... 100644 100644 100644 aaa bbb src/app.py\0"
+            b"1 .M N... 100644 100644 100644 aaa bbb with space.txt\0"
+            b"2 R. N... 100644 100644 100644 aaa bbb R100 new.py\0old.py\0"
+            b"u UU N... 100644 100644 100644 100644 aaa bbb ccc conflict.py\0"
+            b"? notes.txt\0"
+        )
+        snapshot = parse_status_v2(data)
+
+        assert (snapshot.branch.head, snapshot.branch.upstream) == ("main", "origin/main")
+        assert (snapshot.branch.ahead, snapshot.branch.behind) == (2, 1)
+        assert [f.path for f in snapshot.staged] == ["src/app.py", "new.py"]
+        assert snapshot.staged[1].orig_path == "old.py"
+        assert [f.path for f in snapshot.unstaged] == ["with space.txt"]
+        assert [f.path for f in snapshot.conflicted] == ["conflict.py"]
+        assert [f.path for f in snapshot.untracked] == ["notes.txt"]
+
+    def test_numstat_with_rename_and_binary(self):
+        stats = parse_numstat(b"3\t1\tapp.py\0-\t-\tlogo.png\0" b"0\t0\t\0old.py\0new.py\0")
+
+        assert [(s.path, s.added, s.deleted) for s in stats] == \
+               [("app.py", 3, 1), ("logo.png", None, None), ("new.py", 0, 0)]
+        assert stats[1].binary
+        assert stats[2].orig_path == "old.py"
+
+
+class TestRepository:
+    """Test queries against a real repository"""
+
+    @pytest.mark.asyncio
+    async def test_status_and_diff(self, repo):
+        (repo / "app.py").write_text("print('hello')\nprint('world')\n")
+        (repo / "new.py").write_text("x = 1\n")
+        (repo / "README.md").write_text("# Demo project\n")
+        _git(repo, "add", "README.md")
+        service = GitService(str(repo))
+
+        snapshot = await service.status()
+        assert snapshot.branch.head == "main"
+        assert [f.path for f in snapshot.unstaged] == ["app.py"]
+        assert [f.path for f in snapshot.staged] == ["README.md"]
+        assert [f.path for f in snapshot.untracked] == ["new.py"]
+
+        assert [(s.path, s.added, s.deleted) for s in await service.diff_stats()] == [("app.py", 1, 0)]
+        assert [s.path for s in await service.diff_stats(staged=True)] == ["README.md"]
+        assert "+print('world')" in await service.diff("app.py")
+        assert "+# Demo project" in await service.diff("README.md", staged=True)
+
+    @pytest.mark.asyncio
+    async def test_log_and_branches(self, repo):
+        _git(repo, "branch", "feature")
+        service = GitService(str(repo))
+
+        commits = await service.log(5)
+        assert [(c.subject, c.author) for c in commits] == [("Initial commit", "Ada")]
+
+        branches = await service.branches()
+        assert [(b.name, b.current) for b in branches] == [("feature", False), ("main", True)]
+
+    @pytest.mark.asyncio
+    async def test_not_a_repository(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(tmp_path.parent))
+        with pytest.raises(GitError, match="not a git repository"):
+            await GitService(str(tmp_path)).status()
+
+
+class TestCaching:
+    """Test cache reuse and invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_calls_reuse_results(self, repo):
+        service = GitService(str(repo))
+        await asyncio.gather(service.status(), service.log(), service.branches())
+        calls = service.stats["git_calls"]
+
+        await asyncio.gather(service.status(), service.log(), service.branches())
+
+        assert service.stats["git_calls"] == calls
+        assert service.stats["cache_hits"] == 3
+
+    @pytest.mark.asyncio
+    async def test_commit_invalidates_log_and_status(self, repo):
+        service = GitService(str(repo))
+        await service.log()
+        (repo / "app.py").write_text("print('changed')\n")
+        _git(repo, "commit", "-q", "-am", "Change app")
+
+        assert (await service.log())[0].subject == "Change app"
+        assert (await service.status()).clean
+
+    @pytest.mark.asyncio
+    async def test_worktree_edits_need_invalidation_or_expiry(self, repo, monkeypatch):
+        service = GitService(str(repo))
+        assert (await service.status()).clean
+
+        (repo / "app.py").write_text("print('edited')\n")
+        assert (await service.status()).clean  # Cached: the index did not change
+
+        service.invalidate()
+        assert [f.path for f in (await service.status()).unstaged] == ["app.py"]
+
+        (repo / "README.md").write_text("edited\n")
+        monkeypatch.setattr(git_service, "WORKTREE_TTL_SECONDS", 0)
+        assert len((await service.status()).unstaged) == 2
+
+    @pytest.mark.asyncio
+    async def test_status_does_not_rewrite_index(self, repo):
+        index = repo / ".git" / "index"
+        before = os.stat(index).st_mtime_ns
+        (repo / "app.py").write_text("print('edited')\n")
+
+        await GitService(str(repo)).status()
+
+        assert os.stat(index).st_mtime_ns == before
+
+
+class TestFormatting:
+    """Test summaries given to the model"""
+
+    @pytest.mark.asyncio
+    async def test_status_summary(self, repo):
+        (repo / "app.py").write_text("print('hello')\nprint('world')\n")
+        (repo / "new.py").write_text("x = 1\n")
+        service = GitService(str(repo))
+
+        text = format_status(await service.status(), await service.diff_stats(True), await service.diff_stats())
+
+        assert text == "On branch main\nUnstaged (1):\n  M  app.py  (+1 -0)\nUntracked (1):\n  new.py"
+
+    def test_diff_summary_caps_listing(self, monkeypatch):
+        monkeypatch.setattr(git_service, "MAX_LISTED_FILES", 2)
+        stats = parse_numstat(b"10\t2\ta.py\0-\t-\tb.png\0" b"1\t1\tc.py\0")
+
+        text = format_diff_summary(stats)
+
+        assert text.splitlines()[0] == "3 files changed, +11 -3:"
+        assert "binary" in text
+        assert text.endswith("... and 1 more")
@@ -0,0 +1,263 @@
+"""
+Unit tests for the browserless fetch fast path (Phase 12.5)
+
+Tests cover:
+- HTML to markdown conversion
+- JavaScript-shell / empty-body detection
+- HTTP tier against a local server with static and JS-only fixture pages
+- Session cookies scoped by domain, path and secure flag across redirects
+- Escalation to the browser tier and tier/latency recording
+"""
+
+import gzip
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from wyn360_cli import browser_use
+from wyn360_cli.browser_use import fetch_website_content, get_fetch_stats
+from wyn360_cli.html_markdown import html_to_markdown
+from wyn360_cli.http_fetch import close_http_client, fetch_http, get_http_client, needs_browser
+
+
+ARTICLE = " ".join(["Static documentation pages render fine without a browser."] * 10)
+
+PAGES = {
+    "/docs": ("text/html", f"""<!doctype html><html><head><title>Docs</title>
+<script src="/app.js"></script></head><body>
+<nav><a href="/">Home</a></nav>
+<h1>Getting started</h1><p>{ARTICLE}</p>
+<ul><li>Install</li><li><a href="/docs/config">Configure</a></li></ul>
+</body></html>"""),
+    "/spa": ("text/html", """<!doctype html><html><head><title>App</title></head>
+<body><div id="root"></div><noscript>You need to enable JavaScript to run this app.</noscript>
+<script src="/static/js/main.js"></script></body></html>"""),
+    "/notes.txt": ("text/plain", "plain text notes\n" * 20),
+    "/image.png": ("image/png", "\x89PNG"),
+}
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """Serve fixture pages from memory (gzip when the client accepts it)"""
+
+    connections = 0
+    cookies_seen = []
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self):
+        if self.path == "/account":
+            # Same-host redirect, as many sites do for a trailing slash
+            self.send_response(302)
+            self.send_header("Location", "/account/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/account/":
+            cookies = self.headers.get("Cookie", "")
+            self.cookies_seen.append(cookies)
+            name = "Ada" if "sid=abc" in cookies else "guest"
+            body = f"<html><head><title>Account</title></head><body><h1>Signed in as {name}</h1>" \
+                   f"<p>{ARTICLE}</p></body></html>".encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path not in PAGES:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        content_type, text = PAGES[self.path]
+        body = text.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_server():
+    """Local HTTP/1.1 server with static and JS-only pages"""
+    _FixtureHandler.protocol_version = "HTTP/1.1"
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+class TestHtmlToMarkdown:
+    """Test in-process HTML conversion"""
+
+    def test_structure_is_preserved(self):
+        markdown = html_to_markdown(
+            "<h2>Title</h2><p>Some <b>bold</b> and <a href='/x'>link</a>.</p>"
+            "<ol><li>one</li><li>two</li></ol><pre>a = 1\n  b = 2</pre>",
+            base_url="https://example.com/docs/"
+        )
+
+        assert "## Title" in markdown
+        assert "Some **bold** and [link](https://example.com/x)." in markdown
+        assert "1. one\n2. two" in markdown
+        assert "```\na = 1\n  b = 2\n```" in markdown
+
+    def test_scripts_and_styles_dropped(self):
+        markdown = html_to_markdown("<style>p{}</style><script>alert(1)</script><p>Visible</p>")
+
+        assert markdown.strip() == "Visible"
+
+    def test_tables(self):
+        markdown = html_to_markdown("<table><tr><th>A</th><th>B</th></tr><tr><td>1</td><td>2</td></tr></table>")
+
+        assert "| A | B |\n| --- | --- |\n| 1 | 2 |" in markdown
+
+
+class TestNeedsBrowser:
+    """Test JavaScript-shell detection"""
+
+    def test_content_page_is_static(self):
+        assert needs_browser("<p>text</p>", 5000) is None
+
+    def test_empty_body(self):
+        assert needs_browser("<body></body>", 0) == "empty body"
+
+    def test_app_shell(self):
+        html = '<div id="__next"></div>' + "<p>" + "x" * 300 + "</p>"
+        assert needs_browser(html, 300) == "javascript app shell"
+
+    def test_script_heavy(self):
+        html = "<script>" + "x" * 50_000 + "</script><p>" + "y" * 300 + "</p>"
+        assert needs_browser(html, 300) == "script-heavy page"
+
+
+class TestHttpTier:
+    """Test the HTTP tier against a local server"""
+
+    @pytest.mark.asyncio
+    async def test_static_page_served_over_http(self, fixture_server):
+        result = await fetch_http(f"{fixture_server}/docs")
+
+        assert result.status == 200
+        assert not result.needs_browser
+        assert result.title == "Docs"
+        assert "# Getting started" in result.markdown
+        assert f"[Configure]({fixture_server}/docs/config)" in result.markdown
+
+    @pytest.mark.asyncio
+    async def test_js_only_page_needs_browser(self, fixture_server):
+        result = await fetch_http(f"{fixture_server}/spa")
+
+        assert result.needs_browser
+        assert result.escalate_reason == "empty body"
+
+    @pytest.mark.asyncio
+    async def test_plain_text_and_errors(self, fixture_server):
+        text = await fetch_http(f"{fixture_server}/notes.txt")
+        missing = await fetch_http(f"{fixture_server}/missing")
+        binary = await fetch_http(f"{fixture_server}/image.png")
+
+        assert not text.needs_browser and text.markdown.startswith("plain text notes")
+        assert missing.escalate_reason == "HTTP 404"
+        assert binary.escalate_reason.startswith("unsupported content type")
+
+    @pytest.mark.asyncio
+    async def test_connection_is_kept_alive(self, fixture_server):
+        _FixtureHandler.connections = 0
+        client = get_http_client()
+        try:
+            await fetch_http(f"{fixture_server}/docs")
+            await fetch_http(f"{fixture_server}/notes.txt")
+
+            assert get_http_client() is client
+            assert _FixtureHandler.connections == 1
+        finally:
+            await close_http_client()
+
+    @pytest.mark.asyncio
+    async def test_session_cookies_survive_redirect(self, fixture_server):
+        _FixtureHandler.cookies_seen = []
+        cookies = [
+            {'name': 'sid', 'value': 'abc', 'domain': '127.0.0.1', 'path': '/', 'expires': -1},
+            {'name': 'tls_only', 'value': '1', 'domain': '127.0.0.1', 'path': '/', 'secure': True},
+            {'name': 'admin', 'value': '1', 'domain': '127.0.0.1', 'path': '/admin'},
+            {'name': 'other', 'value': '1', 'domain': '.example.com', 'path': '/'},
+        ]
+
+        result = await fetch_http(f"{fixture_server}/account", cookies)
+
+        assert result.status == 200
+        assert "Signed in as Ada" in result.markdown
+        # Only the cookie whose domain, path and secure flag match is sent
+        assert _FixtureHandler.cookies_seen == ["sid=abc"]
+
+    @pytest.mark.asyncio
+    async def test_unreachable_host_escalates(self):
+        result = await fetch_http("http://127.0.0.1:1/")
+
+        assert result.escalate_reason == "http error"
+        assert result.error
+
+
+class TestTieredFetch:
+    """Test fetch_website_content tier selection"""
+
+    @pytest.mark.asyncio
+    async def test_static_page_skips_browser(self, fixture_server):
+        before = get_fetch_stats()['http']
+
+        with patch.object(browser_use, 'AsyncWebCrawler') as crawler_class:
+            success, content = await fetch_website_content(f"{fixture_server}/docs", http_first=True)
+
+        assert success is True
+        assert "Getting started" in content
+        crawler_class.assert_not_called()
+        stats = get_fetch_stats()
+        assert stats['http'] == before + 1
+        assert stats['recent'][-1]['tier'] == 'http'
+
+    @pytest.mark.asyncio
+    async def test_js_page_escalates_to_browser(self, fixture_server):
+        crawl_result = Mock(success=True, markdown="# Rendered app\n\nHydrated content", error_message=None)
+        crawler = AsyncMock()
+        crawler.arun.return_value = crawl_result
+        crawler.__aenter__.return_value = crawler
+        before = get_fetch_stats()['escalations']
+
+        with patch.object(browser_use, 'HAS_CRAWL4AI', True), \
+             patch.object(browser_use, 'AsyncWebCrawler', return_value=crawler), \
+             patch.object(browser_use, 'check_playwright_installed', return_value=(True, "")):
+            success, content = await fetch_website_content(f"{fixture_server}/spa", http_first=True)
+
+        assert success is True
+        assert "Hydrated content" in content
+        stats = get_fetch_stats()
+        assert stats['escalations'] == before + 1
+        assert stats['recent'][-1]['tier'] == 'browser'
+        assert stats['recent'][-1]['escalated_because'] == "empty body"
+
+    @pytest.mark.asyncio
+    async def test_static_content_served_when_browser_unavailable(self, fixture_server):
+        PAGES["/thin"] = ("text/html", "<body><div id='app'></div><p>Short teaser text.</p></body>")
+        try:
+            with patch.object(browser_use, 'HAS_CRAWL4AI', False):
+                success, content = await fetch_website_content(f"{fixture_server}/thin", http_first=True)
+        finally:
+            del PAGES["/thin"]
+
+        assert success is True
+        assert "Short teaser text." in content
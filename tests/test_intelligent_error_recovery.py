@@ -22,6 +22,7 @@ from wyn360_cli.tools.browser.error_classification import (
     ErrorAnalysis
 )
 from wyn360_cli.tools.browser.enhanced_code_generator import CodeGenerationContext
+from wyn360_cli.tools.browser.safe_execution import ExecutionConfig, ExecutionResult, SafeExecutionWrapper
 
 
 class TestErrorClassifier:
@@ -690,4 +691,254 @@ result = {"button_clicked": True}
             "timeout_parameter_adjustment", 0.0
         )
 
-        assert updated_rate > initial_rate
\ No newline at end of file
+        assert updated_rate > initial_rate
+
+def make_analysis(category):
+    """ErrorAnalysis for a category with no matched patterns"""
+    return ErrorAnalysis(
+        category=category,
+        severity=ErrorSeverity.MEDIUM,
+        confidence=0.8,
+        original_error=category.value,
+        matched_patterns=[],
+        recovery_suggestions=[],
+        context_info={}
+    )
+
+
+def make_browser_context():
+    """Live-looking browser context whose browser can open isolated contexts"""
+    isolated = AsyncMock()
+    isolated.new_page.return_value = AsyncMock()
+    browser = AsyncMock()
+    browser.new_context.return_value = isolated
+    page = Mock()
+    page.url = "https://test.com/list"
+    page.viewport_size = {'width': 1280, 'height': 720}
+    page.evaluate = AsyncMock(return_value="TestAgent/1.0")
+    page.context = AsyncMock()
+    page.context.storage_state.return_value = {'cookies': [{'name': 'sid', 'value': 'abc'}], 'origins': []}
+    return {'page': page, 'browser': browser}, browser, isolated
+
+
+class TestSpeculativeRecovery:
+    """Test racing of recovery candidates"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.recovery = IntelligentErrorRecovery()
+        self.context = CodeGenerationContext(task_description="Read list", url="https://test.com/list")
+        self.error = Exception("Locator '.items' not found")
+        self.original_code = 'await page.wait_for_selector(".items")\nresult = 1'
+
+    def patch_candidates(self, codes):
+        """Make each strategy produce the given code"""
+        async def generate(strategy, *args):
+            return codes[strategy], [f"{strategy.value} change"]
+        return patch.object(self.recovery, '_generate_candidate_code', side_effect=generate)
+
+    @pytest.mark.asyncio
+    async def test_first_success_wins_and_others_are_cancelled(self):
+        """Test the fastest successful candidate wins and slower ones are cancelled"""
+        codes = {
+            RecoveryStrategy.CODE_MODIFICATION: 'await page.wait_for_selector(".items", timeout=60000)\nresult = "slow"',
+            RecoveryStrategy.ALTERNATIVE_APPROACH: 'await page.locator("text=Items").first.inner_text()\nresult = "fast"',
+            RecoveryStrategy.PARAMETER_ADJUSTMENT: 'await page.wait_for_timeout(500)\nresult = "fails"',
+        }
+        cancelled = []
+
+        async def fake_test(code, browser_context):
+            if '"slow"' in code:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(code)
+                    raise
+            if '"fails"' in code:
+                return False, "still missing"
+            await asyncio.sleep(0.05)
+            return True, None
+
+        browser_context, browser, isolated = make_browser_context()
+        with self.patch_candidates(codes), \
+             patch.object(self.recovery, '_test_code_in_sandbox', side_effect=fake_test):
+            success, code, session = await self.recovery.recover_from_error(
+                self.error, self.original_code, self.context, browser_context,
+                max_attempts=3, speculative=True
+            )
+
+        assert success is True
+        assert code == codes[RecoveryStrategy.ALTERNATIVE_APPROACH]
+        assert session.attempts[-1].strategy == RecoveryStrategy.ALTERNATIVE_APPROACH
+        assert len(cancelled) == 1
+        assert browser.new_context.await_count == 3
+        assert isolated.close.await_count == 3
+        # Isolated contexts carry the live session, viewport and user agent
+        browser.new_context.assert_awaited_with(
+            storage_state={'cookies': [{'name': 'sid', 'value': 'abc'}], 'origins': []},
+            viewport={'width': 1280, 'height': 720},
+            user_agent="TestAgent/1.0"
+        )
+        browser_context['page'].context.storage_state.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_mutating_candidates_run_serially_on_live_page(self):
+        """Test non-idempotent candidates are not raced"""
+        codes = {
+            RecoveryStrategy.CODE_MODIFICATION: 'await page.locator(".items").click()\nresult = 1',
+            RecoveryStrategy.ALTERNATIVE_APPROACH: 'await page.get_by_text("Items").click()\nresult = 2',
+            RecoveryStrategy.PARAMETER_ADJUSTMENT: 'await page.fill("#q", "x")\nresult = 3',
+        }
+        browser_context, browser, _ = make_browser_context()
+        calls = []
+
+        async def fake_test(code, context):
+            calls.append(context['page'])
+            return len(calls) == 2, None if len(calls) == 2 else "failed"
+
+        with self.patch_candidates(codes), \
+             patch.object(self.recovery, '_test_code_in_sandbox', side_effect=fake_test):
+            success, code, session = await self.recovery.recover_from_error(
+                self.error, self.original_code, self.context, browser_context,
+                max_attempts=3, speculative=True
+            )
+
+        assert success is True
+        assert code == codes[RecoveryStrategy.ALTERNATIVE_APPROACH]
+        assert all(page is browser_context['page'] for page in calls)
+        browser.new_context.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_race_falls_back_to_live_page(self):
+        """Test candidates that only failed in isolation are retried serially on the live page"""
+        codes = {
+            RecoveryStrategy.CODE_MODIFICATION: 'await page.wait_for_selector(".items", timeout=60000)\nresult = 1',
+            RecoveryStrategy.ALTERNATIVE_APPROACH: 'await page.locator("text=Items").first.inner_text()\nresult = 2',
+            RecoveryStrategy.PARAMETER_ADJUSTMENT: 'await page.wait_for_timeout(500)\nresult = 3',
+        }
+        browser_context, browser, isolated = make_browser_context()
+        live_page = browser_context['page']
+        live_runs = []
+
+        async def fake_test(code, context):
+            # The items only exist in the live page's state
+            if context['page'] is not live_page:
+                return False, "not found in isolated copy"
+            live_runs.append(code)
+            return True, None
+
+        with self.patch_candidates(codes), \
+             patch.object(self.recovery, '_test_code_in_sandbox', side_effect=fake_test):
+            success, code, session = await self.recovery.recover_from_error(
+                self.error, self.original_code, self.context, browser_context,
+                max_attempts=3, speculative=True
+            )
+
+        assert success is True
+        assert code == codes[RecoveryStrategy.CODE_MODIFICATION]
+        assert live_runs == [code]
+        assert [attempt.isolated for attempt in session.attempts] == [True, True, True, False]
+        assert session.attempts[-1].attempt_number == 4
+
+    @pytest.mark.asyncio
+    async def test_invalid_candidates_rejected_without_execution(self):
+        """Test syntax errors and unsafe code fail static validation"""
+        codes = {
+            RecoveryStrategy.CODE_MODIFICATION: 'await page.locator(".items"\nresult = 1',
+            RecoveryStrategy.ALTERNATIVE_APPROACH: 'import subprocess\nresult = 2',
+            RecoveryStrategy.PARAMETER_ADJUSTMENT: self.original_code,
+        }
+        tester = AsyncMock(return_value=(True, None))
+
+        with self.patch_candidates(codes), patch.object(self.recovery, '_test_code_in_sandbox', tester):
+            success, code, session = await self.recovery.recover_from_error(
+                self.error, self.original_code, self.context, make_browser_context()[0],
+                max_attempts=3, speculative=True
+            )
+
+        assert success is False
+        tester.assert_not_called()
+        errors = [attempt.error_encountered for attempt in session.attempts]
+        assert len(errors) == 2
+        assert errors[0].startswith("Syntax error")
+        assert errors[1].startswith("Security violations")
+
+    def test_win_rates_reorder_strategies(self):
+        """Test strategies that keep winning move to the front"""
+        analysis = make_analysis(ErrorCategory.ELEMENT_NOT_FOUND)
+        assert self.recovery._rank_strategies(analysis)[0] == RecoveryStrategy.CODE_MODIFICATION
+
+        for _ in range(3):
+            self.recovery._record_strategy_outcome(analysis, RecoveryStrategy.CODE_MODIFICATION, False)
+            self.recovery._record_strategy_outcome(analysis, RecoveryStrategy.PARAMETER_ADJUSTMENT, True)
+
+        ranking = self.recovery._rank_strategies(analysis)
+        assert ranking[0] == RecoveryStrategy.PARAMETER_ADJUSTMENT
+        assert ranking[-1] == RecoveryStrategy.CODE_MODIFICATION
+
+        # Other categories keep their default order
+        assert self.recovery._rank_strategies(make_analysis(ErrorCategory.TIMEOUT))[0] == \
+            RecoveryStrategy.PARAMETER_ADJUSTMENT
+
+    @pytest.mark.asyncio
+    async def test_serial_failures_count_against_strategy(self):
+        """Test failed sequential attempts are recorded as losses"""
+        with patch.object(self.recovery, '_test_code_in_sandbox', return_value=(False, "nope")):
+            await self.recovery.recover_from_error(
+                self.error, self.original_code, self.context, {'page': Mock()}, max_attempts=1
+            )
+
+        assert any(trials == 1 and wins == 0 for wins, trials in self.recovery.strategy_outcomes.values())
+
+
+class TestSafeExecutionRecovery:
+    """Test generated code that fails is handed to error recovery"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.wrapper = SafeExecutionWrapper()
+        self.context = CodeGenerationContext(task_description="Read list", url="https://test.com/list")
+        self.wrapper.code_generator.generate_automation_code = AsyncMock(
+            return_value='await page.wait_for_selector(".items")\nresult = 1'
+        )
+        self.failed = ExecutionResult(success=False, errors="Locator '.items' not found")
+
+    @pytest.mark.asyncio
+    async def test_recovered_code_rerun_on_live_page(self):
+        recovered_code = 'await page.wait_for_selector(".items", timeout=60000)\nresult = 2'
+        runs = AsyncMock(side_effect=[self.failed, ExecutionResult(success=True, result=2)])
+        recover = AsyncMock(return_value=(True, recovered_code, Mock(attempts=[Mock()], total_recovery_time=0.5)))
+
+        with patch.object(self.wrapper, 'execute_code_safely', runs), \
+             patch.object(self.wrapper.error_recovery, 'recover_from_error', recover):
+            result = await self.wrapper.execute_generated_code(self.context, {'page': Mock()})
+
+        assert result.success and result.result == 2
+        assert result.approach_used == "recovered"
+        assert recover.await_args.kwargs == {'max_attempts': 3, 'speculative': True}
+        assert runs.await_args_list[-1].args[0] == recovered_code
+
+    @pytest.mark.asyncio
+    async def test_mutating_recovered_code_not_repeated(self):
+        recovered_code = 'await page.locator(".items").click()'
+        runs = AsyncMock(return_value=self.failed)
+        recover = AsyncMock(return_value=(True, recovered_code, Mock(attempts=[Mock()], total_recovery_time=0.5)))
+
+        with patch.object(self.wrapper, 'execute_code_safely', runs), \
+             patch.object(self.wrapper.error_recovery, 'recover_from_error', recover):
+            result = await self.wrapper.execute_generated_code(self.context, {'page': Mock()})
+
+        assert result.success and result.approach_used == "recovered"
+        runs.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_recovery_disabled(self):
+        self.wrapper.config = ExecutionConfig(recovery_attempts=0)
+        recover = AsyncMock()
+
+        with patch.object(self.wrapper, 'execute_code_safely', AsyncMock(return_value=self.failed)), \
+             patch.object(self.wrapper.error_recovery, 'recover_from_error', recover):
+            result = await self.wrapper.execute_generated_code(self.context, {'page': Mock()})
+
+        assert result is self.failed
+        recover.assert_not_called()
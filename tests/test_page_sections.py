@@ -0,0 +1,198 @@
+"""
+Unit tests for query-aware page reduction (Phase 12.8)
+
+Tests cover:
+- Splitting markdown into heading-delimited sections
+- BM25 ranking and blending with embedding similarity
+- Packing relevant sections into a token budget in document order
+- Caching section indexes next to WebsiteCache entries
+"""
+
+import numpy as np
+import pytest
+
+from wyn360_cli.browser_use import WebsiteCache, count_tokens
+from wyn360_cli.page_sections import (
+    SectionIndex,
+    split_sections,
+    tokenize,
+)
+
+
+def _section(title, topic, paragraphs=8):
+    body = "\n\n".join(
+        f"Paragraph {n} of the {title} chapter discusses {topic} in some detail." for n in range(paragraphs)
+    )
+    return f"## {title}\n\n{body}"
+
+
+PAGE = "# Project handbook\n\nWelcome to the handbook.\n\n" + "\n\n".join([
+    _section("Installation", "downloading packages and virtual environments"),
+    _section("Configuration", "settings files and environment variables"),
+    _section("Deployment", "containers, servers and rollbacks"),
+    _section("Troubleshooting timeouts", "timeout errors, retry limits and slow networks"),
+    _section("Changelog", "release history"),
+])
+
+
+class FakeEmbeddingModel:
+    """Embeds text as counts of a few marker words"""
+
+    model_name = "fake"
+    VOCABULARY = ["deploy", "container", "timeout", "install"]
+
+    def encode(self, texts):
+        if isinstance(texts, str):
+            texts = [texts]
+        return np.array([[t.lower().count(word) + 0.01 for word in self.VOCABULARY] for t in texts])
+
+    def compute_similarity(self, query, chunks):
+        query = query.flatten() / np.linalg.norm(query)
+        chunks = chunks / np.linalg.norm(chunks, axis=1, keepdims=True)
+        return chunks @ query
+
+
+class TestSplitSections:
+    """Test section splitting"""
+
+    def test_splits_at_headings(self):
+        sections = split_sections(PAGE)
+
+        assert [s.heading for s in sections] == [
+            "# Project handbook", "## Installation", "## Configuration",
+            "## Deployment", "## Troubleshooting timeouts", "## Changelog"
+        ]
+        assert sections[1].text.startswith("## Installation\n\nParagraph 0")
+
+    def test_text_before_first_heading(self):
+        sections = split_sections("Intro text\n\n## Details\n\nMore")
+
+        assert sections[0].heading == ""
+        assert sections[0].text == "Intro text"
+
+    def test_large_sections_split_at_paragraphs(self):
+        sections = split_sections(_section("Big", "everything", paragraphs=40), max_section_tokens=150)
+
+        assert len(sections) > 1
+        assert all(s.tokens <= 150 for s in sections)
+        assert not sections[0].continued and all(s.continued for s in sections[1:])
+        assert all(s.heading == "## Big" for s in sections)
+
+    def test_tokenize_drops_stopwords(self):
+        assert tokenize("How do I fix the HTTP-2 timeout?") == ["fix", "http-2", "timeout"]
+
+
+class TestRanking:
+    """Test BM25 and embedding scoring"""
+
+    def test_bm25_prefers_matching_section(self):
+        index = SectionIndex.from_markdown(PAGE)
+        scores = index.score("timeout retry")
+
+        assert scores.index(max(scores)) == 4
+        assert max(scores) == 1.0
+        assert scores[1] == 0.0
+
+    def test_scores_are_memoized_per_query(self):
+        index = SectionIndex.from_markdown(PAGE)
+
+        assert index.score("deployment") is index.score("deployment")
+
+    def test_embeddings_blend_with_bm25(self):
+        index = SectionIndex.from_markdown(PAGE)
+        model = FakeEmbeddingModel()
+
+        assert index.compute_embeddings(model)
+        scores = index.score("container rollout", model)
+
+        # "rollout" matches nothing lexically; "container" matches Deployment both ways
+        assert scores.index(max(scores)) == 3
+
+    def test_round_trip_keeps_embeddings(self):
+        index = SectionIndex.from_markdown(PAGE)
+        index.compute_embeddings(FakeEmbeddingModel())
+
+        restored = SectionIndex.from_dict(index.to_dict())
+
+        assert [s.text for s in restored.sections] == [s.text for s in index.sections]
+        assert restored.embeddings == index.embeddings
+        assert SectionIndex.from_dict({'version': 0, 'sections': []}) is None
+
+
+class TestReduce:
+    """Test packing sections into a budget"""
+
+    def test_small_page_returned_whole(self):
+        content, reduced = SectionIndex.from_markdown("# Title\n\nShort page").reduce("anything", 1000)
+
+        assert not reduced
+        assert content == "# Title\n\nShort page"
+
+    def test_relevant_section_beyond_head_is_kept(self):
+        content, reduced = SectionIndex.from_markdown(PAGE).reduce("timeout errors", 300)
+
+        assert reduced
+        assert "## Troubleshooting timeouts" in content
+        assert "## Installation" not in content
+        assert "section(s) omitted" in content
+        assert content.startswith('*[Query-focused excerpt for "timeout errors"')
+        assert count_tokens(content) <= 300
+
+    def test_sections_stay_in_document_order(self):
+        content, _ = SectionIndex.from_markdown(PAGE).reduce("changelog installation", 700)
+
+        assert content.index("## Installation") < content.index("## Changelog")
+
+    def test_unmatched_query_degrades_to_head(self):
+        content, _ = SectionIndex.from_markdown(PAGE).reduce("zebra", 300)
+
+        assert "# Project handbook" in content
+        assert "## Changelog" not in content
+
+    def test_continued_sections_get_their_heading(self):
+        page = "# Intro\n\nhello\n\n" + _section("Big", "filler", paragraphs=30) + " The answer is quokka."
+        index = SectionIndex.from_markdown(page, max_section_tokens=120)
+
+        content, _ = index.reduce("quokka", 200)
+
+        assert "## Big (continued)" in content
+        assert "quokka" in content
+
+
+class TestSectionCache:
+    """Test section indexes stored with website cache entries"""
+
+    @pytest.mark.asyncio
+    async def test_sections_cached_with_entry(self, tmp_path):
+        cache = WebsiteCache(tmp_path, ttl=3600)
+        await cache.set("https://example.com/doc", "truncated page")
+        await cache.set_sections("https://example.com/doc", SectionIndex.from_markdown(PAGE))
+        cache.close()
+
+        reopened = WebsiteCache(tmp_path, ttl=3600)
+        sections = await reopened.get_sections("https://example.com/doc")
+
+        assert len(sections.sections) == 6
+        assert await reopened.get_sections("https://example.com/doc") is sections
+        assert reopened.get_stats()['total_size_mb'] >= 0
+
+    @pytest.mark.asyncio
+    async def test_new_content_or_removal_drops_sections(self, tmp_path):
+        cache = WebsiteCache(tmp_path, ttl=3600)
+        await cache.set("https://example.com/doc", "v1")
+        await cache.set_sections("https://example.com/doc", SectionIndex.from_markdown(PAGE))
+
+        await cache.set("https://example.com/doc", "v2")
+        assert await cache.get_sections("https://example.com/doc") is None
+
+        await cache.set_sections("https://example.com/doc", SectionIndex.from_markdown(PAGE))
+        await cache.clear()
+        assert list(tmp_path.glob("*.gz")) == []
+
+    @pytest.mark.asyncio
+    async def test_sections_require_an_entry(self, tmp_path):
+        cache = WebsiteCache(tmp_path, ttl=3600)
+
+        await cache.set_sections("https://example.com/none", SectionIndex.from_markdown(PAGE))
+
+        assert await cache.get_sections("https://example.com/none") is None
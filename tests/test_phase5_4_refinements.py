@@ -278,7 +278,7 @@ class TestPerformanceOptimizationsPhase54:
 
     @pytest.mark.asyncio
     async def test_wait_after_action_is_applied(self):
-        """Test that WAIT_AFTER_ACTION is applied after actions."""
+        """Test that WAIT_AFTER_ACTION is applied after actions in fixed wait mode."""
         controller = BrowserController()
         controller._initialized = True
         controller.page = AsyncMock()
@@ -288,11 +288,12 @@ class TestPerformanceOptimizationsPhase54:
 
         start_time = asyncio.get_event_loop().time()
 
-        # Execute action
-        await controller.execute_action({
-            'type': 'click',
-            'selector': '#btn'
-        })
+        # Execute action (fixed mode sleeps; adaptive mode is covered in test_browser_optimization)
+        with patch.object(BrowserConfig, 'get_wait_mode', return_value='fixed'):
+            await controller.execute_action({
+                'type': 'click',
+                'selector': '#btn'
+            })
 
         end_time = asyncio.get_event_loop().time()
 
@@ -302,7 +303,7 @@ class TestPerformanceOptimizationsPhase54:
 
     @pytest.mark.asyncio
     async def test_wait_after_navigation_is_applied(self):
-        """Test that WAIT_AFTER_NAVIGATION is applied after navigation."""
+        """Test that WAIT_AFTER_NAVIGATION is applied after navigation in fixed wait mode."""
         controller = BrowserController()
         controller._initialized = True
         controller.page = AsyncMock()
@@ -313,7 +314,8 @@ class TestPerformanceOptimizationsPhase54:
         start_time = asyncio.get_event_loop().time()
 
         # Navigate
-        await controller.navigate("https://example.com")
+        with patch.object(BrowserConfig, 'get_wait_mode', return_value='fixed'):
+            await controller.navigate("https://example.com")
 
         end_time = asyncio.get_event_loop().time()
 
@@ -0,0 +1,273 @@
+"""
+Unit tests for request interception (Phase 4.5)
+
+Tests cover:
+- Resource type and domain blocking decisions
+- Route handling and per-navigation accounting
+- Site-profile policy resolution (vision mode keeps images)
+- Measured savings against a local HTTP fixture server
+"""
+
+import gc
+import threading
+import pytest
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+from unittest.mock import Mock, AsyncMock
+
+from wyn360_cli.tools.browser.resource_blocker import ResourceBlocker, ESTIMATED_RESOURCE_BYTES
+from wyn360_cli.config import get_resource_policy, RESOURCE_PROFILES
+
+
+def make_route(url, resource_type, page, navigation=False):
+    """Create a mock Playwright route for a request issued by page"""
+    route = AsyncMock()
+    route.request.url = url
+    route.request.resource_type = resource_type
+    route.request.frame.page = page
+    route.request.frame.parent_frame = None
+    route.request.is_navigation_request = Mock(return_value=navigation)
+    return route
+
+
+class TestShouldBlock:
+    """Test blocking decisions"""
+
+    def setup_method(self):
+        self.blocker = ResourceBlocker(
+            block_resource_types=["image", "font"],
+            block_domains=["doubleclick.net", "google-analytics.com"]
+        )
+
+    def test_blocks_by_resource_type(self):
+        assert self.blocker.should_block("image", "https://example.com/logo.png") == "type"
+        assert self.blocker.should_block("font", "https://example.com/a.woff2") == "type"
+
+    def test_blocks_by_domain_and_subdomain(self):
+        assert self.blocker.should_block("script", "https://doubleclick.net/ad.js") == "domain"
+        assert self.blocker.should_block("script", "https://stats.g.doubleclick.net/x.js") == "domain"
+        assert self.blocker.should_block("xhr", "https://www.google-analytics.com/collect") == "domain"
+
+    def test_allows_document_and_scripts(self):
+        assert self.blocker.should_block("document", "https://example.com/") is None
+        assert self.blocker.should_block("script", "https://example.com/app.js") is None
+
+    def test_does_not_match_domain_suffix_without_dot(self):
+        assert self.blocker.should_block("script", "https://notdoubleclick.net/x.js") is None
+
+    def test_ignores_inline_urls(self):
+        assert self.blocker.should_block("image", "data:image/png;base64,AAAA") is None
+
+    def test_empty_policy_is_disabled(self):
+        assert ResourceBlocker().enabled is False
+
+
+class TestRouteHandling:
+    """Test the Playwright route handler"""
+
+    @pytest.mark.asyncio
+    async def test_install_registers_route(self):
+        blocker = ResourceBlocker(block_resource_types=["image"])
+        context = AsyncMock()
+
+        assert await blocker.install(context) is True
+        context.route.assert_called_once_with("**/*", blocker._handle_route)
+
+    @pytest.mark.asyncio
+    async def test_install_skipped_when_disabled(self):
+        context = AsyncMock()
+
+        assert await ResourceBlocker().install(context) is False
+        context.route.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_abort_and_continue_are_counted_per_navigation(self):
+        blocker = ResourceBlocker(block_resource_types=["image"], block_domains=["hotjar.com"])
+        page = Mock()
+
+        doc = make_route("https://example.com/", "document", page, navigation=True)
+        img = make_route("https://example.com/hero.jpg", "image", page)
+        tracker = make_route("https://static.hotjar.com/c.js", "script", page)
+        script = make_route("https://example.com/app.js", "script", page)
+
+        for route in (doc, img, tracker, script):
+            await blocker._handle_route(route)
+
+        doc.continue_.assert_called_once()
+        script.continue_.assert_called_once()
+        img.abort.assert_called_once()
+        tracker.abort.assert_called_once()
+
+        stats = blocker.navigation_stats(page)
+        assert stats['url'] == "https://example.com/"
+        assert stats['requests_total'] == 4
+        assert stats['requests_blocked'] == 2
+        assert stats['blocked_by_domain'] == 1
+        assert stats['bytes_saved'] == ESTIMATED_RESOURCE_BYTES['image'] + ESTIMATED_RESOURCE_BYTES['script']
+
+    @pytest.mark.asyncio
+    async def test_new_navigation_moves_previous_to_history(self):
+        blocker = ResourceBlocker(block_resource_types=["image"])
+        page = Mock()
+
+        await blocker._handle_route(make_route("https://a.com/", "document", page, navigation=True))
+        await blocker._handle_route(make_route("https://a.com/x.png", "image", page))
+        await blocker._handle_route(make_route("https://b.com/", "document", page, navigation=True))
+
+        assert len(blocker.history) == 1
+        assert blocker.history[0].url == "https://a.com/"
+        assert blocker.navigation_stats(page)['url'] == "https://b.com/"
+
+        stats = blocker.get_stats()
+        assert stats['navigations'] == 1
+        assert stats['requests_blocked'] == 1
+        assert stats['requests_total'] == 3
+
+    @pytest.mark.asyncio
+    async def test_policy_resolver_applies_per_page(self):
+        def resolve(url):
+            if "shop.com" in url:
+                return {"block_resource_types": ["image"], "block_domains": []}
+            return {"block_resource_types": [], "block_domains": []}
+
+        blocker = ResourceBlocker(policy_resolver=resolve)
+        shop_page, docs_page = Mock(), Mock()
+
+        await blocker._handle_route(make_route("https://shop.com/", "document", shop_page, navigation=True))
+        await blocker._handle_route(make_route("https://docs.org/", "document", docs_page, navigation=True))
+
+        shop_img = make_route("https://shop.com/p.png", "image", shop_page)
+        docs_img = make_route("https://docs.org/d.png", "image", docs_page)
+        await blocker._handle_route(shop_img)
+        await blocker._handle_route(docs_img)
+
+        shop_img.abort.assert_called_once()
+        docs_img.continue_.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_forget_page_finishes_navigation(self):
+        blocker = ResourceBlocker(block_resource_types=["font"])
+        page = Mock()
+        await blocker._handle_route(make_route("https://a.com/", "document", page, navigation=True))
+
+        blocker.forget_page(page)
+
+        assert blocker.navigation_stats(page) is None
+        assert blocker.get_stats()['navigations'] == 1
+
+    @pytest.mark.asyncio
+    async def test_closed_pages_are_not_retained(self):
+        blocker = ResourceBlocker(block_resource_types=["font"])
+        page = Mock()
+        await blocker._handle_route(make_route("https://a.com/", "document", page, navigation=True))
+
+        del page
+        gc.collect()
+
+        assert len(blocker._current) == 0
+        assert len(blocker._policies) == 0
+
+    @pytest.mark.asyncio
+    async def test_new_page_does_not_inherit_policy(self):
+        blocker = ResourceBlocker(policy_resolver=lambda url: {'block_resource_types': ["image"]})
+        old_page, new_page = Mock(), Mock()
+        await blocker._handle_route(make_route("https://a.com/", "document", old_page, navigation=True))
+
+        image = make_route("https://b.com/x.png", "image", new_page)
+        await blocker._handle_route(image)
+
+        image.continue_.assert_called_once()
+        assert blocker.navigation_stats(new_page) is None
+
+
+class TestResourcePolicy:
+    """Test site-profile policy resolution"""
+
+    def test_balanced_blocks_images_fonts_and_trackers(self):
+        policy = get_resource_policy("https://unknown-site.com", "balanced")
+
+        assert "image" in policy["block_resource_types"]
+        assert "font" in policy["block_resource_types"]
+        assert "google-analytics.com" in policy["block_domains"]
+
+    def test_vision_mode_keeps_images(self):
+        policy = get_resource_policy("https://unknown-site.com", "balanced", vision_mode=True)
+
+        assert "image" not in policy["block_resource_types"]
+        assert "font" in policy["block_resource_types"]
+
+    def test_site_profile_overrides_profile(self):
+        policy = get_resource_policy("https://www.amazon.com/dp/123", "balanced")
+
+        assert policy["block_domains"] == RESOURCE_PROFILES["aggressive"]["block_domains"]
+
+    def test_off_wins_over_site_profile(self):
+        policy = get_resource_policy("https://www.amazon.com/dp/123", "off")
+
+        assert policy == {"block_resource_types": [], "block_domains": []}
+
+
+FIXTURE_PAGE = b"""<!doctype html>
+<html><head>
+<link rel="preload" href="/font.woff2" as="font" crossorigin>
+</head><body>
+<h1>Fixture</h1>
+<img src="/a.png"><img src="/b.png"><img src="/c.png">
+</body></html>
+"""
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    """Serve a page with heavy sub-resources from memory"""
+
+    def do_GET(self):
+        if self.path == "/":
+            body, content_type = FIXTURE_PAGE, "text/html"
+        else:
+            body, content_type = b"\0" * 50_000, "application/octet-stream"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_server():
+    """Local HTTP server for measuring blocked requests"""
+    server = HTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+
+
+class TestFixtureServer:
+    """Measure savings with a real browser against a local server"""
+
+    @pytest.mark.asyncio
+    async def test_blocks_heavy_resources_on_fixture_page(self, fixture_server):
+        playwright_api = pytest.importorskip("playwright.async_api")
+
+        async with playwright_api.async_playwright() as p:
+            try:
+                browser = await p.chromium.launch(headless=True)
+            except Exception as e:
+                pytest.skip(f"Chromium not available: {e}")
+
+            try:
+                context = await browser.new_context()
+                blocker = ResourceBlocker(block_resource_types=["image", "font"])
+                await blocker.install(context)
+
+                page = await context.new_page()
+                await page.goto(fixture_server, wait_until="load")
+
+                stats = blocker.navigation_stats(page)
+                assert stats['requests_blocked'] >= 3
+                assert stats['blocked_by_type'].get('image') == 3
+                assert stats['bytes_saved'] > 0
+            finally:
+                await browser.close()
@@ -0,0 +1,200 @@
+"""
+Unit tests for persistent routing statistics
+
+Tests cover:
+- Per-domain, per-action counters and the domain-wide aggregate
+- Exponential time decay
+- Recent-failure lookups and best-approach selection
+- Cross-domain totals per approach
+- Persistence, batched writes and least-recently-used domain eviction
+- Orchestrator integration
+"""
+
+import time
+
+import pytest
+
+from wyn360_cli.tools.browser.routing_stats import (
+    ANY_ACTION,
+    RoutingStatsStore,
+    routing_domain
+)
+from wyn360_cli.tools.browser.automation_orchestrator import (
+    AutomationOrchestrator,
+    AutomationApproach,
+    ActionRequest,
+    ActionResult
+)
+
+
+DAY = 24 * 3600
+
+
+class TestRoutingStatsStore:
+    """Test counter updates and lookups"""
+
+    def test_routing_domain_ignores_www_and_port(self):
+        assert routing_domain("https://www.Example.com:8443/path?q=1") == "example.com"
+        assert routing_domain("not a url") == ""
+
+    def test_record_updates_action_and_domain_counters(self):
+        store = RoutingStatsStore()
+        store.record("https://shop.com/a", "click", "dom_analysis", True, 1.0)
+        store.record("https://shop.com/b", "type", "dom_analysis", False, 3.0)
+
+        click = store.get("https://shop.com", "click", "dom_analysis")
+        overall = store.get("https://shop.com", ANY_ACTION, "dom_analysis")
+
+        assert click.attempts == pytest.approx(1)
+        assert click.success_rate == pytest.approx(1.0)
+        assert overall.attempts == pytest.approx(2)
+        assert overall.success_rate == pytest.approx(0.5)
+        assert overall.average_latency == pytest.approx(2.0)
+        assert store.get("https://other.com", "click", "dom_analysis") is None
+
+    def test_counters_decay_with_half_life(self):
+        store = RoutingStatsStore(half_life=DAY)
+        now = time.time()
+        store.record("https://shop.com", "click", "stagehand", True, 2.0, now=now - 2 * DAY)
+
+        stats = store.get("https://shop.com", "click", "stagehand", now=now)
+
+        assert abs(stats.attempts - 0.25) < 1e-6
+        assert stats.success_rate == pytest.approx(1.0)
+        assert abs(stats.average_latency - 2.0) < 1e-6
+
+    def test_recent_failures_cleared_by_later_success(self):
+        store = RoutingStatsStore()
+        approaches = ["dom_analysis", "stagehand", "vision_fallback"]
+        store.record("https://shop.com", "click", "dom_analysis", False)
+        store.record("https://shop.com", "click", "stagehand", False, now=time.time() - 7200)
+
+        assert store.recent_failures("https://shop.com", approaches) == ["dom_analysis"]
+
+        store.record("https://shop.com", "click", "dom_analysis", True, now=time.time() + 1)
+        assert store.recent_failures("https://shop.com", approaches) == []
+
+    def test_recent_failures_listed_per_failure(self):
+        store = RoutingStatsStore()
+        store.record("https://shop.com", "click", "dom_analysis", False)
+        store.record("https://shop.com", "type", "dom_analysis", False)
+        store.record("https://shop.com", "click", "stagehand", False)
+
+        failures = store.recent_failures("https://shop.com", ["dom_analysis", "stagehand"])
+
+        assert failures == ["dom_analysis", "dom_analysis", "stagehand"]
+
+    def test_best_approach_needs_enough_attempts(self):
+        store = RoutingStatsStore()
+        for _ in range(2):
+            store.record("https://app.com", "click", "vision_fallback", True)
+
+        assert store.best_approach("https://app.com", "click", ["dom_analysis", "vision_fallback"]) is None
+
+        store.record("https://app.com", "extract", "vision_fallback", True)
+        # Falls back to the domain-wide aggregate (3 attempts across actions)
+        best = store.best_approach("https://app.com", "click", ["dom_analysis", "vision_fallback"])
+        assert best[0] == "vision_fallback"
+
+    def test_best_approach_breaks_ties_by_latency(self):
+        store = RoutingStatsStore()
+        for _ in range(3):
+            store.record("https://app.com", "click", "stagehand", True, 5.0)
+            store.record("https://app.com", "click", "dom_analysis", True, 0.5)
+
+        best = store.best_approach("https://app.com", "click", ["stagehand", "dom_analysis"])
+        assert best[0] == "dom_analysis"
+
+    def test_overall_counts_every_domain(self):
+        store = RoutingStatsStore()
+        now = time.time()
+        store.record("https://a.com", "click", "stagehand", True, now=now)
+        store.record("https://b.com", "type", "stagehand", False, now=now)
+
+        overall = store.overall(now=now + 14 * DAY)
+
+        assert overall["stagehand"].attempts == pytest.approx(1.0)
+        assert overall["stagehand"].success_rate == pytest.approx(0.5)
+
+
+class TestRoutingStatsPersistence:
+    """Test persistence and eviction"""
+
+    def test_statistics_survive_restart(self, tmp_path):
+        path = tmp_path / "routing_stats.json"
+        store = RoutingStatsStore(path)
+        store.record("https://shop.com", "click", "vision_fallback", True, 4.0)
+        store.flush()
+
+        reloaded = RoutingStatsStore(path)
+        stats = reloaded.get("https://shop.com", "click", "vision_fallback")
+
+        assert stats.attempts == pytest.approx(1)
+        assert stats.success_rate == pytest.approx(1.0)
+        assert reloaded.overall()["vision_fallback"].attempts == pytest.approx(1)
+
+    def test_writes_are_batched(self, tmp_path):
+        path = tmp_path / "routing_stats.json"
+        store = RoutingStatsStore(path, flush_every=3, flush_interval=3600)
+
+        store.record("https://shop.com", "click", "dom_analysis", True)
+        store.record("https://shop.com", "click", "dom_analysis", True)
+        assert not path.exists()
+
+        store.record("https://shop.com", "click", "dom_analysis", False)
+        assert RoutingStatsStore(path).get("https://shop.com", "click", "dom_analysis").attempts \
+            == pytest.approx(3)
+
+    def test_pending_writes_flushed_after_interval(self, tmp_path):
+        path = tmp_path / "routing_stats.json"
+        store = RoutingStatsStore(path, flush_interval=3600)
+        store.record("https://shop.com", "click", "dom_analysis", True)
+        assert not path.exists()
+
+        store._last_flush -= 3600
+        store.record("https://shop.com", "click", "dom_analysis", True)
+
+        assert path.exists()
+        assert not store.flush()
+
+    def test_corrupt_file_starts_empty(self, tmp_path):
+        path = tmp_path / "routing_stats.json"
+        path.write_text("{not json")
+
+        assert RoutingStatsStore(path).domains == {}
+
+    def test_least_recently_used_domain_evicted(self):
+        store = RoutingStatsStore(max_domains=2)
+        store.record("https://a.com", "click", "dom_analysis", True)
+        store.record("https://b.com", "click", "dom_analysis", True)
+        store.record("https://a.com", "click", "dom_analysis", True)
+        store.record("https://c.com", "click", "dom_analysis", True)
+
+        assert list(store.domains) == ["a.com", "c.com"]
+
+
+class TestOrchestratorRoutingStats:
+    """Test the base orchestrator records into and reads from the store"""
+
+    def test_results_recorded_and_used_for_recent_failures(self):
+        orchestrator = AutomationOrchestrator()
+        request = ActionRequest(
+            url="https://www.shop.com/cart",
+            task_description="Click checkout",
+            action_type="click",
+            target_description="checkout button"
+        )
+        result = ActionResult(
+            success=False,
+            approach_used=AutomationApproach.DOM_ANALYSIS,
+            confidence=0.8,
+            execution_time=1.5,
+            result_data={}
+        )
+
+        orchestrator.record_execution_result(request, AutomationApproach.DOM_ANALYSIS, result)
+
+        stats = orchestrator.routing_stats.get("https://shop.com", "click", "dom_analysis")
+        assert stats.attempts == pytest.approx(1)
+        # Failures are tracked per domain, not only for the exact URL
+        assert orchestrator._get_recent_failures("https://shop.com/checkout") == ["dom_analysis"]
@@ -0,0 +1,208 @@
+"""
+Unit tests for the pre-forked sandbox worker pool
+
+Tests cover:
+- Executing code in worker processes
+- Killing workers that exceed the time limit
+- Retiring the busy worker when an execution is cancelled (not counted as a crash)
+- Concurrent executions never starting more workers than the pool size
+- Recycling workers after a fixed number of executions
+- Parallel execution of candidates
+- SandboxManager fallback to in-process execution for live contexts
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from unittest.mock import Mock
+
+from wyn360_cli.tools.browser.sandbox_pool import SandboxWorkerPool
+from wyn360_cli.tools.browser.secure_python_sandbox import (
+    SandboxConfig,
+    SandboxError,
+    SandboxManager,
+    SecurityViolation
+)
+from wyn360_cli.tools.browser.intelligent_error_recovery import IntelligentErrorRecovery
+
+
+@pytest.fixture
+def pool():
+    """Small worker pool, shut down after the test"""
+    pool = SandboxWorkerPool(SandboxConfig(max_execution_time=2), size=2, max_executions_per_worker=3)
+    yield pool
+    pool.shutdown()
+
+
+class TestSandboxWorkerPool:
+    """Test worker process execution"""
+
+    @pytest.mark.asyncio
+    async def test_execute_returns_result(self, pool):
+        result = await pool.execute("result = x * 2\nprint('done')", {'x': 21})
+
+        assert result['success'] is True
+        assert result['result'] == 42
+        assert 'done' in result['output']
+        assert pool.get_stats()['executions'] == 1
+
+    @pytest.mark.asyncio
+    async def test_workers_are_reused(self, pool):
+        first = await pool.execute("result = 1")
+        second = await pool.execute("result = 2")
+        await pool.execute("result = 3")
+
+        assert first['success'] and second['success']
+        assert pool.get_stats()['workers_started'] == 2
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_worker(self):
+        pool = SandboxWorkerPool(SandboxConfig(max_execution_time=1), size=1)
+        try:
+            start = time.time()
+            result = await pool.execute("while True:\n    pass")
+
+            assert result['success'] is False
+            assert 'timeout' in result['errors'].lower()
+            assert time.time() - start < 5
+            assert pool.get_stats()['timeouts'] == 1
+
+            # A fresh worker replaces the killed one
+            result = await pool.execute("result = 1")
+            assert result['success'] is True
+            assert pool.get_stats()['workers_started'] == 2
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_execution_retires_worker(self):
+        pool = SandboxWorkerPool(SandboxConfig(max_execution_time=5), size=1)
+        try:
+            task = asyncio.ensure_future(pool.execute("import time\ntime.sleep(3)\nresult = 1"))
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            # The busy worker is killed rather than handed to the next caller
+            start = time.time()
+            result = await pool.execute("result = 2")
+            assert result['result'] == 2
+            assert time.time() - start < 2
+            stats = pool.get_stats()
+            assert stats['workers_started'] == 2
+            assert stats['cancellations'] == 1
+            assert stats['crashes'] == 0
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_workers_recycled_after_max_executions(self):
+        pool = SandboxWorkerPool(SandboxConfig(max_execution_time=2), size=1, max_executions_per_worker=3)
+        try:
+            for _ in range(4):
+                result = await pool.execute("result = 1")
+                assert result['success'] is True
+
+            stats = pool.get_stats()
+            assert stats['recycled'] == 1
+            assert stats['workers_started'] == 2
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_execute_many_runs_in_parallel(self, pool):
+        codes = ["import time\ntime.sleep(0.5)\nresult = 1", "import time\ntime.sleep(0.5)\nresult = 2"]
+        await pool.fill()
+
+        start = time.time()
+        results = await pool.execute_many(codes)
+
+        assert [r['result'] for r in results] == [1, 2]
+        assert time.time() - start < 0.95
+
+    @pytest.mark.asyncio
+    async def test_concurrent_executions_do_not_overfill(self):
+        pool = SandboxWorkerPool(SandboxConfig(max_execution_time=2), size=2)
+        try:
+            results = await pool.execute_many(["result = 1 + 1"] * 6)
+
+            assert all(r['result'] == 2 for r in results)
+            stats = pool.get_stats()
+            assert stats['workers_started'] <= pool.size
+            assert stats['workers_alive'] <= pool.size
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_security_violation_checked_in_parent(self, pool):
+        with pytest.raises(SecurityViolation):
+            await pool.execute("import subprocess")
+
+        results = await pool.execute_many(["import subprocess"])
+        assert results[0]['success'] is False
+        assert pool.get_stats()['workers_started'] == 0
+
+    @pytest.mark.asyncio
+    async def test_unpicklable_context_rejected(self, pool):
+        with pytest.raises(SandboxError):
+            await pool.execute("result = 1", {'lock': threading.Lock()})
+
+
+class TestSandboxManagerPool:
+    """Test SandboxManager pool mode"""
+
+    @pytest.mark.asyncio
+    async def test_picklable_context_uses_pool(self):
+        manager = SandboxManager(SandboxConfig(max_execution_time=2), pool_size=1)
+        try:
+            result = await manager.execute_in_new_sandbox("result = value + 1", {'value': 1})
+
+            assert result['result'] == 2
+            assert manager.get_pool_stats()['executions'] == 1
+        finally:
+            manager.cleanup_all()
+
+        assert manager.pool is None
+
+    @pytest.mark.asyncio
+    async def test_live_context_runs_in_process(self):
+        manager = SandboxManager(SandboxConfig(max_execution_time=2), pool_size=1)
+        try:
+            page = Mock()
+            page.title.return_value = "Example"
+            result = await manager.execute_in_new_sandbox("result = page.title()", {'page': page})
+
+            assert result['result'] == "Example"
+            assert manager.get_pool_stats()['executions'] == 0
+        finally:
+            manager.cleanup_all()
+
+    def test_pool_disabled_by_default(self):
+        manager = SandboxManager()
+
+        assert manager.pool is None
+        assert manager.get_pool_stats() is None
+        assert manager.can_use_pool({}) is False
+
+
+class TestRecoveryWithPool:
+    """Test candidate validation through the pool"""
+
+    @pytest.mark.asyncio
+    async def test_candidates_validated_in_parallel(self):
+        manager = SandboxManager(SandboxConfig(max_execution_time=2), pool_size=2)
+        recovery = IntelligentErrorRecovery(sandbox_manager=manager)
+        try:
+            results = await recovery._test_candidates_in_sandbox(
+                ["result = 1", "result = missing_selector"], {'url': "https://example.com"}
+            )
+
+            assert results[0] == (True, None)
+            assert results[1][0] is False
+            assert 'missing_selector' in results[1][1]
+            assert manager.get_pool_stats()['executions'] == 2
+        finally:
+            manager.cleanup_all()
@@ -0,0 +1,162 @@
+"""Tests for screenshot change detection utilities."""
+
+import io
+from PIL import Image, ImageDraw
+
+from wyn360_cli.screenshot_utils import (
+    ScreenshotChangeDetector,
+    compute_signature,
+    frames_match,
+    hamming_distance,
+    estimate_image_tokens,
+    encode_for_vision,
+    detect_media_type,
+    get_image_size
+)
+
+
+def make_screenshot(text="", size=(1024, 768), box=None):
+    """Render a simple page-like PNG."""
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, size[0], 60], fill='navy')
+    draw.rectangle([100, 200, 500, 240], outline='gray')
+    if text:
+        draw.text((110, 210), text, fill='black')
+    if box:
+        draw.rectangle(box, fill='red')
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class TestSignatures:
+    """Test perceptual signatures."""
+
+    def test_identical_frames_match(self):
+        a = compute_signature(make_screenshot())
+        b = compute_signature(make_screenshot())
+
+        assert hamming_distance(a.dhash, b.dhash) == 0
+        assert frames_match(a, b)
+
+    def test_typed_text_is_a_change(self):
+        """Small edits like typed text must not be treated as unchanged."""
+        a = compute_signature(make_screenshot())
+        b = compute_signature(make_screenshot(text="running shoes size 10"))
+
+        assert not frames_match(a, b)
+
+    def test_large_change_detected(self):
+        a = compute_signature(make_screenshot())
+        b = compute_signature(make_screenshot(box=[0, 300, 1024, 768]))
+
+        assert not frames_match(a, b)
+
+    def test_different_sizes_do_not_match(self):
+        a = compute_signature(make_screenshot(size=(1024, 768)))
+        b = compute_signature(make_screenshot(size=(1280, 720)))
+
+        assert not frames_match(a, b)
+
+    def test_undecodable_bytes_have_no_signature(self):
+        assert compute_signature(b'screenshot') is None
+        assert compute_signature(b'') is None
+
+
+class TestScreenshotChangeDetector:
+    """Test the stateful change detector."""
+
+    def test_first_frame_is_changed(self):
+        detector = ScreenshotChangeDetector()
+        assert detector.has_changed(make_screenshot(), "https://example.com") is True
+
+    def test_unchanged_frame(self):
+        detector = ScreenshotChangeDetector()
+        detector.has_changed(make_screenshot(), "https://example.com")
+
+        assert detector.has_changed(make_screenshot(), "https://example.com") is False
+
+    def test_url_change_counts_as_changed(self):
+        detector = ScreenshotChangeDetector()
+        detector.has_changed(make_screenshot(), "https://example.com/a")
+
+        assert detector.has_changed(make_screenshot(), "https://example.com/b") is True
+
+    def test_undecodable_screenshot_is_changed(self):
+        detector = ScreenshotChangeDetector()
+        detector.has_changed(b'screenshot', "https://example.com")
+
+        assert detector.has_changed(b'screenshot', "https://example.com") is True
+
+    def test_reset_forgets_previous_frame(self):
+        detector = ScreenshotChangeDetector()
+        detector.has_changed(make_screenshot(), "https://example.com")
+        detector.reset()
+
+        assert detector.has_changed(make_screenshot(), "https://example.com") is True
+
+
+class TestTokenEstimate:
+    """Test vision token estimates."""
+
+    def test_tokens_scale_with_image_size(self):
+        small = estimate_image_tokens(make_screenshot(size=(512, 384)))
+        large = estimate_image_tokens(make_screenshot(size=(1024, 768)))
+
+        assert small == (512 * 384) // 750
+        assert large == (1024 * 768) // 750
+
+    def test_undecodable_uses_default_viewport(self):
+        assert estimate_image_tokens(b'screenshot') == (1024 * 768) // 750
+
+
+def make_busy_screenshot(size=(2048, 1536)):
+    """Render a text-heavy HiDPI-sized page, closer to real captures than flat fills."""
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, size[0], 120], fill='navy')
+    for row in range(0, size[1] - 160, 28):
+        draw.text((40, 160 + row), f"Result {row // 28}: product title, price $19.99, rating 4.5 stars", fill='black')
+        draw.rectangle([size[0] - 400, 160 + row, size[0] - 400 + (row * 7) % 300, 176 + row], fill='orange')
+    # Photo-like product image
+    image.paste(Image.effect_noise((480, 480), 40).convert('RGB'), (size[0] - 560, 200))
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class TestVisionEncoding:
+    """Test vision-sized screenshot encoding."""
+
+    def test_detect_media_type(self):
+        assert detect_media_type(make_screenshot()) == 'image/png'
+        assert detect_media_type(encode_for_vision(make_screenshot(size=(2048, 1536)))) == 'image/jpeg'
+        assert detect_media_type(b'screenshot') == 'image/png'
+
+    def test_downscales_to_fit_box(self):
+        encoded = encode_for_vision(make_screenshot(size=(2048, 1536)), max_size=(1024, 768))
+
+        assert get_image_size(encoded) == (1024, 768)
+
+    def test_preserves_aspect_ratio(self):
+        encoded = encode_for_vision(make_screenshot(size=(1920, 1080)), max_size=(1024, 768))
+
+        assert get_image_size(encoded) == (1024, 576)
+
+    def test_png_within_box_is_returned_unchanged(self):
+        original = make_screenshot(size=(800, 600))
+
+        assert encode_for_vision(original, image_format="png") is original
+
+    def test_undecodable_bytes_are_returned_unchanged(self):
+        assert encode_for_vision(b'screenshot') == b'screenshot'
+
+    def test_upload_bytes_and_tokens_benchmark(self):
+        """A 2x HiDPI PNG capture vs. the vision encoding of the same frame."""
+        raw = make_busy_screenshot()
+        encoded = encode_for_vision(raw, max_size=(1024, 768), quality=75)
+
+        assert len(encoded) < len(raw) * 0.25
+        assert estimate_image_tokens(encoded) < estimate_image_tokens(raw)
+        assert estimate_image_tokens(encoded) == (1024 * 768) // 750
@@ -0,0 +1,189 @@
+"""
+Unit tests for the trigram search index
+
+Tests cover:
+- Extracting required literals from regexes
+- Narrowing candidates and agreeing with the plain scan
+- Incremental updates from mtime/size changes (delta and merge)
+- Persistence under .wyn360/index/
+"""
+
+import os
+import time
+
+import pytest
+
+from wyn360_cli import search_index
+from wyn360_cli.code_search import search
+from wyn360_cli.search_index import TrigramIndex, file_trigrams, get_search_index, plan_query
+
+
+def _write(root, relative, text):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def _touch_later(path):
+    """Give a rewritten file a distinct mtime even on coarse file systems"""
+    stamp = time.time() + 5
+    os.utime(path, (stamp, stamp))
+
+
+@pytest.fixture
+def project(tmp_path):
+    _write(tmp_path, "app/models.py", "class User:\n    email = ''\n")
+    _write(tmp_path, "app/views.py", "def login(user):\n    return render('login.html')\n")
+    _write(tmp_path, "app/tasks.py", "def send_email(user):\n    pass\n")
+    _write(tmp_path, "README.md", "User guide\n")
+    return tmp_path
+
+
+class TestPlanQuery:
+    """Test literal extraction from regexes"""
+
+    def test_plain_literal(self):
+        assert plan_query("class User") == ('lit', b'class user')
+
+    def test_sequence_with_wildcards(self):
+        assert plan_query(r"def \w+_email\(") == ('and', [('lit', b'def '), ('lit', b'_email(')])
+
+    def test_alternation(self):
+        assert plan_query("login|signup") == ('or', [('lit', b'login'), ('lit', b'signup')])
+        # The parser factors out common prefixes
+        assert plan_query("login|logout") == ('lit', b'log')
+
+    def test_optional_parts_and_short_literals_are_dropped(self):
+        assert plan_query("ab(cdef)?") is None
+        assert plan_query(r"\w+") is None
+        assert plan_query("(foo|x)bar") == ('lit', b'bar')
+
+    def test_required_repeat_and_invalid_regex(self):
+        assert plan_query("(?:item)+s") == ('lit', b'item')
+        assert plan_query("total(1 + rate") == ('lit', b'total(1 + rate')
+
+    def test_trigrams_are_case_folded(self):
+        assert list(file_trigrams(b"ABCd")) == [
+            (ord('a') << 16) | (ord('b') << 8) | ord('c'),
+            (ord('b') << 16) | (ord('c') << 8) | ord('d'),
+        ]
+
+
+class TestCandidates:
+    """Test narrowing with a built index"""
+
+    def test_not_ready_or_unconstrained_returns_none(self, project):
+        index = TrigramIndex(str(project), persist=False)
+        assert index.candidates("User") is None
+
+        index.update()
+        assert index.candidates(r"\w+") is None
+
+    def test_narrows_to_matching_files(self, project):
+        index = TrigramIndex(str(project), persist=False)
+        index.update()
+
+        assert index.candidates("email") == ["app/models.py", "app/tasks.py"]
+        assert index.candidates("render|class") == ["app/models.py", "app/views.py"]
+        # The index is case-folded, so candidates are a superset for case-sensitive queries
+        assert index.candidates("User") == ["README.md", "app/models.py", "app/tasks.py", "app/views.py"]
+        assert index.candidates("nothing like this") == []
+
+    def test_results_match_plain_scan(self, project):
+        index = TrigramIndex(str(project), persist=False)
+        index.update()
+
+        for pattern in ["user", "def \\w+\\(user", "render\\('login", "class User"]:
+            plain = search(pattern, str(project))
+            narrowed = search(pattern, str(project), candidates=index.candidates(pattern))
+            assert [(m.path, m.line_number) for m in narrowed.matches] == \
+                   [(m.path, m.line_number) for m in plain.matches], pattern
+
+
+class TestIncrementalUpdates:
+    """Test mtime/size-driven updates"""
+
+    def test_changed_file_is_candidate_before_reindex(self, project):
+        index = TrigramIndex(str(project), persist=False)
+        index.update()
+
+        _touch_later(_write(project, "README.md", "Now mentions logout\n"))
+
+        assert "README.md" in index.candidates("logout")
+        index.wait()
+        assert index.candidates("logout") == ["README.md"]
+
+    def test_small_updates_use_delta_then_merge(self, project, monkeypatch):
+        index = TrigramIndex(str(project), persist=False)
+        index.update()
+        merges = index.stats['merges']
+
+        _write(project, "app/new.py", "def logout():\n    pass\n")
+        assert index.update() == 1
+        assert index.get_stats()['delta_files'] == 1
+        assert index.stats['merges'] == merges
+        assert index.candidates("logout") == ["app/new.py"]
+
+        monkeypatch.setattr(search_index, "DELTA_MERGE_FILES", 1)
+        _write(project, "app/other.py", "logout()\n")
+        index.update()
+
+        assert index.get_stats()['delta_files'] == 0
+        assert index.candidates("logout") == ["app/new.py", "app/other.py"]
+
+    def test_removed_and_rewritten_files_are_forgotten(self, project, monkeypatch):
+        monkeypatch.setattr(search_index, "DELTA_MERGE_FILES", 0)
+        index = TrigramIndex(str(project), persist=False)
+        index.update()
+
+        (project / "app/tasks.py").unlink()
+        _touch_later(_write(project, "app/models.py", "class Account:\n    pass\n"))
+        index.update()
+
+        assert index.candidates("email") == []
+        assert index.candidates("Account") == ["app/models.py"]
+        assert index.get_stats()['files'] == 3
+
+    def test_large_files_are_always_scanned(self, project, monkeypatch):
+        monkeypatch.setattr(search_index, "MAX_INDEXED_FILE_BYTES", 100)
+        _write(project, "big.txt", "x" * 200)
+        index = TrigramIndex(str(project), persist=False)
+        index.update()
+
+        assert "big.txt" in index.candidates("anything at all")
+
+
+class TestPersistence:
+    """Test the on-disk index"""
+
+    def test_reload_from_disk(self, project):
+        index = TrigramIndex(str(project))
+        index.update()
+        assert (project / ".wyn360" / "index" / "postings.npz").exists()
+        assert index.get_stats()['index_bytes'] > 0
+
+        reloaded = TrigramIndex(str(project))
+        assert reloaded.stats['loaded_from_disk']
+        assert reloaded.ready
+        assert reloaded.update() == 0
+        assert reloaded.candidates("email") == ["app/models.py", "app/tasks.py"]
+
+    def test_index_directory_is_not_indexed(self, project):
+        index = TrigramIndex(str(project))
+        index.update()
+        index.update()
+
+        assert not any(path.startswith(".wyn360") for path in index._stamps)
+
+    def test_shared_index_only_when_enabled(self, project):
+        assert get_search_index(str(project)) is None
+
+        search_index.configure_search_index(enabled=True)
+        try:
+            index = get_search_index(str(project))
+            index.wait()
+        finally:
+            search_index.configure_search_index(enabled=False)
+
+        assert index is not None and index.ready
@@ -0,0 +1,113 @@
+"""
+Benchmark for the trigram search index
+
+Builds a synthetic source tree, then compares search_files' plain scan
+with the index-narrowed scan: both must return the same matches, and the
+narrowed scan must be faster for selective patterns. Also reports index
+build time and size.
+
+Run directly for timings on a larger tree:
+    PYTHONPATH=. python tests/test_search_index_benchmark.py [files]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from wyn360_cli.code_search import search
+from wyn360_cli.search_index import TrigramIndex
+
+
+WORDS = [
+    "user", "account", "order", "invoice", "payment", "session", "cache", "token",
+    "request", "response", "handler", "config", "logger", "queue", "worker", "record",
+]
+
+QUERIES = [
+    "class InvoiceHandler42",          # one file
+    r"def refund_\w+\(",               # a few files
+    "TODO\\(perf\\)",                  # a few files
+    "import logging",                  # many files
+]
+
+
+def build_tree(root: Path, files: int, seed: int = 7) -> None:
+    """Write `files` Python-like modules of ~4KB with a few rare markers."""
+    rng = random.Random(seed)
+    for n in range(files):
+        lines = [f"import {rng.choice(WORDS)}", "import logging" if n % 3 == 0 else "import os", ""]
+        for _ in range(20):
+            name = "_".join(rng.sample(WORDS, 2))
+            lines += [f"def {name}_{rng.randrange(1000)}(value):",
+                      f"    {rng.choice(WORDS)} = value.{rng.choice(WORDS)}",
+                      f"    return {rng.choice(WORDS)}", ""]
+        if n % 500 == 42:
+            lines.append(f"class {rng.choice(WORDS).title()}Handler{n % 100}:\n    pass")
+        if n % 250 == 17:
+            lines.append(f"def refund_{rng.choice(WORDS)}(order):  # TODO(perf)\n    pass")
+        path = root / f"pkg{n % 20}" / f"module_{n}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(lines) + "\n")
+
+
+def time_query(root: str, pattern: str, index=None, repeat: int = 3) -> float:
+    """Best-of-n wall time for one search in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        candidates = index.candidates(pattern) if index is not None else None
+        search(pattern, root, max_results=1000, candidates=candidates)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+class TestSearchIndexBenchmark:
+    """Parity and speed of index-narrowed search"""
+
+    def test_narrowed_search_matches_plain_scan(self, tmp_path):
+        build_tree(tmp_path, 600)
+        index = TrigramIndex(str(tmp_path), persist=False)
+        index.update()
+
+        for pattern in QUERIES:
+            plain = search(pattern, str(tmp_path), max_results=1000)
+            narrowed = search(pattern, str(tmp_path), max_results=1000, candidates=index.candidates(pattern))
+            assert [(m.path, m.line_number) for m in narrowed.matches] == \
+                   [(m.path, m.line_number) for m in plain.matches], pattern
+
+    def test_selective_query_is_faster_with_index(self, tmp_path):
+        build_tree(tmp_path, 1500)
+        index = TrigramIndex(str(tmp_path), persist=False)
+        index.update()
+
+        plain = time_query(str(tmp_path), QUERIES[0])
+        narrowed = time_query(str(tmp_path), QUERIES[0], index)
+
+        assert len(index.candidates(QUERIES[0])) <= 5
+        assert narrowed < plain
+
+
+if __name__ == "__main__":
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        build_tree(root, files)
+        corpus_mb = sum(p.stat().st_size for p in root.rglob("*.py")) / 1e6
+
+        index = TrigramIndex(directory)
+        start = time.perf_counter()
+        index.update()
+        build = time.perf_counter() - start
+        stats = index.get_stats()
+
+        print(f"{files} files, {corpus_mb:.1f} MB")
+        print(f"  index build: {build:8.2f} s, {stats['index_bytes'] / 1e6:.1f} MB on disk, "
+              f"{stats['trigrams']} trigrams, {stats['postings']} postings")
+        print(f"  {'query':28s} {'plain ms':>10s} {'index ms':>10s} {'speedup':>8s} {'candidates':>11s}")
+        for pattern in QUERIES:
+            plain = time_query(directory, pattern)
+            narrowed = time_query(directory, pattern, index)
+            print(f"  {pattern:28s} {plain:10.1f} {narrowed:10.1f} {plain / narrowed:7.1f}x "
+                  f"{len(index.candidates(pattern)):11d}")
@@ -8,12 +8,14 @@ action generation, and integration with the DOM automation system.
 import pytest
 import os
 import asyncio
+import time
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from src.wyn360.tools.browser.stagehand_generator import (
     StagehandCodeGenerator,
     StagehandAvailability,
     StagehandPattern,
-    StagehandExecutionResult
+    StagehandExecutionResult,
+    PatternStore
 )
 
 
@@ -452,5 +454,245 @@ class TestStagehandCodeGenerator:
         assert generator.current_page is None
 
 
+def make_available_generator(pattern_store=None):
+    """Create a generator that behaves as if Stagehand were configured"""
+    generator = StagehandCodeGenerator(pattern_store=pattern_store)
+    generator.availability_status = StagehandAvailability.AVAILABLE
+    generator.is_configured = True
+    return generator
+
+
+DOM_CONTEXT = """Page: Results for shoes (120 items)
+URL: https://shop.example.com/search?q=shoes
+
+INTERACTIVE ELEMENTS:
+1. BUTTON: 'Add to cart'
+   ID: add-to-cart
+   Confidence: 0.91
+   Selector: #add-to-cart
+"""
+
+
+class TestPatternStore:
+    """Test the persistent, domain-aware pattern store"""
+
+    def test_patterns_persist_and_load_lazily(self, tmp_path):
+        """Test patterns survive a new store instance and are only read on access"""
+        path = tmp_path / "patterns.json"
+        store = PatternStore(path)
+        store.put(StagehandPattern("p1", "click", [{"type": "act"}], domain="example.com"))
+        store.flush()
+
+        reloaded = PatternStore(path)
+        assert reloaded._loaded is False
+
+        assert reloaded.patterns["p1"].domain == "example.com"
+        assert reloaded.patterns["p1"].stagehand_actions == [{"type": "act"}]
+
+    def test_corrupt_file_starts_empty(self, tmp_path):
+        """Test an unreadable store file is ignored"""
+        path = tmp_path / "patterns.json"
+        path.write_text("{not json")
+
+        assert PatternStore(path).patterns == {}
+
+    def test_eviction_prefers_failing_and_stale_patterns(self, tmp_path):
+        """Test the lowest success-rate x recency pattern is evicted first"""
+        store = PatternStore(tmp_path / "patterns.json", max_patterns=2)
+        now = time.time()
+        reliable = StagehandPattern("reliable", "", [], success_count=9, failure_count=1, last_used=now)
+        failing = StagehandPattern("failing", "", [], success_count=1, failure_count=9, last_used=now)
+        store.put(reliable)
+        store.put(failing)
+
+        evicted = store.put(StagehandPattern("new", "", []))
+
+        assert evicted == ["failing"]
+        assert set(store.patterns) == {"reliable", "new"}
+        assert store.evictions == 1
+
+    def test_writes_are_batched(self, tmp_path):
+        """Test the file is rewritten once per flush_every changes, and on flush()"""
+        path = tmp_path / "patterns.json"
+        store = PatternStore(path, flush_every=3, flush_interval=3600)
+
+        with patch.object(store, 'save', wraps=store.save) as save:
+            for i in range(7):
+                store.put(StagehandPattern(f"p{i}", "", []))
+            assert save.call_count == 2
+
+            store.flush()
+            store.flush()  # Nothing pending
+            assert save.call_count == 3
+
+        assert set(PatternStore(path).patterns) == {f"p{i}" for i in range(7)}
+
+    def test_pending_writes_flushed_after_interval(self, tmp_path):
+        """Test a change after flush_interval seconds is written straight away"""
+        path = tmp_path / "patterns.json"
+        store = PatternStore(path, flush_every=100, flush_interval=0)
+
+        store.put(StagehandPattern("p1", "", []))
+
+        assert "p1" in PatternStore(path).patterns
+
+    def test_recency_decays_score(self):
+        """Test an unused pattern scores lower than a recently used one"""
+        store = PatternStore(recency_half_life=3600)
+        now = time.time()
+        recent = StagehandPattern("a", "", [], success_count=5, last_used=now)
+        stale = StagehandPattern("b", "", [], success_count=5, last_used=now - 7200)
+
+        assert store.score(stale, now) == pytest.approx(store.score(recent, now) / 4)
+
+
+class TestDomainAwarePatterns:
+    """Test pattern keys, reuse, and statistics"""
+
+    def test_pattern_key_is_domain_aware(self):
+        """Test the same action on different sites gets different keys"""
+        generator = StagehandCodeGenerator()
+
+        key_a = generator._generate_pattern_key("Buy", "click", "cart", url="https://www.shop.com/a")
+        key_b = generator._generate_pattern_key("Buy", "click", "cart", url="https://shop.com/b")
+        key_c = generator._generate_pattern_key("Buy", "click", "cart", url="https://other.com/a")
+
+        assert key_a == key_b  # www. and path are ignored
+        assert key_a != key_c
+
+    def test_structure_hash_ignores_volatile_content(self):
+        """Test titles, counts, and confidence do not change the structure hash"""
+        changed = DOM_CONTEXT.replace("120 items", "87 items").replace("0.91", "0.74")
+        different = DOM_CONTEXT.replace("add-to-cart", "buy-now")
+
+        assert StagehandCodeGenerator._structure_hash(DOM_CONTEXT) == StagehandCodeGenerator._structure_hash(changed)
+        assert StagehandCodeGenerator._structure_hash(DOM_CONTEXT) != StagehandCodeGenerator._structure_hash(different)
+
+    def test_structure_hash_for_html(self):
+        """Test HTML structure is hashed by tags and attribute names"""
+        a = StagehandCodeGenerator._structure_hash('<button id="b1">Buy</button>')
+        b = StagehandCodeGenerator._structure_hash('<button id="b2">Add</button>')
+
+        assert a == b
+
+    @pytest.mark.asyncio
+    async def test_cached_pattern_skips_generation(self, tmp_path):
+        """Test a repeat task in a new session reuses the persisted pattern"""
+        path = tmp_path / "patterns.json"
+        request = dict(
+            url="https://shop.example.com/search?q=boots",
+            task_description="Add item to cart",
+            dom_context=DOM_CONTEXT,
+            target_description="add to cart button",
+            action_type="click"
+        )
+
+        first = make_available_generator(PatternStore(path))
+        success, actions = await first.generate_stagehand_code(**request)
+        assert success is True
+        await first.close()  # End of session writes pending patterns
+
+        second = make_available_generator(PatternStore(path))
+        second._generate_new_actions = AsyncMock()
+        success, cached_actions = await second.generate_stagehand_code(**request)
+
+        assert success is True
+        assert cached_actions == actions
+        second._generate_new_actions.assert_not_called()
+        assert second.get_pattern_statistics()["store"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unreliable_pattern_is_regenerated(self):
+        """Test a pattern that keeps failing is not reused"""
+        generator = make_available_generator()
+        request = dict(
+            url="https://shop.example.com",
+            task_description="Add item to cart",
+            dom_context=DOM_CONTEXT,
+            target_description="add to cart button",
+            action_type="click"
+        )
+        await generator.generate_stagehand_code(**request)
+        key = next(iter(generator.pattern_cache))
+        for _ in range(3):
+            generator.update_pattern_success(key, False)
+
+        generator._generate_new_actions = AsyncMock(return_value=[{"type": "act"}])
+        success, actions = await generator.generate_stagehand_code(**request)
+
+        assert actions == [{"type": "act"}]
+        generator._generate_new_actions.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_execution_reports_cached_pattern(self):
+        """Test executing a matched pattern's actions reports the pattern for learning"""
+        generator = make_available_generator()
+        success, pattern = await generator.get_or_generate_pattern(
+            url="https://shop.example.com",
+            task_description="Add item to cart",
+            dom_context=DOM_CONTEXT,
+            target_description="add to cart button",
+            action_type="click"
+        )
+
+        result = await generator.execute_stagehand_actions(
+            "https://shop.example.com", pattern.stagehand_actions, pattern_id=pattern.pattern_id
+        )
+
+        assert result.pattern_used is generator.pattern_cache[pattern.pattern_id]
+
+    @pytest.mark.asyncio
+    async def test_execution_without_pattern_id_reports_none(self):
+        """Test ad-hoc actions are not attributed to a cached pattern"""
+        generator = make_available_generator()
+        success, actions = await generator.generate_stagehand_code(
+            url="https://shop.example.com",
+            task_description="Add item to cart",
+            dom_context=DOM_CONTEXT,
+            target_description="add to cart button",
+            action_type="click"
+        )
+
+        result = await generator.execute_stagehand_actions("https://shop.example.com", actions)
+
+        assert result.pattern_used is None
+
+    @pytest.mark.asyncio
+    async def test_failed_execution_reports_cached_pattern(self):
+        """Test a failing execution still reports its pattern, so failures are counted"""
+        generator = make_available_generator()
+        success, pattern = await generator.get_or_generate_pattern(
+            url="https://shop.example.com",
+            task_description="Add item to cart",
+            dom_context=DOM_CONTEXT,
+            target_description="add to cart button",
+            action_type="click"
+        )
+
+        with patch('asyncio.sleep', side_effect=Exception("Element detached")):
+            result = await generator.execute_stagehand_actions(
+                "https://shop.example.com", pattern.stagehand_actions, pattern_id=pattern.pattern_id
+            )
+
+        assert result.success is False
+        assert result.pattern_used is pattern
+
+        generator.update_pattern_success(result.pattern_used.pattern_id, result.success)
+        assert pattern.failure_count == 1
+
+    def test_statistics_include_domains_and_store(self, tmp_path):
+        """Test get_pattern_statistics exposes per-domain counts and store stats"""
+        generator = StagehandCodeGenerator(pattern_store=PatternStore(tmp_path / "patterns.json"))
+        generator.pattern_store.put(StagehandPattern("p1", "", [], domain="shop.com"))
+        generator.pattern_store.put(StagehandPattern("p2", "", [], domain="shop.com"))
+
+        stats = generator.get_pattern_statistics()
+
+        assert stats["total_patterns"] == 2
+        assert stats["domains"] == {"shop.com": 2}
+        assert stats["store"]["persistent"] is True
+        assert stats["store"]["evictions"] == 0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -24,6 +24,11 @@ from src.wyn360.tools.browser.stagehand_generator import (
 )
 
 
+def make_pattern(actions, pattern_id="generated"):
+    """Create a pattern as returned by get_or_generate_pattern()"""
+    return StagehandPattern(pattern_id=pattern_id, description="Generated", stagehand_actions=actions)
+
+
 class TestStagehandExecutionPipeline:
     """Test StagehandExecutionPipeline configuration"""
 
@@ -67,7 +72,7 @@ class TestStagehandIntegration:
         """Create mock stagehand generator"""
         generator = Mock()
         generator.is_available.return_value = True
-        generator.generate_stagehand_code = AsyncMock()
+        generator.get_or_generate_pattern = AsyncMock()
         generator.execute_stagehand_actions = AsyncMock()
         generator.update_pattern_success = Mock()
         generator.get_pattern_statistics.return_value = {"total_patterns": 0}
@@ -137,7 +142,7 @@ class TestStagehandIntegration:
     @pytest.mark.asyncio
     async def test_execute_code_generation_failure(self, integration, sample_action_request, sample_dom_analysis):
         """Test execution when code generation fails"""
-        integration.stagehand_generator.generate_stagehand_code = AsyncMock(
+        integration.stagehand_generator.get_or_generate_pattern = AsyncMock(
             return_value=(False, "Generation failed")
         )
 
@@ -158,8 +163,8 @@ class TestStagehandIntegration:
             {"type": "observe", "description": "Find login button"},
             {"type": "act", "description": "Click login button"}
         ]
-        integration.stagehand_generator.generate_stagehand_code = AsyncMock(
-            return_value=(True, test_actions)
+        integration.stagehand_generator.get_or_generate_pattern = AsyncMock(
+            return_value=(True, make_pattern(test_actions))
         )
 
         # Mock successful execution
@@ -207,8 +212,8 @@ class TestStagehandIntegration:
             result_data={"status": "completed"}
         )
 
-        integration.stagehand_generator.generate_stagehand_code = AsyncMock(
-            return_value=(True, test_pattern.stagehand_actions)
+        integration.stagehand_generator.get_or_generate_pattern = AsyncMock(
+            return_value=(True, test_pattern)
         )
         integration.stagehand_generator.execute_stagehand_actions = AsyncMock(
             return_value=execution_result
@@ -220,6 +225,8 @@ class TestStagehandIntegration:
 
         assert result.success is True
         assert result.confidence > 0.8  # Should be high due to pattern success rate
+        # The pattern's id is passed through so execution can report it
+        assert integration.stagehand_generator.execute_stagehand_actions.call_args.kwargs['pattern_id'] == "test_pattern"
         # Verify pattern success was updated
         integration.stagehand_generator.update_pattern_success.assert_called_once_with(
             "test_pattern", True
@@ -229,8 +236,8 @@ class TestStagehandIntegration:
     async def test_execute_with_retries_eventual_success(self, integration, sample_action_request, sample_dom_analysis):
         """Test execution with retries that eventually succeeds"""
         test_actions = [{"type": "act", "description": "click"}]
-        integration.stagehand_generator.generate_stagehand_code = AsyncMock(
-            return_value=(True, test_actions)
+        integration.stagehand_generator.get_or_generate_pattern = AsyncMock(
+            return_value=(True, make_pattern(test_actions))
         )
 
         # First two attempts fail, third succeeds
@@ -270,8 +277,8 @@ class TestStagehandIntegration:
     async def test_execute_all_retries_fail(self, integration, sample_action_request, sample_dom_analysis):
         """Test execution when all retries fail"""
         test_actions = [{"type": "act", "description": "click"}]
-        integration.stagehand_generator.generate_stagehand_code = AsyncMock(
-            return_value=(True, test_actions)
+        integration.stagehand_generator.get_or_generate_pattern = AsyncMock(
+            return_value=(True, make_pattern(test_actions))
         )
 
         # All attempts fail
@@ -303,8 +310,8 @@ class TestStagehandIntegration:
     async def test_execute_timeout_error(self, integration, sample_action_request, sample_dom_analysis):
         """Test execution timeout handling"""
         test_actions = [{"type": "act", "description": "slow_action"}]
-        integration.stagehand_generator.generate_stagehand_code = AsyncMock(
-            return_value=(True, test_actions)
+        integration.stagehand_generator.get_or_generate_pattern = AsyncMock(
+            return_value=(True, make_pattern(test_actions))
         )
 
         # Mock a slow execution that times out
@@ -0,0 +1,224 @@
+"""
+Unit tests for the Python symbol index
+
+Tests cover:
+- Extracting definitions, imports and references from source
+- find_definition / find_references / outline queries
+- Content-hash caching and incremental updates after writes, moves and deletes
+- Parsing large batches in a process pool
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from wyn360_cli import symbol_index
+from wyn360_cli.symbol_index import SymbolIndex, get_symbol_index, parse_symbols, update_symbol_index
+
+
+MODELS = '''\
+import os
+from typing import List as Seq
+
+
+class Base:
+    registry = {}
+
+
+@dataclass
+class User(Base):
+    name: str = ""
+
+    def save(self, force=False) -> bool:
+        audit("save")
+        return os.path.exists(self.name)
+
+    async def load(cls):
+        pass
+
+
+def create_user(name):
+    user = User(name)
+    user.save()
+    return user
+'''
+
+VIEWS = '''\
+from .models import User, create_user
+
+
+def signup(request):
+    create_user(request.name).save(force=True)
+    User().save()
+'''
+
+
+def _write(root, relative, text):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def _touch_later(path):
+    stamp = time.time() + 5
+    os.utime(path, (stamp, stamp))
+
+
+@pytest.fixture
+def project(tmp_path):
+    _write(tmp_path, "app/models.py", MODELS)
+    _write(tmp_path, "app/views.py", VIEWS)
+    _write(tmp_path, "notes.txt", "def not_python(): pass\n")
+    return tmp_path
+
+
+class TestParseSymbols:
+    """Test what is extracted from one file"""
+
+    def test_definitions(self):
+        symbols = parse_symbols(MODELS.encode())
+
+        found = [(d.qualname, d.kind, d.line) for d in symbols.definitions]
+        assert found == [
+            ("Base", "class", 5), ("Base.registry", "attribute", 6), ("User", "class", 10),
+            ("User.name", "attribute", 11), ("User.save", "method", 13), ("User.load", "method", 17),
+            ("create_user", "function", 21),
+        ]
+        save = symbols.definitions[4]
+        assert save.signature == "def save(self, force=False) -> bool"
+        assert save.end_line == 15
+        assert symbols.definitions[5].signature == "async def load(cls)"
+
+    def test_imports_and_references(self):
+        symbols = parse_symbols(MODELS.encode())
+
+        assert [(i.module, i.name, i.alias) for i in symbols.imports] == [("os", "", "os"), ("typing", "List", "Seq")]
+        references = {(r.text, r.kind) for r in symbols.references}
+        assert {("Base", "base"), ("dataclass", "decorator"), ("audit", "call"),
+                ("os.path.exists", "call"), ("User", "call"), ("user.save", "call")} <= references
+
+    def test_call_on_expression_keeps_attribute(self):
+        symbols = parse_symbols(VIEWS.encode())
+
+        assert ("….save", "save") in {(r.text, r.name) for r in symbols.references}
+
+    def test_syntax_error(self):
+        symbols = parse_symbols(b"def broken(:\n")
+
+        assert symbols.error.startswith("SyntaxError")
+        assert symbols.definitions == []
+
+
+class TestQueries:
+    """Test lookups on a built index"""
+
+    def test_find_definition(self, project):
+        index = SymbolIndex(str(project))
+        index.refresh()
+
+        assert [(p, d.qualname) for p, d in index.find_definition("save")] == [("app/models.py", "User.save")]
+        assert index.find_definition("User.save")[0][1].line == 13
+        assert index.find_definition("Other.save") == []
+        assert index.find_definition("not_python") == []
+
+    def test_find_references(self, project):
+        index = SymbolIndex(str(project))
+        index.refresh()
+
+        references = [(path, ref.line) for path, ref in index.find_references("User")]
+        assert references == [("app/models.py", 22), ("app/views.py", 1), ("app/views.py", 6)]
+        assert len(index.find_references("save")) == 3
+
+    def test_outline(self, project):
+        index = SymbolIndex(str(project))
+        index.refresh()
+
+        symbols = index.outline(str(project / "app/views.py"))
+        assert [d.name for d in symbols.definitions] == ["signup"]
+        assert index.outline(str(project / "notes.txt")) is None
+
+
+class TestIncrementalUpdates:
+    """Test refreshes, hash caching and explicit updates"""
+
+    def test_refresh_reparses_only_changed_files(self, project):
+        index = SymbolIndex(str(project))
+        index.refresh()
+        parsed = index.stats['files_parsed']
+
+        assert index.refresh() == 0
+        _touch_later(_write(project, "app/views.py", VIEWS + "\ndef logout():\n    pass\n"))
+        assert index.refresh() == 1
+
+        assert index.stats['files_parsed'] == parsed + 1
+        assert index.find_definition("logout")
+
+    def test_same_content_is_not_parsed_again(self, project):
+        index = SymbolIndex(str(project))
+        index.refresh()
+        parsed = index.stats['files_parsed']
+
+        _write(project, "app/copy.py", MODELS)
+        _touch_later(project / "app/models.py")
+        index.refresh()
+
+        assert index.stats['files_parsed'] == parsed
+        assert index.stats['hash_hits'] == 2
+        assert [p for p, _ in index.find_definition("create_user")] == ["app/copy.py", "app/models.py"]
+
+    def test_update_after_write_move_and_delete(self, project, monkeypatch):
+        monkeypatch.chdir(project)
+        index = get_symbol_index(str(project))
+
+        _write(project, "app/tasks.py", "def send_email():\n    pass\n")
+        update_symbol_index(["app/tasks.py"], str(project))
+        assert index.find_definition("send_email")[0][0] == "app/tasks.py"
+
+        os.rename(project / "app/tasks.py", project / "app/jobs.py")
+        update_symbol_index(["app/tasks.py", "app/jobs.py"], str(project))
+        assert index.find_definition("send_email")[0][0] == "app/jobs.py"
+
+        (project / "app/jobs.py").unlink()
+        update_symbol_index(["app/jobs.py"], str(project))
+        assert index.find_definition("send_email") == []
+
+    def test_update_without_index_is_a_no_op(self, tmp_path):
+        update_symbol_index(["missing.py"], str(tmp_path))
+
+
+class TestParallelParsing:
+    """Test the process pool path"""
+
+    def test_large_batch_is_parsed_in_batches(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(symbol_index, "PARALLEL_MIN_FILES", 4)
+        monkeypatch.setattr(symbol_index, "PARALLEL_CHUNK_FILES", 2)
+        # Starting worker processes takes seconds; threads run the same batches
+        monkeypatch.setattr(
+            symbol_index, "ProcessPoolExecutor",
+            lambda max_workers, mp_context: ThreadPoolExecutor(max_workers=max_workers)
+        )
+        for n in range(6):
+            _write(tmp_path, f"pkg/mod{n}.py", f"def func_{n}():\n    return {n}\n")
+
+        index = SymbolIndex(str(tmp_path), workers=2)
+        index.refresh()
+
+        assert index.stats['parallel_batches'] == 3
+        assert index.stats['files_parsed'] == 6
+        assert [p for p, _ in index.find_definition("func_5")] == ["pkg/mod5.py"]
+
+    @pytest.mark.slow
+    def test_large_batch_uses_process_pool(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(symbol_index, "PARALLEL_MIN_FILES", 4)
+        monkeypatch.setattr(symbol_index, "PARALLEL_CHUNK_FILES", 2)
+        for n in range(6):
+            _write(tmp_path, f"pkg/mod{n}.py", f"def func_{n}():\n    return {n}\n")
+
+        index = SymbolIndex(str(tmp_path), workers=2)
+        index.refresh()
+
+        assert index.stats['parallel_batches'] == 3
+        assert [p for p, _ in index.find_definition("func_5")] == ["pkg/mod5.py"]
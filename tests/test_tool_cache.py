@@ -0,0 +1,224 @@
+"""
+Unit tests for the read-only tool result cache
+
+Tests cover:
+- Reuse keyed on arguments and file mtime/size, racy files not cached
+- Tree-wide results expiring and being dropped by invalidate()
+- Agent tools that change files or git state invalidating the cache
+- "Unchanged" markers for repeats within a turn
+- Failures never cached, per-tool hit rates
+- Wrapped tools keeping their name, signature and docstring
+"""
+
+import inspect
+import os
+import time
+
+import pytest
+
+from wyn360_cli.tool_cache import ToolResultCache
+
+
+class FakeTools:
+    """Stand-in for the agent's tool methods"""
+
+    def __init__(self):
+        self.calls = 0
+        self.listing = "a.py"
+
+    async def read_file(self, ctx, file_path: str, start_line: int = None) -> str:
+        """Read a file."""
+        self.calls += 1
+        with open(file_path) as f:
+            return f"Contents of {file_path}:\n\n{f.read()}"
+
+    async def list_files(self, ctx, directory: str = ".") -> str:
+        self.calls += 1
+        return self.listing
+
+
+def _age(path, seconds=10):
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "app.py"
+    path.write_text("print('hello')\n")
+    _age(path)
+    return path
+
+
+class TestFileKeyedTools:
+    """Test tools keyed on file stamps"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_call_is_served_from_cache(self, source):
+        tools, cache = FakeTools(), ToolResultCache(unchanged_marker=False)
+        read_file = cache.memoize(tools.read_file, paths=lambda args: [args["file_path"]])
+
+        first = await read_file(None, str(source))
+        second = await read_file(None, file_path=str(source))
+
+        assert first == second
+        assert tools.calls == 1
+        assert cache.get_stats()["read_file"] == {"hits": 1, "misses": 1, "unchanged": 0, "hit_rate": 50.0}
+
+    @pytest.mark.asyncio
+    async def test_different_arguments_are_separate_entries(self, source):
+        tools, cache = FakeTools(), ToolResultCache()
+        read_file = cache.memoize(tools.read_file, paths=lambda args: [args["file_path"]])
+
+        await read_file(None, str(source))
+        await read_file(None, str(source), start_line=5)
+
+        assert tools.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_modified_file_is_read_again(self, source):
+        tools, cache = FakeTools(), ToolResultCache()
+        read_file = cache.memoize(tools.read_file, paths=lambda args: [args["file_path"]])
+        await read_file(None, str(source))
+
+        source.write_text("print('changed')\n")
+        _age(source, 5)
+
+        assert "changed" in await read_file(None, str(source))
+        assert tools.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_recently_modified_file_is_not_cached(self, source):
+        tools, cache = FakeTools(), ToolResultCache()
+        read_file = cache.memoize(tools.read_file, paths=lambda args: [args["file_path"]])
+        source.write_text("print('just written')\n")
+
+        await read_file(None, str(source))
+        await read_file(None, str(source))
+
+        assert tools.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self, tmp_path):
+        tools, cache = FakeTools(), ToolResultCache()
+
+        async def failing(ctx, file_path: str) -> str:
+            tools.calls += 1
+            return "Error: File not found"
+
+        wrapped = cache.memoize(failing, paths=lambda args: [args["file_path"]])
+        await wrapped(None, str(tmp_path / "missing.py"))
+        await wrapped(None, str(tmp_path / "missing.py"))
+
+        assert tools.calls == 2
+
+
+class TestTreeWideTools:
+    """Test TTL and explicit invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_results(self):
+        tools, cache = FakeTools(), ToolResultCache(unchanged_marker=False)
+        list_files = cache.memoize(tools.list_files, ttl=60)
+        await list_files(None)
+        await list_files(None)
+        assert tools.calls == 1
+
+        tools.listing = "a.py\nb.py"
+        cache.invalidate()
+
+        assert await list_files(None) == "a.py\nb.py"
+
+    @pytest.mark.asyncio
+    async def test_results_expire(self):
+        tools, cache = FakeTools(), ToolResultCache()
+        list_files = cache.memoize(tools.list_files, ttl=0)
+
+        await list_files(None)
+        await list_files(None)
+
+        assert tools.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_agent_git_and_generator_tools_invalidate(self, tmp_path, monkeypatch):
+        """Tools that change files or git state drop cached listings"""
+        from types import SimpleNamespace
+        from unittest.mock import patch
+        from wyn360_cli.agent import WYN360Agent
+
+        monkeypatch.chdir(tmp_path)
+        tools, cache = FakeTools(), ToolResultCache(unchanged_marker=False)
+        list_files = cache.memoize(tools.list_files, ttl=60)
+        agent = SimpleNamespace(tool_cache=cache)
+        git_outputs = {"git branch --show-current": "main"}
+
+        def fake_git(cmd, timeout=None):
+            return True, git_outputs.get(cmd, ""), 0
+
+        with patch("wyn360_cli.utils.execute_command_safe", side_effect=fake_git), \
+             patch("wyn360_cli.agent.invalidate_git_cache") as invalidate_git:
+            for run_tool in (
+                lambda: WYN360Agent.gh_checkout_branch(agent, None, "feature"),
+                lambda: WYN360Agent.gh_merge_branch(agent, None, "feature"),
+                lambda: WYN360Agent.create_hf_readme(agent, None, "Echo Bot"),
+            ):
+                await list_files(None)
+                await run_tool()
+                await list_files(None)
+
+        assert tools.calls == 4  # one initial listing, then one per tool run
+        assert invalidate_git.call_count == 3
+        assert (tmp_path / "README.md").exists()
+
+
+class TestUnchangedMarker:
+    """Test repeats within and across turns"""
+
+    @pytest.mark.asyncio
+    async def test_marker_within_turn_full_result_next_turn(self, source):
+        tools, cache = FakeTools(), ToolResultCache()
+        read_file = cache.memoize(tools.read_file, paths=lambda args: [args["file_path"]])
+        cache.start_turn()
+
+        first = await read_file(None, str(source))
+        repeat = await read_file(None, str(source))
+        cache.start_turn()
+        next_turn = await read_file(None, str(source))
+
+        assert repeat.startswith("[read_file: unchanged since the previous call")
+        assert next_turn == first
+        assert cache.stats["read_file"]["unchanged"] == 1
+
+    @pytest.mark.asyncio
+    async def test_identical_output_after_touch_is_a_repeat(self, source):
+        tools, cache = FakeTools(), ToolResultCache()
+        read_file = cache.memoize(tools.read_file, paths=lambda args: [args["file_path"]])
+        await read_file(None, str(source))
+
+        _age(source, 5)
+        repeat = await read_file(None, str(source))
+
+        assert tools.calls == 2
+        assert repeat.startswith("[read_file: unchanged")
+
+
+class TestWrapping:
+    """Test what the agent framework sees"""
+
+    def test_wrapper_keeps_tool_metadata(self):
+        tools = FakeTools()
+        wrapped = ToolResultCache().memoize(tools.read_file, paths=lambda args: [args["file_path"]])
+
+        assert wrapped.__name__ == "read_file"
+        assert wrapped.__doc__ == "Read a file."
+        assert list(inspect.signature(wrapped).parameters) == ["ctx", "file_path", "start_line"]
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self, source):
+        tools, cache = FakeTools(), ToolResultCache(max_entries=2)
+        read_file = cache.memoize(tools.read_file, paths=lambda args: [args["file_path"]])
+
+        for start in range(3):
+            await read_file(None, str(source), start_line=start)
+
+        assert len(cache._entries) == 2
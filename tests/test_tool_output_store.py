@@ -0,0 +1,116 @@
+"""
+Unit tests for out-of-band tool output storage
+
+Tests cover:
+- Replacing large tool returns older than max_age_turns with stubs
+- Leaving recent, small and non-text returns alone
+- Content-hash handles, retention pruning and recall by range or pattern
+"""
+
+import os
+import time
+
+import pytest
+
+from pydantic_ai.messages import (
+    ModelRequest, ModelResponse, TextPart, ToolCallPart, ToolReturnPart, UserPromptPart
+)
+
+from wyn360_cli import tool_output_store
+from wyn360_cli.tool_output_store import STUB_PREFIX, ToolOutputStore, history_tokens
+
+
+def _turn(prompt, tool_output, tool_name="read_file", call_id="call"):
+    """One user turn: prompt, a tool call, its return and a final answer"""
+    return [
+        ModelRequest(parts=[UserPromptPart(content=prompt)]),
+        ModelResponse(parts=[ToolCallPart(tool_name=tool_name, args={"file_path": "x"}, tool_call_id=call_id)]),
+        ModelRequest(parts=[ToolReturnPart(tool_name=tool_name, content=tool_output, tool_call_id=call_id)]),
+        ModelResponse(parts=[TextPart(content="Done.")]),
+    ]
+
+
+def _big(label, lines=3000):
+    return "".join(f"{label} line {n}\n" for n in range(1, lines + 1))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ToolOutputStore(tmp_path / "outputs", min_tokens=1000, max_age_turns=2)
+
+
+def _tool_returns(messages):
+    return [part.content for message in messages for part in message.parts if part.part_kind == "tool-return"]
+
+
+class TestOffload:
+    """Test which tool returns are replaced"""
+
+    def test_old_large_returns_are_stubbed(self, store):
+        messages = _turn("first", _big("alpha"), call_id="a") + _turn("second", _big("beta"), call_id="b") \
+            + _turn("third", _big("gamma"), call_id="c")
+
+        offloaded = store.offload(messages)
+
+        returns = _tool_returns(offloaded)
+        assert returns[0].startswith(STUB_PREFIX)
+        assert "tool=read_file" in returns[0] and "3000 lines" in returns[0]
+        assert "Summary: alpha line 1 | alpha line 2 | alpha line 3" in returns[0]
+        assert returns[1:] == [_big("beta"), _big("gamma")]
+        assert offloaded[2].parts[0].tool_call_id == "a"
+        assert _tool_returns(messages)[0] == _big("alpha")  # input list is not modified
+        assert history_tokens(messages) - history_tokens(offloaded) > 7000
+
+    def test_nothing_to_do_returns_same_list(self, store):
+        messages = _turn("first", "small result") + _turn("second", _big("beta")) + _turn("third", "ok")
+
+        assert store.offload(messages) is messages
+        assert store.stats["stored"] == 0
+
+    def test_stubs_are_not_stored_again(self, store):
+        messages = _turn("first", _big("alpha")) + _turn("second", "x") + _turn("third", "y")
+        once = store.offload(messages)
+        again = store.offload(once + _turn("fourth", "z"))
+
+        assert _tool_returns(again)[0] == _tool_returns(once)[0]
+        assert store.stats["stored"] == 1
+
+    def test_max_age_zero_offloads_current_turn(self, tmp_path):
+        store = ToolOutputStore(tmp_path, min_tokens=1000, max_age_turns=0)
+
+        assert _tool_returns(store.offload(_turn("only", _big("alpha"))))[0].startswith(STUB_PREFIX)
+
+
+class TestStorage:
+    """Test payload files and recall"""
+
+    def test_same_content_shares_a_handle(self, store):
+        first = store.store(_big("alpha"))
+
+        assert store.store(_big("alpha")) == first
+        assert len(list(store.directory.glob("*.txt"))) == 1
+
+    def test_recall_range_and_pattern(self, store):
+        handle = store.store(_big("alpha"))
+
+        result, _ = store.recall(handle, 10, 12)
+        assert result.text == " 10| alpha line 10\n 11| alpha line 11\n 12| alpha line 12"
+
+        result, shown = store.recall(handle, pattern=r"line 2999$")
+        assert shown == 1
+        assert ">2999| alpha line 2999" in result.text
+
+    def test_unknown_or_malformed_handle(self, store):
+        assert store.recall("0123456789ab") == (None, 0)
+        assert store.recall("../../etc/passwd") == (None, 0)
+
+    def test_old_payloads_are_pruned(self, store):
+        stale = store.directory / "aaaaaaaaaaaa.txt"
+        store.directory.mkdir(parents=True)
+        stale.write_text("old")
+        past = time.time() - tool_output_store.RETENTION_SECONDS - 60
+        os.utime(stale, (past, past))
+
+        store.store("new payload")
+
+        assert not stale.exists()
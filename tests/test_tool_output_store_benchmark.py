@@ -0,0 +1,73 @@
+"""
+Benchmark for out-of-band tool output storage
+
+Simulates a session where every turn reads a large file and compares the
+history sent with each request (estimated input tokens) with and without
+the store, plus the time the offload pass adds per turn.
+
+Run directly for a per-turn table:
+    PYTHONPATH=. python tests/test_tool_output_store_benchmark.py [turns]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pydantic_ai.messages import (
+    ModelRequest, ModelResponse, TextPart, ToolCallPart, ToolReturnPart, UserPromptPart
+)
+
+from wyn360_cli.tool_output_store import ToolOutputStore, history_tokens
+
+
+def simulate(turns: int, store=None, file_lines: int = 2000):
+    """Per-turn (input tokens sent, offload seconds) for a read-heavy session"""
+    history, report = [], []
+    for turn in range(turns):
+        sent = history_tokens(history)
+        call_id = f"call-{turn}"
+        history = history + [
+            ModelRequest(parts=[UserPromptPart(content=f"Look at module {turn}")]),
+            ModelResponse(parts=[ToolCallPart(tool_name="read_file", args={"file_path": f"m{turn}.py"},
+                                              tool_call_id=call_id)]),
+            ModelRequest(parts=[ToolReturnPart(
+                tool_name="read_file", tool_call_id=call_id,
+                content="".join(f"def handler_{turn}_{n}(request):  # module {turn}\n" for n in range(file_lines)),
+            )]),
+            ModelResponse(parts=[TextPart(content=f"Module {turn} defines {file_lines} handlers.")]),
+        ]
+        started = time.perf_counter()
+        if store is not None:
+            history = store.offload(history)
+        report.append((sent, time.perf_counter() - started))
+    return report
+
+
+class TestToolOutputStoreBenchmark:
+    """Input tokens per turn stay flat with the store"""
+
+    def test_input_tokens_stop_growing(self, tmp_path):
+        baseline = simulate(8)
+        stored = simulate(8, ToolOutputStore(tmp_path, min_tokens=2000, max_age_turns=2))
+
+        # Identical while nothing is old enough, then bounded by two raw turns plus stubs
+        assert stored[:3] == [(tokens, stored[i][1]) for i, (tokens, _) in enumerate(baseline[:3])]
+        assert baseline[-1][0] > 3 * stored[-1][0]
+        assert stored[-1][0] - stored[-2][0] < 500
+
+    def test_offload_pass_is_cheap(self, tmp_path):
+        stored = simulate(20, ToolOutputStore(tmp_path, min_tokens=2000, max_age_turns=2))
+
+        assert max(seconds for _, seconds in stored) < 0.5
+
+
+if __name__ == "__main__":
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = simulate(turns)
+        stored = simulate(turns, ToolOutputStore(Path(directory)))
+    print(f"  {'turn':>4s} {'tokens (raw)':>13s} {'tokens (store)':>15s} {'offload ms':>11s}")
+    for turn, ((raw, _), (kept, seconds)) in enumerate(zip(baseline, stored), 1):
+        print(f"  {turn:4d} {raw:13,d} {kept:15,d} {seconds * 1000:11.2f}")
+    print(f"  total input tokens: {sum(t for t, _ in baseline):,} -> {sum(t for t, _ in stored):,}")
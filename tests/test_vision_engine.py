@@ -321,6 +321,19 @@ class TestAnalyzeAndDecide:
             await engine.analyze_and_decide(screenshot, goal, history, page_state)
 
 
+    @pytest.mark.asyncio
+    async def test_analyze_with_vision_sends_detected_media_type(self):
+        """Test JPEG screenshots are labelled image/jpeg for the API."""
+        mock_agent = AsyncMock()
+        mock_agent.run = AsyncMock(return_value=Mock(output='{}'))
+        engine = VisionDecisionEngine(mock_agent)
+
+        await engine._analyze_with_vision(b'\xff\xd8\xff\xe0fake_jpeg', "prompt")
+
+        content = mock_agent.run.call_args.kwargs['user_prompt'][1]
+        assert content.media_type == 'image/jpeg'
+
+
 class TestCostEstimation:
     """Test cost estimation."""
 
@@ -356,3 +369,21 @@ class TestCostEstimation:
         # Should be reasonable (not drastically different based on size alone)
         assert cost > 0
         assert cost < 1.0  # Sanity check
+
+    def test_estimate_cost_uses_encoded_dimensions(self):
+        """Test cost follows the pixels actually uploaded, not a flat rate."""
+        import io
+        from PIL import Image
+
+        def encoded(size):
+            buffer = io.BytesIO()
+            Image.new('RGB', size, 'white').save(buffer, format='JPEG')
+            return buffer.getvalue()
+
+        engine = VisionDecisionEngine(Mock())
+
+        small = engine.estimate_cost(screenshot_bytes=encoded((512, 384)), history_length=0)
+        large = engine.estimate_cost(screenshot_bytes=encoded((1024, 768)), history_length=0)
+
+        assert small < large
+        assert large == pytest.approx(((1024 * 768) // 750 + 500) * 0.000003)
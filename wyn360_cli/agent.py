@@ -31,13 +31,33 @@ from .utils import (
     extract_code_blocks,
     PerformanceMetrics
 )
-from .config import WYN360Config
+from .config import WYN360Config, get_resource_policy
 from .browser_use import (
     fetch_website_content,
+    apply_truncation,
     is_valid_url,
+    check_playwright_installed,
+    get_shared_crawler,
+    close_shared_crawler,
+    configure_shared_crawler,
+    get_crawler_stats,
+    get_fetch_stats,
+    configure_fetch_resource_blocking,
     WebsiteCache,
     HAS_CRAWL4AI
 )
+from .http_fetch import close_http_client
+from .crawl_frontier import crawl, format_batch_results
+from .page_sections import SectionIndex
+from .file_index import configure_file_index
+from .search_index import configure_search_index, get_search_index
+from .symbol_index import get_symbol_index, update_symbol_index
+from .git_service import (
+    FULL_DIFF_MAX_LINES, GitError, format_branches, format_diff_summary, format_log,
+    format_status, get_git_service, invalidate_git_cache
+)
+from .tool_cache import TREE_TTL_SECONDS, ToolResultCache
+from .tool_output_store import DEFAULT_MAX_AGE_TURNS, DEFAULT_MIN_TOKENS, ToolOutputStore, history_tokens
 from .credential_manager import CredentialManager
 from .session_manager import SessionManager
 from .browser_auth import BrowserAuth
@@ -65,6 +85,9 @@ from .tools.browser import (
     ActionRequest,
     ActionResult
 )
+from .tools.browser.browser_manager import browser_manager
+from .tools.browser.resource_blocker import ResourceBlocker
+from .tools.browser.stagehand_generator import stagehand_generator
 from .document_readers import (
     ExcelReader,
     WordReader,
@@ -227,6 +250,31 @@ class WYN360Agent:
         """
         self.config = config
 
+        # Project file index backing list_files/get_project_info/search_files
+        configure_file_index(persist=getattr(config, 'file_index_persist', False) is True)
+        configure_search_index(enabled=getattr(config, 'search_index_enabled', False) is True)
+
+        # Memoized results of read-only tools (read_file, list_files, ...)
+        self.tool_cache = ToolResultCache(
+            unchanged_marker=getattr(config, 'tool_cache_unchanged_marker', True) is not False
+        )
+        if getattr(config, 'tool_cache_enabled', True) is not False:
+            self.read_file = self.tool_cache.memoize(self.read_file, paths=lambda args: [args["file_path"]])
+            self.list_files = self.tool_cache.memoize(self.list_files, ttl=TREE_TTL_SECONDS)
+            self.get_project_info = self.tool_cache.memoize(self.get_project_info, ttl=TREE_TTL_SECONDS)
+            self.git_status = self.tool_cache.memoize(
+                self.git_status, paths=lambda args: [os.path.join(".git", "index"), os.path.join(".git", "HEAD")],
+                ttl=TREE_TTL_SECONDS
+            )
+
+        # Large tool results from earlier turns are moved out of the history
+        self.tool_output_store = None
+        if getattr(config, 'tool_output_store_enabled', True) is not False:
+            self.tool_output_store = ToolOutputStore(
+                min_tokens=getattr(config, 'tool_output_min_tokens', DEFAULT_MIN_TOKENS),
+                max_age_turns=getattr(config, 'tool_output_max_age_turns', DEFAULT_MAX_AGE_TURNS),
+            )
+
         # Initialize cache directory for document processing
         self.cache_dir = Path.home() / ".wyn360" / "cache"
 
@@ -367,6 +415,7 @@ class WYN360Agent:
 
         # Browser automation settings
         self.show_browser = show_browser
+        self._browser_warmup_task: Optional[asyncio.Task] = None
 
         # Token usage tracking
         self.total_input_tokens = 0
@@ -465,16 +514,21 @@ class WYN360Agent:
         # Rewind (conversation state snapshots)
         self.rewind_manager = RewindManager()
 
+        # Receives ("stdout" | "stderr", text) while execute_command runs; set by the CLI
+        self.command_output_callback = None
+
         # Browser use / website fetching (Phase 12.1, 12.2)
-        if config and config.browser_use_cache_enabled and HAS_CRAWL4AI:
+        if config and config.browser_use_cache_enabled and (HAS_CRAWL4AI or config.browser_use_http_fast_path):
             cache_dir = Path.home() / ".wyn360" / "cache" / "fetched_sites"
             self.website_cache = WebsiteCache(
                 cache_dir=cache_dir,
                 ttl=config.browser_use_cache_ttl,
-                max_size_mb=config.browser_use_cache_max_size_mb
+                max_size_mb=config.browser_use_cache_max_size_mb,
+                stale_while_revalidate=config.browser_use_cache_stale_while_revalidate
             )
         else:
             self.website_cache = None
+        self._page_embedding_model = None  # Lazily created for query-focused fetches (Phase 12.8)
 
         # Authenticated browsing (Phase 4.2 + 4.4)
         self.credential_manager = CredentialManager()
@@ -623,6 +677,8 @@ class WYN360Agent:
                 self.git_diff,
                 # Website fetching
                 self.fetch_website,
+                # Stored tool outputs
+                self.recall_tool_output,
             ]
         else:
             tools_list = [
@@ -636,6 +692,11 @@ class WYN360Agent:
                 self.git_log,
                 self.git_branch,
                 self.search_files,
+                # Python symbol index
+                self.find_definition,
+                self.find_references,
+                self.outline_file,
+                self.recall_tool_output,
                 self.delete_file,
                 self.move_file,
                 self.create_directory,
@@ -657,12 +718,14 @@ class WYN360Agent:
                 self.generate_tests,
                 # Browser use / website fetching (Phase 12.1, 12.2, 12.3)
                 self.fetch_website,
+                self.fetch_websites,
                 self.clear_website_cache,
                 self.show_cache_stats,
                 # Authenticated browsing (Phase 4.2)
                 self.login_to_website,
                 # Autonomous browsing (Phase 5.3)
                 self.browse_and_find,
+                self.browse_many,
                 # DOM-first browser automation (Phase 1.5)
                 self.analyze_page_dom,
                 self.execute_dom_action,
@@ -749,6 +812,16 @@ ACTION:
 2. Don't give up after first write_file failure - try with overwrite=True
 3. For "write/generate script" requests → ALWAYS create new file (use overwrite=False, then True if needed)
 
+**Python Code Navigation:**
+- Where is X defined? → find_definition("X") or find_definition("Class.method")
+- Who calls/imports/subclasses X? → find_references("X")
+- What is in a file? → outline_file("path.py") before reading a large file
+- Use search_files for text that is not a symbol (strings, comments, non-Python files)
+
+**Stored Tool Outputs:**
+- Large tool results from earlier turns are replaced by "[Tool output stored out of band: handle=...]" stubs
+- If you need that content again, use recall_tool_output(handle, start_line, end_line) or pattern=... instead of re-running the tool
+
 **JUPYTER NOTEBOOK CONVERSIONS:**
 
 When converting .ipynb files to .py scripts:
@@ -1024,6 +1097,16 @@ You now have TWO tools for web access:
 - Returns: Full page content, structure preserved
 - Max tokens: 50,000 (configurable via config)
 
+**fetch_website(url, query=...) - Long pages (Phase 12.8):**
+- When the user asks about something specific on a page, pass it as query="..."
+- Long pages are then reduced to the most relevant sections instead of the first ~50k tokens
+- Follow-up questions about the same URL reuse the cached sections (call again with the new query)
+
+**fetch_websites() - Several URLs at once (Phase 12.6):**
+- When you need 2+ specific URLs, call fetch_websites(urls=[...]) ONCE instead of fetch_website() per URL
+- crawl_depth=1 (with max_pages) also reads same-site pages linked from them
+- The token budget is shared across all pages
+
 **WebSearchTool Details:**
 - Searches the web and returns top results
 - Limited to {self.max_search_limit} searches per session
@@ -1222,6 +1305,8 @@ You have access to `browse_and_find()` which enables autonomous multi-step brows
 - Start URL should be the most relevant page for the task
 - Task description should be clear and specific
 - For complex tasks, break into smaller browse_and_find calls
+- To ask the same thing of several independent sites, use `browse_many(task, urls)`,
+  which browses them concurrently in isolated contexts
 - Browser is visible by default (user can watch)
 
 **NOT available in Bedrock mode** (requires vision capabilities)
@@ -1268,26 +1353,117 @@ You have access to `browse_and_find()` which enables autonomous multi-step brows
 
         return base_prompt
 
-    async def read_file(self, ctx: RunContext[None], file_path: str) -> str:
+    async def read_file(
+        self,
+        ctx: RunContext[None],
+        file_path: str,
+        start_line: Optional[int] = None,
+        end_line: Optional[int] = None,
+        tail_lines: Optional[int] = None,
+        pattern: Optional[str] = None,
+        context_lines: int = 3,
+        byte_offset: Optional[int] = None,
+        byte_length: int = 4096,
+        max_tokens: int = 12000
+    ) -> str:
         """
-        Read the contents of a file.
+        Read a file, or part of it. Works on files of any size (logs, data dumps).
+
+        With no range arguments the whole file is returned if it fits in
+        max_tokens; otherwise the first lines are returned with a note on how
+        to continue.
 
         Args:
             file_path: Path to the file to read
+            start_line: First line to read (1-based); use with end_line for a range or the head
+            end_line: Last line to read (inclusive)
+            tail_lines: Read the last N lines instead
+            pattern: Regex; show only the lines around matches (up to 20 matches)
+            context_lines: Lines of context around each pattern match (default: 3)
+            byte_offset: Read raw bytes from this offset instead (with byte_length)
+            byte_length: Bytes to read with byte_offset (default: 4096)
+            max_tokens: Output budget (default: 12000)
 
         Returns:
-            File contents or error message
+            File contents (ranged reads are line-numbered) or error message
+
+        Examples:
+            - read_file("app.py") - Whole file
+            - read_file("server.log", tail_lines=100) - End of a log
+            - read_file("data.csv", start_line=1, end_line=20) - Head of a file
+            - read_file("server.log", start_line=2000000, end_line=2000050) - Any range, fast on huge files
+            - read_file("server.log", pattern="ERROR|Traceback", context_lines=5) - Windows around matches
         """
-        success, content = read_file_safe(file_path)
+        from .file_ranges import (
+            CHARS_PER_TOKEN, read_byte_range, read_lines, read_matches, read_tail
+        )
 
-        # Track tool call
-        self.performance_metrics.track_tool_call("read_file", success)
+        path = Path(file_path)
+        if not path.is_file():
+            self.performance_metrics.track_tool_call("read_file", False)
+            return f"Error: File not found: {file_path}" if not path.exists() else f"Error: Not a file: {file_path}"
 
-        if success:
-            return f"Contents of {file_path}:\n\n{content}"
-        else:
+        max_chars = max(1000, max_tokens * CHARS_PER_TOKEN)
+        size = path.stat().st_size
+        ranged = any(arg is not None for arg in (start_line, end_line, tail_lines, pattern, byte_offset))
+
+        # Small whole-file reads keep the original behaviour
+        if not ranged and size <= max_chars:
+            success, content = read_file_safe(file_path)
+            self.performance_metrics.track_tool_call("read_file", success)
+            if success:
+                return f"Contents of {file_path}:\n\n{content}"
             return f"Error: {content}"
 
+        try:
+            if byte_offset is not None:
+                result = await asyncio.to_thread(read_byte_range, file_path, byte_offset, byte_length, max_chars)
+                self.performance_metrics.track_tool_call("read_file", True)
+                end = min(size, max(0, byte_offset) + len(result.text.encode('utf-8', errors='replace')))
+                return (f"Bytes {max(0, byte_offset)}-{end} of {file_path} ({size} bytes, "
+                        f"lines {result.first_line}-{result.last_line}):\n\n{result.text}")
+
+            with open(file_path, 'rb') as f:
+                if b'\x00' in f.read(8192):
+                    self.performance_metrics.track_tool_call("read_file", False)
+                    return (f"Error: {file_path} looks like a binary file ({size} bytes). "
+                            f"Use byte_offset/byte_length to inspect raw bytes.")
+
+            if pattern is not None:
+                result, shown = await asyncio.to_thread(
+                    read_matches, file_path, pattern, max(0, context_lines), 20, False, max_chars
+                )
+                self.performance_metrics.track_tool_call("read_file", True)
+                if not shown:
+                    return f"No matches for '{pattern}' in {file_path} ({result.total_lines} lines)."
+                note = ("\n\n[More matches not shown - narrow the pattern or read a line range]"
+                        if result.truncated else "")
+                return (f"Matches for '{pattern}' in {file_path} ({shown} matching lines marked '>', "
+                        f"{result.total_lines} lines total):\n\n{result.text}{note}")
+
+            if tail_lines is not None:
+                result = await asyncio.to_thread(read_tail, file_path, max(1, tail_lines), max_chars)
+                label = f"Last {result.last_line - result.first_line + 1} lines of {file_path}"
+            else:
+                result = await asyncio.to_thread(read_lines, file_path, start_line or 1, end_line, max_chars)
+                label = f"Contents of {file_path}"
+            self.performance_metrics.track_tool_call("read_file", True)
+
+            if not result.text:
+                return f"{label}: no lines in that range (file has {result.total_lines} lines)."
+            total = f" of {result.total_lines}" if result.total_lines is not None else ""
+            header = f"{label} (lines {result.first_line}-{result.last_line}{total}, {size} bytes):"
+            note = ""
+            if result.truncated and result.next_line:
+                note = (f"\n\n[Truncated at the {max_tokens}-token budget - continue with "
+                        f"start_line={result.next_line}, or use pattern= to find what you need]")
+            elif result.truncated:
+                note = f"\n\n[Truncated at the {max_tokens}-token budget]"
+            return f"{header}\n\n{result.text}{note}"
+        except Exception as e:
+            self.performance_metrics.track_tool_call("read_file", False)
+            return f"Error reading file: {str(e)}"
+
     async def write_file(
         self,
         ctx: RunContext[None],
@@ -1368,6 +1544,10 @@ Content preview:
 
             # Try to write the file
             success, message = write_file_safe(file_path, content, overwrite)
+            if success:
+                update_symbol_index([file_path])
+                invalidate_git_cache()
+                self.tool_cache.invalidate()
 
             # Track tool call
             self.performance_metrics.track_tool_call("write_file", success)
@@ -1453,8 +1633,9 @@ Content preview:
         Note:
             User will be asked to confirm before execution.
             Commands run with user's full permissions in the current directory.
+            Very long output keeps its beginning and end; the middle is omitted.
         """
-        from .utils import execute_command_safe
+        from .command_runner import run_command
 
         # Ask for user confirmation in interactive mode
         # Skip confirmation in non-interactive mode (tests) or if disabled via env var
@@ -1481,63 +1662,90 @@ Content preview:
                 sys.stdout.flush()
                 return "❌ Command execution cancelled by user."
 
-        success, output, return_code = execute_command_safe(command, timeout)
+        try:
+            result = await run_command(command, timeout, on_output=self.command_output_callback)
+        except Exception as e:
+            invalidate_git_cache()
+            self.tool_cache.invalidate()
+            self.performance_metrics.track_tool_call("execute_command", False)
+            return f"❌ Command failed (exit code -1)\n\nError output:\nError executing command: {str(e)}"
+
+        # The command may have changed files or git state
+        invalidate_git_cache()
+        self.tool_cache.invalidate()
 
         # Track tool call
-        self.performance_metrics.track_tool_call("execute_command", success)
+        self.performance_metrics.track_tool_call("execute_command", result.success)
 
-        if success:
-            result = f"✅ Command executed successfully (exit code {return_code})\n\n"
-            result += f"Output:\n{output}"
-            return result
-        else:
-            result = f"❌ Command failed (exit code {return_code})\n\n"
-            result += f"Error output:\n{output}"
-            return result
+        output = result.output()
+        if result.dropped_bytes:
+            output += (f"\n\n[Output truncated: {result.dropped_bytes:,} of {result.total_bytes:,} bytes "
+                       f"omitted from the middle]")
+
+        if result.timed_out:
+            return (f"❌ Command timed out after {timeout} seconds and was stopped. "
+                    f"Consider increasing timeout or optimizing the command.\n\n"
+                    f"Output before timeout:\n{output}")
+        if result.success:
+            return f"✅ Command executed successfully (exit code {result.return_code})\n\nOutput:\n{output}"
+        return f"❌ Command failed (exit code {result.return_code})\n\nError output:\n{output}"
 
     async def git_status(self, ctx: RunContext[None]) -> str:
         """
         Get current git status showing modified, staged, and untracked files.
 
+        Lists each changed file with its added/removed line counts.
+        Use git_diff(file_path=...) to see the changes in one file.
+
         Returns:
-            Git status output or error message
+            Git status summary or error message
         """
-        from .utils import execute_command_safe
-        success, output, return_code = execute_command_safe("git status", timeout=10)
+        service = get_git_service()
+        try:
+            snapshot, staged, unstaged = await asyncio.gather(
+                service.status(), service.diff_stats(staged=True), service.diff_stats()
+            )
+        except GitError as e:
+            self.performance_metrics.track_tool_call("git_status", False)
+            return f"Error getting git status: {e}"
 
         # Track tool call
-        self.performance_metrics.track_tool_call("git_status", success)
+        self.performance_metrics.track_tool_call("git_status", True)
 
-        if success:
-            return f"Git Status:\n\n{output}"
-        else:
-            return f"Error getting git status: {output}"
+        return f"Git Status:\n\n{format_status(snapshot, staged, unstaged)}"
 
-    async def git_diff(self, ctx: RunContext[None], file_path: str = None) -> str:
+    async def git_diff(self, ctx: RunContext[None], file_path: str = None, staged: bool = False) -> str:
         """
         Show git diff for specific file or all changes.
 
+        Without file_path, small diffs are shown in full; larger ones are
+        summarised per file so you can fetch the files you need.
+
         Args:
             file_path: Optional specific file to diff. If None, shows all changes.
+            staged: Show staged changes (what will be committed) instead of unstaged ones
 
         Returns:
-            Git diff output or error message
+            Git diff output, per-file summary, or error message
         """
-        from .utils import execute_command_safe
-
-        if file_path:
-            command = f"git diff {file_path}"
-        else:
-            command = "git diff"
-
-        success, output, return_code = execute_command_safe(command, timeout=15)
-
-        if success:
-            if not output.strip():
-                return "No changes to show."
-            return f"Git Diff:\n\n{output}"
-        else:
-            return f"Error getting git diff: {output}"
+        service = get_git_service()
+        try:
+            if file_path:
+                output = await service.diff(file_path, staged)
+            else:
+                stats = await service.diff_stats(staged)
+                changed = sum((stat.added or 0) + (stat.deleted or 0) for stat in stats)
+                if changed > FULL_DIFF_MAX_LINES:
+                    return (f"Git Diff{' (staged)' if staged else ''} summary - too large to show in full:\n\n"
+                            f"{format_diff_summary(stats)}\n\n"
+                            f"Use git_diff(file_path=...) to see the full diff of a file.")
+                output = await service.diff(None, staged) if stats else ""
+        except GitError as e:
+            return f"Error getting git diff: {e}"
+
+        if not output.strip():
+            return "No changes to show."
+        return f"Git Diff{' (staged)' if staged else ''}:\n\n{output}"
 
     async def git_log(self, ctx: RunContext[None], max_count: int = 10) -> str:
         """
@@ -1549,15 +1757,14 @@ Content preview:
         Returns:
             Git log output or error message
         """
-        from .utils import execute_command_safe
+        try:
+            commits = await get_git_service().log(max_count)
+        except GitError as e:
+            return f"Error getting git log: {e}"
 
-        command = f"git log --oneline -n {max_count}"
-        success, output, return_code = execute_command_safe(command, timeout=10)
-
-        if success:
-            return f"Recent Commits (last {max_count}):\n\n{output}"
-        else:
-            return f"Error getting git log: {output}"
+        if not commits:
+            return "No commits yet."
+        return f"Recent Commits (last {max_count}):\n\n{format_log(commits)}"
 
     async def git_branch(self, ctx: RunContext[None]) -> str:
         """
@@ -1566,27 +1773,33 @@ Content preview:
         Returns:
             Git branch list or error message
         """
-        from .utils import execute_command_safe
-
-        success, output, return_code = execute_command_safe("git branch", timeout=10)
+        try:
+            branches = await get_git_service().branches()
+        except GitError as e:
+            return f"Error getting git branches: {e}"
 
-        if success:
-            return f"Git Branches:\n\n{output}"
-        else:
-            return f"Error getting git branches: {output}"
+        if not branches:
+            return "No branches yet (no commits)."
+        return f"Git Branches:\n\n{format_branches(branches)}"
 
     async def search_files(
         self,
         ctx: RunContext[None],
         pattern: str,
-        file_pattern: str = "*.py"
+        file_pattern: str = "*.py",
+        context_lines: int = 0,
+        ignore_case: bool = False
     ) -> str:
         """
         Search for a pattern across files in the project.
 
+        Skips .git, node_modules, virtualenvs, .gitignore'd paths and binary files.
+
         Args:
             pattern: The text pattern to search for (can be regex)
-            file_pattern: File pattern to search within (default: "*.py")
+            file_pattern: File pattern(s) to search within, comma-separated (default: "*.py", "*" for all)
+            context_lines: Lines of context to show around each match (default: 0)
+            ignore_case: Case-insensitive search (default: False)
 
         Returns:
             Search results showing file paths and matching lines
@@ -1595,36 +1808,199 @@ Content preview:
             - search_files("class User") - Find User class definitions
             - search_files("TODO", "*.py") - Find all TODO comments in Python files
             - search_files("import requests") - Find files using requests library
+            - search_files("def main", "*.py,*.pyi", context_lines=3) - Show surrounding code
         """
-        from .utils import execute_command_safe
-        import os
+        from .code_search import stream_search, format_matches
 
-        # Use grep for searching (cross-platform compatible)
-        # -r: recursive, -n: line numbers, -i: case insensitive
-        command = f"grep -rn '{pattern}' --include='{file_pattern}' ."
+        max_results = 100
+        context_lines = max(0, min(context_lines, 10))
+        matches = []
 
-        success, output, return_code = execute_command_safe(command, timeout=20)
+        try:
+            # Narrow to files containing the pattern's literals when the trigram index is on
+            candidates = None
+            index = get_search_index(".")
+            if index is not None:
+                candidates = await asyncio.to_thread(index.candidates, pattern, ignore_case)
+
+            # Matches are streamed from the scanner threads in arrival order;
+            # the search stops shortly after the cap and they are sorted below
+            async for match in stream_search(
+                pattern, ".", file_pattern=file_pattern, max_results=max_results + 1,
+                context_lines=context_lines, ignore_case=ignore_case, candidates=candidates
+            ):
+                matches.append(match)
+            matches.sort(key=lambda m: (m.path, m.line_number))
+        except Exception as e:
+            self.performance_metrics.track_tool_call("search_files", False)
+            return f"Error searching files: {e}"
 
-        # Track tool call (grep returns 1 for no matches, which is not really a failure)
-        tool_success = success or return_code == 1
-        self.performance_metrics.track_tool_call("search_files", tool_success)
+        self.performance_metrics.track_tool_call("search_files", True)
 
-        if success:
-            if not output.strip():
-                return f"No matches found for pattern '{pattern}' in {file_pattern} files."
+        if not matches:
+            return f"No matches found for pattern '{pattern}' in {file_pattern} files."
 
-            # Limit output to prevent overwhelming responses
-            lines = output.split('\n')
-            if len(lines) > 100:
-                truncated = '\n'.join(lines[:100])
-                return f"Search Results (showing first 100 of {len(lines)} matches):\n\n{truncated}\n\n... ({len(lines) - 100} more matches)"
+        if len(matches) > max_results:
+            output = format_matches(matches[:max_results])
+            return (f"Search Results (showing first {max_results} matches for '{pattern}' in {file_pattern}; "
+                    f"search stopped early, narrow the pattern or file_pattern for more):\n\n{output}")
 
-            return f"Search Results for '{pattern}' in {file_pattern}:\n\n{output}"
-        else:
-            # grep returns exit code 1 when no matches found
-            if return_code == 1:
-                return f"No matches found for pattern '{pattern}' in {file_pattern} files."
-            return f"Error searching files: {output}"
+        return f"Search Results for '{pattern}' in {file_pattern}:\n\n{format_matches(matches)}"
+
+    async def find_definition(self, ctx: RunContext[None], name: str) -> str:
+        """
+        Find where a Python class, function, method or variable is defined.
+
+        Args:
+            name: Symbol name, optionally qualified (e.g. "User", "User.save", "parse_config")
+
+        Returns:
+            Definitions with file path, line range and signature
+
+        Examples:
+            - find_definition("WYN360Agent") - Find a class
+            - find_definition("Cache.get") - Find a specific method
+        """
+        index = await asyncio.to_thread(get_symbol_index, ".")
+        definitions = index.find_definition(name)
+        self.performance_metrics.track_tool_call("find_definition", True)
+
+        if not definitions:
+            return (f"No definition found for '{name}' in {index.get_stats()['files']} Python files. "
+                    f"Try search_files for non-Python code or dynamically created names.")
+
+        lines = [
+            f"{path}:{d.line}-{d.end_line}  [{d.kind}] {d.qualname}\n    {d.signature}"
+            for path, d in definitions[:50]
+        ]
+        more = f"\n\n... ({len(definitions) - 50} more)" if len(definitions) > 50 else ""
+        return f"Definitions of '{name}' ({len(definitions)}):\n\n" + "\n".join(lines) + more
+
+    async def find_references(self, ctx: RunContext[None], name: str, max_results: int = 100) -> str:
+        """
+        Find calls, imports, subclasses and decorator uses of a Python name.
+
+        Matching is by the last part of the name, so "User.save" lists every
+        ".save(...)" call whatever the receiver.
+
+        Args:
+            name: Symbol name (e.g. "User", "save_config", "Cache.get")
+            max_results: Maximum references to list (default: 100)
+
+        Returns:
+            References with file path, line and source line
+        """
+        index = await asyncio.to_thread(get_symbol_index, ".")
+        references = index.find_references(name)
+        self.performance_metrics.track_tool_call("find_references", True)
+
+        if not references:
+            return f"No references found for '{name}' in {index.get_stats()['files']} Python files."
+
+        shown = references[:max(1, max_results)]
+        source_lines: Dict[str, List[str]] = {}
+        lines = []
+        for path, ref in shown:
+            if path not in source_lines:
+                try:
+                    source_lines[path] = Path(path).read_text(encoding='utf-8', errors='replace').splitlines()
+                except OSError:
+                    source_lines[path] = []
+            text = source_lines[path][ref.line - 1].strip() if ref.line <= len(source_lines[path]) else ""
+            kind = getattr(ref, 'kind', 'import')
+            lines.append(f"{path}:{ref.line}  [{kind}] {text[:160]}")
+
+        header = f"References to '{name}' ({len(references)}"
+        header += f", showing first {len(shown)}):" if len(shown) < len(references) else "):"
+        return header + "\n\n" + "\n".join(lines)
+
+    async def outline_file(self, ctx: RunContext[None], file_path: str) -> str:
+        """
+        Show the structure of a Python file: imports, classes, functions and methods with line numbers.
+
+        Use before read_file on large files to find the part you need.
+
+        Args:
+            file_path: Path to a .py file
+
+        Returns:
+            Indented outline or error message
+        """
+        index = await asyncio.to_thread(get_symbol_index, ".")
+        symbols = index.outline(file_path)
+        if symbols is None:
+            # Files the project index skips (e.g. .gitignore'd) are parsed on demand
+            await asyncio.to_thread(index.update_paths, [file_path])
+            symbols = index.outline(file_path)
+        self.performance_metrics.track_tool_call("outline_file", symbols is not None)
+
+        if symbols is None:
+            return f"Error: '{file_path}' is not a Python file in this project."
+        if symbols.error:
+            return f"Error: Could not parse '{file_path}': {symbols.error}"
+
+        lines = [f"Outline of {file_path}:", ""]
+        if symbols.imports:
+            modules = sorted({i.module for i in symbols.imports})
+            lines.append(f"imports: {', '.join(modules)}")
+            lines.append("")
+        for d in symbols.definitions:
+            if d.kind in ('variable', 'attribute') and d.qualname.count('.') > 1:
+                continue
+            indent = "    " * d.qualname.count('.')
+            lines.append(f"{indent}{d.line}-{d.end_line}  {d.signature}")
+        if not symbols.definitions:
+            lines.append("(no definitions)")
+        return "\n".join(lines)
+
+    async def recall_tool_output(
+        self,
+        ctx: RunContext[None],
+        handle: str,
+        start_line: int = 1,
+        end_line: Optional[int] = None,
+        pattern: Optional[str] = None,
+        max_tokens: int = 8000
+    ) -> str:
+        """
+        Read back a large tool result from an earlier turn that was moved out of the conversation.
+
+        Such results appear as "[Tool output stored out of band: handle=...]" stubs.
+        Only recall what you need: a line range, or the lines around a pattern.
+
+        Args:
+            handle: Handle shown in the stub
+            start_line: First line to show (1-based, default: 1)
+            end_line: Last line to show (inclusive)
+            pattern: Regex; show only lines around matches instead of a range
+            max_tokens: Output budget (default: 8000)
+
+        Returns:
+            The stored text (line-numbered) or error message
+        """
+        from .file_ranges import CHARS_PER_TOKEN
+
+        if self.tool_output_store is None:
+            return "Error: Tool output storage is disabled."
+        result, shown = await asyncio.to_thread(
+            self.tool_output_store.recall, handle, start_line, end_line, pattern,
+            max(1000, max_tokens * CHARS_PER_TOKEN)
+        )
+        self.performance_metrics.track_tool_call("recall_tool_output", result is not None)
+
+        if result is None:
+            return f"Error: No stored tool output with handle '{handle}'."
+        if pattern:
+            if not shown:
+                return f"No matches for '{pattern}' in stored output {handle} ({result.total_lines} lines)."
+            return f"Stored output {handle}, matches for '{pattern}':\n\n{result.text}"
+        if not result.text:
+            return f"Stored output {handle} has {result.total_lines} lines; nothing in that range."
+        note = ""
+        if result.truncated and result.next_line:
+            note = f"\n\n[Truncated - continue with start_line={result.next_line}]"
+        return (f"Stored output {handle} (lines {result.first_line}-{result.last_line} "
+                f"of {result.total_lines}):\n\n{result.text}{note}")
 
     async def delete_file(self, ctx: RunContext[None], file_path: str) -> str:
         """
@@ -1653,6 +2029,9 @@ Content preview:
 
             # Delete the file
             path.unlink()
+            update_symbol_index([file_path])
+            invalidate_git_cache()
+            self.tool_cache.invalidate()
             return f"✓ Successfully deleted file: {file_path}"
 
         except Exception as e:
@@ -1696,6 +2075,9 @@ Content preview:
 
             # Move the file
             shutil.move(str(source_path), str(dest_path))
+            update_symbol_index([source, destination])
+            invalidate_git_cache()
+            self.tool_cache.invalidate()
             return f"✓ Successfully moved '{source}' to '{destination}'"
 
         except Exception as e:
@@ -1728,6 +2110,7 @@ Content preview:
 
             # Create directory and parents
             path.mkdir(parents=True, exist_ok=True)
+            self.tool_cache.invalidate()
             return f"✓ Successfully created directory: {dir_path}"
 
         except Exception as e:
@@ -1870,6 +2253,8 @@ Check out the configuration reference at https://huggingface.co/docs/hub/spaces-
         success, msg = write_file_safe("README.md", readme_content, overwrite=True)
 
         if success:
+            invalidate_git_cache()
+            self.tool_cache.invalidate()
             return f"✓ Created README.md with {sdk} Space configuration (title: {title})"
         else:
             return f"❌ Failed to create README.md: {msg}"
@@ -2105,6 +2490,9 @@ Check out the configuration reference at https://huggingface.co/docs/hub/spaces-
         # Commit changes
         commit_cmd = f"git commit -m \"{message}\""
         success, output, code = execute_command_safe(commit_cmd, timeout=30)
+        # Staging and committing change git status
+        invalidate_git_cache()
+        self.tool_cache.invalidate()
 
         if not success and code != 0:
             if "nothing to commit" in output.lower():
@@ -2257,6 +2645,8 @@ Check out the configuration reference at https://huggingface.co/docs/hub/spaces-
             cmd = f"git branch {branch_name}"
 
         success, output, code = execute_command_safe(cmd, timeout=10)
+        invalidate_git_cache()
+        self.tool_cache.invalidate()
 
         if success:
             if checkout:
@@ -2306,6 +2696,9 @@ Check out the configuration reference at https://huggingface.co/docs/hub/spaces-
         # Checkout branch
         cmd = f"git checkout {branch_name}"
         success, output, code = execute_command_safe(cmd, timeout=10)
+        # Switching branches changes the working tree
+        invalidate_git_cache()
+        self.tool_cache.invalidate()
 
         if success:
             return f"✓ Switched to branch '{branch_name}'"
@@ -2355,6 +2748,8 @@ Check out the configuration reference at https://huggingface.co/docs/hub/spaces-
                     f"git checkout {target_branch}",
                     timeout=10
                 )
+                invalidate_git_cache()
+                self.tool_cache.invalidate()
                 if not switch_success:
                     return f"❌ Failed to switch to target branch '{target_branch}': {switch_output[:200]}"
 
@@ -2366,6 +2761,9 @@ Check out the configuration reference at https://huggingface.co/docs/hub/spaces-
         # Merge branches
         cmd = f"git merge {source_branch}"
         success, output, code = execute_command_safe(cmd, timeout=30)
+        # A merge (even a conflicted one) changes the working tree
+        invalidate_git_cache()
+        self.tool_cache.invalidate()
 
         if success:
             if "already up to date" in output.lower():
@@ -2517,6 +2915,9 @@ from {module_name} import {', '.join([f['name'] for f in functions] + [c['name']
         success, msg = write_file_safe(str(test_file_path), test_code, overwrite=False)
 
         if success:
+            update_symbol_index([str(test_file_path)])
+            invalidate_git_cache()
+            self.tool_cache.invalidate()
             summary = f"✓ Generated test file: {test_file_path}\n\n"
             summary += f"Test coverage:\n"
             summary += f"  - {len(functions)} function(s): {', '.join([f['name'] for f in functions])}\n" if functions else ""
@@ -2531,7 +2932,8 @@ from {module_name} import {', '.join([f['name'] for f in functions] + [c['name']
     async def fetch_website(
         self,
         ctx: RunContext[None],
-        url: str
+        url: str,
+        query: Optional[str] = None
     ) -> str:
         """
         Fetch and extract content from a specific website URL.
@@ -2540,6 +2942,11 @@ from {module_name} import {', '.join([f['name'] for f in functions] + [c['name']
         LLM-friendly markdown format, and applies smart truncation to stay under
         token limits. Content is cached for 30 minutes by default (configurable).
 
+        **Query-focused reading (Phase 12.8):**
+        With a query, long pages are reduced to the sections most relevant to
+        it instead of being cut at a fixed point. The page's sections are
+        cached, so follow-up queries on the same URL do not refetch it.
+
         **Authenticated Browsing (Phase 4.3):**
         Automatically uses saved session cookies if available for the domain.
         After logging in with login_to_website, subsequent fetch_website calls
@@ -2547,6 +2954,7 @@ from {module_name} import {', '.join([f['name'] for f in functions] + [c['name']
 
         Args:
             url: Full URL to fetch (e.g., https://github.com/user/repo)
+            query: Optional description of what to look for on the page
 
         Returns:
             Markdown-formatted website content or error message
@@ -2556,6 +2964,8 @@ from {module_name} import {', '.join([f['name'] for f in functions] + [c['name']
             - "What's on https://python.org/downloads"
             - "Fetch https://docs.anthropic.com/api"
             - "Fetch my profile from https://wyn360search.com/profile" (after login)
+            - "What does https://docs.python.org/3/library/asyncio-task.html say about timeouts?"
+              → fetch_website(url, query="timeouts")
 
         Note:
             - Use this for SPECIFIC URLs
@@ -2564,8 +2974,10 @@ from {module_name} import {', '.join([f['name'] for f in functions] + [c['name']
             - Cached for improved performance
             - Automatically authenticated if session exists for domain
         """
-        # Check if crawl4ai is available
-        if not HAS_CRAWL4AI:
+        http_first = self.config.browser_use_http_fast_path if self.config else True
+
+        # Check if crawl4ai is available (static pages only need the HTTP fast path)
+        if not HAS_CRAWL4AI and not http_first:
             return ("❌ Website fetching is not available. The crawl4ai package is not installed.\n\n"
                    "To enable this feature, install it with:\n"
                    "```bash\n"
@@ -2580,54 +2992,319 @@ from {module_name} import {', '.join([f['name'] for f in functions] + [c['name']
         # Track tool call
         self.performance_metrics.track_tool_call("fetch_website", True)
 
-        # Check cache first (Phase 12.2)
+        if query and query.strip():
+            return await self._fetch_website_for_query(url, query.strip())
+
+        # Check cache first (Phase 12.2); stale pages are refreshed in the background
         if self.website_cache:
-            cached_content = await self.website_cache.get(url)
+            cached_content = await self.website_cache.get(url, refresh=self._website_refresher(url))
             if cached_content:
                 return f"📄 **Fetched from cache:** {url}\n\n{cached_content}\n\n---\n*Note: Content cached, may not reflect latest changes*"
 
-        # Get config values
-        max_tokens = 50000  # default
-        truncate_strategy = "smart"  # default
+        # Fetch website content (Phase 4.3: with saved session cookies)
+        success, content, authenticated = await self._fetch_url_content(url)
+
+        if not success:
+            # Track failure
+            self.performance_metrics.track_tool_call("fetch_website", False)
+            return content  # Error message
+
+        # Cache the content (Phase 12.2)
+        if self.website_cache:
+            await self.website_cache.set(url, content)
+
+        # Format response (Phase 4.3: Include authentication indicator)
+        auth_indicator = " 🔐 (authenticated)" if authenticated else ""
+        response = f"📄 **Fetched{auth_indicator}:** {url}\n\n{content}"
+
+        return response
+
+    async def fetch_websites(
+        self,
+        ctx: RunContext[None],
+        urls: List[str],
+        crawl_depth: int = 0,
+        max_pages: int = 10
+    ) -> str:
+        """
+        Fetch several website URLs in one call, optionally crawling same-site links (Phase 12.6).
+
+        Pages are fetched concurrently (with a per-host limit), cached pages
+        are served from the website cache, and the combined markdown shares
+        one token budget across all pages.
+
+        Args:
+            urls: Full URLs to fetch (duplicates are fetched once)
+            crawl_depth: Levels of same-site links to follow from each URL
+                (0 = only the given URLs, 1 = also pages they link to, ...)
+            max_pages: Most pages to fetch in total when crawling (max 30)
+
+        Returns:
+            Timing table plus each page's markdown content, or an error message
+
+        Examples:
+            - "Compare the pricing pages at https://a.com/pricing and https://b.com/pricing"
+            - "Read the docs starting at https://docs.example.com/guide, one level deep"
 
+        Note:
+            - Use this instead of several fetch_website calls for multiple URLs
+            - Crawling never leaves the sites of the given URLs
+        """
+        http_first = self.config.browser_use_http_fast_path if self.config else True
+
+        if not HAS_CRAWL4AI and not http_first:
+            return ("❌ Website fetching is not available. The crawl4ai package is not installed.\n\n"
+                   "To enable this feature, install it with:\n"
+                   "```bash\n"
+                   "pip install crawl4ai\n"
+                   "playwright install chromium\n"
+                   "```")
+
+        invalid = [url for url in urls if not is_valid_url(url)]
+        if invalid or not urls:
+            return (f"❌ Invalid URL format: {', '.join(invalid) or '(no URLs given)'}\n\n"
+                    "Please provide valid URLs starting with http:// or https://")
+
+        self.performance_metrics.track_tool_call("fetch_websites", True)
+
+        max_tokens = 50000
+        truncate_strategy = "smart"
+        concurrency = 6
+        per_host_limit = 2
         if self.config:
             max_tokens = self.config.browser_use_max_tokens
             truncate_strategy = self.config.browser_use_truncate_strategy
+            concurrency = self.config.browser_use_batch_concurrency
+            per_host_limit = self.config.browser_use_per_host_limit
+
+        async def fetch_one(url: str) -> Tuple[bool, str, bool]:
+            if self.website_cache:
+                cached_content = await self.website_cache.get(url, refresh=self._website_refresher(url))
+                if cached_content:
+                    return True, cached_content, True
+
+            success, content, _ = await self._fetch_url_content(url)
+            if success and self.website_cache:
+                await self.website_cache.set(url, content)
+            return success, content, False
+
+        start = time.perf_counter()
+        pages = await crawl(
+            urls,
+            fetch_one,
+            max_depth=max(crawl_depth, 0),
+            max_pages=max(max_pages, len(urls)) if crawl_depth > 0 else len(urls),
+            max_concurrency=concurrency,
+            per_host_limit=per_host_limit
+        )
+        wall_time = time.perf_counter() - start
 
-        # Check for saved session cookies (Phase 4.3)
-        cookies = None
+        if not any(page.success for page in pages):
+            self.performance_metrics.track_tool_call("fetch_websites", False)
+
+        return format_batch_results(pages, max_tokens, truncate_strategy, wall_time)
+
+    async def _fetch_website_for_query(self, url: str, query: str) -> str:
+        """
+        fetch_website with query-aware reduction (Phase 12.8).
+
+        Uses the cached section index of the page when there is one;
+        otherwise fetches the full page, splits it, and caches both the
+        normally truncated content and the sections.
+        """
+        max_tokens = self.config.browser_use_max_tokens if self.config else 50000
+        truncate_strategy = self.config.browser_use_truncate_strategy if self.config else "smart"
+
+        sections = await self.website_cache.get_sections(url) if self.website_cache else None
+        from_cache = sections is not None
         authenticated = False
-        from urllib.parse import urlparse
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc
 
-        session = self.session_manager.get_session(domain)
-        if session:
-            cookies = session['cookies']
-            authenticated = True
+        if sections is None:
+            success, full_content, authenticated = await self._fetch_url_content(url, truncate_strategy="none")
+            if not success:
+                self.performance_metrics.track_tool_call("fetch_website", False)
+                return full_content  # Error message
+
+            sections = SectionIndex.from_markdown(full_content)
+            embedding_model = self._get_page_embedding_model()
+            if embedding_model is not None and sections.total_tokens > max_tokens:
+                await asyncio.to_thread(sections.compute_embeddings, embedding_model)
+
+            if self.website_cache:
+                await self.website_cache.set(url, apply_truncation(full_content, max_tokens, truncate_strategy))
+                await self.website_cache.set_sections(url, sections)
+
+        embedding_model = self._get_page_embedding_model() if sections.embeddings is not None else None
+        content, _ = await asyncio.to_thread(sections.reduce, query, max_tokens, embedding_model)
+
+        if from_cache:
+            return f"📄 **Fetched from cache:** {url}\n\n{content}\n\n---\n*Note: Content cached, may not reflect latest changes*"
+        auth_indicator = " 🔐 (authenticated)" if authenticated else ""
+        return f"📄 **Fetched{auth_indicator}:** {url}\n\n{content}"
+
+    def _get_page_embedding_model(self) -> Optional[EmbeddingModel]:
+        """Local embedding model for ranking page sections, if enabled and installed."""
+        if self._page_embedding_model is None:
+            if not (self.config and self.config.browser_use_query_embeddings):
+                return None
+            import importlib.util
+            if importlib.util.find_spec("sentence_transformers") is None:
+                return None
+            self._page_embedding_model = EmbeddingModel()
+        return self._page_embedding_model
+
+    async def _fetch_url_content(
+        self,
+        url: str,
+        truncate_strategy: Optional[str] = None
+    ) -> Tuple[bool, str, bool]:
+        """
+        Fetch one URL with the configured limits and any saved session cookies.
+
+        Args:
+            url: URL to fetch
+            truncate_strategy: Override the configured strategy ("none" keeps the full page)
+
+        Returns:
+            Tuple of (success, content_or_error, authenticated)
+        """
+        max_tokens = 50000
+        if self.config:
+            max_tokens = self.config.browser_use_max_tokens
+            truncate_strategy = truncate_strategy or self.config.browser_use_truncate_strategy
+        truncate_strategy = truncate_strategy or "smart"
+
+        # Check for saved session cookies (Phase 4.3)
+        from urllib.parse import urlparse
+        session = self.session_manager.get_session(urlparse(url).netloc)
+        cookies = session['cookies'] if session else None
 
-        # Fetch website content
         success, content = await fetch_website_content(
             url=url,
             max_tokens=max_tokens,
             truncate_strategy=truncate_strategy,
-            cookies=cookies
+            cookies=cookies,
+            reuse_browser=self.config.browser_pool_enabled if self.config else False,
+            http_first=self.config.browser_use_http_fast_path if self.config else True
         )
+        return success, content, cookies is not None
 
-        if not success:
-            # Track failure
-            self.performance_metrics.track_tool_call("fetch_website", False)
-            return content  # Error message
+    def _website_refresher(self, url: str):
+        """Coroutine function the website cache uses to refresh a stale entry (Phase 12.7)."""
+        async def refresh() -> Optional[str]:
+            success, content, _ = await self._fetch_url_content(url)
+            return content if success else None
+        return refresh
 
-        # Cache the content (Phase 12.2)
+    def start_browser_warmup(self) -> Optional[asyncio.Task]:
+        """
+        Pre-launch Chromium in the background when browser_pool_prewarm is set (Phase 4.4).
+
+        Warms the unified browser pool used by DOM automation and the shared
+        crawler used by fetch_website, so the first browse of a session does not
+        pay a cold browser launch. Both close again after browser_pool_idle_timeout.
+        Must be called from a running event loop.
+
+        Returns:
+            Background warm-up task, or None if warm-up is disabled
+        """
+        if not self.config:
+            return None
+
+        configure_shared_crawler(idle_timeout=self.config.browser_pool_idle_timeout)
+
+        if self.use_openai:
+            # OpenAI mode only registers fetch_website; launch on demand there
+            return None
+
+        self._configure_resource_blocking()
+        browser_tools.configure_dom_backend(self.config.browser_dom_backend)
+
+        if not self.config.browser_pool_enabled:
+            browser_manager.configure_pool(size=0)
+            return None
+
+        browser_manager.configure_pool(
+            size=self.config.browser_pool_size,
+            idle_timeout=self.config.browser_pool_idle_timeout
+        )
+
+        if not self.config.browser_pool_prewarm:
+            return None
+
+        async def _warm():
+            installed, _ = await asyncio.to_thread(check_playwright_installed)
+            if not installed:
+                return
+            try:
+                await browser_manager.warm_up(headless=not self.show_browser)
+                if HAS_CRAWL4AI:
+                    await get_shared_crawler()
+            except Exception as e:
+                # Warm-up is an optimization; tools launch on demand instead
+                logger.warning(f"Background browser warm-up failed: {e}")
+
+        self._browser_warmup_task = asyncio.get_running_loop().create_task(_warm())
+        return self._browser_warmup_task
+
+    def _configure_resource_blocking(self) -> None:
+        """
+        Install request interception on DOM automation and fetch browsers (Phase 4.5).
+
+        Both are text/DOM consumers, so images are blocked too. Vision contexts
+        on the shared browser (browse_many) get a policy that keeps images, as
+        does the vision executor's own BrowserController, since the model sees
+        their screenshots.
+        """
+        if not self.config.browser_resource_blocking or self.config.browser_resource_profile == "off":
+            browser_manager.configure_resource_blocking(None)
+            configure_fetch_resource_blocking(None)
+            return
+
+        profile = self.config.browser_resource_profile
+        auto_detection = self.config.browser_auto_site_detection
+
+        def resolve(url: str) -> Dict[str, Any]:
+            return get_resource_policy(url, profile, vision_mode=False, auto_detection=auto_detection)
+
+        def resolve_vision(url: str) -> Dict[str, Any]:
+            return get_resource_policy(url, profile, vision_mode=True, auto_detection=auto_detection)
+
+        browser_manager.configure_resource_blocking(
+            ResourceBlocker(policy_resolver=resolve),
+            vision_blocker=ResourceBlocker(policy_resolver=resolve_vision)
+        )
+        configure_fetch_resource_blocking(ResourceBlocker(policy_resolver=resolve))
+
+    async def shutdown_browsers(self) -> None:
+        """Close pooled browser resources started by warm-up or tools (Phase 4.4)."""
+        if self._browser_warmup_task is not None and not self._browser_warmup_task.done():
+            self._browser_warmup_task.cancel()
+
+        await browser_manager.close()
+        await close_shared_crawler()
+        await close_http_client()
         if self.website_cache:
-            await self.website_cache.set(url, content)
+            self.website_cache.close()
+        # Routing statistics are shared by both orchestrators and written in batches
+        automation_orchestrator.routing_stats.flush()
+        # Pattern store writes are batched; persist what is still pending
+        stagehand_generator.pattern_store.flush()
 
-        # Format response (Phase 4.3: Include authentication indicator)
-        auth_indicator = " 🔐 (authenticated)" if authenticated else ""
-        response = f"📄 **Fetched{auth_indicator}:** {url}\n\n{content}"
+    def get_browser_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get warm browser pool statistics (Phase 4.4).
 
-        return response
+        Returns:
+            Dictionary with pool hit rate, time-to-page and shared crawler counters
+        """
+        return {
+            'browser_running': browser_manager.is_initialized(),
+            'pool': browser_manager.pool.get_stats(),
+            'fetch_crawler': get_crawler_stats(),
+            'fetch_tiers': get_fetch_stats(),
+            'resource_blocking': browser_manager.get_resource_stats()
+        }
 
     async def clear_website_cache(
         self,
@@ -2688,6 +3365,7 @@ from {module_name} import {', '.join([f['name'] for f in functions] + [c['name']
 
         Note:
             - Shows total cache size, number of entries, expired entries
+            - Shows hit/miss/byte counters and entries in LRU order
             - Helps monitor cache usage and decide when to clear
         """
         if not self.website_cache:
@@ -2706,21 +3384,30 @@ from {module_name} import {', '.join([f['name'] for f in functions] + [c['name']
             response += f"**Location:** `{stats['cache_dir']}`\n\n"
             response += f"**Total Entries:** {stats['total_entries']}\n"
             response += f"**Total Size:** {stats['total_size_mb']} MB\n"
-            response += f"**Expired Entries:** {stats['expired_entries']}\n\n"
+            response += f"**Expired Entries:** {stats['expired_entries']}\n"
+            response += (f"**Hits / Misses:** {stats['hits']} / {stats['misses']} "
+                         f"(hit rate {stats['hit_rate']:.0%})\n")
+            response += (f"**Served:** {stats['bytes_read'] / 1024:.1f} KB · "
+                         f"**Written:** {stats['bytes_written'] / 1024:.1f} KB · "
+                         f"**LRU evictions:** {stats['evictions']}\n")
+            if self.website_cache.stale_while_revalidate > 0:
+                response += (f"**Stale-while-revalidate:** {stats['stale_hits']} stale hit(s), "
+                             f"{stats['revalidations']} refreshed, {stats['revalidation_failures']} failed\n")
+            response += "\n"
 
             if stats['expired_entries'] > 0:
                 response += "💡 *Tip: Expired entries will be automatically cleaned up on next cache access*\n\n"
 
             if stats['total_entries'] > 0:
-                # List cached URLs
+                # List cached URLs, most recently used first
                 response += "**Cached URLs:**\n"
-                for key, entry in self.website_cache.index.items():
+                for key, entry in reversed(self.website_cache.index.items()):
                     age_seconds = time.time() - entry['timestamp']
                     age_minutes = int(age_seconds / 60)
                     expired = age_seconds > self.website_cache.ttl
 
                     status = "❌ Expired" if expired else f"✓ {age_minutes}m old"
-                    response += f"- {status}: {entry['url']}\n"
+                    response += f"- {status}: {entry['url']} ({entry['hits']} hit(s))\n"
 
             return response
 
@@ -3080,6 +3767,72 @@ You can restart the task by running the command again.
             logger.error(f"Autonomous browsing error: {e}")
             return f"❌ Error during autonomous browsing: {str(e)}"
 
+    async def browse_many(
+        self,
+        ctx: RunContext[None],
+        task: str,
+        urls: List[str],
+        max_steps_per_site: int = 10,
+        max_concurrency: int = 3,
+        headless: Optional[bool] = None
+    ) -> str:
+        """
+        Run the same browsing task on several websites at once using vision.
+
+        Each site gets its own isolated browser context in one shared browser,
+        and up to max_concurrency sites are browsed at the same time. Use this
+        instead of repeated browse_and_find calls when the sites are independent.
+
+        **Examples:**
+        - "Find the price of the Sony WH-1000XM5" on three retailer sites
+        - "What are the opening hours?" across several store pages
+
+        **Args:**
+            task: Natural language description of what to accomplish on each site
+            urls: Starting URLs, one per site
+            max_steps_per_site: Maximum browser actions per site (default: 10)
+            max_concurrency: Sites browsed at the same time (default: 3)
+            headless: Run browser invisibly (default: follows show_browser)
+
+        **IMPORTANT:**
+        - Only works in Anthropic API mode (requires vision capabilities)
+
+        **Returns:**
+            Per-site results followed by timing for the whole batch
+        """
+        import logging
+        logger = logging.getLogger(__name__)
+
+        if self.use_bedrock:
+            return (
+                "❌ Autonomous browsing requires vision capabilities.\n\n"
+                "Vision capabilities are not available in AWS Bedrock mode. "
+                "Please use Anthropic API mode to access this feature."
+            )
+
+        if not urls:
+            return "❌ No URLs given to browse"
+
+        try:
+            if headless is None:
+                headless = not self.show_browser
+
+            executor = BrowserTaskExecutor(self.agent)
+            batch = await executor.execute_tasks(
+                [{'task': task, 'url': url} for url in urls],
+                max_concurrency=max_concurrency,
+                max_steps=max_steps_per_site,
+                headless=headless
+            )
+            return executor.get_concurrent_summary(batch)
+
+        except asyncio.CancelledError:
+            return f"🛑 **Task Cancelled**\n\n**Task:** {task}\n\nBrowser automation was interrupted by user (Ctrl+C)."
+
+        except Exception as e:
+            logger.error(f"Concurrent browsing error: {e}")
+            return f"❌ Error during concurrent browsing: {str(e)}"
+
     def _format_extracted_data(self, data: Dict) -> str:
         """Format extracted data for display."""
         if not data:
@@ -4116,6 +4869,8 @@ You can restart the task by running the command again.
             Agent's response
         """
         try:
+            self.tool_cache.start_turn()
+
             # Run the agent with message history (Phase 5.9: Fix context retention)
             # Pass conversation history to maintain context across turns
             result = await self.agent.run(
@@ -4130,6 +4885,7 @@ You can restart the task by running the command again.
             # This includes user message, tool calls, tool responses, and assistant response
             if self.use_history:
                 self.conversation_history = result.all_messages()
+                self._offload_tool_outputs()
 
             # Track token usage
             self._track_tokens(user_message, response_text)
@@ -4147,6 +4903,9 @@ You can restart the task by running the command again.
                     filename = self._suggest_filename(code)
                     success, msg = write_file_safe(filename, code, overwrite=False)
                     if success:
+                        update_symbol_index([filename])
+                        invalidate_git_cache()
+                        self.tool_cache.invalidate()
                         response_text += f"\n\n✓ Code saved to: {filename}"
 
             return response_text
@@ -4180,6 +4939,7 @@ You can restart the task by running the command again.
 
             # Start token budget tracking for this turn
             self.token_budget.start_turn()
+            self.tool_cache.start_turn()
 
             # Track response time
             start_time = time.time()
@@ -4250,6 +5010,9 @@ You can restart the task by running the command again.
                 output_tokens=self.total_output_tokens,
             )
 
+            # Move large tool results from earlier turns out of the history
+            self._offload_tool_outputs()
+
             # Auto-compact if history is too long
             if self.compaction_manager.should_compact(len(self.conversation_history)):
                 self.conversation_history = self.compaction_manager.compact_pydantic_messages(
@@ -4278,6 +5041,9 @@ You can restart the task by running the command again.
                     filename = self._suggest_filename(code)
                     success, msg = write_file_safe(filename, code, overwrite=False)
                     if success:
+                        update_symbol_index([filename])
+                        invalidate_git_cache()
+                        self.tool_cache.invalidate()
                         save_message = f"\n\n✓ Code saved to: {filename}"
                         response_text = response_text + save_message
 
@@ -4689,9 +5455,33 @@ You can restart the task by running the command again.
         Get performance metrics statistics.
 
         Returns:
-            Dictionary with performance metrics
+            Dictionary with performance metrics (tool_cache: per-tool cache hit rates)
         """
-        return self.performance_metrics.get_statistics()
+        stats = self.performance_metrics.get_statistics()
+        stats['tool_cache'] = self.tool_cache.get_stats()
+        if self.tool_output_store is not None:
+            stats['tool_output_store'] = dict(self.tool_output_store.stats)
+        return stats
+
+    def _offload_tool_outputs(self) -> None:
+        """Replace large tool returns from earlier turns with stubs (see ToolOutputStore)."""
+        if self.tool_output_store is None or not self.use_history:
+            return
+        started = time.perf_counter()
+        before = history_tokens(self.conversation_history)
+        try:
+            self.conversation_history = self.tool_output_store.offload(self.conversation_history)
+        except Exception as e:
+            logger.warning(f"Could not offload tool outputs: {e}")
+            return
+        after = history_tokens(self.conversation_history)
+        self.tool_output_store.stats.update(
+            history_tokens_before=before,
+            history_tokens_after=after,
+            offload_seconds=time.perf_counter() - started,
+        )
+        if after < before:
+            logger.info(f"Moved tool outputs out of history: ~{before} -> ~{after} tokens")
 
     def switch_model(self, model_name: str) -> bool:
         """
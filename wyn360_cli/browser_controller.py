@@ -7,11 +7,14 @@ Responsible for: browser lifecycle, action execution, screenshot capture.
 
 import asyncio
 import logging
+import time
 from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 
 # Import configuration system
-from .config import load_config, get_progressive_timeout, get_site_profile
+from .config import load_config, get_progressive_timeout, get_site_profile, get_resource_policy
+from .tools.browser.resource_blocker import ResourceBlocker
+from .screenshot_utils import encode_for_vision, DEFAULT_VISION_MAX_SIZE, DEFAULT_JPEG_QUALITY
 
 try:
     from playwright.async_api import async_playwright, Browser, BrowserContext, Page, ElementHandle, TimeoutError as PlaywrightTimeoutError
@@ -29,6 +32,70 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+# Installed on every document before page scripts run (Phase 5.5). Tracks
+# in-flight fetch/XHR requests and the last network or DOM activity so that
+# stability can be evaluated in-page without fixed sleeps.
+STABILITY_TRACKER_SCRIPT = """
+(() => {
+    if (window.__wyn360Stability) return;
+    const state = { inflight: 0, lastActivity: performance.now() };
+    const bump = () => { state.lastActivity = performance.now(); };
+    const settle = () => { state.inflight = Math.max(0, state.inflight - 1); bump(); };
+
+    if (window.fetch) {
+        const originalFetch = window.fetch;
+        window.fetch = function(...args) {
+            state.inflight++; bump();
+            return originalFetch.apply(this, args).finally(settle);
+        };
+    }
+
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function(...args) {
+        state.inflight++; bump();
+        this.addEventListener('loadend', settle, { once: true });
+        return originalSend.apply(this, args);
+    };
+
+    try {
+        new PerformanceObserver(bump).observe({ type: 'resource' });
+    } catch (e) {}
+
+    const observe = () => new MutationObserver(bump).observe(document.documentElement, {
+        subtree: true, childList: true, attributes: true, characterData: true
+    });
+    if (document.documentElement) observe();
+    else document.addEventListener('DOMContentLoaded', observe, { once: true });
+
+    state.isStable = (quietMs) => {
+        if (document.readyState === 'loading') return false;
+        if (state.inflight > 0) return false;
+        if (performance.now() - state.lastActivity < quietMs) return false;
+        // Finite animations (transitions, slide-ins) must finish; infinite ones (spinners) are ignored
+        const animations = document.getAnimations ? document.getAnimations() : [];
+        return !animations.some(a =>
+            a.playState === 'running' && a.effect && Number.isFinite(a.effect.getComputedTiming().endTime)
+        );
+    };
+
+    Object.defineProperty(window, '__wyn360Stability', { value: state, enumerable: false });
+})();
+"""
+
+# Predicate polled by page.wait_for_function; falls back to readyState for
+# documents the tracker could not be injected into
+STABILITY_PREDICATE = """
+(quietMs) => {
+    const state = window.__wyn360Stability;
+    if (!state) return document.readyState === 'complete';
+    return state.isStable(quietMs);
+}
+"""
+
+# Actions that leave the page untouched, or already waited for it
+NO_SETTLE_ACTIONS = {'navigate', 'extract', 'wait'}
+
+
 class BrowserControllerError(Exception):
     """Base exception for BrowserController errors."""
     pass
@@ -170,6 +237,102 @@ class BrowserConfig:
 
         return config.browser_wait_strategy
 
+    @classmethod
+    def get_wait_mode(cls) -> str:
+        """Get post-navigation/action wait mode ('adaptive' or 'fixed')"""
+        config = cls.get_config()
+
+        if not config:
+            return 'fixed'  # Legacy behavior
+
+        return config.browser_wait_mode
+
+    @classmethod
+    def get_stability_quiet_ms(cls) -> int:
+        """Get the network/DOM quiet window required for stability (ms)"""
+        config = cls.get_config()
+
+        if not config:
+            return 400
+
+        return config.browser_stability_quiet_ms
+
+    @classmethod
+    def get_stability_max_wait(cls, wait_type: str, url: str = "") -> float:
+        """
+        Get the cap on an adaptive stability wait with site-specific optimization.
+
+        Args:
+            wait_type: 'navigation' or 'action'
+            url: URL for site-specific optimization
+
+        Returns:
+            Maximum wait in seconds
+        """
+        config = cls.get_config()
+
+        if not config:
+            return cls.WAIT_AFTER_NAVIGATION if wait_type == 'navigation' else cls.WAIT_AFTER_ACTION
+
+        if wait_type == 'action':
+            return config.browser_stability_max_wait_action
+
+        # Check for site-specific settings
+        if url:
+            site_overrides = get_site_profile(url, config.browser_auto_site_detection)
+            if "browser_stability_max_wait" in site_overrides:
+                return site_overrides["browser_stability_max_wait"]
+
+        return config.browser_stability_max_wait
+
+    @classmethod
+    def get_vision_encoding(cls) -> Dict[str, Any]:
+        """
+        Get screenshot encoding settings for the vision API (Phase 5.6).
+
+        Returns:
+            Dict with image_format, quality and max_size
+        """
+        config = cls.get_config()
+
+        if not config:
+            return {
+                'image_format': 'png',  # Legacy behavior
+                'quality': DEFAULT_JPEG_QUALITY,
+                'max_size': DEFAULT_VISION_MAX_SIZE,
+            }
+
+        return {
+            'image_format': config.browser_vision_image_format,
+            'quality': config.browser_vision_jpeg_quality,
+            'max_size': (config.browser_vision_max_width, config.browser_vision_max_height),
+        }
+
+    @classmethod
+    def get_resource_blocker(cls, vision_mode: bool = True) -> Optional[ResourceBlocker]:
+        """
+        Build the request interception policy for automation (Phase 4.5).
+
+        Args:
+            vision_mode: Keep images, since screenshots go to the vision model
+
+        Returns:
+            ResourceBlocker resolving site profiles per navigation, or None if disabled
+        """
+        config = cls.get_config()
+
+        if not config or not config.browser_resource_blocking or config.browser_resource_profile == "off":
+            return None
+
+        return ResourceBlocker(
+            policy_resolver=lambda url: get_resource_policy(
+                url,
+                config.browser_resource_profile,
+                vision_mode=vision_mode,
+                auto_detection=config.browser_auto_site_detection
+            )
+        )
+
 
 class BrowserController:
     """
@@ -196,6 +359,11 @@ class BrowserController:
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self.resource_blocker: Optional[ResourceBlocker] = None
+        self.last_navigation_resources: Optional[Dict[str, Any]] = None
+        self.wait_log: List[Dict[str, Any]] = []
+        self.last_screenshot_stats: Optional[Dict[str, Any]] = None
+        self._owns_browser = True
         self._initialized = False
 
     async def initialize(
@@ -254,6 +422,14 @@ class BrowserController:
                 }
             )
 
+            # Block heavy resources the automation never uses (Phase 4.5)
+            self.resource_blocker = BrowserConfig.get_resource_blocker(vision_mode=True)
+            if self.resource_blocker is not None:
+                await self.resource_blocker.install(self.context)
+
+            # Track network/DOM activity for adaptive stability waits (Phase 5.5)
+            await self.context.add_init_script(STABILITY_TRACKER_SCRIPT)
+
             # Create new page
             self.page = await self.context.new_page()
 
@@ -284,6 +460,32 @@ class BrowserController:
             await self.cleanup()
             raise BrowserControllerError(f"Browser initialization failed: {e}")
 
+    async def attach(self, page: Page) -> None:
+        """
+        Drive an existing page instead of launching a browser.
+
+        Used for concurrent browsing, where pages live in isolated contexts of
+        one shared browser (UnifiedBrowserManager). The caller owns the page:
+        cleanup() only forgets it.
+
+        Args:
+            page: Page to automate
+        """
+        if self._initialized:
+            logger.warning("Browser already initialized")
+            return
+
+        self.page = page
+        self.context = page.context
+        self._owns_browser = False
+
+        # Track network/DOM activity for adaptive stability waits (Phase 5.5)
+        await self.page.add_init_script(STABILITY_TRACKER_SCRIPT)
+        self.page.set_default_timeout(BrowserConfig.DEFAULT_TIMEOUT)
+
+        self._initialized = True
+        logger.info("Attached to existing page")
+
     async def navigate(self, url: str, wait_until: str = None, attempt: int = 0) -> None:
         """
         Navigate to URL with smart waiting and dynamic configuration.
@@ -307,7 +509,6 @@ class BrowserController:
 
         # Get dynamic timeout with progressive strategy
         navigation_timeout = BrowserConfig.get_timeout('navigation', url, attempt)
-        wait_after_nav = BrowserConfig.get_wait_after_navigation(url)
 
         try:
             logger.info(f"Navigating to: {url} (timeout: {navigation_timeout}ms, wait_until: {wait_until}, attempt: {attempt + 1})")
@@ -319,8 +520,10 @@ class BrowserController:
                 timeout=navigation_timeout
             )
 
-            # Additional wait for JavaScript rendering (configurable)
-            await asyncio.sleep(wait_after_nav)
+            # Wait for JavaScript rendering to settle (adaptive or fixed, configurable)
+            await self.wait_for_page_stable('navigation', url)
+
+            self._record_navigation_resources(url)
 
             # Check for common blocking patterns
             await self._check_for_blocking_patterns(url)
@@ -342,18 +545,144 @@ class BrowserController:
         except Exception as e:
             raise BrowserControllerError(f"Navigation failed: {e}")
 
-    async def take_screenshot(self, optimize_for_vision: bool = True) -> bytes:
+    async def wait_for_page_stable(self, wait_type: str = 'action', url: str = "") -> Dict[str, Any]:
         """
-        Capture screenshot optimized for Claude Vision.
+        Wait until the page settles after a navigation or action (Phase 5.5).
+
+        In adaptive mode the page counts as stable once no fetch/XHR is in
+        flight, no resource has loaded and the DOM has not mutated for the
+        quiet window, and no finite animation is running. The wait is capped
+        per site profile. In fixed mode the configured wait_after_* delay is
+        slept instead.
+
+        Args:
+            wait_type: 'navigation' or 'action'
+            url: URL for site-specific caps (defaults to the current page URL)
+
+        Returns:
+            Wait record with seconds waited and whether the page settled
+        """
+        url = url or (self.page.url if self.page else "")
+        start = time.perf_counter()
+
+        if BrowserConfig.get_wait_mode() == 'fixed':
+            if wait_type == 'navigation':
+                delay = BrowserConfig.get_wait_after_navigation(url)
+            else:
+                delay = BrowserConfig.get_wait_after_action(url)
+            await asyncio.sleep(delay)
+            return self._record_wait(wait_type, url, 'fixed', True, time.perf_counter() - start)
+
+        max_wait = BrowserConfig.get_stability_max_wait(wait_type, url)
+        quiet_ms = BrowserConfig.get_stability_quiet_ms()
+        stable = False
+
+        while True:
+            remaining = max_wait - (time.perf_counter() - start)
+            if remaining <= 0:
+                break
+            try:
+                await self.page.wait_for_function(
+                    STABILITY_PREDICATE,
+                    arg=quiet_ms,
+                    polling=100,
+                    timeout=int(remaining * 1000)
+                )
+                stable = True
+                break
+            except PlaywrightTimeoutError:
+                break
+            except Exception as e:
+                # Execution context destroyed by a navigation the action triggered
+                logger.debug(f"Stability check interrupted, retrying: {e}")
+                try:
+                    await self.page.wait_for_load_state('domcontentloaded', timeout=int(remaining * 1000))
+                except Exception:
+                    break
+
+        return self._record_wait(wait_type, url, 'adaptive', stable, time.perf_counter() - start)
+
+    def _record_wait(self, wait_type: str, url: str, mode: str, stable: bool, waited: float) -> Dict[str, Any]:
+        """Append a wait record so site profiles can be tuned from data."""
+        record = {
+            'type': wait_type,
+            'url': url,
+            'mode': mode,
+            'stable': stable,
+            'waited': waited
+        }
+        self.wait_log.append(record)
+        logger.debug(f"Waited {waited:.2f}s after {wait_type} ({mode}, stable={stable})")
+        return record
+
+    def get_wait_stats(self) -> Dict[str, Any]:
+        """
+        Summarize post-navigation/action waits for this browser session.
+
+        Returns:
+            Totals and averages per wait type, plus how often the cap was hit
+        """
+        stats: Dict[str, Any] = {
+            'total_waits': len(self.wait_log),
+            'total_wait_time': sum(r['waited'] for r in self.wait_log),
+            'capped': sum(1 for r in self.wait_log if not r['stable'])
+        }
+        for wait_type in ('navigation', 'action'):
+            waits = [r['waited'] for r in self.wait_log if r['type'] == wait_type]
+            stats[wait_type] = {
+                'count': len(waits),
+                'avg': sum(waits) / len(waits) if waits else 0.0,
+                'max': max(waits) if waits else 0.0
+            }
+        return stats
+
+    def _record_navigation_resources(self, url: str) -> None:
+        """Capture requests/bytes saved by interception for the last navigation."""
+        if self.resource_blocker is None:
+            return
+
+        self.last_navigation_resources = self.resource_blocker.navigation_stats(self.page)
+        if self.last_navigation_resources:
+            logger.info(
+                f"Blocked {self.last_navigation_resources['requests_blocked']}/"
+                f"{self.last_navigation_resources['requests_total']} requests "
+                f"(~{self.last_navigation_resources['bytes_saved'] // 1024} KB saved): {url}"
+            )
+
+    def get_resource_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get request interception statistics for this browser session.
+
+        Returns:
+            Cumulative counters plus the last navigation, or None if disabled
+        """
+        if self.resource_blocker is None:
+            return None
+
+        stats = self.resource_blocker.get_stats()
+        stats['last_navigation'] = self.last_navigation_resources
+        return stats
+
+    async def take_screenshot(
+        self,
+        optimize_for_vision: bool = True,
+        roi_selector: Optional[str] = None,
+        roi_padding: int = 16
+    ) -> bytes:
+        """
+        Capture screenshot optimized for Claude Vision (Phase 5.6).
 
         Args:
             optimize_for_vision: Optimize screenshot for vision API (default: True)
-                                - Resolution: 1024x768 (XGA - optimal for vision API)
-                                - Format: PNG
-                                - Compression: Balanced for quality vs size
+                                - Captured at CSS pixel scale (device scale 1)
+                                - Downscaled to fit the configured box (default 1024x768)
+                                - Re-encoded as JPEG at the configured quality
+            roi_selector: Optional selector; crop the capture to this element
+                          (plus roi_padding pixels), clamped to the viewport
+            roi_padding: Padding around the region of interest in CSS pixels
 
         Returns:
-            Screenshot as bytes (PNG format)
+            Screenshot as bytes (JPEG or PNG; see screenshot_utils.detect_media_type)
 
         Raises:
             BrowserControllerError: If screenshot capture fails
@@ -363,18 +692,73 @@ class BrowserController:
 
         try:
             logger.debug("Capturing screenshot")
+            start = time.perf_counter()
 
-            screenshot_bytes = await self.page.screenshot(
-                type='png',
-                full_page=False  # Only visible viewport (better for vision analysis)
-            )
+            options: Dict[str, Any] = {
+                'type': 'png',
+                'full_page': False,  # Only visible viewport (better for vision analysis)
+            }
+            if optimize_for_vision:
+                # HiDPI contexts would otherwise capture 2-3x the pixels we upload
+                options['scale'] = 'css'
+            if roi_selector:
+                clip = await self._get_roi_clip(roi_selector, roi_padding)
+                if clip:
+                    options['clip'] = clip
+
+            screenshot_bytes = await self.page.screenshot(**options)
+            raw_size = len(screenshot_bytes)
+
+            if optimize_for_vision:
+                encoding = BrowserConfig.get_vision_encoding()
+                screenshot_bytes = encode_for_vision(
+                    screenshot_bytes,
+                    max_size=encoding['max_size'],
+                    image_format=encoding['image_format'],
+                    quality=encoding['quality']
+                )
+
+            self.last_screenshot_stats = {
+                'raw_bytes': raw_size,
+                'encoded_bytes': len(screenshot_bytes),
+                'capture_ms': (time.perf_counter() - start) * 1000,
+                'cropped': 'clip' in options,
+            }
 
-            logger.debug(f"Screenshot captured ({len(screenshot_bytes)} bytes)")
+            logger.debug(f"Screenshot captured ({raw_size} bytes raw, {len(screenshot_bytes)} bytes encoded)")
             return screenshot_bytes
 
         except Exception as e:
             raise BrowserControllerError(f"Screenshot capture failed: {e}")
 
+    async def _get_roi_clip(self, selector: str, padding: int) -> Optional[Dict[str, float]]:
+        """
+        Compute a screenshot clip rectangle around an element.
+
+        Returns:
+            Clip dict clamped to the viewport, or None if the element is not visible
+        """
+        try:
+            element = await self.page.query_selector(selector)
+            box = await element.bounding_box() if element else None
+        except Exception as e:
+            logger.debug(f"Region of interest '{selector}' not found: {e}")
+            return None
+
+        if not box:
+            return None
+
+        viewport = self.page.viewport_size or {'width': 1024, 'height': 768}
+        x = max(0.0, box['x'] - padding)
+        y = max(0.0, box['y'] - padding)
+        right = min(float(viewport['width']), box['x'] + box['width'] + padding)
+        bottom = min(float(viewport['height']), box['y'] + box['height'] + padding)
+
+        if right <= x or bottom <= y:
+            return None  # Element is scrolled out of view
+
+        return {'x': x, 'y': y, 'width': right - x, 'height': bottom - y}
+
     async def execute_action(self, action: Dict[str, Any], retry: bool = True) -> Dict[str, Any]:
         """
         Execute browser action from parsed decision (Phase 5.4: with retry logic).
@@ -427,8 +811,12 @@ class BrowserController:
                 else:
                     raise BrowserControllerError(f"Unknown action type: {action_type}")
 
-                # Wait for page updates after action (Phase 5.4)
-                await asyncio.sleep(BrowserConfig.WAIT_AFTER_ACTION)
+                # Wait for page updates after action (Phase 5.4, adaptive since 5.5)
+                if action_type in NO_SETTLE_ACTIONS and BrowserConfig.get_wait_mode() == 'adaptive':
+                    result['wait_time'] = 0.0
+                else:
+                    wait = await self.wait_for_page_stable('action')
+                    result['wait_time'] = wait['waited']
 
                 return result
 
@@ -533,8 +921,10 @@ class BrowserController:
             await self.page.type(selector, text, delay=50)  # Realistic typing speed
             logger.info(f"Typed into {selector}: {text}")
 
-            # Small delay for any auto-complete/suggestions
-            await asyncio.sleep(0.5)
+            # Small delay for any auto-complete/suggestions (the adaptive
+            # post-action wait covers this by waiting for the XHR/DOM update)
+            if BrowserConfig.get_wait_mode() == 'fixed':
+                await asyncio.sleep(0.5)
 
             return {'success': True, 'action': 'type', 'selector': selector, 'text': text}
 
@@ -558,8 +948,9 @@ class BrowserController:
 
             logger.info(f"Scrolled {direction} by {amount}px")
 
-            # Wait for any lazy-loaded content
-            await asyncio.sleep(1)
+            # Wait for any lazy-loaded content (covered by the adaptive post-action wait)
+            if BrowserConfig.get_wait_mode() == 'fixed':
+                await asyncio.sleep(1)
 
             return {'success': True, 'action': 'scroll', 'direction': direction, 'amount': amount}
 
@@ -794,6 +1185,14 @@ class BrowserController:
 
         This method is safe to call multiple times.
         """
+        if not self._owns_browser:
+            # Attached page: its owner closes it
+            self.page = None
+            self.context = None
+            self._owns_browser = True
+            self._initialized = False
+            return
+
         logger.info("Cleaning up browser resources")
 
         try:
@@ -809,6 +1208,8 @@ class BrowserController:
                     logger.error(f"Error closing {name}: {e}")
 
             if self.page:
+                if self.resource_blocker is not None:
+                    self.resource_blocker.forget_page(self.page)
                 await force_close(self.page.close(), "page")
                 self.page = None
 
@@ -3,15 +3,21 @@ Browser Task Executor for autonomous browser automation.
 
 This module orchestrates autonomous browser tasks using vision-based decision making.
 Coordinates BrowserController (automation) + VisionDecisionEngine (AI).
+
+Independent sub-tasks (e.g. the same question on several sites) can run
+concurrently, each in an isolated context of one shared Chromium.
 """
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from pydantic_ai import Agent
 
-from .browser_controller import BrowserController, BrowserControllerError
+from .browser_controller import BrowserController, BrowserControllerError, BrowserConfig
 from .vision_engine import VisionDecisionEngine, VisionDecisionError
+from .screenshot_utils import ScreenshotChangeDetector
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +27,56 @@ class BrowserTaskExecutorError(Exception):
     pass
 
 
+# Per-task counters added up across concurrent sub-tasks
+SUMMED_METRICS = (
+    'screenshots_taken', 'actions_executed', 'errors_encountered',
+    'vision_api_calls', 'vision_calls_skipped', 'vision_tokens_saved', 'vision_cache_hits'
+)
+
+
+class VisionDecisionCache:
+    """
+    Decisions for first steps, shared between concurrent sub-tasks.
+
+    Only decisions made with an empty history are cached: with no prior
+    actions, the same goal on a visually identical page at the same URL gets
+    the same decision, so sub-tasks that start alike (or retries of one
+    sub-task) skip a vision call.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, int], Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(goal: str, url: str, signature) -> Optional[Tuple[str, str, int]]:
+        """Cache key, or None when the screenshot could not be fingerprinted"""
+        if signature is None:
+            return None
+        return (goal, url, signature.dhash)
+
+    def get(self, key: Optional[Tuple[str, str, int]]) -> Optional[Dict[str, Any]]:
+        if key is None:
+            return None
+        decision = self._entries.get(key)
+        if decision is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return decision
+
+    def put(self, key: Optional[Tuple[str, str, int]], decision: Dict[str, Any]) -> None:
+        if key is None:
+            return
+        self._entries[key] = decision
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
 class BrowserTaskExecutor:
     """
     Orchestrates autonomous browser tasks using vision-based decision making.
@@ -39,23 +95,34 @@ class BrowserTaskExecutor:
     - Execution metrics tracking
     """
 
-    def __init__(self, agent: Agent):
+    def __init__(
+        self,
+        agent: Agent,
+        vision_engine: Optional[VisionDecisionEngine] = None,
+        decision_cache: Optional[VisionDecisionCache] = None
+    ):
         """
         Initialize with WYN360Agent (pydantic-ai).
 
         Args:
             agent: pydantic-ai Agent instance (must support vision)
+            vision_engine: Engine to share with other executors (default: a new one)
+            decision_cache: First-step decision cache shared by concurrent sub-tasks
         """
         self.agent = agent
         self.controller = BrowserController()
-        self.vision_engine = VisionDecisionEngine(agent)
+        self.vision_engine = vision_engine or VisionDecisionEngine(agent)
+        self.decision_cache = decision_cache
+        self.change_detector = ScreenshotChangeDetector()
+        self.max_consecutive_skips = 2  # Force a fresh vision look after this many reuses
 
     async def execute_task(
         self,
         task: str,
         url: str,
         max_steps: int = 20,
-        headless: bool = False
+        headless: bool = False,
+        page=None
     ) -> Dict[str, Any]:
         """
         Execute multi-step browser task autonomously.
@@ -65,6 +132,7 @@ class BrowserTaskExecutor:
             url: Starting URL
             max_steps: Maximum browser actions (default: 20)
             headless: Run browser in headless mode (default: False for user visibility)
+            page: Existing Playwright page to drive instead of launching a browser
 
         Returns:
             Result dictionary:
@@ -90,7 +158,14 @@ class BrowserTaskExecutor:
             'screenshots_taken': 0,
             'actions_executed': 0,
             'vision_api_calls': 0,
-            'errors_encountered': 0
+            'errors_encountered': 0,
+            'wait_time': 0.0,
+            'step_wait_times': [],
+            'vision_calls_skipped': 0,
+            'vision_tokens_saved': 0,
+            'vision_upload_bytes': [],
+            'vision_latencies': [],
+            'vision_cache_hits': 0
         }
 
         # Initialize state
@@ -98,14 +173,20 @@ class BrowserTaskExecutor:
         stuck_count = 0
         last_action = None
         api_error_count = 0  # Track consecutive API errors
+        last_decision = None  # Last vision decision, reusable while the page is unchanged
+        consecutive_skips = 0
+        self.change_detector.reset()
 
         # Flag to track if we're in the middle of cleanup
         cleanup_in_progress = False
 
         try:
-            # Initialize browser
-            logger.info("Initializing browser...")
-            await self.controller.initialize(headless=headless)
+            # Initialize browser (or drive a page from a shared browser)
+            if page is not None:
+                await self.controller.attach(page)
+            else:
+                logger.info("Initializing browser...")
+                await self.controller.initialize(headless=headless)
 
             # Navigate to starting URL
             logger.info(f"Navigating to {url}...")
@@ -127,48 +208,84 @@ class BrowserTaskExecutor:
                     page_state = await self.controller.get_page_state()
                     logger.info(f"Current page: {page_state.get('url', 'unknown')}")
 
-                    # 2. Analyze and decide (ALL AI via pydantic-ai + Anthropic Vision)
-                    logger.debug("Analyzing screenshot with vision engine...")
+                    # 2. Skip the vision round-trip when the page has not visibly
+                    # changed and the previous decision can be reused or adjusted
+                    decision = None
+                    api_fallback = False
+                    frame_changed = self.change_detector.has_changed(screenshot, page_state.get('url', ''))
+                    if not frame_changed and history and consecutive_skips < self.max_consecutive_skips:
+                        decision = self._reuse_decision(last_decision, history[-1]['result'])
+
+                    if decision is not None:
+                        consecutive_skips += 1
+                        metrics['vision_calls_skipped'] += 1
+                        metrics['vision_tokens_saved'] += self.vision_engine.estimate_input_tokens(
+                            screenshot, task, history, page_state
+                        )
+                        logger.info("Page unchanged since last step, reusing previous decision (vision call skipped)")
+                    else:
+                        consecutive_skips = 0
 
-                    try:
-                        decision = await self.vision_engine.analyze_and_decide(
-                            screenshot=screenshot,
-                            goal=task,
-                            history=history,
-                            page_state=page_state
+                    cache_key = None
+                    if decision is None and self.decision_cache is not None and not history:
+                        cache_key = VisionDecisionCache.make_key(
+                            task, page_state.get('url', ''), self.change_detector.last_signature
                         )
-                        metrics['vision_api_calls'] += 1
-                        api_error_count = 0  # Reset on successful API call
-
-                    except Exception as e:
-                        api_error_count += 1
-                        logger.error(f"Vision analysis failed (attempt {api_error_count}): {e}")
-
-                        if api_error_count >= 5:
-                            logger.error("Too many consecutive API failures, giving up")
-                            metrics['end_time'] = asyncio.get_event_loop().time()
-                            metrics['total_duration'] = metrics['end_time'] - metrics['start_time']
-                            return {
-                                'status': 'failed',
-                                'result': None,
-                                'steps_taken': step + 1,
-                                'history': history,
-                                'reasoning': f"Repeated API failures: {e}",
-                                'metrics': metrics
+                        decision = self.decision_cache.get(cache_key)
+                        if decision is not None:
+                            metrics['vision_cache_hits'] += 1
+                            logger.info("Reusing a concurrent sub-task's decision for this page (vision call skipped)")
+
+                    if decision is None:
+                        # Analyze and decide (ALL AI via pydantic-ai + Anthropic Vision)
+                        logger.debug("Analyzing screenshot with vision engine...")
+
+                        try:
+                            vision_start = time.perf_counter()
+                            decision = await self.vision_engine.analyze_and_decide(
+                                screenshot=screenshot,
+                                goal=task,
+                                history=history,
+                                page_state=page_state
+                            )
+                            metrics['vision_api_calls'] += 1
+                            metrics['vision_upload_bytes'].append(len(screenshot))
+                            metrics['vision_latencies'].append(time.perf_counter() - vision_start)
+                            api_error_count = 0  # Reset on successful API call
+                            if cache_key is not None:
+                                self.decision_cache.put(cache_key, decision)
+
+                        except Exception as e:
+                            api_error_count += 1
+                            logger.error(f"Vision analysis failed (attempt {api_error_count}): {e}")
+
+                            if api_error_count >= 5:
+                                logger.error("Too many consecutive API failures, giving up")
+                                metrics['end_time'] = asyncio.get_event_loop().time()
+                                metrics['total_duration'] = metrics['end_time'] - metrics['start_time']
+                                return {
+                                    'status': 'failed',
+                                    'result': None,
+                                    'steps_taken': step + 1,
+                                    'history': history,
+                                    'reasoning': f"Repeated API failures: {e}",
+                                    'metrics': metrics
+                                }
+
+                            # Use fallback decision for API failures
+                            api_fallback = True
+                            decision = {
+                                'status': 'continue',
+                                'action': {'type': 'wait', 'seconds': 2},
+                                'reasoning': f'API error, waiting before retry (attempt {api_error_count})',
+                                'confidence': 10
                             }
 
-                        # Use fallback decision for API failures
-                        decision = {
-                            'status': 'continue',
-                            'action': {'type': 'wait', 'seconds': 2},
-                            'reasoning': f'API error, waiting before retry (attempt {api_error_count})',
-                            'confidence': 10
-                        }
-
                     logger.info(f"Decision: {decision['status']}")
                     logger.info(f"Action: {decision['action'].get('type', 'none')}")
                     logger.info(f"Confidence: {decision.get('confidence', 0)}%")
                     logger.debug(f"Reasoning: {decision.get('reasoning', 'N/A')[:100]}...")
+                    last_decision = None if api_fallback else decision
 
                     # 3. Check if task complete
                     if decision['status'] == 'complete':
@@ -221,9 +338,15 @@ class BrowserTaskExecutor:
 
                     last_action = decision['action']
 
-                    # 7. Small delay for page updates
-                    logger.debug("Waiting for page to update...")
-                    await asyncio.sleep(1)
+                    # 7. Record how long the controller waited for the page to settle
+                    # (adaptive stability wait inside execute_action, Phase 5.5)
+                    step_wait = action_result.get('wait_time', 0.0)
+                    if BrowserConfig.get_wait_mode() == 'fixed':
+                        logger.debug("Waiting for page to update...")
+                        await asyncio.sleep(1)
+                        step_wait += 1.0
+                    metrics['step_wait_times'].append(step_wait)
+                    metrics['wait_time'] += step_wait
 
                 except VisionDecisionError as e:
                     logger.error(f"Vision decision error: {e}")
@@ -304,6 +427,155 @@ class BrowserTaskExecutor:
             'metrics': metrics
         }
 
+    async def execute_tasks(
+        self,
+        subtasks: List[Dict[str, Any]],
+        max_concurrency: int = 3,
+        max_steps: int = 20,
+        headless: bool = True,
+        browser_manager=None
+    ) -> Dict[str, Any]:
+        """
+        Execute independent sub-tasks concurrently in one shared browser.
+
+        Each sub-task runs in its own browser context (separate cookies and
+        storage) on the unified browser, with at most max_concurrency running
+        at once. Sub-tasks share this executor's vision engine and a decision
+        cache for their first step.
+
+        Args:
+            subtasks: Dicts with 'task' and 'url' (optional 'max_steps')
+            max_concurrency: Maximum sub-tasks running at the same time
+            max_steps: Default step budget per sub-task
+            headless: Run the shared browser in headless mode
+            browser_manager: UnifiedBrowserManager to use (default: the global one)
+
+        Returns:
+            Dict with:
+                - status: 'success' if every sub-task succeeded, 'partial' if some did, else 'failed'
+                - results: Per-sub-task results, in input order
+                - metrics: Aggregated counters, wall time and summed sequential time
+        """
+        if browser_manager is None:
+            from .tools.browser.browser_manager import browser_manager
+
+        if self.decision_cache is None:
+            self.decision_cache = VisionDecisionCache()
+
+        await browser_manager.initialize(headless=headless)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        wall_start = time.perf_counter()
+
+        async def run(index: int, subtask: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                executor = BrowserTaskExecutor(self.agent, self.vision_engine, self.decision_cache)
+                page = None
+                try:
+                    # Vision context: screenshots need images, unlike DOM automation pages.
+                    # The page is held until release, so idle shutdown cannot close it mid-task.
+                    page = await browser_manager.acquire_page(vision=True)
+                    result = await executor.execute_task(
+                        task=subtask['task'],
+                        url=subtask['url'],
+                        max_steps=subtask.get('max_steps', max_steps),
+                        page=page
+                    )
+                except Exception as e:
+                    logger.error(f"Sub-task {index + 1} ({subtask.get('url')}) failed: {e}")
+                    result = {
+                        'status': 'failed',
+                        'result': None,
+                        'steps_taken': 0,
+                        'history': [],
+                        'reasoning': f"Sub-task failed: {e}",
+                        'metrics': {}
+                    }
+                finally:
+                    if page is not None:
+                        await browser_manager.release_page(page)
+
+                result['task'] = subtask['task']
+                result['url'] = subtask['url']
+                return result
+
+        results = await asyncio.gather(*(run(i, subtask) for i, subtask in enumerate(subtasks)))
+        wall_time = time.perf_counter() - wall_start
+
+        metrics = {
+            'subtasks': len(results),
+            'max_concurrency': max(1, max_concurrency),
+            'wall_time': wall_time,
+            'sequential_time': 0.0,
+            'status_counts': {}
+        }
+        metrics.update(dict.fromkeys(SUMMED_METRICS, 0))
+
+        for result in results:
+            status = result['status']
+            metrics['status_counts'][status] = metrics['status_counts'].get(status, 0) + 1
+            sub_metrics = result.get('metrics') or {}
+            metrics['sequential_time'] += sub_metrics.get('total_duration') or 0.0
+            for key in SUMMED_METRICS:
+                metrics[key] += sub_metrics.get(key, 0)
+
+        succeeded = metrics['status_counts'].get('success', 0)
+        if results and succeeded == len(results):
+            status = 'success'
+        elif succeeded:
+            status = 'partial'
+        else:
+            status = 'failed'
+
+        return {'status': status, 'results': list(results), 'metrics': metrics}
+
+    def _reuse_decision(
+        self,
+        previous: Optional[Dict[str, Any]],
+        last_result: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Derive the next decision from the previous one when the page is unchanged.
+
+        Only cases where another look at an identical screenshot would not add
+        information are handled:
+        - a wait that changed nothing is repeated with a longer delay
+        - a failed click that had both a selector and visible text is retried
+          by text alone
+
+        Args:
+            previous: Previous decision from the vision engine
+            last_result: Result of executing the previous decision's action
+
+        Returns:
+            Adjusted decision, or None if a fresh vision call is needed
+        """
+        if not previous or previous.get('status') != 'continue':
+            return None
+
+        action = previous.get('action') or {}
+        action_type = action.get('type')
+        succeeded = last_result.get('success', False)
+
+        if action_type == 'wait' and succeeded:
+            seconds = min(action.get('seconds', 2) * 2, 8)
+            return {
+                **previous,
+                'action': {**action, 'seconds': seconds},
+                'reasoning': f"Page unchanged after waiting, waiting {seconds}s more",
+                'reused': True
+            }
+
+        if action_type == 'click' and not succeeded and action.get('selector') and action.get('text'):
+            adjusted = {k: v for k, v in action.items() if k != 'selector'}
+            return {
+                **previous,
+                'action': adjusted,
+                'reasoning': f"Click on selector failed with no visible change, retrying by text '{action['text']}'",
+                'reused': True
+            }
+
+        return None
+
     def _handle_stuck_state(
         self,
         task: str,
@@ -372,6 +644,17 @@ class BrowserTaskExecutor:
             summary += f"**Screenshots:** {metrics.get('screenshots_taken', 0)}\n"
             summary += f"**Actions:** {metrics.get('actions_executed', 0)}\n"
             summary += f"**Errors:** {metrics.get('errors_encountered', 0)}\n"
+            if metrics.get('vision_calls_skipped'):
+                summary += f"**Vision Calls Skipped:** {metrics['vision_calls_skipped']} (~{metrics['vision_tokens_saved']:,} tokens saved)\n"
+            if metrics.get('step_wait_times'):
+                summary += f"**Page Settle Time:** {metrics['wait_time']:.1f}s\n"
+            if metrics.get('vision_upload_bytes'):
+                uploads = metrics['vision_upload_bytes']
+                latencies = metrics['vision_latencies']
+                summary += (
+                    f"**Vision Upload:** {sum(uploads) / len(uploads) / 1024:.0f} KB/step, "
+                    f"{sum(latencies) / len(latencies):.1f}s avg latency\n"
+                )
 
         summary += f"\n**Reasoning:**\n{result.get('reasoning', 'N/A')}\n"
 
@@ -380,6 +663,30 @@ class BrowserTaskExecutor:
 
         return summary
 
+    def get_concurrent_summary(self, batch: Dict[str, Any]) -> str:
+        """
+        Generate human-readable summary of an execute_tasks() batch.
+
+        Args:
+            batch: Result dictionary from execute_tasks()
+
+        Returns:
+            Formatted summary string
+        """
+        metrics = batch['metrics']
+        summary = (
+            f"**{metrics['subtasks']} sites browsed** "
+            f"({metrics['max_concurrency']} at a time) in {metrics['wall_time']:.1f}s "
+            f"(sequential: {metrics['sequential_time']:.1f}s)\n"
+        )
+        if metrics.get('vision_cache_hits'):
+            summary += f"**Shared Decisions Reused:** {metrics['vision_cache_hits']}\n"
+
+        for result in batch['results']:
+            summary += f"\n---\n### {result['url']}\n\n{self.get_summary(result)}"
+
+        return summary
+
     def _format_data(self, data: Any, indent: int = 0) -> str:
         """Format extracted data for display."""
         if isinstance(data, dict):
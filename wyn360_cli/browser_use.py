@@ -4,19 +4,29 @@ This module provides website fetching and caching capabilities using crawl4ai.
 Phase 12.1: Basic fetching with smart truncation
 Phase 12.2: TTL-based caching
 Phase 12.3: User-controlled persistent storage
+Phase 12.4: Shared long-lived crawler (no browser launch per fetch)
+Phase 12.5: Browserless HTTP fast path, browser only for JS-rendered pages
+Phase 12.7: SQLite-indexed LRU cache with batched writes and stale-while-revalidate
+Phase 12.8: Query-aware reduction with cached page sections
 """
 
+import asyncio
 import hashlib
 import gzip
 import json
 import time
 import re
 import os
+import sqlite3
 import subprocess
 from pathlib import Path
-from typing import Optional, Tuple
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Optional, Tuple
 from urllib.parse import urlparse
 
+from .http_fetch import fetch_http, HttpFetchResult
+
 # crawl4ai is optional - only available if installed
 try:
     from crawl4ai import AsyncWebCrawler
@@ -26,6 +36,183 @@ except ImportError:
     AsyncWebCrawler = None
 
 
+# Long-lived crawler shared across fetches (Phase 12.4)
+_shared_crawler = None
+_shared_crawler_lock: Optional[asyncio.Lock] = None
+_crawler_stats = {'launches': 0, 'reuses': 0, 'launch_seconds': 0.0, 'idle_shutdowns': 0}
+
+# Idle shutdown for the shared crawler, matching the warm page pool's timeout
+_crawler_idle_timeout: float = 300.0
+_crawler_last_used: float = 0.0
+_crawler_active = 0
+_crawler_idle_task: Optional[asyncio.Task] = None
+
+# Request interception for the shared crawler's pages (Phase 4.5)
+_fetch_resource_blocker = None
+
+# Tier used per fetch and its latency (Phase 12.5)
+_fetch_stats = {
+    'http': 0, 'browser': 0, 'escalations': 0,
+    'http_seconds': 0.0, 'browser_seconds': 0.0,
+    'recent': deque(maxlen=20)
+}
+
+
+def _record_fetch(url: str, tier: str, latency: float, reason: Optional[str] = None) -> None:
+    """Record which tier served a fetch and how long it took."""
+    _fetch_stats[tier] += 1
+    _fetch_stats[f'{tier}_seconds'] += latency
+    _fetch_stats['recent'].append({
+        'url': url, 'tier': tier, 'latency': round(latency, 3), 'escalated_because': reason
+    })
+
+
+def get_fetch_stats() -> dict:
+    """Get per-tier counts, average latencies and the most recent fetches."""
+    stats = {key: value for key, value in _fetch_stats.items() if key != 'recent'}
+    for tier in ('http', 'browser'):
+        count = _fetch_stats[tier]
+        stats[f'{tier}_avg_seconds'] = round(_fetch_stats[f'{tier}_seconds'] / count, 3) if count else 0.0
+    stats['recent'] = list(_fetch_stats['recent'])
+    return stats
+
+
+def configure_fetch_resource_blocking(blocker) -> None:
+    """
+    Set the ResourceBlocker used by the shared crawler.
+
+    Takes effect the next time the shared crawler is started.
+
+    Args:
+        blocker: ResourceBlocker instance, or None to disable interception
+    """
+    global _fetch_resource_blocker
+    _fetch_resource_blocker = blocker
+
+
+def _install_resource_hook(crawler) -> None:
+    """Route every page the crawler opens through the configured blocker."""
+    blocker = _fetch_resource_blocker
+    strategy = getattr(crawler, 'crawler_strategy', None)
+    if blocker is None or strategy is None or not hasattr(strategy, 'set_hook'):
+        return
+
+    async def on_page_context_created(page, context=None, **kwargs):
+        await blocker.install(page)
+        page.on("close", blocker.forget_page)
+        return page
+
+    strategy.set_hook('on_page_context_created', on_page_context_created)
+
+
+def configure_shared_crawler(idle_timeout: Optional[float] = None) -> None:
+    """
+    Configure the shared crawler's lifetime.
+
+    Args:
+        idle_timeout: Seconds without a fetch before the crawler's browser is
+            closed (0 disables); relaunched on the next fetch
+    """
+    global _crawler_idle_timeout
+    if idle_timeout is not None:
+        _crawler_idle_timeout = idle_timeout
+
+
+def _start_crawler_idle_watchdog() -> None:
+    """Start the task that closes the shared crawler after _crawler_idle_timeout"""
+    global _crawler_idle_task
+    if _crawler_idle_timeout <= 0:
+        return
+    if _crawler_idle_task is not None and not _crawler_idle_task.done():
+        return
+    _crawler_idle_task = asyncio.get_running_loop().create_task(_crawler_idle_watchdog())
+
+
+async def _crawler_idle_watchdog() -> None:
+    """Close the shared crawler once no fetch has used it for _crawler_idle_timeout"""
+    global _crawler_idle_task
+    interval = min(_crawler_idle_timeout, 30.0)
+    while _shared_crawler is not None:
+        await asyncio.sleep(interval)
+        idle_for = time.time() - _crawler_last_used
+        if not _crawler_active and idle_for >= _crawler_idle_timeout:
+            _crawler_stats['idle_shutdowns'] += 1
+            _crawler_idle_task = None
+            await close_shared_crawler()
+            return
+
+
+async def get_shared_crawler():
+    """
+    Get the shared AsyncWebCrawler, starting its browser on first use.
+
+    The browser is closed again after the configured idle timeout; hold it
+    through use_shared_crawler() to keep it open for the duration of a fetch.
+
+    Returns:
+        Started AsyncWebCrawler instance
+    """
+    global _shared_crawler, _shared_crawler_lock, _crawler_last_used
+
+    if _shared_crawler_lock is None:
+        _shared_crawler_lock = asyncio.Lock()
+
+    async with _shared_crawler_lock:
+        if _shared_crawler is None:
+            start = time.perf_counter()
+            crawler = AsyncWebCrawler()
+            _install_resource_hook(crawler)
+            await crawler.start()
+            _shared_crawler = crawler
+            _crawler_stats['launches'] += 1
+            _crawler_stats['launch_seconds'] += time.perf_counter() - start
+        else:
+            _crawler_stats['reuses'] += 1
+        _crawler_last_used = time.time()
+        _start_crawler_idle_watchdog()
+
+    return _shared_crawler
+
+
+@asynccontextmanager
+async def use_shared_crawler():
+    """Hold the shared crawler so the idle watchdog does not close it mid-fetch."""
+    global _crawler_active, _crawler_last_used
+
+    crawler = await get_shared_crawler()
+    _crawler_active += 1
+    try:
+        yield crawler
+    finally:
+        _crawler_active -= 1
+        _crawler_last_used = time.time()
+
+
+async def close_shared_crawler():
+    """Close the shared crawler and its browser, if running."""
+    global _shared_crawler, _crawler_idle_task
+
+    # Stop the idle watchdog unless we are running inside it
+    if _crawler_idle_task is not None and _crawler_idle_task is not asyncio.current_task():
+        _crawler_idle_task.cancel()
+    _crawler_idle_task = None
+
+    crawler, _shared_crawler = _shared_crawler, None
+    if crawler is not None:
+        try:
+            await crawler.close()
+        except Exception as e:
+            print(f"Warning: Failed to close shared crawler: {e}")
+
+
+def get_crawler_stats() -> dict:
+    """Get launch/reuse counters for the shared crawler."""
+    stats = {**_crawler_stats, 'running': _shared_crawler is not None}
+    if _fetch_resource_blocker is not None:
+        stats['resource_blocking'] = _fetch_resource_blocker.get_stats()
+    return stats
+
+
 def check_playwright_installed() -> Tuple[bool, str]:
     """
     Check if Playwright browser binaries are installed.
@@ -83,9 +270,35 @@ def check_playwright_installed() -> Tuple[bool, str]:
 
 
 class WebsiteCache:
-    """TTL-based cache for fetched websites (Phase 12.2)."""
+    """
+    TTL-based cache for fetched websites (Phase 12.2).
+
+    Content is stored as one gzip file per URL. The index lives in memory as
+    an LRU-ordered dict and is persisted to SQLite in batches (Phase 12.7):
+    sets, evictions and access times are marked dirty and written in a
+    single transaction every `flush_every` changes or `flush_interval`
+    seconds, instead of rewriting the whole index on every operation.
 
-    def __init__(self, cache_dir: Path, ttl: int = 1800, max_size_mb: int = 100):
+    With `stale_while_revalidate` > 0, entries up to that many seconds past
+    their TTL are still served by get() when a refresh coroutine is given;
+    the refresh runs in a background task and replaces the entry.
+
+    An entry can also carry the full page split into sections (Phase 12.8),
+    stored beside the content and decoded at most once per session.
+    """
+
+    # Decoded section indexes kept in memory
+    SECTION_MEMORY_SIZE = 8
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl: int = 1800,
+        max_size_mb: int = 100,
+        stale_while_revalidate: int = 0,
+        flush_every: int = 32,
+        flush_interval: float = 5.0
+    ):
         """
         Initialize the website cache.
 
@@ -93,36 +306,158 @@ class WebsiteCache:
             cache_dir: Directory to store cached content
             ttl: Time to live in seconds (default 30 minutes)
             max_size_mb: Maximum cache size in MB
+            stale_while_revalidate: Seconds past the TTL during which stale
+                content is served while it is refreshed (0 = disabled)
+            flush_every: Pending index changes that trigger a flush
+            flush_interval: Seconds after which pending changes are flushed
         """
         self.cache_dir = cache_dir
         self.ttl = ttl
         self.max_size_mb = max_size_mb
-        self.index_file = cache_dir / "cache_index.json"
+        self.stale_while_revalidate = stale_while_revalidate
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.index_file = cache_dir / "cache_index.sqlite3"
 
         # Create cache directory if it doesn't exist
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-        # Load or create index
-        self.index = self._load_index()
+        self.stats = {
+            'hits': 0, 'misses': 0, 'stale_hits': 0,
+            'revalidations': 0, 'revalidation_failures': 0,
+            'evictions': 0, 'bytes_read': 0, 'bytes_written': 0, 'index_flushes': 0
+        }
+        self._dirty: set = set()
+        self._deleted: set = set()
+        self._last_flush = time.monotonic()
+        self._revalidating: dict = {}
+        self._section_memory: "OrderedDict[str, SectionIndex]" = OrderedDict()
+
+        # Load or create index (least recently used first)
+        self._db = self._open_index()
+        self.index: "OrderedDict[str, dict]" = self._load_index()
+        self._total_bytes = sum(entry['size'] + entry['sections_size'] for entry in self.index.values())
+        if self._dirty:
+            self.flush()  # Persist a migrated legacy index
+
+    def _open_index(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite index, or None to keep the index in memory only."""
+        try:
+            db = sqlite3.connect(str(self.index_file))
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, url TEXT NOT NULL, timestamp REAL NOT NULL, "
+                "last_access REAL NOT NULL, size INTEGER NOT NULL, hits INTEGER NOT NULL DEFAULT 0, "
+                "sections_size INTEGER NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in db.execute("PRAGMA table_info(entries)")}
+            if 'sections_size' not in columns:
+                db.execute("ALTER TABLE entries ADD COLUMN sections_size INTEGER NOT NULL DEFAULT 0")
+            return db
+        except sqlite3.Error as e:
+            print(f"Warning: Failed to open cache index: {e}")
+            return None
 
-    def _load_index(self) -> dict:
-        """Load the cache index from disk."""
-        if self.index_file.exists():
+    def _load_index(self) -> "OrderedDict[str, dict]":
+        """Load the cache index from disk, migrating a legacy JSON index."""
+        index: "OrderedDict[str, dict]" = OrderedDict()
+        if self._db is not None:
+            try:
+                rows = self._db.execute(
+                    "SELECT key, url, timestamp, last_access, size, hits, sections_size "
+                    "FROM entries ORDER BY last_access"
+                ).fetchall()
+                for key, url, timestamp, last_access, size, hits, sections_size in rows:
+                    index[key] = {'url': url, 'timestamp': timestamp, 'last_access': last_access,
+                                  'size': size, 'hits': hits, 'sections_size': sections_size}
+            except sqlite3.Error as e:
+                print(f"Warning: Failed to load cache index: {e}")
+
+        legacy_file = self.cache_dir / "cache_index.json"
+        if legacy_file.exists():
             try:
-                with open(self.index_file, 'r') as f:
-                    return json.load(f)
+                with open(legacy_file, 'r') as f:
+                    legacy = json.load(f)
+                for key, entry in sorted(legacy.items(), key=lambda item: item[1]['timestamp']):
+                    if key not in index:
+                        index[key] = {'url': entry['url'], 'timestamp': entry['timestamp'],
+                                      'last_access': entry['timestamp'], 'size': entry['size'], 'hits': 0,
+                                      'sections_size': 0}
+                        self._dirty.add(key)
+                legacy_file.unlink()
             except Exception:
-                return {}
-        return {}
+                pass
+
+        # Files written after the last flush of a previous session have no
+        # index entry; nothing can find them, so reclaim the space. Another
+        # session sharing the directory may not have flushed its newer files
+        # yet, so only reclaim those too old to be served by anyone
+        reclaim_before = time.time() - (self.ttl + self.stale_while_revalidate)
+        for cache_file in self.cache_dir.glob("*.gz"):
+            if cache_file.name.split('.', 1)[0] not in index:
+                try:
+                    if cache_file.stat().st_mtime < reclaim_before:
+                        cache_file.unlink()
+                except OSError:
+                    pass
+
+        return index
 
     def _save_index(self):
-        """Save the cache index to disk."""
+        """Compatibility alias: write pending index changes now."""
+        self.flush()
+
+    def flush(self):
+        """Write pending index changes to disk in one transaction."""
+        self._last_flush = time.monotonic()
+        if not self._dirty and not self._deleted:
+            return
+        dirty, deleted = self._dirty, self._deleted
+        self._dirty, self._deleted = set(), set()
+        if self._db is None:
+            return
+
         try:
-            with open(self.index_file, 'w') as f:
-                json.dump(self.index, f, indent=2)
-        except Exception as e:
+            with self._db:
+                if deleted:
+                    self._db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in deleted])
+                rows = [
+                    (key, entry['url'], entry['timestamp'], entry['last_access'], entry['size'],
+                     entry['hits'], entry['sections_size'])
+                    for key in dirty if (entry := self.index.get(key)) is not None
+                ]
+                if rows:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO entries (key, url, timestamp, last_access, size, hits, sections_size) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                    )
+            self.stats['index_flushes'] += 1
+        except sqlite3.Error as e:
             print(f"Warning: Failed to save cache index: {e}")
 
+    def _mark_dirty(self, cache_key: str, deleted: bool = False):
+        """Queue an index change and flush if enough changes or time have accumulated."""
+        if deleted:
+            self._dirty.discard(cache_key)
+            self._deleted.add(cache_key)
+        else:
+            self._deleted.discard(cache_key)
+            self._dirty.add(cache_key)
+
+        pending = len(self._dirty) + len(self._deleted)
+        if pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def close(self):
+        """Flush pending index changes and close the index."""
+        for task in self._revalidating.values():
+            task.cancel()
+        self._revalidating.clear()
+        self.flush()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
     def _get_cache_key(self, url: str) -> str:
         """Generate a cache key from URL."""
         return hashlib.md5(url.encode()).hexdigest()
@@ -131,12 +466,24 @@ class WebsiteCache:
         """Check if a cache entry is expired."""
         return (time.time() - timestamp) > self.ttl
 
-    async def get(self, url: str) -> Optional[str]:
+    def _is_servable_stale(self, timestamp: float) -> bool:
+        """Check if an expired entry may still be served while it is refreshed."""
+        return (time.time() - timestamp) <= self.ttl + self.stale_while_revalidate
+
+    async def get(
+        self,
+        url: str,
+        refresh: Optional[Callable[[], Awaitable[Optional[str]]]] = None
+    ) -> Optional[str]:
         """
         Get cached content if available and not expired.
 
         Args:
             url: URL to fetch from cache
+            refresh: Coroutine function returning fresh content (or None on
+                failure). When given and the entry is within the
+                stale-while-revalidate window, the stale content is returned
+                and the entry is refreshed in the background.
 
         Returns:
             Cached markdown content, or None if not found/expired
@@ -146,26 +493,75 @@ class WebsiteCache:
 
         # Check if cached
         if cache_key not in self.index:
+            self.stats['misses'] += 1
             return None
 
         entry = self.index[cache_key]
 
         # Check if expired
-        if self._is_expired(entry['timestamp']):
+        stale = self._is_expired(entry['timestamp'])
+        if stale and not (refresh and self.stale_while_revalidate > 0 and self._is_servable_stale(entry['timestamp'])):
             # Remove expired entry
             self._remove_entry(cache_key)
+            self.stats['misses'] += 1
             return None
 
         # Read cached content
         try:
             if cache_file.exists():
                 with gzip.open(cache_file, 'rt', encoding='utf-8') as f:
-                    return f.read()
+                    content = f.read()
+            else:
+                content = None
         except Exception as e:
             print(f"Warning: Failed to read cache: {e}")
+            content = None
+
+        if content is None:
             self._remove_entry(cache_key)
+            self.stats['misses'] += 1
+            return None
+
+        entry['last_access'] = time.time()
+        entry['hits'] += 1
+        self.index.move_to_end(cache_key)
+        self._mark_dirty(cache_key)
+        self.stats['hits'] += 1
+        self.stats['bytes_read'] += entry['size']
+
+        if stale:
+            self.stats['stale_hits'] += 1
+            self._schedule_revalidation(url, cache_key, refresh)
+
+        return content
 
-        return None
+    def _schedule_revalidation(self, url: str, cache_key: str, refresh: Callable[[], Awaitable[Optional[str]]]):
+        """Refresh an entry in the background (one refresh per URL at a time)."""
+        if cache_key in self._revalidating:
+            return
+
+        async def revalidate():
+            try:
+                content = await refresh()
+                if content:
+                    await self.set(url, content)
+                    self.stats['revalidations'] += 1
+                else:
+                    self.stats['revalidation_failures'] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['revalidation_failures'] += 1
+                print(f"Warning: Failed to refresh cached {url}: {e}")
+            finally:
+                self._revalidating.pop(cache_key, None)
+
+        self._revalidating[cache_key] = asyncio.get_running_loop().create_task(revalidate())
+
+    async def wait_for_revalidations(self):
+        """Wait until all background refreshes have finished."""
+        while self._revalidating:
+            await asyncio.gather(*list(self._revalidating.values()), return_exceptions=True)
 
     async def set(self, url: str, content: str):
         """
@@ -178,53 +574,128 @@ class WebsiteCache:
         cache_key = self._get_cache_key(url)
         cache_file = self.cache_dir / f"{cache_key}.md.gz"
 
-        # Check cache size before adding
-        await self._cleanup_if_needed()
-
         # Write compressed content
         try:
             with gzip.open(cache_file, 'wt', encoding='utf-8') as f:
                 f.write(content)
+            size = cache_file.stat().st_size
+        except Exception as e:
+            print(f"Warning: Failed to cache content: {e}")
+            return
+
+        # Update index
+        now = time.time()
+        previous = self.index.pop(cache_key, None)
+        if previous is not None:
+            self._total_bytes -= previous['size'] + previous['sections_size']
+            self._drop_sections(cache_key)
+        self.index[cache_key] = {
+            'url': url,
+            'timestamp': now,
+            'last_access': now,
+            'size': size,
+            'hits': previous['hits'] if previous else 0,
+            'sections_size': 0
+        }
+        self._total_bytes += size
+        self.stats['bytes_written'] += size
+        self._mark_dirty(cache_key)
+
+        # Evict least recently used entries if over the size limit
+        await self._cleanup_if_needed()
+
+    async def get_sections(self, url: str) -> Optional["SectionIndex"]:
+        """
+        Get the cached section index of a page, if its entry is still fresh.
+
+        Args:
+            url: URL whose sections to load
+
+        Returns:
+            SectionIndex, or None if not cached/expired
+        """
+        cache_key = self._get_cache_key(url)
+        entry = self.index.get(cache_key)
+        if entry is None or not entry['sections_size'] or self._is_expired(entry['timestamp']):
+            return None
+
+        if cache_key in self._section_memory:
+            self._section_memory.move_to_end(cache_key)
+            return self._section_memory[cache_key]
+
+        # Imported here: page_sections uses this module's count_tokens
+        from .page_sections import SectionIndex
 
-            # Update index
-            self.index[cache_key] = {
-                'url': url,
-                'timestamp': time.time(),
-                'size': cache_file.stat().st_size
-            }
-            self._save_index()
+        try:
+            with gzip.open(self.cache_dir / f"{cache_key}.sections.json.gz", 'rt', encoding='utf-8') as f:
+                sections = SectionIndex.from_dict(json.load(f))
+        except Exception:
+            sections = None
+        if sections is not None:
+            self._remember_sections(cache_key, sections)
+        return sections
+
+    async def set_sections(self, url: str, sections: "SectionIndex"):
+        """
+        Store the section index of a cached page (call after set()).
+
+        Args:
+            url: URL the sections belong to
+            sections: Index of the full page
+        """
+        cache_key = self._get_cache_key(url)
+        entry = self.index.get(cache_key)
+        if entry is None:
+            return
 
+        sections_file = self.cache_dir / f"{cache_key}.sections.json.gz"
+        try:
+            with gzip.open(sections_file, 'wt', encoding='utf-8') as f:
+                json.dump(sections.to_dict(), f)
+            size = sections_file.stat().st_size
         except Exception as e:
-            print(f"Warning: Failed to cache content: {e}")
+            print(f"Warning: Failed to cache page sections: {e}")
+            return
+
+        self._total_bytes += size - entry['sections_size']
+        self.stats['bytes_written'] += size
+        entry['sections_size'] = size
+        self._remember_sections(cache_key, sections)
+        self._mark_dirty(cache_key)
+        await self._cleanup_if_needed()
+
+    def _remember_sections(self, cache_key: str, sections: "SectionIndex"):
+        self._section_memory[cache_key] = sections
+        self._section_memory.move_to_end(cache_key)
+        while len(self._section_memory) > self.SECTION_MEMORY_SIZE:
+            self._section_memory.popitem(last=False)
+
+    def _drop_sections(self, cache_key: str):
+        self._section_memory.pop(cache_key, None)
+        sections_file = self.cache_dir / f"{cache_key}.sections.json.gz"
+        if sections_file.exists():
+            sections_file.unlink()
 
     def _remove_entry(self, cache_key: str):
         """Remove a cache entry."""
         cache_file = self.cache_dir / f"{cache_key}.md.gz"
         if cache_file.exists():
             cache_file.unlink()
-        if cache_key in self.index:
-            del self.index[cache_key]
-            self._save_index()
+        self._drop_sections(cache_key)
+        entry = self.index.pop(cache_key, None)
+        if entry is not None:
+            self._total_bytes -= entry['size'] + entry['sections_size']
+            self._mark_dirty(cache_key, deleted=True)
 
     async def _cleanup_if_needed(self):
-        """Clean up cache if it exceeds max size."""
-        # Calculate total cache size
-        total_size_bytes = sum(entry['size'] for entry in self.index.values())
+        """Evict least recently used entries while the cache exceeds max size."""
         max_size_bytes = self.max_size_mb * 1024 * 1024
 
-        if total_size_bytes > max_size_bytes:
-            # Remove oldest entries until under limit
-            sorted_entries = sorted(
-                self.index.items(),
-                key=lambda x: x[1]['timestamp']
-            )
-
-            for cache_key, _ in sorted_entries:
-                if total_size_bytes <= max_size_bytes:
-                    break
-                entry = self.index[cache_key]
-                total_size_bytes -= entry['size']
-                self._remove_entry(cache_key)
+        # The most recently used entry (just written) is never evicted
+        while self._total_bytes > max_size_bytes and len(self.index) > 1:
+            cache_key = next(iter(self.index))
+            self._remove_entry(cache_key)
+            self.stats['evictions'] += 1
 
     async def cleanup_expired(self):
         """Remove all expired cache entries."""
@@ -238,18 +709,21 @@ class WebsiteCache:
 
     def get_stats(self) -> dict:
         """Get cache statistics."""
-        total_size_bytes = sum(entry['size'] for entry in self.index.values())
         total_entries = len(self.index)
         expired_count = sum(
             1 for entry in self.index.values()
             if self._is_expired(entry['timestamp'])
         )
+        lookups = self.stats['hits'] + self.stats['misses']
 
         return {
             'total_entries': total_entries,
-            'total_size_mb': round(total_size_bytes / (1024 * 1024), 2),
+            'total_size_mb': round(self._total_bytes / (1024 * 1024), 2),
             'expired_entries': expired_count,
-            'cache_dir': str(self.cache_dir)
+            'cache_dir': str(self.cache_dir),
+            'hit_rate': round(self.stats['hits'] / lookups, 3) if lookups else 0.0,
+            'pending_index_writes': len(self._dirty) + len(self._deleted),
+            **self.stats
         }
 
     async def clear(self, url: Optional[str] = None):
@@ -267,6 +741,7 @@ class WebsiteCache:
             # Clear all
             for cache_key in list(self.index.keys()):
                 self._remove_entry(cache_key)
+        self.flush()
 
 
 def is_valid_url(url: str) -> bool:
@@ -383,11 +858,48 @@ def smart_truncate(markdown: str, max_tokens: int) -> Tuple[str, bool]:
     return truncated, True
 
 
+def apply_truncation(markdown: str, max_tokens: int, truncate_strategy: str = "smart") -> str:
+    """
+    Truncate markdown according to the configured strategy.
+
+    Args:
+        markdown: Markdown content to truncate
+        max_tokens: Maximum tokens to keep
+        truncate_strategy: How to truncate (smart, head, tail)
+
+    Returns:
+        Truncated markdown
+    """
+    if truncate_strategy == "smart":
+        truncated, was_truncated = smart_truncate(markdown, max_tokens)
+    elif truncate_strategy == "head":
+        # Keep first N tokens
+        max_chars = max_tokens * 4
+        truncated = markdown[:max_chars]
+        was_truncated = len(markdown) > max_chars
+        if was_truncated:
+            truncated += f"\n\n---\n**[Content truncated]**\n---\n"
+    elif truncate_strategy == "tail":
+        # Keep last N tokens
+        max_chars = max_tokens * 4
+        truncated = markdown[-max_chars:]
+        was_truncated = len(markdown) > max_chars
+        if was_truncated:
+            truncated = f"---\n**[Content truncated]**\n---\n\n" + truncated
+    else:
+        # No truncation
+        truncated = markdown
+
+    return truncated
+
+
 async def fetch_website_content(
     url: str,
     max_tokens: int = 50000,
     truncate_strategy: str = "smart",
-    cookies: Optional[list] = None
+    cookies: Optional[list] = None,
+    reuse_browser: bool = False,
+    http_first: bool = False
 ) -> Tuple[bool, str]:
     """
     Fetch website content and convert to markdown.
@@ -397,69 +909,76 @@ async def fetch_website_content(
         max_tokens: Maximum tokens to return
         truncate_strategy: How to truncate (smart, head, tail)
         cookies: Optional list of cookie dicts for authenticated requests (Phase 4.3)
+        reuse_browser: Use the shared long-lived crawler instead of launching
+            a browser for this call (Phase 12.4). Ignored for authenticated fetches.
+        http_first: Try a plain HTTP GET first and only render in the browser
+            when the page needs JavaScript (Phase 12.5)
 
     Returns:
         Tuple of (success, content_or_error_message)
     """
-    if not HAS_CRAWL4AI:
-        return False, "❌ crawl4ai is not installed. Install with: pip install crawl4ai"
-
     if not is_valid_url(url):
         return False, f"❌ Invalid URL: {url}"
 
+    http_result: Optional[HttpFetchResult] = None
+    if http_first:
+        http_result = await fetch_http(url, cookies)
+        if not http_result.needs_browser:
+            _record_fetch(url, 'http', http_result.latency)
+            return True, apply_truncation(http_result.markdown, max_tokens, truncate_strategy)
+        _fetch_stats['escalations'] += 1
+
+    def static_fallback(error: str) -> Tuple[bool, str]:
+        """Serve whatever the HTTP tier got when the browser cannot be used."""
+        if http_result is not None and http_result.markdown.strip():
+            _record_fetch(url, 'http', http_result.latency, http_result.escalate_reason)
+            return True, apply_truncation(http_result.markdown, max_tokens, truncate_strategy)
+        return False, error
+
+    if not HAS_CRAWL4AI:
+        return static_fallback("❌ crawl4ai is not installed. Install with: pip install crawl4ai")
+
     # Check if Playwright is installed BEFORE attempting to use it
     # This prevents crawl4ai from trying to auto-install during execution
     playwright_installed, error_msg = check_playwright_installed()
     if not playwright_installed:
-        return False, error_msg
+        return static_fallback(error_msg)
 
+    start = time.perf_counter()
     try:
         # Prevent auto-installation of Playwright during execution
         # Set environment variable to skip auto-install
         os.environ['PLAYWRIGHT_SKIP_BROWSER_DOWNLOAD'] = '1'
 
-        # Prepare browser config with cookies if provided (Phase 4.3)
-        browser_config = {}
-        if cookies:
-            # Convert cookies to Playwright format
-            browser_config['cookies'] = cookies
-
-        # Fetch website using crawl4ai
-        async with AsyncWebCrawler(browser_config=browser_config if cookies else None) as crawler:
-            result = await crawler.arun(url)
-
-            if not result.success:
-                return False, f"❌ Failed to fetch website: {result.error_message or 'Unknown error'}"
-
-            # Get markdown content
-            markdown = result.markdown
-
-            if not markdown or markdown.strip() == "":
-                return False, "❌ No content extracted from website"
-
-            # Apply truncation
-            if truncate_strategy == "smart":
-                truncated, was_truncated = smart_truncate(markdown, max_tokens)
-            elif truncate_strategy == "head":
-                # Keep first N tokens
-                max_chars = max_tokens * 4
-                truncated = markdown[:max_chars]
-                was_truncated = len(markdown) > max_chars
-                if was_truncated:
-                    truncated += f"\n\n---\n**[Content truncated]**\n---\n"
-            elif truncate_strategy == "tail":
-                # Keep last N tokens
-                max_chars = max_tokens * 4
-                truncated = markdown[-max_chars:]
-                was_truncated = len(markdown) > max_chars
-                if was_truncated:
-                    truncated = f"---\n**[Content truncated]**\n---\n\n" + truncated
-            else:
-                # No truncation
-                truncated = markdown
-                was_truncated = False
+        if reuse_browser and not cookies:
+            # Shared crawler keeps its browser alive between fetches
+            async with use_shared_crawler() as crawler:
+                result = await crawler.arun(url)
+        else:
+            # Prepare browser config with cookies if provided (Phase 4.3)
+            browser_config = {}
+            if cookies:
+                # Convert cookies to Playwright format
+                browser_config['cookies'] = cookies
+
+            # Fetch website using crawl4ai
+            async with AsyncWebCrawler(browser_config=browser_config if cookies else None) as crawler:
+                result = await crawler.arun(url)
+
+        if not result.success:
+            return static_fallback(f"❌ Failed to fetch website: {result.error_message or 'Unknown error'}")
+
+        # Get markdown content
+        markdown = result.markdown
+
+        if not markdown or markdown.strip() == "":
+            return static_fallback("❌ No content extracted from website")
+
+        _record_fetch(url, 'browser', time.perf_counter() - start,
+                      http_result.escalate_reason if http_result else None)
 
-            return True, truncated
+        # Apply truncation
+        return True, apply_truncation(markdown, max_tokens, truncate_strategy)
 
     except Exception as e:
-        return False, f"❌ Error fetching website: {str(e)}"
+        return static_fallback(f"❌ Error fetching website: {str(e)}")
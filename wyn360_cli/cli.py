@@ -511,6 +511,27 @@ def handle_slash_command(command: str, agent: WYN360Agent) -> tuple[bool, str]:
 
             console.print(tools_list)
 
+        # Show memoized tool results if any were looked up
+        if perf_stats.get('tool_cache'):
+            console.print()
+            cache_table = Table(title="Tool Result Cache", show_header=True)
+            cache_table.add_column("Tool", style="cyan")
+            cache_table.add_column("Hits", style="green")
+            cache_table.add_column("Misses", style="red")
+            cache_table.add_column("Unchanged", style="yellow")
+            cache_table.add_column("Hit Rate", style="yellow")
+
+            for tool_name, stats in perf_stats['tool_cache'].items():
+                cache_table.add_row(
+                    tool_name,
+                    str(stats['hits']),
+                    str(stats['misses']),
+                    str(stats['unchanged']),
+                    f"{stats['hit_rate']:.1f}%"
+                )
+
+            console.print(cache_table)
+
         # Show error summary if any
         if perf_stats['error_types']:
             console.print()
@@ -523,6 +544,37 @@ def handle_slash_command(command: str, agent: WYN360Agent) -> tuple[bool, str]:
 
             console.print(error_table)
 
+        # Show warm browser pool stats once it has been used (Phase 4.4)
+        pool_stats = agent.get_browser_pool_stats()
+        pool = pool_stats['pool']
+        crawler = pool_stats['fetch_crawler']
+        if pool['acquisitions'] > 0 or crawler['launches'] > 0:
+            console.print()
+            pool_table = Table(title="Browser Pool", show_header=False)
+            pool_table.add_column("Metric", style="cyan")
+            pool_table.add_column("Value", style="yellow")
+
+            pool_table.add_row("Browser Running", "yes" if pool_stats['browser_running'] else "no")
+            pool_table.add_row("Warm Pages (idle/size)", f"{pool['idle']}/{pool['size']}")
+            pool_table.add_row("Page Requests", str(pool['acquisitions']))
+            pool_table.add_row("Pool Hit Rate", f"{pool['hit_rate'] * 100:.1f}%")
+            pool_table.add_row("Avg Time to Page", f"{pool['avg_time_to_page_ms']:.1f}ms")
+            pool_table.add_row("Max Time to Page", f"{pool['max_time_to_page_ms']:.1f}ms")
+            pool_table.add_row("Idle Shutdowns", str(pool['idle_shutdowns']))
+            pool_table.add_row("Fetch Browser Launches", str(crawler['launches']))
+            pool_table.add_row("Fetch Browser Reuses", str(crawler['reuses']))
+
+            # Request interception savings across automation and fetch (Phase 4.5)
+            blocking = [b for b in (pool_stats.get('resource_blocking'), crawler.get('resource_blocking')) if b]
+            if blocking:
+                blocked = sum(b['requests_blocked'] for b in blocking)
+                total = sum(b['requests_total'] for b in blocking)
+                saved_kb = sum(b['bytes_saved'] for b in blocking) / 1024
+                pool_table.add_row("Requests Blocked", f"{blocked}/{total}")
+                pool_table.add_row("Est. Bytes Saved", f"{saved_kb:,.0f} KB")
+
+            console.print(pool_table)
+
         return True, ""
 
     elif cmd == "model":
@@ -1199,6 +1251,12 @@ async def chat_loop(agent: WYN360Agent):
     def _(event):
         event.current_buffer.insert_text('\n')
 
+    # Stream execute_command output above the status spinner as it arrives
+    agent.command_output_callback = lambda stream, text: console.print(
+        text, end="", style="dim red" if stream == "stderr" else "dim",
+        markup=False, highlight=False
+    )
+
     # Create prompt session with optional vim mode
     editing_mode = agent.vim_mode.get_editing_mode()
     session = PromptSession(
@@ -1208,6 +1266,9 @@ async def chat_loop(agent: WYN360Agent):
         editing_mode=editing_mode,
     )
 
+    # Pre-launch the browser pool in the background (Phase 4.4)
+    agent.start_browser_warmup()
+
     # Show buddy greeting if enabled
     if agent.buddy_manager.enabled:
         greeting = agent.buddy_manager.get_greeting()
@@ -1280,6 +1341,12 @@ async def chat_loop(agent: WYN360Agent):
             console.print(f"\n[red]Error:[/red] {str(e)}\n")
             continue
 
+    # Release pooled browsers before the event loop shuts down
+    try:
+        await agent.shutdown_browsers()
+    except Exception:
+        pass
+
 
 if __name__ == '__main__':
     main()
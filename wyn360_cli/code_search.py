@@ -0,0 +1,302 @@
+"""In-process code search for WYN360 CLI.
+
+Backs the search_files tool instead of shelling out to grep. Candidate files
+come from the project file index (so .git, node_modules, virtualenvs and
+.gitignore'd paths are never read), binary files are skipped, and files are
+scanned through mmap by a small pool of worker threads. Scanning stops as
+soon as the result cap is reached, and matches are streamed to the caller
+as they are found.
+
+Python's re module holds the GIL while matching, so the worker threads
+mainly overlap file I/O and page faults; the regex pre-check on the mapped
+file keeps the per-file cost low for the common case of no match.
+"""
+
+import asyncio
+import fnmatch
+import mmap
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Iterable, List, Optional
+
+from .file_index import get_file_index
+
+
+# Files larger than this are not searched
+MAX_FILE_BYTES = 20 * 1024 * 1024
+
+# Bytes inspected for NUL to decide whether a file is binary
+BINARY_SNIFF_BYTES = 8192
+
+# Longest line returned (minified files can have megabyte-long lines)
+MAX_LINE_CHARS = 300
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 4)
+
+
+@dataclass
+class SearchMatch:
+    """One matching line"""
+    path: str                    # Relative to the search root, '/'-separated
+    line_number: int
+    line: str
+    before: List[str] = field(default_factory=list)   # Context lines preceding the match
+    after: List[str] = field(default_factory=list)    # Context lines following the match
+
+
+@dataclass
+class SearchResult:
+    """Matches plus what the search had to do to find them"""
+    matches: List[SearchMatch] = field(default_factory=list)
+    files_considered: int = 0
+    files_scanned: int = 0
+    binary_skipped: int = 0
+    truncated: bool = False      # Stopped early at max_results
+    literal_fallback: bool = False  # Pattern was not a valid regex and was searched literally
+    elapsed: float = 0.0
+
+
+def compile_pattern(pattern: str, ignore_case: bool = False):
+    """
+    Compile a search pattern for bytes.
+
+    Returns:
+        Tuple of (compiled regex, True if the pattern was invalid and is matched literally)
+    """
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    try:
+        return re.compile(pattern.encode('utf-8'), flags), False
+    except re.error:
+        return re.compile(re.escape(pattern.encode('utf-8')), flags), True
+
+
+def match_file_pattern(path: str, file_patterns: List[str]) -> bool:
+    """True if the file name (or relative path) matches one of the glob patterns"""
+    name = path.rsplit('/', 1)[-1]
+    return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path, pattern) for pattern in file_patterns)
+
+
+def _decode(line: bytes) -> str:
+    text = line.rstrip(b'\r').decode('utf-8', errors='replace')
+    return text if len(text) <= MAX_LINE_CHARS else text[:MAX_LINE_CHARS] + '…'
+
+
+def _context_before(data, line_start: int, count: int) -> List[str]:
+    lines = []
+    end = line_start - 1
+    while count > 0 and end >= 0:
+        start = data.rfind(b'\n', 0, end) + 1
+        lines.append(_decode(data[start:end]))
+        end = start - 1
+        count -= 1
+    return list(reversed(lines))
+
+
+def _context_after(data, line_end: int, count: int) -> List[str]:
+    lines = []
+    start = line_end + 1
+    while count > 0 and start < len(data):
+        end = data.find(b'\n', start)
+        end = len(data) if end == -1 else end
+        lines.append(_decode(data[start:end]))
+        start = end + 1
+        count -= 1
+    return lines
+
+
+def scan_file(
+    full_path: str,
+    relative_path: str,
+    regex,
+    context_lines: int = 0,
+    stop: Optional[threading.Event] = None,
+    limit: Optional[int] = None
+) -> Optional[List[SearchMatch]]:
+    """
+    Search one file.
+
+    Returns:
+        Matches (one per matching line), or None if the file is binary,
+        too large or unreadable
+    """
+    try:
+        with open(full_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return []
+            if size > MAX_FILE_BYTES:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if b'\x00' in data[:BINARY_SNIFF_BYTES]:
+                    return None
+                if regex.search(data) is None:
+                    return []
+
+                matches = []
+                line_number = 1
+                counted_to = 0
+                position = 0
+                while position <= size:
+                    if stop is not None and stop.is_set():
+                        break
+                    found = regex.search(data, position)
+                    if found is None:
+                        break
+                    if found.start() == size and data[size - 1:size] == b'\n':
+                        break  # Empty match after the final newline, not on a line
+                    line_start = data.rfind(b'\n', 0, found.start()) + 1
+                    line_end = data.find(b'\n', found.start())
+                    line_end = size if line_end == -1 else line_end
+                    line_number += data[counted_to:line_start].count(b'\n')
+                    counted_to = line_start
+
+                    matches.append(SearchMatch(
+                        path=relative_path,
+                        line_number=line_number,
+                        line=_decode(data[line_start:line_end]),
+                        before=_context_before(data, line_start, context_lines) if context_lines else [],
+                        after=_context_after(data, line_end, context_lines) if context_lines else [],
+                    ))
+                    if limit is not None and len(matches) >= limit:
+                        break
+                    # One match per line, like grep
+                    position = line_end + 1
+                return matches
+    except (OSError, ValueError):
+        return None
+
+
+def search(
+    pattern: str,
+    root: str = ".",
+    file_pattern: str = "*",
+    max_results: int = 100,
+    context_lines: int = 0,
+    ignore_case: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    on_match: Optional[Callable[[SearchMatch], None]] = None,
+    stop: Optional[threading.Event] = None,
+    candidates: Optional[Iterable[str]] = None
+) -> SearchResult:
+    """
+    Search project files for a regex (blocking; see stream_search for async use).
+
+    Args:
+        pattern: Regular expression (invalid expressions are matched literally)
+        root: Project directory
+        file_pattern: Glob(s) for file names, comma-separated (e.g. "*.py,*.pyi")
+        max_results: Stop after this many matching lines
+        context_lines: Lines of context before and after each match
+        ignore_case: Case-insensitive matching
+        workers: Scanner threads
+        on_match: Called from worker threads for every match as it is found;
+            files already being scanned when the cap is reached still report
+            theirs, so sort and cut the streamed matches as search() does
+        stop: Event that aborts the search when set
+        candidates: Relative paths to search instead of every indexed file
+
+    Returns:
+        SearchResult with matches sorted by path and line
+    """
+    start = time.perf_counter()
+    regex, literal = compile_pattern(pattern, ignore_case)
+    result = SearchResult(literal_fallback=literal)
+    stop = stop or threading.Event()
+
+    patterns = [p.strip() for p in file_pattern.split(',') if p.strip()] or ['*']
+    paths = list(candidates) if candidates is not None else get_file_index(root).files()
+    paths = [path for path in paths if patterns == ['*'] or match_file_pattern(path, patterns)]
+    result.files_considered = len(paths)
+
+    lock = threading.Lock()
+    # Files are handed out in order and, once enough matches are in, files
+    # already handed out still finish; the cap then keeps the first matches
+    # by (path, line) whatever order the threads finished in
+    next_path = iter(sorted(paths))
+    enough = threading.Event()
+
+    def worker():
+        while not stop.is_set() and not enough.is_set():
+            with lock:
+                relative_path = next(next_path, None)
+            if relative_path is None:
+                return
+            found = scan_file(os.path.join(root, relative_path), relative_path, regex,
+                              context_lines, stop, limit=max(max_results, 1))
+            with lock:
+                if found is None:
+                    result.binary_skipped += 1
+                    continue
+                result.files_scanned += 1
+                result.matches.extend(found)
+                if on_match is not None:
+                    for match in found:
+                        on_match(match)
+                if len(result.matches) >= max_results:
+                    enough.set()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, min(workers, len(paths))))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    result.matches.sort(key=lambda m: (m.path, m.line_number))
+    result.truncated = enough.is_set()
+    del result.matches[max_results:]
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def stream_search(pattern: str, root: str = ".", **options) -> AsyncIterator[SearchMatch]:
+    """
+    Search without blocking the event loop, yielding matches as they are found.
+
+    Takes the same options as search(). Leaving the loop early (or
+    cancelling the consumer) stops the worker threads.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+    finished = object()
+
+    def emit(item) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, item)
+
+    def run():
+        try:
+            return search(pattern, root, on_match=emit, stop=stop, **options)
+        finally:
+            emit(finished)
+
+    future = loop.run_in_executor(None, run)
+    try:
+        while True:
+            item = await queue.get()
+            if item is finished:
+                break
+            yield item
+    finally:
+        stop.set()
+        await asyncio.wait([future])
+
+
+def format_matches(matches: List[SearchMatch]) -> str:
+    """grep-style output: path:line:text for matches, path-line-text for context."""
+    lines = []
+    previous = None
+    for match in sorted(matches, key=lambda m: (m.path, m.line_number)):
+        has_context = bool(match.before or match.after)
+        if has_context and previous is not None:
+            lines.append('--')
+        first = match.line_number - len(match.before)
+        for offset, text in enumerate(match.before):
+            lines.append(f"{match.path}-{first + offset}-{text}")
+        lines.append(f"{match.path}:{match.line_number}:{match.line}")
+        for offset, text in enumerate(match.after, 1):
+            lines.append(f"{match.path}-{match.line_number + offset}-{text}")
+        previous = match
+    return '\n'.join(lines)
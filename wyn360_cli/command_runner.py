@@ -0,0 +1,207 @@
+"""
+Async shell command execution with bounded output capture
+
+Commands run as asyncio subprocesses, so the event loop (and the cron and
+dream background tasks on it) keeps running while they execute. stdout and
+stderr are read incrementally into head+tail buffers: the first and last
+bytes of each stream are kept and the middle is counted and dropped, so a
+command that prints gigabytes costs a fixed amount of memory. Each command
+gets its own process group, which is killed as a whole on timeout or
+cancellation so that children of the shell do not outlive it.
+"""
+
+import asyncio
+import codecs
+import logging
+import os
+import signal
+import subprocess
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bytes kept from the start and from the end of each stream
+HEAD_BYTES = 32 * 1024
+TAIL_BYTES = 96 * 1024
+
+# Read size per stream; also the granularity of streamed output
+READ_CHUNK_BYTES = 64 * 1024
+
+# How long a process group gets between SIGTERM and SIGKILL
+KILL_GRACE_SECONDS = 2.0
+
+OutputCallback = Callable[[str, str], None]
+
+
+class OutputBuffer:
+    """Keep the first head_bytes and last tail_bytes of a byte stream."""
+
+    def __init__(self, head_bytes: int = HEAD_BYTES, tail_bytes: int = TAIL_BYTES):
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.head = bytearray()
+        self._tail: deque = deque()
+        self._tail_size = 0
+        self.total = 0
+
+    def append(self, chunk: bytes) -> None:
+        self.total += len(chunk)
+        room = self.head_bytes - len(self.head)
+        if room > 0:
+            self.head += chunk[:room]
+            chunk = chunk[room:]
+        if not chunk or self.tail_bytes <= 0:
+            return
+        self._tail.append(chunk)
+        self._tail_size += len(chunk)
+        # Drop whole chunks while the rest still covers the tail window
+        while self._tail_size - len(self._tail[0]) >= self.tail_bytes:
+            self._tail_size -= len(self._tail.popleft())
+
+    def tail(self) -> bytes:
+        if self.tail_bytes <= 0:
+            return b""
+        return b"".join(self._tail)[-self.tail_bytes:]
+
+    @property
+    def dropped(self) -> int:
+        return self.total - len(self.head) - min(self._tail_size, max(self.tail_bytes, 0))
+
+    def text(self) -> str:
+        head = self.head.decode("utf-8", errors="replace")
+        tail = self.tail().decode("utf-8", errors="replace")
+        if self.dropped:
+            return f"{head}\n\n[... {self.dropped:,} bytes omitted ...]\n\n{tail}"
+        return head + tail
+
+
+@dataclass
+class CommandResult:
+    """Outcome of one command"""
+    return_code: int
+    stdout: str
+    stderr: str
+    total_bytes: int
+    dropped_bytes: int
+    timed_out: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.return_code == 0 and not self.timed_out
+
+    def output(self) -> str:
+        """Combined stdout and stderr, in the same layout as execute_command_safe"""
+        output = self.stdout
+        if self.stderr:
+            if output:
+                output += "\n\n[STDERR]\n"
+            output += self.stderr
+        return output if output else "(No output)"
+
+
+def _signal_group(process: asyncio.subprocess.Process, sig: int) -> None:
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, sig)
+        elif sig == signal.SIGTERM:
+            process.terminate()
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def _kill_group(process: asyncio.subprocess.Process) -> None:
+    """SIGTERM the process group, then SIGKILL it after a grace period."""
+    _signal_group(process, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(process.wait(), KILL_GRACE_SECONDS)
+    except asyncio.TimeoutError:
+        _signal_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+        await process.wait()
+    # The shell may have exited on SIGTERM while children ignored it
+    if os.name == "posix":
+        _signal_group(process, signal.SIGKILL)
+
+
+async def run_command(
+    command: str,
+    timeout: float = 300,
+    working_dir: str = ".",
+    on_output: Optional[OutputCallback] = None,
+    head_bytes: int = HEAD_BYTES,
+    tail_bytes: int = TAIL_BYTES,
+) -> CommandResult:
+    """
+    Run a shell command without blocking the event loop.
+
+    Args:
+        command: Full command string, run through the shell
+        timeout: Seconds before the process group is killed
+        working_dir: Directory to run the command in
+        on_output: Called with ("stdout" | "stderr", text) as output arrives
+        head_bytes: Bytes kept from the start of each stream
+        tail_bytes: Bytes kept from the end of each stream
+
+    Returns:
+        CommandResult; return_code is -1 when the command timed out.
+        Cancelling the awaiting task kills the process group and re-raises.
+    """
+    started = time.monotonic()
+    extra = {"start_new_session": True} if os.name == "posix" else {}
+    process = await asyncio.create_subprocess_shell(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=working_dir,
+        **extra,
+    )
+    buffers = {
+        "stdout": OutputBuffer(head_bytes, tail_bytes),
+        "stderr": OutputBuffer(head_bytes, tail_bytes),
+    }
+
+    async def pump(stream: asyncio.StreamReader, name: str) -> None:
+        buffer = buffers[name]
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            chunk = await stream.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            buffer.append(chunk)
+            if on_output is not None:
+                text = decoder.decode(chunk)
+                if text:
+                    try:
+                        on_output(name, text)
+                    except Exception as e:
+                        logger.debug(f"Command output callback failed: {e}")
+
+    timed_out = False
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(pump(process.stdout, "stdout"), pump(process.stderr, "stderr"), process.wait()),
+            timeout,
+        )
+    except asyncio.TimeoutError:
+        timed_out = True
+        await _kill_group(process)
+    except asyncio.CancelledError:
+        await _kill_group(process)
+        raise
+
+    stdout, stderr = buffers["stdout"], buffers["stderr"]
+    return CommandResult(
+        return_code=-1 if timed_out else process.returncode,
+        stdout=stdout.text(),
+        stderr=stderr.text(),
+        total_bytes=stdout.total + stderr.total,
+        dropped_bytes=stdout.dropped + stderr.dropped,
+        timed_out=timed_out,
+        elapsed=time.monotonic() - started,
+    )
@@ -45,6 +45,24 @@ class WYN360Config:
     browser_use_cache_enabled: bool = True
     browser_use_cache_ttl: int = 1800  # 30 minutes
     browser_use_cache_max_size_mb: int = 100
+    browser_use_cache_stale_while_revalidate: int = 600  # Serve expired pages this long while refreshing in background
+    browser_use_http_fast_path: bool = True  # Plain HTTP GET first; browser only for JS-rendered pages
+    browser_use_query_embeddings: bool = True  # Rank sections for fetch_website(query=...) with the local embedding model too
+    browser_use_batch_concurrency: int = 6   # Pages fetched at once by fetch_websites (Phase 12.6)
+    browser_use_per_host_limit: int = 2      # Concurrent fetch_websites requests to one host
+
+    # Warm browser pool settings (Phase 4.4)
+    browser_pool_enabled: bool = True            # Serve automation pages from a warm pool
+    browser_pool_prewarm: bool = False           # Pre-launch Chromium in the background at CLI start (opt-in)
+    browser_pool_size: int = 2                   # Pre-created contexts/pages kept ready
+    browser_pool_idle_timeout: int = 300         # Shut the browser down after this many idle seconds
+
+    # Request interception settings (Phase 4.5)
+    browser_resource_blocking: bool = True       # Abort requests for resources automation never uses
+    browser_resource_profile: str = "balanced"   # off|balanced|aggressive (site profiles may override)
+
+    # DOM extraction backend (Phase 1.6)
+    browser_dom_backend: str = "auto"            # auto|cdp|selectors (auto: CDP snapshot when Chromium supports it)
 
     # Browser automation optimization settings (v0.3.69)
     browser_navigation_timeout: int = 45000      # Navigation timeout (ms) - Optimized from 90s
@@ -59,6 +77,31 @@ class WYN360Config:
     browser_enable_stealth: bool = True           # Enable anti-detection measures
     browser_auto_site_detection: bool = True     # Auto-detect site-specific optimizations
 
+    # Adaptive page-stability waits (Phase 5.5)
+    browser_wait_mode: str = "adaptive"          # adaptive|fixed (fixed sleeps wait_after_* seconds)
+    browser_stability_quiet_ms: int = 400        # Network/DOM must be quiet this long to count as stable
+    browser_stability_max_wait: float = 5.0      # Cap on the stability wait after navigation (seconds)
+    browser_stability_max_wait_action: float = 2.0  # Cap on the stability wait after an action (seconds)
+
+    # Vision screenshot encoding (Phase 5.6)
+    browser_vision_image_format: str = "jpeg"    # jpeg|png
+    browser_vision_jpeg_quality: int = 75        # JPEG quality sent to the vision API (1-95)
+    browser_vision_max_width: int = 1024         # Screenshots are downscaled to fit this box
+    browser_vision_max_height: int = 768
+
+    # Project file index
+    file_index_persist: bool = False             # Keep a snapshot in .wyn360/file_index.json for fast startup
+    search_index_enabled: bool = False           # Trigram index in .wyn360/index/ to narrow search_files
+
+    # Memoized read-only tools
+    tool_cache_enabled: bool = True              # Reuse read_file/list_files/get_project_info/git_status results
+    tool_cache_unchanged_marker: bool = True     # Repeats within a turn return a short "unchanged" marker
+
+    # Out-of-band storage for large tool results in the history
+    tool_output_store_enabled: bool = True       # Replace old large tool returns with stubs + recall_tool_output
+    tool_output_min_tokens: int = 2000           # Only tool returns at least this large are stored
+    tool_output_max_age_turns: int = 2           # Store them once this many user turns have followed
+
     # Config file paths (for reference)
     user_config_path: Optional[str] = None
     project_config_path: Optional[str] = None
@@ -156,16 +199,68 @@ def merge_configs(user_config: Dict[str, Any], project_config: Dict[str, Any]) -
         config.aliases = user_config.get("aliases", {})
         config.workspaces = user_config.get("workspaces", [])
 
+        # Project file index settings
+        file_index_config = user_config.get("file_index", {})
+        if file_index_config:
+            config.file_index_persist = file_index_config.get("persist", config.file_index_persist)
+
+        search_index_config = user_config.get("search_index", {})
+        if search_index_config:
+            config.search_index_enabled = search_index_config.get("enabled", config.search_index_enabled)
+
+        tool_cache_config = user_config.get("tool_cache", {})
+        if tool_cache_config:
+            config.tool_cache_enabled = tool_cache_config.get("enabled", config.tool_cache_enabled)
+            config.tool_cache_unchanged_marker = tool_cache_config.get(
+                "unchanged_marker", config.tool_cache_unchanged_marker
+            )
+
+        tool_output_config = user_config.get("tool_output_store", {})
+        if tool_output_config:
+            config.tool_output_store_enabled = tool_output_config.get("enabled", config.tool_output_store_enabled)
+            config.tool_output_min_tokens = tool_output_config.get("min_tokens", config.tool_output_min_tokens)
+            config.tool_output_max_age_turns = tool_output_config.get(
+                "max_age_turns", config.tool_output_max_age_turns
+            )
+
         # Browser use settings
         browser_use_config = user_config.get("browser_use", {})
         if browser_use_config:
             config.browser_use_max_tokens = browser_use_config.get("max_tokens", config.browser_use_max_tokens)
             config.browser_use_truncate_strategy = browser_use_config.get("truncate_strategy", config.browser_use_truncate_strategy)
+            config.browser_use_http_fast_path = browser_use_config.get("http_fast_path", config.browser_use_http_fast_path)
+            config.browser_use_query_embeddings = browser_use_config.get("query_embeddings", config.browser_use_query_embeddings)
             cache_config = browser_use_config.get("cache", {})
             if cache_config:
                 config.browser_use_cache_enabled = cache_config.get("enabled", config.browser_use_cache_enabled)
                 config.browser_use_cache_ttl = cache_config.get("ttl", config.browser_use_cache_ttl)
                 config.browser_use_cache_max_size_mb = cache_config.get("max_size_mb", config.browser_use_cache_max_size_mb)
+                config.browser_use_cache_stale_while_revalidate = cache_config.get(
+                    "stale_while_revalidate", config.browser_use_cache_stale_while_revalidate
+                )
+            batch_config = browser_use_config.get("batch", {})
+            if batch_config:
+                config.browser_use_batch_concurrency = batch_config.get("concurrency", config.browser_use_batch_concurrency)
+                config.browser_use_per_host_limit = batch_config.get("per_host", config.browser_use_per_host_limit)
+            pool_config = browser_use_config.get("pool", {})
+            if pool_config:
+                config.browser_pool_enabled = pool_config.get("enabled", config.browser_pool_enabled)
+                config.browser_pool_prewarm = pool_config.get("prewarm", config.browser_pool_prewarm)
+                config.browser_pool_size = pool_config.get("size", config.browser_pool_size)
+                config.browser_pool_idle_timeout = pool_config.get("idle_timeout", config.browser_pool_idle_timeout)
+            blocking_config = browser_use_config.get("resource_blocking", {})
+            if blocking_config:
+                config.browser_resource_blocking = blocking_config.get("enabled", config.browser_resource_blocking)
+                config.browser_resource_profile = blocking_config.get("profile", config.browser_resource_profile)
+            dom_config = browser_use_config.get("dom_extraction", {})
+            if dom_config:
+                config.browser_dom_backend = dom_config.get("backend", config.browser_dom_backend)
+            vision_config = browser_use_config.get("vision_screenshots", {})
+            if vision_config:
+                config.browser_vision_image_format = vision_config.get("format", config.browser_vision_image_format)
+                config.browser_vision_jpeg_quality = vision_config.get("jpeg_quality", config.browser_vision_jpeg_quality)
+                config.browser_vision_max_width = vision_config.get("max_width", config.browser_vision_max_width)
+                config.browser_vision_max_height = vision_config.get("max_height", config.browser_vision_max_height)
 
         config.user_config_path = str(get_user_config_path()) if get_user_config_path().exists() else None
 
@@ -181,6 +276,15 @@ def merge_configs(user_config: Dict[str, Any], project_config: Dict[str, Any]) -
         config.project_dependencies = project_config.get("dependencies", [])
         config.project_commands = project_config.get("commands", {})
 
+        # Project can opt into a persisted file index
+        file_index_config = project_config.get("file_index", {})
+        if file_index_config:
+            config.file_index_persist = file_index_config.get("persist", config.file_index_persist)
+
+        search_index_config = project_config.get("search_index", {})
+        if search_index_config:
+            config.search_index_enabled = search_index_config.get("enabled", config.search_index_enabled)
+
         # Project can add to custom instructions
         project_instructions = project_config.get("custom_instructions", "")
         if project_instructions:
@@ -246,6 +350,64 @@ def load_env_config() -> Dict[str, Any]:
     if auto_detect := os.getenv("WYN360_AUTO_SITE_DETECTION"):
         env_config["browser_auto_site_detection"] = auto_detect.lower() in ("true", "1", "yes")
 
+    # Adaptive page-stability waits
+    if wait_mode := os.getenv("WYN360_WAIT_MODE"):
+        if wait_mode.lower() in ["adaptive", "fixed"]:
+            env_config["browser_wait_mode"] = wait_mode.lower()
+
+    if quiet_ms := os.getenv("WYN360_STABILITY_QUIET_MS"):
+        env_config["browser_stability_quiet_ms"] = int(quiet_ms)
+
+    if max_wait := os.getenv("WYN360_STABILITY_MAX_WAIT"):
+        env_config["browser_stability_max_wait"] = float(max_wait)
+
+    if max_wait_action := os.getenv("WYN360_STABILITY_MAX_WAIT_ACTION"):
+        env_config["browser_stability_max_wait_action"] = float(max_wait_action)
+
+    # Vision screenshot encoding
+    if image_format := os.getenv("WYN360_VISION_IMAGE_FORMAT"):
+        if image_format.lower() in ["jpeg", "png"]:
+            env_config["browser_vision_image_format"] = image_format.lower()
+
+    if jpeg_quality := os.getenv("WYN360_VISION_JPEG_QUALITY"):
+        env_config["browser_vision_jpeg_quality"] = int(jpeg_quality)
+
+    if max_width := os.getenv("WYN360_VISION_MAX_WIDTH"):
+        env_config["browser_vision_max_width"] = int(max_width)
+
+    if max_height := os.getenv("WYN360_VISION_MAX_HEIGHT"):
+        env_config["browser_vision_max_height"] = int(max_height)
+
+    # Browserless fetch fast path
+    if fast_path := os.getenv("WYN360_HTTP_FAST_PATH"):
+        env_config["browser_use_http_fast_path"] = fast_path.lower() in ("true", "1", "yes")
+
+    # Warm browser pool
+    if pool_enabled := os.getenv("WYN360_BROWSER_POOL"):
+        env_config["browser_pool_enabled"] = pool_enabled.lower() in ("true", "1", "yes")
+
+    if prewarm := os.getenv("WYN360_BROWSER_PREWARM"):
+        env_config["browser_pool_prewarm"] = prewarm.lower() in ("true", "1", "yes")
+
+    if pool_size := os.getenv("WYN360_BROWSER_POOL_SIZE"):
+        env_config["browser_pool_size"] = int(pool_size)
+
+    if idle_timeout := os.getenv("WYN360_BROWSER_IDLE_TIMEOUT"):
+        env_config["browser_pool_idle_timeout"] = int(idle_timeout)
+
+    # Request interception
+    if blocking := os.getenv("WYN360_RESOURCE_BLOCKING"):
+        env_config["browser_resource_blocking"] = blocking.lower() in ("true", "1", "yes")
+
+    if profile := os.getenv("WYN360_RESOURCE_PROFILE"):
+        if profile.lower() in RESOURCE_PROFILES:
+            env_config["browser_resource_profile"] = profile.lower()
+
+    # DOM extraction backend
+    if dom_backend := os.getenv("WYN360_DOM_BACKEND"):
+        if dom_backend.lower() in ("auto", "cdp", "selectors"):
+            env_config["browser_dom_backend"] = dom_backend.lower()
+
     return env_config
 
 
@@ -294,7 +456,9 @@ def get_site_profile(url: str, auto_detection: bool = True) -> Dict[str, Any]:
             "browser_navigation_timeout": 60000,
             "browser_action_timeout": 20000,
             "browser_wait_after_navigation": 5.0,
-            "browser_max_retries": 3
+            "browser_max_retries": 3,
+            "browser_stability_max_wait": 8.0,
+            "browser_resource_profile": "aggressive"
         }
 
     # Fast, simple sites
@@ -304,7 +468,8 @@ def get_site_profile(url: str, auto_detection: bool = True) -> Dict[str, Any]:
             "browser_action_timeout": 10000,
             "browser_wait_strategy": "load",
             "browser_wait_after_navigation": 1.0,
-            "browser_max_retries": 2
+            "browser_max_retries": 2,
+            "browser_stability_max_wait": 3.0
         }
 
     # Standard e-commerce sites
@@ -313,12 +478,100 @@ def get_site_profile(url: str, auto_detection: bool = True) -> Dict[str, Any]:
             "browser_navigation_timeout": 45000,
             "browser_action_timeout": 15000,
             "browser_wait_after_navigation": 3.0,
-            "browser_max_retries": 2
+            "browser_max_retries": 2,
+            "browser_stability_max_wait": 6.0,
+            "browser_resource_profile": "aggressive"
         }
 
     return {}
 
 
+# Ad, analytics and tracking hosts that never contribute page content
+TRACKER_DOMAINS = [
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+    "scorecardresearch.com",
+    "hotjar.com",
+    "segment.io",
+    "mixpanel.com",
+    "connect.facebook.net",
+]
+
+# Request interception profiles (Phase 4.5).
+# Resource types follow Playwright's request.resource_type values.
+RESOURCE_PROFILES: Dict[str, Dict[str, list]] = {
+    "off": {
+        "block_resource_types": [],
+        "block_domains": [],
+    },
+    "balanced": {
+        "block_resource_types": ["image", "media", "font"],
+        "block_domains": TRACKER_DOMAINS,
+    },
+    "aggressive": {
+        "block_resource_types": ["image", "media", "font", "texttrack", "manifest", "eventsource"],
+        "block_domains": TRACKER_DOMAINS + [
+            "adsafeprotected.com",
+            "moatads.com",
+            "doubleverify.com",
+            "nr-data.net",
+            "quantserve.com",
+        ],
+    },
+}
+
+# Resource types that screenshots for vision analysis depend on
+VISION_RESOURCE_TYPES = {"image"}
+
+
+def get_resource_policy(
+    url: str = "",
+    profile: Optional[str] = None,
+    vision_mode: bool = False,
+    auto_detection: bool = True
+) -> Dict[str, list]:
+    """
+    Get the request blocking policy for a URL.
+
+    Args:
+        url: URL being loaded (used for site-specific profile overrides)
+        profile: Profile name (off, balanced, aggressive); defaults to "balanced"
+        vision_mode: Keep images when screenshots are sent to a vision model
+        auto_detection: Whether site profiles may override the profile
+
+    Returns:
+        Dictionary with "block_resource_types" and "block_domains" lists
+    """
+    profile_name = profile or "balanced"
+
+    if url:
+        site_overrides = get_site_profile(url, auto_detection)
+        profile_name = site_overrides.get("browser_resource_profile", profile_name)
+
+    # An explicit "off" always wins over site overrides
+    if profile == "off":
+        profile_name = "off"
+
+    base = RESOURCE_PROFILES.get(profile_name, RESOURCE_PROFILES["balanced"])
+    block_types = list(base["block_resource_types"])
+    if vision_mode:
+        block_types = [t for t in block_types if t not in VISION_RESOURCE_TYPES]
+
+    return {
+        "block_resource_types": block_types,
+        "block_domains": list(base["block_domains"]),
+    }
+
+
 def load_config() -> WYN360Config:
     """
     Load and merge all configuration sources.
@@ -382,10 +635,51 @@ custom_instructions: |
 browser_use:
   max_tokens: 50000  # Max tokens per fetched website (configurable)
   truncate_strategy: "smart"  # Options: smart, head, tail
+  http_fast_path: true  # Plain HTTP fetch first; headless browser only for JS-rendered pages
+  query_embeddings: true  # Use sentence-transformers (if installed) with BM25 for fetch_website(query=...)
   cache:
     enabled: true
     ttl: 1800  # Cache duration in seconds (30 minutes)
     max_size_mb: 100  # Maximum cache size in MB
+    stale_while_revalidate: 600  # Serve expired pages this long while refreshing them (0 = off)
+  batch:
+    concurrency: 6  # Pages fetched at once by fetch_websites
+    per_host: 2  # Concurrent requests to a single host
+  pool:
+    enabled: true
+    prewarm: false  # Launch Chromium in the background at startup
+    size: 2  # Warm pages kept ready for automation tools
+    idle_timeout: 300  # Close the browser after 5 idle minutes
+  resource_blocking:
+    enabled: true
+    profile: "balanced"  # Options: off, balanced, aggressive
+  dom_extraction:
+    backend: "auto"  # Options: auto, cdp (Chromium DOM snapshot), selectors
+  vision_screenshots:
+    format: "jpeg"  # Options: jpeg, png
+    jpeg_quality: 75
+    max_width: 1024
+    max_height: 768
+
+# Project file index (list_files, get_project_info, search_files)
+file_index:
+  persist: false  # Save the index to .wyn360/file_index.json in each project for fast startup
+
+# Trigram search index (search_files on large repositories)
+search_index:
+  enabled: false  # Build .wyn360/index/ in the background and search only files that can match
+
+# Memoized read-only tools (read_file, list_files, get_project_info, git_status)
+tool_cache:
+  enabled: true
+  unchanged_marker: true  # Repeated identical results within a turn are replaced by a short marker
+
+# Large tool results from earlier turns are stored under ~/.wyn360/cache/tool_outputs/
+# and replaced in the conversation by a stub; the model reads them back with recall_tool_output
+tool_output_store:
+  enabled: true
+  min_tokens: 2000  # Only results at least this large are moved
+  max_age_turns: 2  # Move them once this many user turns have followed
 
 # Command aliases for quick access
 aliases:
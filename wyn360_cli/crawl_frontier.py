@@ -0,0 +1,306 @@
+"""Batch website fetching and bounded same-site crawling for WYN360 CLI.
+
+Phase 12.6: fetch_websites fetches many URLs in one tool call instead of one
+model round-trip per page. URLs go through a deduplicated frontier; a small
+scheduler runs fetches concurrently while capping how many requests hit the
+same host at once. In crawl mode, same-site links found in each fetched page
+are added to the frontier up to a depth and page limit. The combined result
+shares one token budget across pages and reports per-URL timings.
+"""
+
+import asyncio
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urlparse, urlunparse
+
+from .browser_use import apply_truncation, count_tokens
+
+
+# Hard cap on pages per batch, whatever the caller asks for
+MAX_BATCH_PAGES = 30
+
+# Links to files that are not pages are never followed
+SKIP_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.bmp',
+    '.pdf', '.zip', '.gz', '.tgz', '.tar', '.rar', '.7z', '.exe', '.dmg', '.whl',
+    '.mp3', '.mp4', '.avi', '.mov', '.webm', '.css', '.js', '.woff', '.woff2', '.ttf'
+}
+
+# Markdown links (not images): [text](https://...)
+_MARKDOWN_LINK = re.compile(r'(?<!!)\[[^\]]*\]\((https?://[^)\s]+)(?:\s+"[^"]*")?\)')
+
+# fetch(url) -> (success, content_or_error, served_from_cache)
+FetchFunction = Callable[[str], Awaitable[Tuple[bool, str, bool]]]
+
+
+@dataclass
+class PageResult:
+    """Outcome of fetching one URL in a batch"""
+    url: str
+    depth: int = 0
+    order: int = 0               # Position in the frontier (discovery order)
+    success: bool = False
+    content: str = ''            # Markdown, or the error message on failure
+    from_cache: bool = False
+    elapsed: float = 0.0         # Seconds spent fetching this URL
+    links_found: int = 0         # New same-site links added to the frontier
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL used to deduplicate the frontier.
+
+    Lowercases scheme and host, drops the fragment and default ports, and
+    gives an empty path a trailing slash. Query strings are kept as-is.
+    """
+    url, _ = urldefrag(url.strip())
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or '').lower()
+    port = parsed.port
+    if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
+        host = f"{host}:{port}"
+    return urlunparse((scheme, host, parsed.path or '/', parsed.params, parsed.query, ''))
+
+
+def site_of(url: str) -> str:
+    """Host of a URL without a leading www., used for same-site checks"""
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def extract_links(markdown: str) -> List[str]:
+    """
+    Absolute http(s) links in fetched markdown, in order of appearance.
+
+    Both fetch tiers emit links as markdown with absolute URLs, so links are
+    read from the converted content rather than re-parsing the HTML.
+    """
+    links = []
+    for match in _MARKDOWN_LINK.finditer(markdown):
+        path = urlparse(match.group(1)).path.lower()
+        if any(path.endswith(ext) for ext in SKIP_EXTENSIONS):
+            continue
+        links.append(match.group(1))
+    return links
+
+
+class CrawlFrontier:
+    """
+    Deduplicated FIFO of URLs to fetch.
+
+    Breadth-first: a URL's depth is the number of links followed from a seed.
+    `pop` skips over URLs whose host is saturated, so a busy host does not
+    hold up fetches to other hosts.
+    """
+
+    def __init__(self, max_pages: int, max_depth: int = 0, same_site: bool = True):
+        """
+        Args:
+            max_pages: Most URLs ever admitted (seeds included)
+            max_depth: Deepest link level admitted (0 = seeds only)
+            same_site: Only admit discovered links on a seed's site
+        """
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.same_site = same_site
+        self.seen: Set[str] = set()
+        self.sites: Set[str] = set()
+        self.admitted = 0
+        self.duplicates = 0
+        self._queue: deque = deque()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def add_seed(self, url: str) -> bool:
+        """Admit a start URL; its site becomes crawlable"""
+        if self._admit(url, 0):
+            self.sites.add(site_of(url))
+            return True
+        return False
+
+    def add_link(self, url: str, depth: int) -> bool:
+        """Admit a discovered link at the given depth, if in scope"""
+        if depth > self.max_depth:
+            return False
+        if self.same_site and site_of(url) not in self.sites:
+            return False
+        return self._admit(url, depth)
+
+    def _admit(self, url: str, depth: int) -> bool:
+        key = normalize_url(url)
+        if key in self.seen:
+            self.duplicates += 1
+            return False
+        if self.admitted >= self.max_pages:
+            return False
+        self.seen.add(key)
+        self._queue.append((url, depth, self.admitted))
+        self.admitted += 1
+        return True
+
+    def pop(self, host_available: Callable[[str], bool] = lambda host: True) -> Optional[Tuple[str, int, int]]:
+        """
+        Take the oldest URL whose host has capacity.
+
+        Returns:
+            (url, depth, order), or None if every queued URL's host is busy
+        """
+        for position, entry in enumerate(self._queue):
+            if host_available(urlparse(entry[0]).netloc.lower()):
+                del self._queue[position]
+                return entry
+        return None
+
+
+async def crawl(
+    seeds: Iterable[str],
+    fetch: FetchFunction,
+    max_depth: int = 0,
+    max_pages: int = 10,
+    max_concurrency: int = 6,
+    per_host_limit: int = 2,
+    same_site: bool = True
+) -> List[PageResult]:
+    """
+    Fetch seed URLs (and, with max_depth > 0, same-site links) concurrently.
+
+    Args:
+        seeds: Start URLs
+        fetch: Coroutine returning (success, content, from_cache) for a URL
+        max_depth: Link levels to follow from the seeds (0 = seeds only)
+        max_pages: Most pages fetched in total (capped at MAX_BATCH_PAGES)
+        max_concurrency: Fetches in flight at once
+        per_host_limit: Fetches in flight against a single host
+        same_site: Only follow links on a seed's site
+
+    Returns:
+        PageResults in discovery order
+    """
+    frontier = CrawlFrontier(min(max_pages, MAX_BATCH_PAGES), max_depth, same_site)
+    for url in seeds:
+        frontier.add_seed(url)
+
+    active_per_host: Dict[str, int] = {}
+    per_host_limit = max(1, per_host_limit)
+    max_concurrency = max(1, max_concurrency)
+
+    async def visit(url: str, depth: int, order: int) -> PageResult:
+        page = PageResult(url=url, depth=depth, order=order)
+        start = time.perf_counter()
+        try:
+            page.success, page.content, page.from_cache = await fetch(url)
+        except Exception as e:
+            page.content = f"❌ Error fetching website: {e}"
+        page.elapsed = time.perf_counter() - start
+        return page
+
+    results: List[PageResult] = []
+    running: Dict[asyncio.Task, str] = {}
+
+    while frontier or running:
+        while len(running) < max_concurrency:
+            entry = frontier.pop(lambda host: active_per_host.get(host, 0) < per_host_limit)
+            if entry is None:
+                break
+            url, depth, order = entry
+            host = urlparse(url).netloc.lower()
+            active_per_host[host] = active_per_host.get(host, 0) + 1
+            running[asyncio.ensure_future(visit(url, depth, order))] = host
+
+        if not running:
+            break
+
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            host = running.pop(task)
+            active_per_host[host] -= 1
+            page = task.result()
+            results.append(page)
+            if page.success and page.depth < max_depth:
+                for link in extract_links(page.content):
+                    if frontier.add_link(link, page.depth + 1):
+                        page.links_found += 1
+
+    results.sort(key=lambda page: page.order)
+    return results
+
+
+def allocate_token_budget(sizes: List[int], total: int) -> List[int]:
+    """
+    Split a token budget across pages.
+
+    Pages smaller than an equal share keep all their tokens and the unused
+    remainder is shared among the larger pages (water-filling), so one huge
+    page does not crowd out the rest and short pages are never truncated
+    needlessly.
+
+    Args:
+        sizes: Token count of each page
+        total: Tokens available for all pages
+
+    Returns:
+        Token budget per page, in the order of `sizes`
+    """
+    budgets = [0] * len(sizes)
+    remaining = max(total, 0)
+    for position, index in enumerate(sorted(range(len(sizes)), key=lambda i: sizes[i])):
+        share = remaining // (len(sizes) - position)
+        budgets[index] = min(sizes[index], share)
+        remaining -= budgets[index]
+    return budgets
+
+
+def format_batch_results(
+    pages: List[PageResult],
+    max_tokens: int,
+    truncate_strategy: str = "smart",
+    wall_time: Optional[float] = None
+) -> str:
+    """
+    Combine fetched pages into one markdown document within a token budget.
+
+    Args:
+        pages: Results from crawl()
+        max_tokens: Token budget for all page contents together
+        truncate_strategy: How each page is truncated to its share (smart, head, tail)
+        wall_time: Elapsed seconds for the whole batch, if measured
+
+    Returns:
+        Markdown with a timing table followed by each page's content
+    """
+    fetched = [page for page in pages if page.success]
+    budgets = allocate_token_budget([count_tokens(page.content) for page in fetched], max_tokens)
+    budget_for = {id(page): budget for page, budget in zip(fetched, budgets)}
+
+    cache_hits = sum(1 for page in fetched if page.from_cache)
+    header = f"📚 **Fetched {len(fetched)} of {len(pages)} page(s)**"
+    details = []
+    if wall_time is not None:
+        details.append(f"{wall_time:.2f}s wall")
+    details.append(f"{sum(page.elapsed for page in pages):.2f}s summed")
+    if cache_hits:
+        details.append(f"{cache_hits} from cache")
+    lines = [f"{header} ({', '.join(details)})", "", "| # | URL | Depth | Status | Time |", "| --- | --- | --- | --- | --- |"]
+
+    for number, page in enumerate(pages, 1):
+        if page.success:
+            status = "cached" if page.from_cache else "ok"
+        else:
+            status = "failed"
+        lines.append(f"| {number} | {page.url} | {page.depth} | {status} | {page.elapsed:.2f}s |")
+
+    for number, page in enumerate(pages, 1):
+        lines.extend(["", "---", "", f"## [{number}] {page.url}", ""])
+        if page.success and budget_for[id(page)] > 0:
+            lines.append(apply_truncation(page.content, budget_for[id(page)], truncate_strategy).strip())
+        elif page.success:
+            lines.append("**[Content omitted - token budget exhausted]**")
+        else:
+            lines.append(page.content)
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,378 @@
+"""Project file index for WYN360 CLI.
+
+Keeps the list of project files in memory so that list_files,
+get_project_info and the blank-project check after every response do not
+walk the whole tree again. The walker uses os.scandir, never descends into
+dependency/VCS directories, and honours .gitignore files at every level.
+
+Refreshes are incremental: adding, removing or renaming an entry changes
+its directory's mtime, so only directories whose mtime (or .gitignore)
+changed are listed again; the rest cost one stat each. The index can be
+persisted under .wyn360/ so a new session starts from the last snapshot.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Directories never indexed, wherever they appear
+PRUNED_DIRS = {
+    '.git', '.hg', '.svn', 'node_modules', '.venv', 'venv', '__pycache__',
+    '.mypy_cache', '.pytest_cache', '.ruff_cache', '.tox', '.nox', '.wyn360',
+    '.idea', '.eggs', 'site-packages',
+}
+
+# File suffixes never indexed
+PRUNED_SUFFIXES = ('.pyc', '.pyo')
+
+INDEX_FILE = Path('.wyn360') / 'file_index.json'
+INDEX_VERSION = 1
+
+# Directories modified this recently may change again within the same mtime
+# tick, so they are listed again on the next refresh ("racy" entries)
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob (without anchoring) to a regex."""
+    regex = ''
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+            continue
+        if pattern.startswith('/**', i) and i + 3 == len(pattern):
+            regex += '/.*'
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            regex += '.*'
+            i += 2
+            continue
+        if char == '*':
+            regex += '[^/]*'
+        elif char == '?':
+            regex += '[^/]'
+        elif char == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                regex += re.escape(char)
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                regex += f'[{body}]'
+                i = end
+        elif char == '\\' and i + 1 < len(pattern):
+            i += 1
+            regex += re.escape(pattern[i])
+        else:
+            regex += re.escape(char)
+        i += 1
+    return regex
+
+
+class IgnoreRules:
+    """Patterns of one .gitignore file, matched relative to its directory"""
+
+    def __init__(self, lines: List[str]):
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []  # (regex, negated, directories only)
+        for line in lines:
+            line = line.rstrip('\n')
+            if not line.strip() or line.startswith('#'):
+                continue
+            line = line.rstrip() if not line.endswith('\\ ') else line
+            negated = line.startswith('!')
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+            anchored = '/' in line
+            line = line.lstrip('/')
+            prefix = '^' if anchored else '^(?:.*/)?'
+            self.rules.append((re.compile(prefix + _glob_to_regex(line) + '$'), negated, dir_only))
+
+    @classmethod
+    def from_file(cls, path: str) -> Optional["IgnoreRules"]:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                rules = cls(f.readlines())
+        except OSError:
+            return None
+        return rules if rules.rules else None
+
+    def match(self, relative_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Returns:
+            True if ignored, False if re-included by a negation, None if no rule matches
+        """
+        result = None
+        for regex, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(relative_path):
+                result = not negated
+        return result
+
+
+@dataclass
+class _DirState:
+    """Indexed listing of one directory"""
+    mtime_ns: int
+    ignore_mtime_ns: int                     # mtime of its .gitignore (0 if none)
+    files: List[str] = field(default_factory=list)
+    subdirs: List[str] = field(default_factory=list)
+
+
+class FileIndex:
+    """
+    In-memory index of the files under a project root.
+
+    Paths are relative to the root, '/'-separated. Call refresh() before
+    reading; it is incremental and cheap when little has changed.
+    """
+
+    def __init__(self, root: str = ".", persist: bool = False):
+        """
+        Args:
+            root: Project directory
+            persist: Load/save a snapshot at <root>/.wyn360/file_index.json
+        """
+        self.root = os.path.abspath(root)
+        self.persist = persist
+        self._dirs: Dict[str, _DirState] = {}
+        self._rules: Dict[str, Optional[IgnoreRules]] = {}
+        self._files: Optional[List[str]] = None
+        self._lock = threading.RLock()
+        self._dirty = False
+        self.stats = {
+            'refreshes': 0, 'dirs_listed': 0, 'dirs_checked': 0,
+            'last_refresh_ms': 0.0, 'loaded_from_disk': False
+        }
+        if persist:
+            self._load()
+
+    # Persistence
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, INDEX_FILE)
+
+    def _load(self) -> None:
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION or data.get('root') != self.root:
+            return
+        self._dirs = {
+            rel: _DirState(state[0], state[1], state[2], state[3]) for rel, state in data['dirs'].items()
+        }
+        self.stats['loaded_from_disk'] = True
+
+    def save(self) -> None:
+        """Write the snapshot (only if persistence is on and the index changed)."""
+        with self._lock:
+            if not self.persist or not self._dirty:
+                return
+            data = {
+                'version': INDEX_VERSION,
+                'root': self.root,
+                'dirs': {
+                    rel: [s.mtime_ns, s.ignore_mtime_ns, s.files, s.subdirs] for rel, s in self._dirs.items()
+                },
+            }
+            try:
+                os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+                temp_path = self.index_path + '.tmp'
+                with open(temp_path, 'w') as f:
+                    json.dump(data, f, separators=(',', ':'))
+                os.replace(temp_path, self.index_path)
+                self._dirty = False
+            except OSError as e:
+                logger.debug(f"Could not save file index: {e}")
+
+    # Refresh
+
+    def _ignore_rules(self, rel: str, ignore_mtime_ns: int) -> Optional[IgnoreRules]:
+        """Parsed .gitignore of a directory (re-read when its mtime changed)."""
+        state = self._dirs.get(rel)
+        if rel in self._rules and state is not None and state.ignore_mtime_ns == ignore_mtime_ns:
+            return self._rules[rel]
+        rules = IgnoreRules.from_file(os.path.join(self.root, rel, '.gitignore')) if ignore_mtime_ns else None
+        self._rules[rel] = rules
+        return rules
+
+    @staticmethod
+    def _is_ignored(rule_stack: List[Tuple[str, IgnoreRules]], rel_path: str, is_dir: bool) -> bool:
+        ignored = False
+        for base, rules in rule_stack:
+            relative = rel_path[len(base) + 1:] if base else rel_path
+            result = rules.match(relative, is_dir)
+            if result is not None:
+                ignored = result
+        return ignored
+
+    def _list_directory(self, rel: str, rule_stack: List[Tuple[str, IgnoreRules]]) -> Tuple[List[str], List[str]]:
+        files, subdirs = [], []
+        path = os.path.join(self.root, rel) if rel else self.root
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = entry.name
+                rel_path = f"{rel}/{name}" if rel else name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if is_dir:
+                        if name in PRUNED_DIRS or self._is_ignored(rule_stack, rel_path, True):
+                            continue
+                        subdirs.append(name)
+                    elif entry.is_file():
+                        if name.endswith(PRUNED_SUFFIXES) or self._is_ignored(rule_stack, rel_path, False):
+                            continue
+                        files.append(name)
+                except OSError:
+                    continue
+        files.sort()
+        subdirs.sort()
+        return files, subdirs
+
+    def _drop_subtree(self, rel: str) -> None:
+        prefix = rel + '/'
+        for key in [key for key in self._dirs if key == rel or key.startswith(prefix)]:
+            del self._dirs[key]
+            self._rules.pop(key, None)
+
+    def refresh(self) -> bool:
+        """
+        Bring the index up to date with the file system.
+
+        Returns:
+            True if the set of indexed files changed
+        """
+        with self._lock:
+            start = time.perf_counter()
+            changed = False
+            now_ns = time.time_ns()
+            visited = set()
+
+            # (relative dir, ignore rules of ancestors, ancestor rules changed)
+            stack: List[Tuple[str, List[Tuple[str, IgnoreRules]], bool]] = [('', [], False)]
+            while stack:
+                rel, parent_rules, rescan = stack.pop()
+                path = os.path.join(self.root, rel) if rel else self.root
+                try:
+                    mtime_ns = os.stat(path).st_mtime_ns
+                except OSError:
+                    continue
+                try:
+                    ignore_mtime_ns = os.stat(os.path.join(path, '.gitignore')).st_mtime_ns
+                except OSError:
+                    ignore_mtime_ns = 0
+
+                visited.add(rel)
+                self.stats['dirs_checked'] += 1
+                state = self._dirs.get(rel)
+                rules_changed = state is None or state.ignore_mtime_ns != ignore_mtime_ns
+                rules = self._ignore_rules(rel, ignore_mtime_ns)
+                rule_stack = parent_rules + [(rel, rules)] if rules else parent_rules
+
+                if rescan or rules_changed or state.mtime_ns != mtime_ns:
+                    try:
+                        files, subdirs = self._list_directory(rel, rule_stack)
+                    except OSError:
+                        continue
+                    self.stats['dirs_listed'] += 1
+                    if state is None or state.files != files or state.subdirs != subdirs:
+                        changed = True
+                    # A directory changed within the mtime granularity may change
+                    # again without a new mtime; list it again next time
+                    recorded_mtime = -1 if now_ns - mtime_ns < RACY_WINDOW_NS else mtime_ns
+                    state = _DirState(recorded_mtime, ignore_mtime_ns, files, subdirs)
+                    self._dirs[rel] = state
+                    self._dirty = True
+
+                for name in reversed(state.subdirs):
+                    stack.append((f"{rel}/{name}" if rel else name, rule_stack, rescan or rules_changed))
+
+            # Directories that disappeared or became ignored
+            for rel in [rel for rel in self._dirs if rel not in visited]:
+                self._drop_subtree(rel)
+                changed = True
+                self._dirty = True
+
+            if changed:
+                self._files = None
+            self.stats['refreshes'] += 1
+            self.stats['last_refresh_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+        if self.persist and self._dirty:
+            self.save()
+        return changed
+
+    # Queries
+
+    def files(self) -> List[str]:
+        """All indexed files (relative, '/'-separated), sorted."""
+        with self._lock:
+            if self._files is None:
+                self._files = sorted(
+                    f"{rel}/{name}" if rel else name
+                    for rel, state in self._dirs.items()
+                    for name in state.files
+                )
+            return self._files
+
+    def get_stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                'root': self.root,
+                'files': sum(len(state.files) for state in self._dirs.values()),
+                'directories': len(self._dirs),
+                **self.stats,
+            }
+
+
+_indexes: Dict[Tuple[str, bool], FileIndex] = {}
+_indexes_lock = threading.Lock()
+_persist_default = False
+
+
+def configure_file_index(persist: bool) -> None:
+    """Set whether indexes created from now on persist under .wyn360/."""
+    global _persist_default
+    _persist_default = persist
+
+
+def get_file_index(root: str = ".", refresh: bool = True) -> FileIndex:
+    """
+    Shared index for a project root.
+
+    Args:
+        root: Project directory
+        refresh: Bring the index up to date before returning it
+
+    Returns:
+        FileIndex for the root
+    """
+    key = (os.path.realpath(root), _persist_default)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = FileIndex(root, persist=_persist_default)
+    if refresh:
+        index.refresh()
+    return index
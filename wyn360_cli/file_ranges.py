@@ -0,0 +1,356 @@
+"""Ranged reads of large files for WYN360 CLI.
+
+read_file used to load whole files (and refuse anything over 1 MB). This
+module reads only the part that is asked for: a line range, a byte range,
+the head or tail, or windows around regex matches, all through mmap and
+capped by a character budget.
+
+Seeking to a line uses a sparse line-offset index: the byte offset of every
+CHECKPOINT_LINES-th line, found with a vectorised newline scan on the first
+request. After that, reaching any line means one lookup plus at most
+CHECKPOINT_LINES - 1 newline searches. Indexes are cached per file and
+extended in place when a file (typically a log) has only been appended to.
+"""
+
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+# Lines between checkpoints in the line-offset index
+CHECKPOINT_LINES = 1024
+
+# Bytes scanned per vectorised newline search
+SCAN_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Bytes before the indexed end that must be unchanged to extend an index
+APPEND_GUARD_BYTES = 4096
+
+MAX_CACHED_INDEXES = 16
+
+# Same estimate as count_tokens elsewhere in the package: 1 token ~ 4 characters
+CHARS_PER_TOKEN = 4
+
+# Longest line shown; longer lines (minified files, JSON blobs) are cut
+MAX_LINE_CHARS = 2000
+
+
+@dataclass
+class RangeResult:
+    """Text read from a file plus where it came from"""
+    text: str
+    first_line: int              # First line shown (1-based, 0 if none)
+    last_line: int               # Last line shown
+    total_lines: Optional[int]   # Lines in the file, if known
+    truncated: bool = False      # Stopped at the budget before the requested end
+    next_line: Optional[int] = None  # Where to continue after a truncated read
+
+
+class LineIndex:
+    """Sparse line-offset index of one file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.size = 0
+        self.mtime_ns = 0
+        self.newlines = 0
+        self.checkpoints = np.zeros(1, dtype=np.int64)  # Offset of line 1, 1 + K, 1 + 2K, ...
+        self.ends_with_newline = False
+        self._guard = b''
+        self.scans = 0
+
+    @property
+    def line_count(self) -> int:
+        """Lines in the file (a final line without a newline counts)."""
+        if self.size == 0:
+            return 0
+        return self.newlines + (0 if self.ends_with_newline else 1)
+
+    def _guard_hash(self, data, end: int) -> bytes:
+        return hashlib.blake2b(data[max(0, end - APPEND_GUARD_BYTES):end], digest_size=16).digest()
+
+    def _scan(self, data, start: int, end: int) -> None:
+        """Record checkpoints for newlines in data[start:end]."""
+        view = np.frombuffer(data, dtype=np.uint8)
+        new_checkpoints = []
+        for chunk_start in range(start, end, SCAN_CHUNK_BYTES):
+            chunk_end = min(end, chunk_start + SCAN_CHUNK_BYTES)
+            positions = np.flatnonzero(view[chunk_start:chunk_end] == 10)
+            if len(positions):
+                # Newline number n (1-based) starts line n + 1; keep n % K == 0
+                first = (CHECKPOINT_LINES - self.newlines % CHECKPOINT_LINES - 1) % CHECKPOINT_LINES
+                new_checkpoints.append(positions[first::CHECKPOINT_LINES].astype(np.int64) + chunk_start + 1)
+                self.newlines += len(positions)
+        del view
+        if new_checkpoints:
+            self.checkpoints = np.concatenate([self.checkpoints] + new_checkpoints)
+        self.scans += 1
+
+    def update(self, data, stat: os.stat_result) -> None:
+        """Bring the index in line with the file contents mapped in data."""
+        if stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns:
+            return
+        appended = (
+            self.size and stat.st_size > self.size and
+            self._guard_hash(data, self.size) == self._guard
+        )
+        if not appended:
+            self.newlines = 0
+            self.checkpoints = np.zeros(1, dtype=np.int64)
+            self._scan(data, 0, stat.st_size)
+        else:
+            self._scan(data, self.size, stat.st_size)
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.ends_with_newline = stat.st_size > 0 and data[stat.st_size - 1:stat.st_size] == b'\n'
+        self._guard = self._guard_hash(data, self.size)
+
+    def line_offset(self, data, line: int) -> int:
+        """Byte offset where a 1-based line starts (file size if past the end)."""
+        if line <= 1:
+            return 0
+        if line > self.newlines + 1:
+            return self.size
+        checkpoint = (line - 1) // CHECKPOINT_LINES
+        offset = int(self.checkpoints[checkpoint])
+        for _ in range((line - 1) % CHECKPOINT_LINES):
+            offset = data.find(b'\n', offset) + 1
+        return offset
+
+    def line_at(self, data, offset: int) -> int:
+        """1-based line containing a byte offset."""
+        checkpoint = int(np.searchsorted(self.checkpoints, offset, side='right')) - 1
+        start = int(self.checkpoints[checkpoint])
+        if offset <= start:
+            return checkpoint * CHECKPOINT_LINES + 1
+        between = np.frombuffer(data, dtype=np.uint8, count=offset - start, offset=start)
+        return checkpoint * CHECKPOINT_LINES + 1 + int(np.count_nonzero(between == 10))
+
+
+_indexes: "OrderedDict[str, LineIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def _line_index(path: str, data, stat: os.stat_result) -> LineIndex:
+    """Cached index for a file, updated for its current contents."""
+    key = os.path.realpath(path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = LineIndex(key)
+            while len(_indexes) > MAX_CACHED_INDEXES:
+                _indexes.popitem(last=False)
+        _indexes.move_to_end(key)
+        index.update(data, stat)
+    return index
+
+
+class _MappedFile:
+    """Read-only mmap of a file (an empty bytes object for empty files)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self.stat = os.fstat(self._file.fileno())
+        self.data = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.stat.st_size else b''
+        )
+
+    def __enter__(self) -> "_MappedFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    def index(self) -> LineIndex:
+        return _line_index(self.path, self.data, self.stat)
+
+
+def _decode_line(line: bytes) -> str:
+    text = line.rstrip(b'\r').decode('utf-8', errors='replace')
+    return text if len(text) <= MAX_LINE_CHARS else text[:MAX_LINE_CHARS] + f' … [{len(text) - MAX_LINE_CHARS} more chars]'
+
+
+def _numbered(lines: List[bytes], first_line: int, budget: int, marks=frozenset()) -> Tuple[List[str], int]:
+    """Format lines as 'N| text' until the character budget runs out."""
+    width = len(str(first_line + len(lines)))
+    out = []
+    used = 0
+    for offset, raw in enumerate(lines):
+        number = first_line + offset
+        prefix = '>' if number in marks else ' '
+        text = f"{prefix}{number:>{width}}| {_decode_line(raw)}"
+        if out and used + len(text) + 1 > budget:
+            break
+        out.append(text)
+        used += len(text) + 1
+    return out, used
+
+
+def read_lines(path: str, start: int = 1, end: Optional[int] = None, max_chars: int = 32000) -> RangeResult:
+    """
+    Read lines start..end (1-based, inclusive) of a file.
+
+    Args:
+        path: File path
+        start: First line
+        end: Last line (None = until the budget runs out)
+        max_chars: Output budget
+
+    Returns:
+        RangeResult with numbered lines
+    """
+    start = max(1, start)
+    with _MappedFile(path) as f:
+        data = f.data
+        # Near the top of the file a forward scan is cheaper than a full index pass
+        index = f.index() if start > CHECKPOINT_LINES or len(data) <= SCAN_CHUNK_BYTES else None
+        if index is not None:
+            offset = index.line_offset(data, start)
+        else:
+            offset = 0
+            for _ in range(start - 1):
+                offset = data.find(b'\n', offset) + 1 or len(data)
+
+        # Enough bytes for the budget; long lines are cut when formatted
+        window = data[offset:offset + max_chars * 2 + MAX_LINE_CHARS]
+        pieces = window.split(b'\n')
+        lines, partial = pieces[:-1], pieces[-1]
+        if partial and (offset + len(window) >= len(data) or not lines):
+            lines.append(partial)  # Last line without a newline, or one huge line
+        if end is not None:
+            lines = lines[:max(0, end - start + 1)]
+
+        shown, _ = _numbered(lines, start, max_chars)
+        next_offset = offset
+        for raw in lines[:len(shown)]:
+            next_offset = data.find(b'\n', next_offset + len(raw)) + 1 or len(data)
+
+        last = start + len(shown) - 1
+        truncated = next_offset < len(data) and (end is None or last < end)
+        return RangeResult(
+            '\n'.join(shown), start if shown else 0, last if shown else 0,
+            index.line_count if index is not None else None,
+            truncated, last + 1 if truncated else None
+        )
+
+
+def read_tail(path: str, count: int = 50, max_chars: int = 32000) -> RangeResult:
+    """Last `count` lines of a file, numbered (the end is kept when the budget is short)."""
+    with _MappedFile(path) as f:
+        data = f.data
+        total = f.index().line_count
+        end = len(data) - 1 if data[-1:] == b'\n' else len(data)
+        shown: List[str] = []
+        used = 0
+        number = total
+        while number >= 1 and len(shown) < count:
+            line_start = data.rfind(b'\n', 0, end) + 1
+            formatted, size = _numbered([data[line_start:end]], number, max_chars)
+            if shown and used + size > max_chars:
+                break
+            shown.append(formatted[0])
+            used += size
+            end = line_start - 1
+            number -= 1
+        shown.reverse()
+        return RangeResult('\n'.join(shown), number + 1 if shown else 0, total if shown else 0, total,
+                           truncated=len(shown) < min(count, total))
+
+
+def read_byte_range(path: str, offset: int, length: int, max_chars: int = 32000) -> RangeResult:
+    """
+    Raw bytes offset..offset+length, decoded as UTF-8 (invalid bytes replaced).
+
+    The reported line numbers are the lines the range starts and ends in.
+    """
+    with _MappedFile(path) as f:
+        data = f.data
+        offset = max(0, min(offset, len(data)))
+        length = max(0, min(length, max_chars, len(data) - offset))
+        chunk = data[offset:offset + length]
+        index = f.index()
+        first = index.line_at(data, offset) if len(data) else 0
+        last = index.line_at(data, max(offset, offset + length - 1)) if len(data) else 0
+        return RangeResult(chunk.decode('utf-8', errors='replace'), first, last, index.line_count)
+
+
+def read_matches(
+    path: str,
+    pattern: str,
+    context_lines: int = 3,
+    max_matches: int = 20,
+    ignore_case: bool = False,
+    max_chars: int = 32000
+) -> Tuple[RangeResult, int]:
+    """
+    Windows of lines around regex matches; matching lines are marked with '>'.
+
+    Returns:
+        (RangeResult with windows separated by '--', number of matching lines shown)
+    """
+    from .code_search import compile_pattern
+
+    regex, _ = compile_pattern(pattern, ignore_case)
+    with _MappedFile(path) as f:
+        data = f.data
+        index = f.index()
+        total = index.line_count
+
+        matched_lines = []
+        position = 0
+        more = False
+        while position <= len(data):
+            found = regex.search(data, position)
+            if found is None:
+                break
+            if len(matched_lines) == max_matches:
+                more = True
+                break
+            line = index.line_at(data, found.start())
+            if line > total:
+                break  # Empty match after the final newline, not on a line
+            matched_lines.append(line)
+            line_end = data.find(b'\n', found.start())
+            position = len(data) + 1 if line_end == -1 else line_end + 1
+
+        # Merge overlapping windows
+        windows: List[List[int]] = []
+        for line in matched_lines:
+            low, high = max(1, line - context_lines), min(total, line + context_lines)
+            if windows and low <= windows[-1][1] + 1:
+                windows[-1][1] = max(windows[-1][1], high)
+            else:
+                windows.append([low, high])
+
+        marks = frozenset(matched_lines)
+        parts, used, shown_matches = [], 0, 0
+        truncated = more
+        for low, high in windows:
+            start = index.line_offset(data, low)
+            end = index.line_offset(data, high + 1)
+            lines = data[start:end].split(b'\n')
+            if lines and lines[-1] == b'':
+                lines = lines[:-1]
+            formatted, size = _numbered(lines, low, max_chars - used, marks)
+            if parts and (not formatted or used + size > max_chars):
+                truncated = True
+                break
+            parts.append('\n'.join(formatted))
+            used += size + 3
+            shown_matches += sum(1 for n in range(low, low + len(formatted)) if n in marks)
+            if len(formatted) < len(lines):
+                truncated = True
+                break
+
+        first = windows[0][0] if windows else 0
+        last = windows[len(parts) - 1][1] if parts else 0
+        return RangeResult('\n--\n'.join(parts), first, last, total, truncated), shown_matches
@@ -0,0 +1,445 @@
+"""Structured git state for WYN360 CLI.
+
+The git tools used to run `git status`, `git diff`, ... through a blocking
+shell for every call and hand the raw text to the model. This service runs
+git asynchronously (exec, no shell) with machine-readable output, parses it
+into records, and caches the results:
+
+- status:   `git status --porcelain=v2 -z --branch`
+- diffstat: `git diff --numstat -z [--cached]`
+- diff:     `git diff [--cached] -- <path>` (full patches, per file)
+- log:      `git log` with a field-separated format
+- branches: `git for-each-ref refs/heads`
+
+Cache entries are keyed on the mtimes of .git/index, HEAD, the ref HEAD
+points to and packed-refs, so commits, staging, checkouts and branch
+changes invalidate them without running git. Edits to the working tree do
+not touch those files; results that depend on the working tree are also
+invalidated by `invalidate_git_cache()` (called after the agent writes
+files or runs commands) and expire after WORKTREE_TTL_SECONDS to pick up
+edits made outside the agent. git is run with GIT_OPTIONAL_LOCKS=0 so a
+status call never rewrites the index (and so never invalidates itself).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Working-tree dependent results (status, diffs) are reused for this long
+WORKTREE_TTL_SECONDS = 10.0
+
+GIT_TIMEOUT_SECONDS = 15.0
+
+# Separators for log / for-each-ref formats
+FIELD_SEP = "\x1f"
+RECORD_SEP = "\x1e"
+
+
+class GitError(Exception):
+    """A git command failed; the message is git's stderr."""
+
+
+@dataclass
+class FileStatus:
+    """One entry of `git status --porcelain=v2`"""
+    path: str
+    index: str = "."        # Staged change: M, A, D, R, C, T, U or '.'
+    worktree: str = "."     # Unstaged change, same codes
+    kind: str = "changed"   # changed | renamed | unmerged | untracked | ignored
+    orig_path: Optional[str] = None
+
+    @property
+    def staged(self) -> bool:
+        return self.kind not in ("untracked", "ignored", "unmerged") and self.index != "."
+
+    @property
+    def unstaged(self) -> bool:
+        return self.kind not in ("untracked", "ignored", "unmerged") and self.worktree != "."
+
+
+@dataclass
+class BranchInfo:
+    """Branch headers of `git status --porcelain=v2 --branch`"""
+    head: Optional[str] = None      # None when detached
+    oid: Optional[str] = None       # None before the first commit
+    upstream: Optional[str] = None
+    ahead: int = 0
+    behind: int = 0
+
+
+@dataclass
+class StatusSnapshot:
+    branch: BranchInfo
+    files: List[FileStatus] = field(default_factory=list)
+
+    @property
+    def staged(self) -> List[FileStatus]:
+        return [f for f in self.files if f.staged]
+
+    @property
+    def unstaged(self) -> List[FileStatus]:
+        return [f for f in self.files if f.unstaged]
+
+    @property
+    def untracked(self) -> List[FileStatus]:
+        return [f for f in self.files if f.kind == "untracked"]
+
+    @property
+    def conflicted(self) -> List[FileStatus]:
+        return [f for f in self.files if f.kind == "unmerged"]
+
+    @property
+    def clean(self) -> bool:
+        return not any(f.kind != "ignored" for f in self.files)
+
+
+@dataclass
+class DiffStat:
+    """One entry of `git diff --numstat`; added/deleted are None for binary files"""
+    path: str
+    added: Optional[int]
+    deleted: Optional[int]
+    orig_path: Optional[str] = None
+
+    @property
+    def binary(self) -> bool:
+        return self.added is None
+
+
+@dataclass
+class Commit:
+    sha: str
+    short_sha: str
+    author: str
+    date: str
+    subject: str
+
+
+@dataclass
+class Branch:
+    name: str
+    current: bool
+    short_sha: str
+    upstream: Optional[str]
+    subject: str
+
+
+def parse_status_v2(data: bytes) -> StatusSnapshot:
+    """Parse `git status --porcelain=v2 -z --branch` output."""
+    branch = BranchInfo()
+    files: List[FileStatus] = []
+    entries = data.decode("utf-8", errors="surrogateescape").split("\0")
+    i = 0
+    while i < len(entries):
+        entry = entries[i]
+        i += 1
+        if not entry:
+            continue
+        tag = entry[0]
+        if tag == "#":
+            _, key, *value = entry.split(" ", 2)
+            value = value[0] if value else ""
+            if key == "branch.head":
+                branch.head = None if value == "(detached)" else value
+            elif key == "branch.oid":
+                branch.oid = None if value == "(initial)" else value
+            elif key == "branch.upstream":
+                branch.upstream = value
+            elif key == "branch.ab":
+                ahead, behind = value.split()
+                branch.ahead, branch.behind = int(ahead), -int(behind)
+        elif tag == "1":
+            # 1 XY sub mH mI mW hH hI path
+            parts = entry.split(" ", 8)
+            files.append(FileStatus(parts[8], parts[1][0], parts[1][1]))
+        elif tag == "2":
+            # 2 XY sub mH mI mW hH hI Xscore path \0 origPath
+            parts = entry.split(" ", 9)
+            files.append(FileStatus(parts[9], parts[1][0], parts[1][1], "renamed", entries[i]))
+            i += 1
+        elif tag == "u":
+            # u XY sub m1 m2 m3 mW h1 h2 h3 path
+            parts = entry.split(" ", 10)
+            files.append(FileStatus(parts[10], parts[1][0], parts[1][1], "unmerged"))
+        elif tag == "?":
+            files.append(FileStatus(entry[2:], "?", "?", "untracked"))
+        elif tag == "!":
+            files.append(FileStatus(entry[2:], "!", "!", "ignored"))
+    return StatusSnapshot(branch, files)
+
+
+def parse_numstat(data: bytes) -> List[DiffStat]:
+    """Parse `git diff --numstat -z` output."""
+    stats: List[DiffStat] = []
+    entries = data.decode("utf-8", errors="surrogateescape").split("\0")
+    i = 0
+    while i < len(entries):
+        entry = entries[i]
+        i += 1
+        if not entry:
+            continue
+        added, deleted, path = entry.split("\t", 2)
+        orig_path = None
+        if not path:
+            # Renames: "added\tdeleted\t\0orig\0new"
+            orig_path, path = entries[i], entries[i + 1]
+            i += 2
+        binary = added == "-"
+        stats.append(DiffStat(path, None if binary else int(added), None if binary else int(deleted), orig_path))
+    return stats
+
+
+def parse_log(data: bytes) -> List[Commit]:
+    """Parse `git log` output written with LOG_FORMAT."""
+    commits = []
+    for record in data.decode("utf-8", errors="replace").split(RECORD_SEP):
+        record = record.strip("\n")
+        if record:
+            commits.append(Commit(*record.split(FIELD_SEP, 4)))
+    return commits
+
+
+def parse_branches(data: bytes) -> List[Branch]:
+    """Parse `git for-each-ref` output written with BRANCH_FORMAT."""
+    branches = []
+    for record in data.decode("utf-8", errors="replace").split(RECORD_SEP):
+        record = record.strip("\n")
+        if record:
+            head, name, short_sha, upstream, subject = record.split(FIELD_SEP, 4)
+            branches.append(Branch(name, head == "*", short_sha, upstream or None, subject))
+    return branches
+
+
+LOG_FORMAT = FIELD_SEP.join(["%H", "%h", "%an", "%ad", "%s"]) + RECORD_SEP
+BRANCH_FORMAT = "%1f".join(["%(HEAD)", "%(refname:short)", "%(objectname:short)",
+                            "%(upstream:short)", "%(contents:subject)"]) + "%1e"
+
+
+class GitService:
+    """Cached, structured view of one repository's state."""
+
+    def __init__(self, root: str = "."):
+        self.root = os.path.realpath(root)
+        self._git_dir: Optional[str] = None
+        self._common_dir: Optional[str] = None
+        self._cache: Dict[tuple, Tuple[tuple, float, object]] = {}
+        self._generation = 0
+        self.stats = {"git_calls": 0, "cache_hits": 0}
+
+    async def _git(self, *args: str, timeout: float = GIT_TIMEOUT_SECONDS) -> bytes:
+        """Run git in the repository and return stdout; raises GitError."""
+        env = dict(os.environ, GIT_OPTIONAL_LOCKS="0")
+        self.stats["git_calls"] += 1
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "git", *args,
+                cwd=self.root, env=env,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError:
+            raise GitError("git is not installed or not on PATH")
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise GitError(f"git {args[0]} timed out after {timeout:g} seconds")
+        if process.returncode != 0:
+            raise GitError(stderr.decode("utf-8", errors="replace").strip() or f"git {args[0]} failed")
+        return stdout
+
+    async def _locate(self) -> None:
+        if self._git_dir is None:
+            output = await self._git("rev-parse", "--absolute-git-dir", "--git-common-dir")
+            git_dir, common_dir = output.decode("utf-8", errors="surrogateescape").splitlines()[:2]
+            self._git_dir = git_dir
+            self._common_dir = os.path.normpath(os.path.join(self.root, common_dir))
+
+    def _stamp(self) -> tuple:
+        """mtimes of the files git updates on staging, commits, checkouts and ref changes"""
+        def mtime(path: str) -> int:
+            try:
+                return os.stat(path).st_mtime_ns
+            except OSError:
+                return 0
+
+        head = os.path.join(self._git_dir, "HEAD")
+        ref_mtime = 0
+        try:
+            with open(head, "r", encoding="utf-8", errors="replace") as f:
+                content = f.read(512).strip()
+            if content.startswith("ref: "):
+                ref_mtime = mtime(os.path.join(self._common_dir, content[5:]))
+        except OSError:
+            pass
+        return (
+            mtime(os.path.join(self._git_dir, "index")),
+            mtime(head),
+            ref_mtime,
+            mtime(os.path.join(self._common_dir, "packed-refs")),
+            mtime(os.path.join(self._common_dir, "refs", "heads")),
+        )
+
+    async def _cached(self, key: tuple, worktree: bool, produce):
+        await self._locate()
+        stamp = self._stamp() + ((self._generation,) if worktree else ())
+        hit = self._cache.get(key)
+        now = time.monotonic()
+        if hit is not None and hit[0] == stamp and (not worktree or now - hit[1] < WORKTREE_TTL_SECONDS):
+            self.stats["cache_hits"] += 1
+            return hit[2]
+        value = await produce()
+        self._cache[key] = (stamp, now, value)
+        return value
+
+    def invalidate(self) -> None:
+        """Forget working-tree dependent results (after files were written or commands run)."""
+        self._generation += 1
+
+    async def status(self) -> StatusSnapshot:
+        async def produce():
+            return parse_status_v2(await self._git("status", "--porcelain=v2", "-z", "--branch"))
+        return await self._cached(("status",), True, produce)
+
+    async def diff_stats(self, staged: bool = False) -> List[DiffStat]:
+        args = ["diff", "--numstat", "-z"] + (["--cached"] if staged else [])
+
+        async def produce():
+            return parse_numstat(await self._git(*args))
+        return await self._cached(("numstat", staged), True, produce)
+
+    async def diff(self, path: Optional[str] = None, staged: bool = False) -> str:
+        """Full patch text, for one path or the whole tree."""
+        args = ["diff", "--no-color"] + (["--cached"] if staged else []) + (["--", path] if path else [])
+
+        async def produce():
+            return (await self._git(*args)).decode("utf-8", errors="replace")
+        return await self._cached(("diff", path, staged), True, produce)
+
+    async def log(self, max_count: int = 10) -> List[Commit]:
+        async def produce():
+            try:
+                return parse_log(await self._git(
+                    "log", f"-n{max_count}", f"--format={LOG_FORMAT}", "--date=short"
+                ))
+            except GitError as e:
+                # No commits yet
+                if "does not have any commits" in str(e):
+                    return []
+                raise
+        return await self._cached(("log", max_count), False, produce)
+
+    async def branches(self) -> List[Branch]:
+        async def produce():
+            return parse_branches(await self._git("for-each-ref", f"--format={BRANCH_FORMAT}", "refs/heads"))
+        return await self._cached(("branches",), False, produce)
+
+
+# Sections of the status summary list at most this many files
+MAX_LISTED_FILES = 50
+
+# Whole-tree diffs with more changed lines than this are summarised per file
+FULL_DIFF_MAX_LINES = 200
+
+
+def _counts(stat: Optional[DiffStat]) -> str:
+    if stat is None:
+        return ""
+    if stat.binary:
+        return "  (binary)"
+    return f"  (+{stat.added} -{stat.deleted})"
+
+
+def _listed(title: str, lines: List[str]) -> List[str]:
+    if not lines:
+        return []
+    shown = [f"  {line}" for line in lines[:MAX_LISTED_FILES]]
+    if len(lines) > MAX_LISTED_FILES:
+        shown.append(f"  ... and {len(lines) - MAX_LISTED_FILES} more")
+    return [f"{title} ({len(lines)}):"] + shown
+
+
+def format_status(snapshot: StatusSnapshot, staged_stats: List[DiffStat] = (),
+                  unstaged_stats: List[DiffStat] = ()) -> str:
+    """Compact status summary with per-file line counts."""
+    branch = snapshot.branch
+    if branch.head:
+        line = f"On branch {branch.head}"
+    else:
+        line = f"HEAD detached at {branch.oid[:7] if branch.oid else '(no commit)'}"
+    if branch.upstream:
+        line += f" (tracking {branch.upstream}"
+        if branch.ahead or branch.behind:
+            line += f", ahead {branch.ahead}, behind {branch.behind}"
+        line += ")"
+    if branch.oid is None:
+        line += " - no commits yet"
+
+    staged = {s.path: s for s in staged_stats}
+    unstaged = {s.path: s for s in unstaged_stats}
+    lines = [line]
+    lines += _listed("Staged", [
+        f"{f.index}  {f.orig_path + ' -> ' if f.orig_path else ''}{f.path}{_counts(staged.get(f.path))}"
+        for f in snapshot.staged
+    ])
+    lines += _listed("Unstaged", [
+        f"{f.worktree}  {f.path}{_counts(unstaged.get(f.path))}" for f in snapshot.unstaged
+    ])
+    lines += _listed("Conflicts", [f"{f.index}{f.worktree} {f.path}" for f in snapshot.conflicted])
+    lines += _listed("Untracked", [f.path for f in snapshot.untracked])
+    if snapshot.clean:
+        lines.append("Working tree clean")
+    return "\n".join(lines)
+
+
+def format_diff_summary(stats: List[DiffStat]) -> str:
+    """One line per changed file, for diffs too large to show in full."""
+    added = sum(s.added or 0 for s in stats)
+    deleted = sum(s.deleted or 0 for s in stats)
+    lines = [f"{len(stats)} files changed, +{added} -{deleted}:"]
+    for stat in stats[:MAX_LISTED_FILES]:
+        counts = "   binary   " if stat.binary else f"{'+' + str(stat.added):>6} {'-' + str(stat.deleted):>6}"
+        rename = f"{stat.orig_path} -> " if stat.orig_path else ""
+        lines.append(f"  {counts}  {rename}{stat.path}")
+    if len(stats) > MAX_LISTED_FILES:
+        lines.append(f"  ... and {len(stats) - MAX_LISTED_FILES} more")
+    return "\n".join(lines)
+
+
+def format_log(commits: List[Commit]) -> str:
+    return "\n".join(f"{c.short_sha} {c.date} {c.subject} ({c.author})" for c in commits)
+
+
+def format_branches(branches: List[Branch]) -> str:
+    width = max((len(b.name) for b in branches), default=0)
+    return "\n".join(
+        f"{'*' if b.current else ' '} {b.name:<{width}}  {b.short_sha}"
+        f"{' [' + b.upstream + ']' if b.upstream else ''} {b.subject}"
+        for b in branches
+    )
+
+
+_services: Dict[str, GitService] = {}
+
+
+def get_git_service(root: str = ".") -> GitService:
+    """Get (or create) the shared service for a repository root."""
+    key = os.path.realpath(root)
+    service = _services.get(key)
+    if service is None:
+        service = _services[key] = GitService(key)
+    return service
+
+
+def invalidate_git_cache(root: str = ".") -> None:
+    """Mark working-tree dependent results stale; a no-op if no service exists yet."""
+    service = _services.get(os.path.realpath(root))
+    if service is not None:
+        service.invalidate()
@@ -0,0 +1,265 @@
+"""HTML to markdown conversion for WYN360 CLI.
+
+Lightweight, dependency-free converter used by the HTTP fast path of
+fetch_website (Phase 12.5): static pages are converted in-process instead of
+being rendered in a headless browser. Covers the structure that matters to an
+LLM reader - headings, paragraphs, links, lists, emphasis, code, quotes and
+tables - and drops scripts, styles and other non-content markup.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import List, Optional
+from urllib.parse import urljoin
+
+
+# Elements whose content is never shown as text
+SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'svg', 'canvas', 'iframe', 'object', 'head'}
+
+# Elements that start a new block of text
+BLOCK_TAGS = {
+    'p', 'div', 'section', 'article', 'main', 'header', 'footer', 'nav', 'aside',
+    'form', 'fieldset', 'figure', 'figcaption', 'address', 'details', 'summary',
+    'dl', 'dt', 'dd', 'ul', 'ol', 'table', 'blockquote', 'pre', 'hr', 'body'
+}
+
+# Elements separated from the next block by a blank line
+PARAGRAPH_TAGS = {'p', 'ul', 'ol', 'table', 'blockquote', 'pre', 'figure', 'dl'}
+
+VOID_TAGS = {'br', 'hr', 'img', 'input', 'meta', 'link', 'source', 'wbr', 'area', 'base', 'col', 'embed', 'param', 'track'}
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class HTMLToMarkdown(HTMLParser):
+    """
+    Streaming HTML to markdown converter.
+
+    After feed() and close(), `title` holds the document title and
+    `text_length` the number of visible text characters, which the fetcher
+    uses to tell a content page from an empty JavaScript shell.
+    """
+
+    def __init__(self, base_url: str = ""):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.title = ""
+        self.text_length = 0
+
+        self._out: List[str] = []
+        self._skip_depth = 0
+        self._in_title = False
+        self._pre_depth = 0
+        self._quote_depth = 0
+        self._lists: List[List] = []     # [tag, item counter] per open list
+        self._links: List[Optional[str]] = []
+        self._link_start: List[int] = []
+        self._row: Optional[List[str]] = None
+        self._cell: Optional[List[str]] = None
+        self._rows_in_table: List[int] = []
+        self._line_start = True
+
+    # Output helpers
+
+    def _write(self, text: str) -> None:
+        if self._cell is not None:
+            self._cell.append(text)
+            return
+        if self._line_start and text:
+            if self._quote_depth:
+                self._out.append('> ' * self._quote_depth)
+            self._line_start = False
+        self._out.append(text)
+
+    def _ensure_newlines(self, count: int) -> None:
+        """End the current block with at least `count` newlines"""
+        if self._cell is not None:
+            self._cell.append(' ')
+            return
+        if not self._out:
+            return
+        tail = ''.join(self._out[-3:])
+        existing = len(tail) - len(tail.rstrip('\n'))
+        if existing < count:
+            self._out.append('\n' * (count - existing))
+        self._line_start = True
+
+    # Parser callbacks
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            if tag not in VOID_TAGS:
+                self._skip_depth += 1
+            return
+        if tag == 'title':
+            self._in_title = True
+            return
+        if self._skip_depth:
+            return
+
+        attributes = dict(attrs)
+
+        if tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+            self._ensure_newlines(2)
+            self._write('#' * int(tag[1]) + ' ')
+        elif tag == 'li':
+            self._ensure_newlines(1)
+            depth = max(len(self._lists) - 1, 0)
+            if self._lists and self._lists[-1][0] == 'ol':
+                self._lists[-1][1] += 1
+                marker = f"{self._lists[-1][1]}. "
+            else:
+                marker = "- "
+            self._write('  ' * depth + marker)
+        elif tag in ('ul', 'ol'):
+            self._ensure_newlines(1 if self._lists else 2)
+            self._lists.append([tag, 0])
+        elif tag == 'blockquote':
+            self._ensure_newlines(2)
+            self._quote_depth += 1
+        elif tag == 'pre':
+            self._ensure_newlines(2)
+            self._write('```\n')
+            self._pre_depth += 1
+        elif tag == 'code' and not self._pre_depth:
+            self._write('`')
+        elif tag in ('strong', 'b'):
+            self._write('**')
+        elif tag in ('em', 'i'):
+            self._write('*')
+        elif tag == 'a':
+            href = attributes.get('href') or ''
+            if href and not href.startswith(('#', 'javascript:')):
+                self._links.append(urljoin(self.base_url, href))
+                self._write('[')
+            else:
+                self._links.append(None)
+        elif tag == 'img':
+            alt = (attributes.get('alt') or '').strip()
+            src = attributes.get('src') or ''
+            if alt and src and not src.startswith('data:'):
+                self._write(f"![{alt}]({urljoin(self.base_url, src)})")
+        elif tag == 'br':
+            if self._pre_depth:
+                self._write('\n')
+            else:
+                self._ensure_newlines(1)
+        elif tag == 'hr':
+            self._ensure_newlines(2)
+            self._write('---')
+            self._ensure_newlines(2)
+        elif tag == 'table':
+            self._ensure_newlines(2)
+            self._rows_in_table.append(0)
+        elif tag == 'tr':
+            self._row = []
+        elif tag in ('td', 'th'):
+            self._cell = []
+        elif tag in BLOCK_TAGS:
+            self._ensure_newlines(2 if tag in PARAGRAPH_TAGS else 1)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            if tag not in VOID_TAGS:
+                self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if tag == 'title':
+            self._in_title = False
+            return
+        if self._skip_depth:
+            return
+
+        if tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+            self._ensure_newlines(2)
+        elif tag in ('ul', 'ol'):
+            if self._lists:
+                self._lists.pop()
+            self._ensure_newlines(1 if self._lists else 2)
+        elif tag == 'blockquote':
+            self._quote_depth = max(0, self._quote_depth - 1)
+            self._ensure_newlines(2)
+        elif tag == 'pre':
+            if self._pre_depth:
+                self._pre_depth -= 1
+                self._ensure_newlines(1)
+                self._write('```')
+                self._ensure_newlines(2)
+        elif tag == 'code' and not self._pre_depth:
+            self._write('`')
+        elif tag in ('strong', 'b'):
+            self._write('**')
+        elif tag in ('em', 'i'):
+            self._write('*')
+        elif tag == 'a':
+            href = self._links.pop() if self._links else None
+            if href:
+                self._write(f"]({href})")
+        elif tag in ('td', 'th'):
+            if self._cell is not None and self._row is not None:
+                self._row.append(_WHITESPACE.sub(' ', ''.join(self._cell)).strip().replace('|', '\\|'))
+            self._cell = None
+        elif tag == 'tr':
+            self._finish_row()
+        elif tag == 'table':
+            self._finish_row()
+            if self._rows_in_table:
+                self._rows_in_table.pop()
+            self._ensure_newlines(2)
+        elif tag in BLOCK_TAGS:
+            self._ensure_newlines(2 if tag in PARAGRAPH_TAGS else 1)
+
+    def _finish_row(self) -> None:
+        row, self._row = self._row, None
+        if not row:
+            return
+        self._write('| ' + ' | '.join(row) + ' |')
+        self._ensure_newlines(1)
+        if self._rows_in_table:
+            self._rows_in_table[-1] += 1
+            if self._rows_in_table[-1] == 1:
+                self._write('|' + ' --- |' * len(row))
+                self._ensure_newlines(1)
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+            return
+        if self._skip_depth:
+            return
+
+        if self._pre_depth:
+            self._write(data)
+            self.text_length += len(data.strip())
+            return
+
+        text = _WHITESPACE.sub(' ', data)
+        if self._line_start and self._cell is None:
+            text = text.lstrip()
+        if not text:
+            return
+        self.text_length += len(text.strip())
+        self._write(text)
+
+    def markdown(self) -> str:
+        """The converted document"""
+        text = ''.join(self._out)
+        text = re.sub(r'[ \t]+\n', '\n', text)
+        text = re.sub(r'\n{3,}', '\n\n', text)
+        return text.strip() + '\n' if text.strip() else ''
+
+
+def html_to_markdown(html: str, base_url: str = "") -> str:
+    """
+    Convert an HTML document to markdown.
+
+    Args:
+        html: HTML source
+        base_url: URL the document was fetched from (resolves relative links)
+
+    Returns:
+        Markdown text
+    """
+    converter = HTMLToMarkdown(base_url)
+    converter.feed(html)
+    converter.close()
+    return converter.markdown()
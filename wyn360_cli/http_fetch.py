@@ -0,0 +1,252 @@
+"""Browserless HTTP fetching for WYN360 CLI.
+
+Phase 12.5: fetch_website first tries a plain HTTP GET through a pooled
+keep-alive client and converts the HTML in-process. The headless browser is
+only needed when the response looks like a JavaScript-rendered shell, has no
+readable body, or is not HTML at all; `needs_browser` makes that call.
+"""
+
+import asyncio
+import http.cookiejar
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+    httpx = None
+
+from .html_markdown import HTMLToMarkdown
+
+
+# Below this many visible characters a page is treated as empty
+MIN_STATIC_TEXT = 200
+
+# Pages with less text than this are checked for JavaScript-shell markers
+SHELL_TEXT_LIMIT = 2000
+
+# Responses are read up to this size; the remainder is discarded
+MAX_RESPONSE_BYTES = 5 * 1024 * 1024
+
+HTTP_TIMEOUT = 15.0
+
+MAX_REDIRECTS = 10
+
+DEFAULT_HEADERS = {
+    'User-Agent': (
+        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+        '(KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+    ),
+    'Accept': 'text/html,application/xhtml+xml,text/plain;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+HTML_TYPES = ('text/html', 'application/xhtml+xml')
+TEXT_TYPES = ('text/plain', 'text/markdown', 'text/x-markdown', 'text/csv',
+              'application/json', 'text/xml', 'application/xml')
+
+_EMPTY_MOUNT_POINT = re.compile(
+    r'<div[^>]+id=["\'](?:root|app|__next|___gatsby|svelte|main-app)["\'][^>]*>\s*</div>',
+    re.IGNORECASE
+)
+_JS_REQUIRED = re.compile(
+    r'<noscript[^>]*>[^<]*(?:<[^/][^>]*>[^<]*)*?(?:enable|requires?|turn on)\s+javascript',
+    re.IGNORECASE
+)
+_SCRIPT_BLOCK = re.compile(r'<script\b[^>]*>(.*?)</script>', re.IGNORECASE | re.DOTALL)
+
+
+@dataclass
+class HttpFetchResult:
+    """Outcome of the HTTP tier for one URL"""
+    url: str
+    status: int = 0
+    content_type: str = ''
+    markdown: str = ''
+    title: str = ''
+    text_length: int = 0
+    latency: float = 0.0
+    bytes_received: int = 0
+    escalate_reason: Optional[str] = None  # Why the browser is needed, or None
+    error: Optional[str] = None
+
+    @property
+    def needs_browser(self) -> bool:
+        return self.escalate_reason is not None
+
+
+_client = None
+_client_loop = None
+
+
+def get_http_client():
+    """
+    Get the pooled HTTP client for the running event loop.
+
+    The connection pool is bound to the loop it was created on, so a new
+    client is made if the loop changed (e.g. a new asyncio.run()).
+    """
+    global _client, _client_loop
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop or _client.is_closed:
+        _client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            timeout=httpx.Timeout(HTTP_TIMEOUT, connect=5.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the pooled HTTP client, if open."""
+    global _client, _client_loop
+
+    client, _client, _client_loop = _client, None, None
+    if client is not None and not client.is_closed:
+        try:
+            await client.aclose()
+        except Exception:
+            pass
+
+
+def _cookie_jar(cookies: Optional[list]):
+    """
+    Build a cookie jar from saved session cookies (Playwright format).
+
+    Each cookie keeps its domain, path, secure flag and expiry, so the jar
+    only sends it where the browser would - including on redirect hops.
+    """
+    if not cookies:
+        return None
+    jar = httpx.Cookies()
+    for cookie in cookies:
+        domain = cookie.get('domain') or ''
+        expires = cookie.get('expires')
+        jar.jar.set_cookie(http.cookiejar.Cookie(
+            version=0, name=cookie['name'], value=cookie['value'],
+            port=None, port_specified=False,
+            domain=domain, domain_specified=domain.startswith('.'),
+            domain_initial_dot=domain.startswith('.'),
+            path=cookie.get('path') or '/', path_specified=True,
+            secure=bool(cookie.get('secure')),
+            expires=int(expires) if expires and expires > 0 else None,
+            discard=False, comment=None, comment_url=None,
+            rest={'HttpOnly': None} if cookie.get('httpOnly') else {},
+        ))
+    return jar
+
+
+async def _send(client, url: str, jar):
+    """
+    Send a streamed GET for url.
+
+    With a session cookie jar, redirects are followed by hand so the
+    cookies that apply to each hop are sent with it; httpx's own redirect
+    handling only sends the client's cookies and strips a Cookie header.
+    """
+    if jar is None:
+        return await client.send(client.build_request('GET', url), stream=True)
+
+    for _ in range(MAX_REDIRECTS + 1):
+        request = client.build_request('GET', url)
+        jar.set_cookie_header(request)
+        response = await client.send(request, stream=True, follow_redirects=False)
+        if not response.is_redirect:
+            return response
+        jar.extract_cookies(response)
+        url = response.url.join(response.headers['location'])
+        await response.aclose()
+    raise httpx.TooManyRedirects(f"Exceeded {MAX_REDIRECTS} redirects", request=request)
+
+
+def needs_browser(html: str, text_length: int) -> Optional[str]:
+    """
+    Decide whether a page must be rendered in a browser to be readable.
+
+    Args:
+        html: Raw HTML
+        text_length: Visible text characters found by the converter
+
+    Returns:
+        Reason to escalate, or None if the static HTML is good enough
+    """
+    if text_length < MIN_STATIC_TEXT:
+        return "empty body"
+    if text_length < SHELL_TEXT_LIMIT:
+        if _EMPTY_MOUNT_POINT.search(html):
+            return "javascript app shell"
+        if _JS_REQUIRED.search(html):
+            return "javascript required"
+        script_bytes = sum(len(match) for match in _SCRIPT_BLOCK.findall(html))
+        if script_bytes > 20 * text_length:
+            return "script-heavy page"
+    return None
+
+
+async def fetch_http(url: str, cookies: Optional[list] = None) -> HttpFetchResult:
+    """
+    Fetch a URL over plain HTTP and convert it to markdown.
+
+    Args:
+        url: URL to fetch
+        cookies: Optional saved session cookies (Playwright format)
+
+    Returns:
+        HttpFetchResult; check `needs_browser` before using its markdown
+    """
+    result = HttpFetchResult(url=url)
+    if not HAS_HTTPX:
+        result.escalate_reason = "httpx not installed"
+        return result
+
+    jar = _cookie_jar(cookies)
+
+    start = time.perf_counter()
+    try:
+        response = await _send(get_http_client(), url, jar)
+        try:
+            result.status = response.status_code
+            result.content_type = response.headers.get('content-type', '').split(';')[0].strip().lower()
+
+            chunks = []
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                result.bytes_received += len(chunk)
+                if result.bytes_received >= MAX_RESPONSE_BYTES:
+                    break
+            body = b''.join(chunks).decode(response.encoding or 'utf-8', errors='replace')
+        finally:
+            await response.aclose()
+    except Exception as e:
+        result.latency = time.perf_counter() - start
+        result.error = f"{type(e).__name__}: {e}"
+        result.escalate_reason = "http error"
+        return result
+
+    if not 200 <= result.status < 300:
+        result.escalate_reason = f"HTTP {result.status}"
+    elif result.content_type in TEXT_TYPES:
+        result.markdown = body
+        result.text_length = len(body.strip())
+        if not result.text_length:
+            result.escalate_reason = "empty body"
+    elif result.content_type in HTML_TYPES or not result.content_type:
+        converter = HTMLToMarkdown(str(response.url))
+        converter.feed(body)
+        converter.close()
+        result.markdown = converter.markdown()
+        result.title = converter.title.strip()
+        result.text_length = converter.text_length
+        result.escalate_reason = needs_browser(body, converter.text_length)
+    else:
+        result.escalate_reason = f"unsupported content type {result.content_type}"
+
+    result.latency = time.perf_counter() - start
+    return result
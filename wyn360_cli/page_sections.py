@@ -0,0 +1,333 @@
+"""Query-aware reduction of fetched pages for WYN360 CLI.
+
+Phase 12.8: when fetch_website is given a query, the page is not cut at a
+fixed position. It is split into heading-delimited sections, the sections
+are ranked against the query with BM25 (plus cosine similarity from the
+local embedding model when available), and the best sections are packed
+into the token budget in document order with elision markers between them.
+
+A SectionIndex is cached next to the page (see WebsiteCache.set_sections),
+so follow-up questions about the same URL re-rank the stored sections
+instead of fetching and splitting the page again.
+"""
+
+import math
+import re
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .browser_use import count_tokens
+
+
+# Sections larger than this are split further at paragraph boundaries
+MAX_SECTION_TOKENS = 800
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Weight of embedding similarity when blended with BM25
+EMBEDDING_WEIGHT = 0.5
+
+# Queries whose scores are kept per index
+SCORE_CACHE_SIZE = 16
+
+# A matching section too large for the remaining budget is trimmed to fit,
+# if at least this many tokens are left
+MIN_TRIMMED_TOKENS = 100
+
+SECTION_INDEX_VERSION = 1
+
+STOPWORDS = {
+    'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'any', 'can', 'was', 'one',
+    'our', 'out', 'has', 'have', 'had', 'how', 'what', 'when', 'where', 'which', 'who',
+    'why', 'with', 'this', 'that', 'from', 'they', 'them', 'their', 'there', 'into',
+    'about', 'does', 'than', 'then', 'its', 'your', 'will', 'would', 'should', 'could',
+    'is', 'in', 'of', 'to', 'a', 'an', 'on', 'or', 'as', 'at', 'be', 'by', 'it', 'do', 'if', 'me', 'my'
+}
+
+_HEADING = re.compile(r'^(#{1,6})\s+\S', re.MULTILINE)
+_WORD = re.compile(r'[a-z0-9]+(?:[._-][a-z0-9]+)*')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased search terms of a text, without stopwords."""
+    return [word for word in _WORD.findall(text.lower()) if len(word) > 1 and word not in STOPWORDS]
+
+
+@dataclass
+class PageSection:
+    """A heading-delimited part of a page"""
+    heading: str                 # Heading line the section belongs to ('' before the first heading)
+    text: str                    # Markdown of the section (includes the heading unless continued)
+    continued: bool = False      # Later part of a section split for size
+    tokens: int = 0
+    terms: Counter = field(default_factory=Counter)
+
+    def __post_init__(self):
+        self.tokens = count_tokens(self.text)
+        # Heading terms count double: they say what the section is about
+        self.terms = Counter(tokenize(self.text)) + Counter(tokenize(self.heading))
+
+
+def split_sections(markdown: str, max_section_tokens: int = MAX_SECTION_TOKENS) -> List[PageSection]:
+    """
+    Split markdown into sections at headings, then at paragraphs if too large.
+
+    Args:
+        markdown: Page markdown
+        max_section_tokens: Largest section kept whole
+
+    Returns:
+        Sections in document order
+    """
+    starts = [match.start() for match in _HEADING.finditer(markdown)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    starts.append(len(markdown))
+
+    sections = []
+    for start, end in zip(starts, starts[1:]):
+        block = markdown[start:end].strip()
+        if not block:
+            continue
+        heading = block.split('\n', 1)[0] if _HEADING.match(block) else ''
+
+        if count_tokens(block) <= max_section_tokens:
+            sections.append(PageSection(heading, block))
+            continue
+
+        # Pack paragraphs into parts of at most max_section_tokens
+        max_chars = max_section_tokens * 4
+        parts: List[str] = []
+        current = ''
+        for paragraph in re.split(r'\n{2,}', block):
+            while len(paragraph) > max_chars:
+                if current:
+                    parts.append(current)
+                    current = ''
+                parts.append(paragraph[:max_chars])
+                paragraph = paragraph[max_chars:]
+            if current and len(current) + len(paragraph) + 2 > max_chars:
+                parts.append(current)
+                current = ''
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current:
+            parts.append(current)
+
+        for number, part in enumerate(parts):
+            sections.append(PageSection(heading, part.strip(), continued=number > 0))
+
+    return sections
+
+
+class SectionIndex:
+    """
+    Sections of one page with the statistics needed to rank them.
+
+    BM25 document frequencies are computed once per page; scores are
+    memoized per query, and section embeddings (when computed) are stored
+    with the index so they survive in the website cache.
+    """
+
+    def __init__(self, sections: List[PageSection], embeddings: Optional[List[List[float]]] = None,
+                 embedding_model_name: str = ''):
+        self.sections = sections
+        self.embeddings = embeddings
+        self.embedding_model_name = embedding_model_name
+        self.total_tokens = sum(section.tokens for section in sections)
+
+        self.document_frequency: Counter = Counter()
+        for section in sections:
+            self.document_frequency.update(section.terms.keys())
+        lengths = [sum(section.terms.values()) for section in sections]
+        self._lengths = lengths
+        self._average_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        self._score_cache: "OrderedDict[Tuple[str, bool], List[float]]" = OrderedDict()
+
+    @classmethod
+    def from_markdown(cls, markdown: str, max_section_tokens: int = MAX_SECTION_TOKENS) -> "SectionIndex":
+        """Split a page and index its sections."""
+        return cls(split_sections(markdown, max_section_tokens))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form stored by the website cache."""
+        return {
+            'version': SECTION_INDEX_VERSION,
+            'sections': [
+                {'heading': s.heading, 'text': s.text, 'continued': s.continued} for s in self.sections
+            ],
+            'embeddings': self.embeddings,
+            'embedding_model': self.embedding_model_name,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional["SectionIndex"]:
+        """Rebuild an index from to_dict() output, or None if it is from another version."""
+        if data.get('version') != SECTION_INDEX_VERSION:
+            return None
+        sections = [PageSection(s['heading'], s['text'], s.get('continued', False)) for s in data['sections']]
+        return cls(sections, data.get('embeddings'), data.get('embedding_model', ''))
+
+    def compute_embeddings(self, embedding_model) -> bool:
+        """
+        Embed every section once (slow; run off the event loop).
+
+        Args:
+            embedding_model: document_readers.EmbeddingModel or compatible
+
+        Returns:
+            True if embeddings are available afterwards
+        """
+        name = getattr(embedding_model, 'model_name', '')
+        if self.embeddings is not None and self.embedding_model_name == name:
+            return True
+        if not self.sections:
+            return False
+        try:
+            vectors = embedding_model.encode([section.text for section in self.sections])
+        except Exception:
+            return False
+        self.embeddings = [list(map(float, vector)) for vector in vectors]
+        self.embedding_model_name = name
+        self._score_cache.clear()
+        return True
+
+    def bm25_scores(self, query: str) -> List[float]:
+        """BM25 score of every section for the query."""
+        query_terms = set(tokenize(query))
+        count = len(self.sections)
+        scores = []
+        for section, length in zip(self.sections, self._lengths):
+            score = 0.0
+            for term in query_terms:
+                frequency = section.terms.get(term, 0)
+                if not frequency:
+                    continue
+                df = self.document_frequency[term]
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (self._average_length or 1))
+                score += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+            scores.append(score)
+        return scores
+
+    def score(self, query: str, embedding_model=None) -> List[float]:
+        """
+        Relevance of every section to the query, in [0, 1].
+
+        BM25 (normalized by the best section) is blended with cosine
+        similarity when the sections have embeddings and a model is given.
+        """
+        use_embeddings = embedding_model is not None and self.embeddings is not None
+        key = (query, use_embeddings)
+        if key in self._score_cache:
+            self._score_cache.move_to_end(key)
+            return self._score_cache[key]
+
+        scores = self.bm25_scores(query)
+        best = max(scores, default=0.0)
+        scores = [s / best for s in scores] if best > 0 else [0.0] * len(scores)
+
+        if use_embeddings:
+            try:
+                query_vector = embedding_model.encode(query)
+                similarities = embedding_model.compute_similarity(query_vector, _as_array(self.embeddings))
+                scores = [
+                    (1 - EMBEDDING_WEIGHT) * s + EMBEDDING_WEIGHT * max(float(similarity), 0.0)
+                    for s, similarity in zip(scores, similarities)
+                ]
+            except Exception:
+                pass  # Keep the BM25 ranking
+
+        self._score_cache[key] = scores
+        if len(self._score_cache) > SCORE_CACHE_SIZE:
+            self._score_cache.popitem(last=False)
+        return scores
+
+    def reduce(self, query: str, max_tokens: int, embedding_model=None) -> Tuple[str, bool]:
+        """
+        Pack the sections most relevant to the query into the token budget.
+
+        Sections are chosen by score (document order breaks ties, so
+        unscored pages degrade to a head cut) and emitted in document order
+        with a marker wherever sections were left out.
+
+        Args:
+            query: What the user is looking for
+            max_tokens: Token budget for the result
+            embedding_model: Optional model for semantic scoring
+
+        Returns:
+            Tuple of (reduced_markdown, was_reduced)
+        """
+        if self.total_tokens <= max_tokens:
+            return '\n\n'.join(section.text for section in self.sections), False
+
+        scores = self.score(query, embedding_model)
+        ranked = sorted(range(len(self.sections)), key=lambda i: (-scores[i], i))
+
+        # Leave room for the banner and elision markers
+        budget = max(max_tokens - 50, 0)
+        chosen = set()
+        trimmed: Dict[int, str] = {}
+        used = 0
+        for index in ranked:
+            cost = self.sections[index].tokens + 10
+            if used + cost <= budget:
+                chosen.add(index)
+                used += cost
+            elif scores[index] > 0 and not trimmed and budget - used - 10 >= MIN_TRIMMED_TOKENS:
+                # Keep the head of a relevant section rather than dropping it
+                text = _trim(self.sections[index].text, (budget - used - 10) * 4)
+                trimmed[index] = text
+                chosen.add(index)
+                used += count_tokens(text) + 10
+
+        if not chosen:
+            # Budget smaller than any section: cut the best one
+            best = ranked[0]
+            return self.sections[best].text[:max_tokens * 4], True
+
+        matched = sum(1 for index in chosen if scores[index] > 0)
+        parts = [
+            f"*[Query-focused excerpt for \"{query}\": {len(chosen)} of {len(self.sections)} sections "
+            f"({matched} matching), ~{used:,} of {self.total_tokens:,} tokens]*"
+        ]
+        skipped = 0
+        previous_heading = None
+        for index, section in enumerate(self.sections):
+            if index not in chosen:
+                skipped += 1
+                continue
+            if skipped:
+                parts.append(f"*[… {skipped} section(s) omitted …]*")
+                skipped = 0
+            text = trimmed.get(index, section.text)
+            if section.continued and section.heading and previous_heading != section.heading:
+                text = f"{section.heading} (continued)\n\n{text}"
+            parts.append(text)
+            previous_heading = section.heading
+        if skipped:
+            parts.append(f"*[… {skipped} section(s) omitted …]*")
+
+        return '\n\n'.join(parts), True
+
+
+def _trim(text: str, max_chars: int) -> str:
+    """Head of a section cut at a paragraph (or line) boundary."""
+    if len(text) <= max_chars:
+        return text
+    head = text[:max_chars - 2]
+    for separator in ('\n\n', '\n'):
+        cut = head.rfind(separator)
+        if cut > max_chars // 2:
+            head = head[:cut]
+            break
+    return head.rstrip() + ' …'
+
+
+def _as_array(vectors: List[List[float]]):
+    """Embeddings as a numpy array for EmbeddingModel.compute_similarity."""
+    import numpy as np
+    return np.array(vectors)
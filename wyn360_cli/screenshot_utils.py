@@ -0,0 +1,273 @@
+"""
+Screenshot utilities for vision-based browser automation.
+
+Provides cheap perceptual change detection between consecutive screenshots so
+that BrowserTaskExecutor can skip vision API calls when the page has not
+visibly changed, vision-sized re-encoding of captures, plus token estimates
+for vision requests.
+"""
+
+import io
+import logging
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+try:
+    from PIL import Image, ImageChops
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+    Image = None
+    ImageChops = None
+
+logger = logging.getLogger(__name__)
+
+
+# Anthropic vision pricing: an image costs roughly (width * height) / 750 input
+# tokens, and images are scaled to fit ~1.15 megapixels before counting
+IMAGE_TOKEN_DIVISOR = 750
+MAX_IMAGE_TOKENS = 1600
+DEFAULT_VIEWPORT = (1024, 768)
+
+# Vision encoding defaults: XGA fits the ~1.15 MP budget without server-side
+# rescaling, and JPEG q75 keeps UI text legible at a fraction of PNG's size
+DEFAULT_VISION_MAX_SIZE = (1024, 768)
+DEFAULT_JPEG_QUALITY = 75
+VISION_IMAGE_FORMATS = ("jpeg", "png")
+
+
+@dataclass
+class FrameSignature:
+    """Perceptual fingerprint of a screenshot"""
+    dhash: int
+    thumbnail: "Image.Image"
+    size: Tuple[int, int]
+
+
+def compute_signature(screenshot: bytes, hash_size: int = 16, thumb_width: int = 128) -> Optional[FrameSignature]:
+    """
+    Compute a difference hash and grayscale thumbnail for a screenshot.
+
+    Args:
+        screenshot: Encoded image bytes (PNG/JPEG)
+        hash_size: dHash grid size (hash has hash_size**2 bits)
+        thumb_width: Width of the thumbnail used for pixel diffs
+
+    Returns:
+        FrameSignature, or None if Pillow is unavailable or the bytes are not an image
+    """
+    if not HAS_PIL or not screenshot:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(screenshot)) as image:
+            size = image.size
+            gray = image.convert('L')
+    except Exception as e:
+        logger.debug(f"Screenshot could not be decoded for change detection: {e}")
+        return None
+
+    # dHash: compare horizontally adjacent pixels of a tiny grayscale image
+    small = gray.resize((hash_size + 1, hash_size), Image.BILINEAR)
+    pixels = small.tobytes()
+    row = hash_size + 1
+    value = 0
+    for y in range(hash_size):
+        offset = y * row
+        for x in range(hash_size):
+            value = (value << 1) | (pixels[offset + x] > pixels[offset + x + 1])
+
+    thumb_height = max(1, round(thumb_width * size[1] / max(size[0], 1)))
+    thumbnail = gray.resize((thumb_width, thumb_height), Image.BILINEAR)
+
+    return FrameSignature(dhash=value, thumbnail=thumbnail, size=size)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes"""
+    return bin(a ^ b).count('1')
+
+
+def changed_pixel_ratio(a: FrameSignature, b: FrameSignature, pixel_delta: int = 24) -> float:
+    """
+    Fraction of thumbnail pixels whose brightness differs by more than pixel_delta.
+
+    Catches small but meaningful edits (typed text, a toggled checkbox) that a
+    whole-frame hash can miss, while ignoring anti-aliasing and caret blinks.
+    """
+    if a.thumbnail.size != b.thumbnail.size:
+        return 1.0
+
+    histogram = ImageChops.difference(a.thumbnail, b.thumbnail).histogram()
+    total = a.thumbnail.size[0] * a.thumbnail.size[1]
+    return sum(histogram[pixel_delta + 1:]) / total
+
+
+def frames_match(
+    a: FrameSignature,
+    b: FrameSignature,
+    hash_threshold: int = 3,
+    pixel_threshold: float = 0.001
+) -> bool:
+    """
+    Check whether two screenshots are visually the same.
+
+    Args:
+        a: Previous frame signature
+        b: Current frame signature
+        hash_threshold: Maximum dHash bit distance
+        pixel_threshold: Maximum fraction of changed thumbnail pixels
+
+    Returns:
+        True if the frames are effectively unchanged
+    """
+    if a.size != b.size:
+        return False
+    if hamming_distance(a.dhash, b.dhash) > hash_threshold:
+        return False
+    return changed_pixel_ratio(a, b) <= pixel_threshold
+
+
+class ScreenshotChangeDetector:
+    """
+    Tracks the last screenshot and reports whether the page visibly changed.
+
+    Screenshots that cannot be decoded are always treated as changed, so the
+    caller falls back to a normal vision call.
+    """
+
+    def __init__(self, hash_threshold: int = 3, pixel_threshold: float = 0.001):
+        self.hash_threshold = hash_threshold
+        self.pixel_threshold = pixel_threshold
+        self._last: Optional[FrameSignature] = None
+        self._last_url: Optional[str] = None
+
+    @property
+    def last_signature(self) -> Optional[FrameSignature]:
+        """Signature of the most recent screenshot passed to has_changed()"""
+        return self._last
+
+    def reset(self) -> None:
+        """Forget the previous frame"""
+        self._last = None
+        self._last_url = None
+
+    def has_changed(self, screenshot: bytes, url: str = "") -> bool:
+        """
+        Compare a screenshot with the previous one and remember it.
+
+        Args:
+            screenshot: Current screenshot bytes
+            url: Current page URL (a URL change always counts as changed)
+
+        Returns:
+            True if the page changed (or no comparison was possible)
+        """
+        signature = compute_signature(screenshot)
+        previous, previous_url = self._last, self._last_url
+        self._last, self._last_url = signature, url
+
+        if signature is None or previous is None:
+            return True
+        if url != previous_url:
+            return True
+
+        return not frames_match(previous, signature, self.hash_threshold, self.pixel_threshold)
+
+
+def get_image_size(screenshot: bytes) -> Optional[Tuple[int, int]]:
+    """Get (width, height) of encoded image bytes, or None if unknown"""
+    if not HAS_PIL or not screenshot:
+        return None
+    try:
+        with Image.open(io.BytesIO(screenshot)) as image:
+            return image.size
+    except Exception:
+        return None
+
+
+def estimate_image_tokens(screenshot: bytes) -> int:
+    """
+    Estimate vision input tokens for a screenshot.
+
+    Args:
+        screenshot: Encoded image bytes
+
+    Returns:
+        Approximate input tokens (falls back to the default viewport size)
+    """
+    width, height = get_image_size(screenshot) or DEFAULT_VIEWPORT
+    return min(MAX_IMAGE_TOKENS, (width * height) // IMAGE_TOKEN_DIVISOR)
+
+
+def detect_media_type(image: bytes) -> str:
+    """
+    Detect the MIME type of encoded image bytes from their magic number.
+
+    Args:
+        image: Encoded image bytes
+
+    Returns:
+        "image/jpeg", "image/webp", "image/gif", or "image/png" (the default)
+    """
+    if image[:3] == b'\xff\xd8\xff':
+        return 'image/jpeg'
+    if image[:4] == b'RIFF' and image[8:12] == b'WEBP':
+        return 'image/webp'
+    if image[:6] in (b'GIF87a', b'GIF89a'):
+        return 'image/gif'
+    return 'image/png'
+
+
+def encode_for_vision(
+    screenshot: bytes,
+    max_size: Tuple[int, int] = DEFAULT_VISION_MAX_SIZE,
+    image_format: str = "jpeg",
+    quality: int = DEFAULT_JPEG_QUALITY
+) -> bytes:
+    """
+    Downscale and re-encode a screenshot for upload to the vision API.
+
+    Args:
+        screenshot: Captured image bytes (usually PNG)
+        max_size: (width, height) bounding box; aspect ratio is preserved
+        image_format: "jpeg" or "png"
+        quality: JPEG quality (1-95)
+
+    Returns:
+        Encoded bytes, or the original bytes if Pillow is unavailable, the input
+        cannot be decoded, or re-encoding would not make it smaller
+    """
+    if not HAS_PIL or not screenshot:
+        return screenshot
+
+    image_format = image_format.lower()
+    if image_format == "jpg":
+        image_format = "jpeg"
+    if image_format not in VISION_IMAGE_FORMATS:
+        logger.debug(f"Unknown vision image format '{image_format}', using jpeg")
+        image_format = "jpeg"
+
+    try:
+        with Image.open(io.BytesIO(screenshot)) as image:
+            needs_resize = image.size[0] > max_size[0] or image.size[1] > max_size[1]
+            if not needs_resize and detect_media_type(screenshot) == f"image/{image_format}":
+                return screenshot
+
+            image.load()
+            if needs_resize:
+                image.thumbnail(max_size, Image.LANCZOS)
+
+            buffer = io.BytesIO()
+            if image_format == "jpeg":
+                image.convert('RGB').save(buffer, format='JPEG', quality=quality, optimize=True)
+            else:
+                image.save(buffer, format='PNG', optimize=True)
+    except Exception as e:
+        logger.debug(f"Screenshot could not be re-encoded for vision: {e}")
+        return screenshot
+
+    encoded = buffer.getvalue()
+    if not needs_resize and len(encoded) >= len(screenshot):
+        return screenshot
+    return encoded
@@ -0,0 +1,490 @@
+"""Persistent trigram index for search_files.
+
+On large repositories every search_files call would otherwise read the
+whole tree. The index maps each 3-byte sequence (case-folded) to the files
+that contain it, so a query only has to verify the files that contain every
+trigram of the literal text its regex requires. Patterns without a usable
+literal (e.g. "\\w+_id") fall back to the plain scan.
+
+The posting lists are a sorted CSR table (numpy arrays) plus a small
+in-memory delta for files changed since the last merge. Files are tracked
+by mtime and size: a query stats every candidate file and always includes
+files that changed since they were indexed, so results are never stale, and
+re-indexing of those files happens in the background. The index lives under
+.wyn360/index/ and is built on first use in a background thread; until it is
+ready searches use the plain scan.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .file_index import get_file_index
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python 3.10
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+
+
+INDEX_DIR = os.path.join('.wyn360', 'index')
+INDEX_VERSION = 1
+
+# Files larger than this are not indexed; they are always scanned
+MAX_INDEXED_FILE_BYTES = 1024 * 1024
+
+BINARY_SNIFF_BYTES = 8192
+
+# Changed files are kept in the delta until this many accumulate, then merged
+DELTA_MERGE_FILES = 512
+
+# Special ids in the file table
+BINARY = -1        # Never matches (code search skips binary files)
+TOO_LARGE = -2     # Not indexed, always a candidate
+
+
+def file_trigrams(data: bytes) -> np.ndarray:
+    """Sorted unique case-folded trigrams of a byte string, packed into uint32."""
+    if len(data) < 3:
+        return np.empty(0, dtype=np.uint32)
+    chars = np.frombuffer(data.lower(), dtype=np.uint8).astype(np.uint32)
+    return np.unique((chars[:-2] << 16) | (chars[1:-1] << 8) | chars[2:])
+
+
+# Query planning: reduce a regex to the literals every match must contain.
+# A plan is ('lit', bytes), ('and', [plans]), ('or', [plans']) or None
+# (no constraint, every file is a candidate).
+
+_REPEATS = tuple(
+    getattr(sre_parse, name) for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+    if hasattr(sre_parse, name)
+)
+
+
+def _all_of(parts):
+    parts = [part for part in parts if part is not None]
+    if not parts:
+        return None
+    return parts[0] if len(parts) == 1 else ('and', parts)
+
+
+def _any_of(parts):
+    if not parts or any(part is None for part in parts):
+        return None
+    return parts[0] if len(parts) == 1 else ('or', parts)
+
+
+def _plan_sequence(items, ignore_case: bool):
+    parts = []
+    run = []
+
+    def flush():
+        literal = ''.join(run).encode('utf-8')
+        run.clear()
+        # Case folding of the index only covers ASCII
+        if len(literal) >= 3 and not (ignore_case and not literal.isascii()):
+            parts.append(('lit', literal.lower()))
+
+    for op, av in items:
+        if op == sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        flush()
+        if op == sre_parse.SUBPATTERN:
+            parts.append(_plan_sequence(av[-1], ignore_case))
+        elif op == getattr(sre_parse, 'ATOMIC_GROUP', None):
+            parts.append(_plan_sequence(av, ignore_case))
+        elif op == sre_parse.BRANCH:
+            parts.append(_any_of([_plan_sequence(branch, ignore_case) for branch in av[1]]))
+        elif op in _REPEATS and av[0] >= 1:
+            parts.append(_plan_sequence(av[2], ignore_case))
+    flush()
+    return _all_of(parts)
+
+
+def plan_query(pattern: str, ignore_case: bool = False):
+    """
+    Literals a regex requires, as an and/or plan.
+
+    Invalid regexes are planned as plain text, matching the literal fallback
+    of code_search.
+
+    Args:
+        pattern: Search pattern
+        ignore_case: Query is case-insensitive
+
+    Returns:
+        Plan, or None if the pattern constrains nothing usable
+    """
+    try:
+        return _plan_sequence(sre_parse.parse(pattern), ignore_case)
+    except Exception:
+        pass
+    text = pattern.encode('utf-8')
+    if len(text) < 3 or (ignore_case and not text.isascii()):
+        return None
+    return ('lit', text.lower())
+
+
+class TrigramIndex:
+    """
+    Trigram index of the files under a project root.
+
+    Call update() (or start()) to build it; candidates() narrows a search to
+    the files that can match.
+    """
+
+    def __init__(self, root: str = ".", persist: bool = True):
+        """
+        Args:
+            root: Project directory
+            persist: Load/save the index under <root>/.wyn360/index/
+        """
+        self.root = os.path.abspath(root)
+        self.persist = persist
+        self.ready = False
+
+        # path -> [id, mtime_ns, size]; id indexes self._paths or is BINARY/TOO_LARGE
+        self._stamps: Dict[str, List[int]] = {}
+        self._paths: List[Optional[str]] = []       # id -> path (None once replaced or removed)
+        self._dead = 0
+
+        # Merged posting lists: trigram keys[i] -> ids[offsets[i]:offsets[i + 1]]
+        self._keys = np.empty(0, dtype=np.uint32)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._ids = np.empty(0, dtype=np.uint32)
+        # Postings of files indexed since the last merge
+        self._delta: Dict[int, List[int]] = {}
+        self._delta_files = 0
+
+        self._lock = threading.RLock()
+        self._update_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self.stats = {
+            'builds': 0, 'files_indexed': 0, 'merges': 0, 'last_update_s': 0.0,
+            'queries': 0, 'narrowed_queries': 0, 'candidates': 0, 'stale_candidates': 0,
+            'loaded_from_disk': False,
+        }
+        if persist:
+            self._load()
+
+    # Persistence
+
+    @property
+    def index_dir(self) -> str:
+        return os.path.join(self.root, INDEX_DIR)
+
+    def _load(self) -> None:
+        try:
+            with open(os.path.join(self.index_dir, 'files.json'), 'r') as f:
+                meta = json.load(f)
+            if meta.get('version') != INDEX_VERSION or meta.get('root') != self.root:
+                return
+            with np.load(os.path.join(self.index_dir, 'postings.npz')) as data:
+                keys, offsets, ids = data['keys'], data['offsets'], data['ids']
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f"Could not load search index: {e}")
+            return
+
+        paths: List[Optional[str]] = [None] * meta['file_count']
+        for path, (file_id, _, _) in meta['files'].items():
+            if file_id >= 0:
+                paths[file_id] = path
+        with self._lock:
+            self._stamps = meta['files']
+            self._paths = paths
+            self._keys, self._offsets, self._ids = keys, offsets, ids
+            self.ready = True
+            self.stats['loaded_from_disk'] = True
+
+    def save(self) -> None:
+        """Merge pending changes and write the index to .wyn360/index/."""
+        if not self.persist:
+            return
+        with self._lock:
+            if self._delta or self._dead:
+                self._merge()
+            meta = {
+                'version': INDEX_VERSION,
+                'root': self.root,
+                'file_count': len(self._paths),
+                'files': {path: list(stamp) for path, stamp in self._stamps.items()},
+            }
+            keys, offsets, ids = self._keys, self._offsets, self._ids
+        try:
+            os.makedirs(self.index_dir, exist_ok=True)
+            postings_path = os.path.join(self.index_dir, 'postings.npz')
+            with open(postings_path + '.tmp', 'wb') as f:
+                np.savez(f, keys=keys, offsets=offsets, ids=ids)
+            os.replace(postings_path + '.tmp', postings_path)
+            files_path = os.path.join(self.index_dir, 'files.json')
+            with open(files_path + '.tmp', 'w') as f:
+                json.dump(meta, f, separators=(',', ':'))
+            os.replace(files_path + '.tmp', files_path)
+        except OSError as e:
+            logger.debug(f"Could not save search index: {e}")
+
+    # Building
+
+    def _read_trigrams(self, path: str, size: int) -> Tuple[int, Optional[np.ndarray]]:
+        """(kind, trigrams) for a file; kind is 0, BINARY or TOO_LARGE."""
+        if size > MAX_INDEXED_FILE_BYTES:
+            return TOO_LARGE, None
+        try:
+            with open(os.path.join(self.root, path), 'rb') as f:
+                data = f.read(MAX_INDEXED_FILE_BYTES + 1)
+        except OSError:
+            return TOO_LARGE, None
+        if len(data) > MAX_INDEXED_FILE_BYTES:
+            return TOO_LARGE, None
+        if b'\x00' in data[:BINARY_SNIFF_BYTES]:
+            return BINARY, None
+        return 0, file_trigrams(data)
+
+    def _changes(self, paths: List[str]) -> Tuple[List[Tuple[str, int, int]], List[str]]:
+        """Files that are new or whose mtime/size changed, and files that are gone."""
+        with self._lock:
+            stamps = dict(self._stamps)
+        # Runs on every query: keep the per-file work to one stat
+        prefix = self.root + os.sep
+        stat = os.stat
+        changed = []
+        for path in paths:
+            try:
+                result = stat(prefix + path)
+            except OSError:
+                continue
+            stamp = stamps.pop(path, None)
+            if stamp is None or stamp[1] != result.st_mtime_ns or stamp[2] != result.st_size:
+                changed.append((path, result.st_mtime_ns, result.st_size))
+        return changed, list(stamps)
+
+    def _retire(self, path: str) -> None:
+        stamp = self._stamps.pop(path, None)
+        if stamp is not None and stamp[0] >= 0:
+            self._paths[stamp[0]] = None
+            self._dead += 1
+
+    def _merge(self, added: Optional[List[Tuple[int, np.ndarray]]] = None) -> None:
+        """Fold the delta (and newly added files) into the CSR table, dropping dead ids."""
+        trigram_parts = [np.repeat(self._keys, np.diff(self._offsets))]
+        id_parts = [self._ids]
+        for trigram, ids in self._delta.items():
+            trigram_parts.append(np.full(len(ids), trigram, dtype=np.uint32))
+            id_parts.append(np.asarray(ids, dtype=np.uint32))
+        for file_id, trigrams in added or []:
+            trigram_parts.append(trigrams)
+            id_parts.append(np.full(len(trigrams), file_id, dtype=np.uint32))
+        trigrams = np.concatenate(trigram_parts).astype(np.uint32, copy=False)
+        ids = np.concatenate(id_parts).astype(np.uint32, copy=False)
+
+        # Renumber live files densely
+        alive = np.fromiter((path is not None for path in self._paths), dtype=bool, count=len(self._paths))
+        keep = alive[ids]
+        trigrams, ids = trigrams[keep], ids[keep]
+        renumber = (np.cumsum(alive) - 1).astype(np.uint32)
+        ids = renumber[ids]
+        self._paths = [path for path in self._paths if path is not None]
+        for file_id, path in enumerate(self._paths):
+            self._stamps[path][0] = file_id
+
+        order = np.lexsort((ids, trigrams))
+        trigrams, ids = trigrams[order], ids[order]
+        keys, starts = np.unique(trigrams, return_index=True)
+        self._keys = keys
+        self._offsets = np.append(starts, len(ids)).astype(np.int64)
+        self._ids = ids
+        self._delta = {}
+        self._delta_files = 0
+        self._dead = 0
+        self.stats['merges'] += 1
+
+    def update(self) -> int:
+        """
+        Index new and changed files and forget removed ones.
+
+        Returns:
+            Number of files (re)indexed
+        """
+        with self._update_lock:
+            start = time.perf_counter()
+            paths = get_file_index(self.root).files()
+            changed, removed = self._changes(paths)
+
+            # Read files outside the lock so queries are not blocked
+            indexed = [(path, mtime_ns, size, *self._read_trigrams(path, size)) for path, mtime_ns, size in changed]
+
+            with self._lock:
+                for path in removed:
+                    self._retire(path)
+                added = []
+                for path, mtime_ns, size, kind, trigrams in indexed:
+                    self._retire(path)
+                    if kind < 0:
+                        self._stamps[path] = [kind, mtime_ns, size]
+                        continue
+                    file_id = len(self._paths)
+                    self._paths.append(path)
+                    self._stamps[path] = [file_id, mtime_ns, size]
+                    added.append((file_id, trigrams))
+
+                merge = len(added) + self._delta_files > DELTA_MERGE_FILES or not self.ready
+                if merge:
+                    self._merge(added)
+                else:
+                    for file_id, trigrams in added:
+                        for trigram in trigrams.tolist():
+                            self._delta.setdefault(trigram, []).append(file_id)
+                    self._delta_files += len(added)
+
+                self.ready = True
+                self.stats['builds'] += 1
+                self.stats['files_indexed'] += len(indexed)
+                self.stats['last_update_s'] = round(time.perf_counter() - start, 3)
+
+            # Only merged state is written; files still in the delta are
+            # simply re-indexed by the next session
+            if merge:
+                self.save()
+            return len(indexed)
+
+    def start(self) -> None:
+        """Build or refresh the index in a background thread (no-op if one is running)."""
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run_update, name="wyn360-search-index", daemon=True)
+            self._worker.start()
+
+    def _run_update(self) -> None:
+        try:
+            self.update()
+        except Exception as e:
+            logger.warning(f"Search index update failed: {e}")
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait for a background update to finish."""
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    # Queries
+
+    def _postings(self, trigram: int) -> np.ndarray:
+        i = int(np.searchsorted(self._keys, trigram))
+        if i < len(self._keys) and self._keys[i] == trigram:
+            merged = self._ids[self._offsets[i]:self._offsets[i + 1]]
+        else:
+            merged = np.empty(0, dtype=np.uint32)
+        recent = self._delta.get(trigram)
+        if recent:
+            # Delta ids are all newer (larger) than merged ones
+            return np.concatenate([merged, np.asarray(recent, dtype=np.uint32)])
+        return merged
+
+    def _evaluate(self, plan) -> np.ndarray:
+        kind, value = plan
+        if kind == 'lit':
+            trigrams = file_trigrams(value)
+            lists = sorted((self._postings(int(t)) for t in trigrams), key=len)
+            result = lists[0]
+            for postings in lists[1:]:
+                if not len(result):
+                    break
+                result = np.intersect1d(result, postings, assume_unique=True)
+            return result
+        results = [self._evaluate(part) for part in value]
+        combine = np.intersect1d if kind == 'and' else np.union1d
+        result = results[0]
+        for other in results[1:]:
+            result = combine(result, other)
+        return result
+
+    def candidates(self, pattern: str, ignore_case: bool = False) -> Optional[List[str]]:
+        """
+        Files that may match a pattern.
+
+        Files changed since they were indexed are always included (and
+        re-indexed in the background).
+
+        Returns:
+            Sorted relative paths, or None when the index cannot narrow the
+            search (not built yet, or no usable literal in the pattern)
+        """
+        self.stats['queries'] += 1
+        plan = plan_query(pattern, ignore_case)
+        if plan is None or not self.ready:
+            return None
+
+        paths = get_file_index(self.root).files()
+        changed, removed = self._changes(paths)
+        stale = {path for path, _, _ in changed}
+
+        with self._lock:
+            ids = self._evaluate(plan)
+            matched = {self._paths[i] for i in ids.tolist() if self._paths[i] is not None}
+            always = {path for path, stamp in self._stamps.items() if stamp[0] == TOO_LARGE}
+
+        current = set(paths)
+        result = sorted(((matched | always) & current) | stale)
+        self.stats['narrowed_queries'] += 1
+        self.stats['candidates'] += len(result)
+        self.stats['stale_candidates'] += len(stale)
+        if changed or removed:
+            self.start()
+        return result
+
+    def get_stats(self) -> Dict[str, object]:
+        with self._lock:
+            size = 0
+            for name in ('postings.npz', 'files.json'):
+                try:
+                    size += os.path.getsize(os.path.join(self.index_dir, name))
+                except OSError:
+                    pass
+            return {
+                'root': self.root,
+                'ready': self.ready,
+                'files': len(self._stamps),
+                'trigrams': len(self._keys),
+                'postings': len(self._ids) + sum(len(ids) for ids in self._delta.values()),
+                'delta_files': self._delta_files,
+                'index_bytes': size,
+                **self.stats,
+            }
+
+
+_indexes: Dict[str, TrigramIndex] = {}
+_indexes_lock = threading.Lock()
+_enabled = False
+
+
+def configure_search_index(enabled: bool) -> None:
+    """Turn the trigram index on or off for search_files."""
+    global _enabled
+    _enabled = enabled
+
+
+def get_search_index(root: str = ".") -> Optional[TrigramIndex]:
+    """
+    Shared trigram index for a project root, started in the background on first use.
+
+    Returns:
+        TrigramIndex, or None when the index is disabled
+    """
+    if not _enabled:
+        return None
+    key = os.path.realpath(root)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = TrigramIndex(root)
+            index.start()
+    return index
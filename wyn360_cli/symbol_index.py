@@ -0,0 +1,495 @@
+"""Python symbol index for WYN360 CLI.
+
+Answers find_definition / find_references / outline_file from memory
+instead of grepping for "class User". Each Python file is parsed with ast
+into its definitions (classes, functions, methods, module and class
+attributes), imports and references (calls, base classes, decorators).
+
+Parsed results are cached by content hash, so touching a file or switching
+branches back and forth does not parse it again. Large batches (the first
+build of a big project) are parsed in a process pool; small updates, such
+as the ones after write_file/move_file/delete_file, are parsed inline.
+"""
+
+import ast
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .file_index import get_file_index
+
+logger = logging.getLogger(__name__)
+
+
+PYTHON_SUFFIXES = ('.py', '.pyi')
+
+# Files larger than this are not parsed (generated code, vendored bundles)
+MAX_PARSE_BYTES = 2 * 1024 * 1024
+
+# Below this many files to parse, a process pool costs more than it saves
+PARALLEL_MIN_FILES = 400
+PARALLEL_CHUNK_FILES = 64
+
+# Parsed results kept for content no longer present in the project
+MAX_UNREFERENCED_CACHED = 1024
+
+
+@dataclass
+class Definition:
+    """A class, function, method or assignment"""
+    name: str
+    qualname: str                # e.g. "User.save"
+    kind: str                    # class|function|method|variable|attribute
+    line: int
+    end_line: int
+    signature: str = ""
+
+
+@dataclass
+class Import:
+    """One imported name"""
+    module: str                  # "os.path" for "import os.path" / "from os import path"
+    name: str                    # Imported name ("" for "import module")
+    alias: str                   # Name bound in this file
+    line: int
+
+
+@dataclass
+class Reference:
+    """A use of a name"""
+    name: str                    # Last component ("save" for user.save())
+    text: str                    # Dotted expression as written ("user.save")
+    kind: str                    # call|base|decorator
+    line: int
+    column: int
+
+
+@dataclass
+class FileSymbols:
+    """Everything extracted from one file"""
+    definitions: List[Definition] = field(default_factory=list)
+    imports: List[Import] = field(default_factory=list)
+    references: List[Reference] = field(default_factory=list)
+    error: Optional[str] = None  # Syntax error, if the file could not be parsed
+
+
+def _dotted(node: ast.AST) -> Optional[str]:
+    """
+    'a.b.c' for Name/Attribute chains; other receivers are shown as '…'
+    ('User().save' -> '….save'). None if there is no name at all.
+    """
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+    elif parts:
+        parts.append('…')
+    else:
+        return None
+    return '.'.join(reversed(parts))
+
+
+# Nodes that cannot contain definitions, calls or imports
+_LEAVES = (
+    ast.Constant, ast.Name, ast.expr_context, ast.operator, ast.unaryop, ast.cmpop,
+    ast.boolop, ast.alias, ast.Pass, ast.Break, ast.Continue,
+)
+
+
+def _node_types() -> Set[type]:
+    types, pending = set(), [ast.AST]
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        if not issubclass(cls, _LEAVES):
+            types.add(cls)
+    return types
+
+
+# Concrete node types the walker descends into (a set lookup per child is
+# much cheaper than isinstance checks)
+_WALKED_TYPES = frozenset(_node_types())
+
+
+def _reference(symbols: FileSymbols, node: ast.AST, kind: str, target: ast.AST) -> None:
+    text = _dotted(target)
+    if text:
+        symbols.references.append(Reference(text.rsplit('.', 1)[-1], text, kind, node.lineno, node.col_offset))
+
+
+def _decorators(symbols: FileSymbols, node) -> None:
+    for decorator in node.decorator_list:
+        target = decorator.func if isinstance(decorator, ast.Call) else decorator
+        _reference(symbols, decorator, 'decorator', target)
+
+
+def _collect(tree: ast.Module, lines: List[bytes]) -> FileSymbols:
+    """
+    Walk a module iteratively (much cheaper than ast.NodeVisitor on large
+    files) tracking the enclosing class/function scope.
+    """
+    symbols = FileSymbols()
+    stack: List[Tuple[ast.AST, Tuple[Tuple[str, str], ...]]] = [(tree, ())]
+    while stack:
+        node, scope = stack.pop()
+        node_type = type(node)
+        child_scope = scope
+
+        if node_type is ast.Call:
+            _reference(symbols, node, 'call', node.func)
+        elif node_type is ast.FunctionDef or node_type is ast.AsyncFunctionDef:
+            prefix = 'async ' if node_type is ast.AsyncFunctionDef else ''
+            signature = f"{prefix}def {node.name}({ast.unparse(node.args)})"
+            if node.returns is not None:
+                signature += f" -> {ast.unparse(node.returns)}"
+            kind = 'method' if scope and scope[-1][1] == 'class' else 'function'
+            qualname = '.'.join([n for n, _ in scope] + [node.name])
+            symbols.definitions.append(
+                Definition(node.name, qualname, kind, node.lineno, node.end_lineno or node.lineno, signature)
+            )
+            _decorators(symbols, node)
+            child_scope = scope + ((node.name, 'function'),)
+        elif node_type is ast.ClassDef:
+            bases = ', '.join(ast.unparse(base) for base in node.bases + node.keywords)
+            qualname = '.'.join([n for n, _ in scope] + [node.name])
+            symbols.definitions.append(Definition(
+                node.name, qualname, 'class', node.lineno, node.end_lineno or node.lineno,
+                f"class {node.name}({bases})" if bases else f"class {node.name}"
+            ))
+            for base in node.bases:
+                _reference(symbols, base, 'base', base)
+            _decorators(symbols, node)
+            child_scope = scope + ((node.name, 'class'),)
+        elif node_type is ast.Assign or node_type is ast.AnnAssign:
+            # Only module and class level assignments are definitions
+            if not scope or scope[-1][1] == 'class':
+                kind = 'attribute' if scope else 'variable'
+                targets = node.targets if node_type is ast.Assign else [node.target]
+                text = lines[node.lineno - 1].strip().decode('utf-8', errors='replace')[:120]
+                for target in targets:
+                    if type(target) is ast.Name:
+                        qualname = '.'.join([n for n, _ in scope] + [target.id])
+                        symbols.definitions.append(Definition(
+                            target.id, qualname, kind, node.lineno, node.end_lineno or node.lineno, text
+                        ))
+        elif node_type is ast.Import:
+            for alias in node.names:
+                symbols.imports.append(
+                    Import(alias.name, '', alias.asname or alias.name.split('.', 1)[0], node.lineno)
+                )
+            continue
+        elif node_type is ast.ImportFrom:
+            module = '.' * node.level + (node.module or '')
+            for alias in node.names:
+                symbols.imports.append(Import(module, alias.name, alias.asname or alias.name, node.lineno))
+            continue
+
+        for name in node._fields:
+            value = getattr(node, name, None)
+            if type(value) is list:
+                for item in value:
+                    if type(item) in _WALKED_TYPES:
+                        stack.append((item, child_scope))
+            elif type(value) in _WALKED_TYPES:
+                stack.append((value, child_scope))
+
+    symbols.definitions.sort(key=lambda d: (d.line, d.end_line))
+    symbols.imports.sort(key=lambda i: i.line)
+    symbols.references.sort(key=lambda r: (r.line, r.column))
+    return symbols
+
+
+def parse_symbols(source: bytes) -> FileSymbols:
+    """Extract definitions, imports and references from Python source."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as e:
+        return FileSymbols(error=f"{type(e).__name__}: {e}")
+    return _collect(tree, source.splitlines())
+
+
+def _parse_batch(batch: List[Tuple[str, bytes]]) -> List[Tuple[str, FileSymbols]]:
+    """Process pool entry point: (content hash, source) -> (content hash, symbols)."""
+    return [(digest, parse_symbols(source)) for digest, source in batch]
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class SymbolIndex:
+    """
+    In-memory symbol index of the Python files under a project root.
+
+    Paths are relative to the root, '/'-separated. Queries call refresh()
+    first, which only re-reads files whose mtime or size changed.
+    """
+
+    def __init__(self, root: str = ".", workers: Optional[int] = None):
+        """
+        Args:
+            root: Project directory
+            workers: Parser processes for large batches (default: CPU count, at most 8)
+        """
+        self.root = os.path.abspath(root)
+        self.workers = workers or min(8, os.cpu_count() or 2)
+        self._files: Dict[str, Tuple[int, int, str]] = {}     # path -> (mtime_ns, size, content hash)
+        self._parsed: "OrderedDict[str, FileSymbols]" = OrderedDict()  # content hash -> symbols
+        self._definitions: Dict[str, Set[str]] = {}            # name -> paths defining it
+        self._references: Dict[str, Set[str]] = {}             # name -> paths referencing/importing it
+        self._lock = threading.RLock()
+        self.stats = {
+            'refreshes': 0, 'files_read': 0, 'files_parsed': 0, 'hash_hits': 0,
+            'parallel_batches': 0, 'last_refresh_ms': 0.0,
+        }
+
+    # Name maps
+
+    @staticmethod
+    def _names(symbols: FileSymbols) -> Tuple[Set[str], Set[str]]:
+        defined = {d.name for d in symbols.definitions}
+        referenced = {r.name for r in symbols.references}
+        referenced.update(i.alias for i in symbols.imports)
+        referenced.update(i.name for i in symbols.imports if i.name)
+        return defined, referenced
+
+    def _unlink(self, path: str) -> None:
+        entry = self._files.pop(path, None)
+        symbols = self._parsed.get(entry[2]) if entry else None
+        if symbols is None:
+            return
+        defined, referenced = self._names(symbols)
+        for name in defined:
+            self._definitions.get(name, set()).discard(path)
+        for name in referenced:
+            self._references.get(name, set()).discard(path)
+
+    def _link(self, path: str, stamp: Tuple[int, int, str]) -> None:
+        self._files[path] = stamp
+        defined, referenced = self._names(self._parsed[stamp[2]])
+        for name in defined:
+            self._definitions.setdefault(name, set()).add(path)
+        for name in referenced:
+            self._references.setdefault(name, set()).add(path)
+
+    # Updating
+
+    def _read(self, path: str) -> Optional[Tuple[int, int, bytes]]:
+        try:
+            with open(os.path.join(self.root, path), 'rb') as f:
+                stat = os.fstat(f.fileno())
+                if stat.st_size > MAX_PARSE_BYTES:
+                    return None
+                return stat.st_mtime_ns, stat.st_size, f.read()
+        except OSError:
+            return None
+
+    def _parse_missing(self, sources: Dict[str, bytes]) -> None:
+        """Parse sources (keyed by content hash) that are not cached yet."""
+        if len(sources) >= PARALLEL_MIN_FILES and self.workers > 1:
+            items = list(sources.items())
+            batches = [items[i:i + PARALLEL_CHUNK_FILES] for i in range(0, len(items), PARALLEL_CHUNK_FILES)]
+            available = multiprocessing.get_all_start_methods()
+            # Workers must not inherit the parent's threads
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in available else 'spawn')
+            try:
+                with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+                    for results in pool.map(_parse_batch, batches):
+                        for digest, symbols in results:
+                            self._parsed[digest] = symbols
+                self.stats['parallel_batches'] += len(batches)
+                self.stats['files_parsed'] += len(items)
+                return
+            except Exception as e:
+                logger.debug(f"Parallel parsing failed, parsing inline: {e}")
+        for digest, source in sources.items():
+            if digest not in self._parsed:
+                self._parsed[digest] = parse_symbols(source)
+                self.stats['files_parsed'] += 1
+
+    def _update(self, paths: Iterable[str], known: Optional[Set[str]] = None) -> int:
+        """Re-read the given paths if they changed; drop those that no longer exist."""
+        changed: Dict[str, Tuple[int, int, str]] = {}
+        sources: Dict[str, bytes] = {}
+        removed = []
+        for path in paths:
+            full_path = os.path.join(self.root, path)
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                removed.append(path)
+                continue
+            if known is not None and path not in known:
+                removed.append(path)
+                continue
+            entry = self._files.get(path)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                continue
+            read = self._read(path)
+            if read is None:
+                removed.append(path)
+                continue
+            mtime_ns, size, data = read
+            digest = _content_hash(data)
+            self.stats['files_read'] += 1
+            if digest in self._parsed:
+                self._parsed.move_to_end(digest)
+                self.stats['hash_hits'] += 1
+            else:
+                sources[digest] = data
+            changed[path] = (mtime_ns, size, digest)
+
+        self._parse_missing(sources)
+        for path in removed:
+            self._unlink(path)
+        for path, stamp in changed.items():
+            self._unlink(path)
+            self._link(path, stamp)
+        self._prune()
+        return len(changed) + len(removed)
+
+    def _prune(self) -> None:
+        """Forget cached parses of content that is gone, beyond a small reserve."""
+        live = {stamp[2] for stamp in self._files.values()}
+        unreferenced = [digest for digest in self._parsed if digest not in live]
+        for digest in unreferenced[:max(0, len(unreferenced) - MAX_UNREFERENCED_CACHED)]:
+            del self._parsed[digest]
+
+    def refresh(self) -> int:
+        """
+        Bring the index up to date with the project.
+
+        Returns:
+            Number of files added, changed or removed
+        """
+        with self._lock:
+            start = time.perf_counter()
+            current = [p for p in get_file_index(self.root).files() if p.endswith(PYTHON_SUFFIXES)]
+            current_set = set(current)
+            vanished = [path for path in self._files if path not in current_set]
+            count = self._update(current + vanished, current_set)
+            self.stats['refreshes'] += 1
+            self.stats['last_refresh_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            return count
+
+    def update_paths(self, paths: Iterable[str]) -> int:
+        """
+        Update specific files right away (after a write, move or delete).
+
+        Args:
+            paths: File paths, absolute or relative to the current directory
+
+        Returns:
+            Number of files added, changed or removed
+        """
+        relative = []
+        for path in paths:
+            rel = os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, '/')
+            if rel.endswith(PYTHON_SUFFIXES) and not rel.startswith('../'):
+                relative.append(rel)
+        with self._lock:
+            return self._update(relative)
+
+    # Queries
+
+    def find_definition(self, name: str) -> List[Tuple[str, Definition]]:
+        """
+        Definitions of a name.
+
+        Args:
+            name: Plain ("save") or qualified ("User.save") name
+
+        Returns:
+            (path, definition) pairs sorted by path and line
+        """
+        last = name.rsplit('.', 1)[-1]
+        with self._lock:
+            results = []
+            for path in self._definitions.get(last, ()):
+                for definition in self._parsed[self._files[path][2]].definitions:
+                    if definition.name != last:
+                        continue
+                    if '.' in name and not ('.' + definition.qualname).endswith('.' + name):
+                        continue
+                    results.append((path, definition))
+        return sorted(results, key=lambda item: (item[0], item[1].line))
+
+    def find_references(self, name: str) -> List[Tuple[str, object]]:
+        """
+        Calls, base classes, decorators and imports of a name.
+
+        Matching is by the last component of the name ("User.save" finds
+        every ".save(...)" call, whatever the receiver).
+
+        Returns:
+            (path, Reference or Import) pairs sorted by path and line
+        """
+        last = name.rsplit('.', 1)[-1]
+        with self._lock:
+            results = []
+            for path in self._references.get(last, ()):
+                symbols = self._parsed[self._files[path][2]]
+                results.extend((path, r) for r in symbols.references if r.name == last)
+                results.extend((path, i) for i in symbols.imports if last in (i.alias, i.name))
+        return sorted(results, key=lambda item: (item[0], item[1].line))
+
+    def outline(self, path: str) -> Optional[FileSymbols]:
+        """Symbols of one file (None if it is not an indexed Python file)."""
+        rel = os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, '/')
+        with self._lock:
+            entry = self._files.get(rel)
+            return self._parsed.get(entry[2]) if entry else None
+
+    def get_stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                'root': self.root,
+                'files': len(self._files),
+                'cached_parses': len(self._parsed),
+                'names': len(self._definitions),
+                **self.stats,
+            }
+
+
+_indexes: Dict[str, SymbolIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_symbol_index(root: str = ".", refresh: bool = True) -> SymbolIndex:
+    """
+    Shared symbol index for a project root.
+
+    Args:
+        root: Project directory
+        refresh: Bring the index up to date before returning it
+
+    Returns:
+        SymbolIndex for the root
+    """
+    key = os.path.realpath(root)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = SymbolIndex(root)
+    if refresh:
+        index.refresh()
+    return index
+
+
+def update_symbol_index(paths: Iterable[str], root: str = ".") -> None:
+    """Apply file changes to the root's index, if one has been built."""
+    index = _indexes.get(os.path.realpath(root))
+    if index is not None:
+        try:
+            index.update_paths(paths)
+        except Exception as e:
+            logger.debug(f"Symbol index update failed: {e}")
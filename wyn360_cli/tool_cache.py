@@ -0,0 +1,163 @@
+"""Memoization of read-only agent tools.
+
+Within one run the model often calls read_file, list_files,
+get_project_info or git_status again with the same arguments. The cache
+wraps those tools and reuses the previous result when nothing it depends
+on has changed:
+
+- Tools that depend on specific files (read_file) are keyed on tool name,
+  arguments and the (mtime_ns, size) of those files. A file modified within
+  the last RACY_WINDOW_NS is not cached, because a second write in the same
+  mtime tick would go unnoticed.
+- Tools that depend on the whole tree (list_files, get_project_info,
+  git_status) are also dropped by invalidate(), which the write tools call,
+  and expire after a TTL to pick up edits made outside the agent.
+
+When a result is repeated within the same turn, the model already has it
+in context, so the cache can return a short "unchanged" marker instead of
+the full text again.
+"""
+
+import functools
+import inspect
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = 256
+
+# Files modified this recently may change again within the same mtime tick
+RACY_WINDOW_NS = 2_000_000_000
+
+# Lifetime of tree-wide results
+TREE_TTL_SECONDS = 10.0
+
+# Results starting with these are failures and are never cached
+_FAILURE_PREFIXES = ("Error", "❌")
+
+PathsFunc = Callable[[Dict[str, object]], List[str]]
+
+
+@dataclass
+class _Entry:
+    stamp: tuple
+    created: float
+    result: str
+    returned_turn: int
+
+
+def _file_stamp(paths: List[str]) -> Optional[tuple]:
+    """(path, mtime_ns, size) per path; None if any file is racy."""
+    now = time.time_ns()
+    stamp = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stamp.append((path, None, None))
+            continue
+        if now - stat.st_mtime_ns < RACY_WINDOW_NS:
+            return None
+        stamp.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(stamp)
+
+
+class ToolResultCache:
+    """Result cache shared by the memoized tools of one agent."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, unchanged_marker: bool = True):
+        self.max_entries = max_entries
+        self.unchanged_marker = unchanged_marker
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._turn = 0
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def start_turn(self) -> None:
+        """Mark the start of a user turn; earlier results may no longer be in context."""
+        self._turn += 1
+
+    def invalidate(self) -> None:
+        """Drop every cached result (after the agent wrote files or ran a command)."""
+        self._entries.clear()
+
+    def _count(self, tool: str, field: str) -> None:
+        counts = self.stats.setdefault(tool, {"hits": 0, "misses": 0, "unchanged": 0})
+        counts[field] += 1
+
+    def _repeat(self, tool: str, entry: _Entry) -> str:
+        if self.unchanged_marker and entry.returned_turn == self._turn:
+            self._count(tool, "unchanged")
+            return (f"[{tool}: unchanged since the previous call with the same arguments in this turn - "
+                    f"use that result]")
+        entry.returned_turn = self._turn
+        return entry.result
+
+    def memoize(self, tool: Callable, paths: Optional[PathsFunc] = None,
+                ttl: Optional[float] = None) -> Callable:
+        """
+        Wrap an async tool method.
+
+        Args:
+            tool: Bound async tool method; its first parameter is the run context
+            paths: Maps the call's arguments to the files the result depends on
+            ttl: Seconds a result stays valid; results with a ttl are tree-wide
+                 and are also dropped by invalidate()
+
+        Returns:
+            Wrapper with the tool's name, signature and docstring
+        """
+        name = tool.__name__
+        signature = inspect.signature(tool)
+        context_param = next(iter(signature.parameters))
+
+        @functools.wraps(tool)
+        async def wrapper(*args, **kwargs):
+            try:
+                bound = signature.bind(*args, **kwargs)
+            except TypeError:
+                return await tool(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {k: v for k, v in bound.arguments.items() if k != context_param}
+            key = (name, repr(sorted(arguments.items())))
+
+            stamp = ()
+            if paths is not None:
+                stamp = _file_stamp(paths(arguments))
+            now = time.monotonic()
+            entry = self._entries.get(key)
+            if (entry is not None and stamp is not None and entry.stamp == stamp
+                    and (ttl is None or now - entry.created < ttl)):
+                self._entries.move_to_end(key)
+                self._count(name, "hits")
+                return self._repeat(name, entry)
+
+            self._count(name, "misses")
+            result = await tool(*args, **kwargs)
+            if stamp is None or not isinstance(result, str) or result.startswith(_FAILURE_PREFIXES):
+                return result
+
+            # Identical output (e.g. a file touched but not changed) can still be a repeat
+            returned_turn = -1
+            if entry is not None and entry.result == result:
+                returned_turn = entry.returned_turn
+            fresh = _Entry(stamp, now, result, returned_turn)
+            self._entries[key] = fresh
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return self._repeat(name, fresh)
+
+        return wrapper
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-tool hits, misses, unchanged markers and hit rate (%)."""
+        report = {}
+        for tool, counts in sorted(self.stats.items()):
+            calls = counts["hits"] + counts["misses"]
+            report[tool] = dict(counts, hit_rate=100.0 * counts["hits"] / calls if calls else 0.0)
+        return report
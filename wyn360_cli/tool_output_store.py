@@ -0,0 +1,193 @@
+"""Out-of-band storage for large tool results.
+
+pydantic-ai's message history keeps every tool return verbatim, so an old
+read_file, read_pdf or fetch_website result of tens of thousands of tokens
+is sent again with every later request. Once a large tool return is older
+than a configurable number of user turns, the store writes the full text
+to disk and replaces it in the history with a short stub: tool name, size,
+the first lines as a summary and a handle. The recall_tool_output tool
+reads the stored text back by line range or pattern (through file_ranges,
+so recalling from a huge payload stays cheap).
+
+Payloads are stored by content hash under ~/.wyn360/cache/tool_outputs/,
+so repeated results share one file and stubs stay valid in resumed
+sessions. Files older than RETENTION_SECONDS are pruned at startup.
+"""
+
+import dataclasses
+import hashlib
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .file_ranges import CHARS_PER_TOKEN, RangeResult, read_lines, read_matches
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = Path.home() / ".wyn360" / "cache" / "tool_outputs"
+
+# Only tool returns at least this large are moved out of the history
+DEFAULT_MIN_TOKENS = 2000
+
+# A tool return is moved once this many user turns have followed it
+DEFAULT_MAX_AGE_TURNS = 2
+
+RETENTION_SECONDS = 7 * 24 * 3600
+
+SUMMARY_LINES = 3
+SUMMARY_LINE_CHARS = 120
+
+STUB_PREFIX = "[Tool output stored out of band"
+
+_HANDLE_RE = re.compile(r"^[0-9a-f]{12}$")
+
+
+def history_tokens(messages: List) -> int:
+    """Estimated tokens of the text in a pydantic-ai message history."""
+    chars = 0
+    for message in messages:
+        for part in getattr(message, "parts", ()):
+            content = getattr(part, "content", None)
+            if isinstance(content, str):
+                chars += len(content)
+            elif content is not None:
+                chars += len(str(content))
+            args = getattr(part, "args", None)
+            if args is not None:
+                chars += len(args) if isinstance(args, str) else len(str(args))
+    return chars // CHARS_PER_TOKEN
+
+
+def _summary(text: str) -> str:
+    """First non-empty lines of the payload, shortened."""
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            lines.append(line if len(line) <= SUMMARY_LINE_CHARS else line[:SUMMARY_LINE_CHARS] + "...")
+            if len(lines) == SUMMARY_LINES:
+                break
+    return " | ".join(lines)
+
+
+class ToolOutputStore:
+    """Moves large, old tool returns out of the message history."""
+
+    def __init__(self, directory: Optional[Path] = None, min_tokens: int = DEFAULT_MIN_TOKENS,
+                 max_age_turns: int = DEFAULT_MAX_AGE_TURNS):
+        self.directory = Path(directory) if directory is not None else DEFAULT_STORE_DIR
+        self.min_tokens = min_tokens
+        self.max_age_turns = max_age_turns
+        self.stats = {"stored": 0, "tokens_removed": 0, "recalls": 0}
+        self._pruned = False
+
+    def _prune(self) -> None:
+        self._pruned = True
+        if not self.directory.is_dir():
+            return
+        cutoff = time.time() - RETENTION_SECONDS
+        for path in self.directory.glob("*.txt"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+
+    def path_for(self, handle: str) -> Optional[Path]:
+        if not _HANDLE_RE.match(handle):
+            return None
+        return self.directory / f"{handle}.txt"
+
+    def store(self, text: str) -> str:
+        """Write a payload and return its handle."""
+        if not self._pruned:
+            self._prune()
+        handle = hashlib.sha1(text.encode("utf-8", errors="surrogatepass")).hexdigest()[:12]
+        path = self.directory / f"{handle}.txt"
+        if path.exists():
+            os.utime(path)
+        else:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp = path.with_suffix(f".{os.getpid()}.tmp")
+            temp.write_text(text, encoding="utf-8", errors="surrogatepass")
+            os.replace(temp, path)
+        return handle
+
+    def stub(self, handle: str, tool_name: str, text: str) -> str:
+        lines = text.count("\n") + (0 if text.endswith("\n") else 1)
+        tokens = len(text) // CHARS_PER_TOKEN
+        return (f"{STUB_PREFIX}: handle={handle}, tool={tool_name}, {lines} lines, ~{tokens} tokens]\n"
+                f"Summary: {_summary(text)}\n"
+                f"Use recall_tool_output(handle=\"{handle}\", start_line=..., end_line=...) "
+                f"or recall_tool_output(handle=\"{handle}\", pattern=...) if you need it again.")
+
+    def offload(self, messages: List) -> List:
+        """
+        Replace large tool returns older than max_age_turns with stubs.
+
+        Args:
+            messages: pydantic-ai ModelMessage list (not modified)
+
+        Returns:
+            The same list if nothing changed, otherwise a new list with
+            replaced ModelRequest objects
+        """
+        min_chars = self.min_tokens * CHARS_PER_TOKEN
+        # A user turn starts at each request carrying a user prompt
+        turn_starts = [
+            i for i, message in enumerate(messages)
+            if any(getattr(part, "part_kind", None) == "user-prompt" for part in getattr(message, "parts", ()))
+        ]
+        if len(turn_starts) <= self.max_age_turns:
+            return messages
+        # Messages before this index are at least max_age_turns turns old
+        boundary = turn_starts[-self.max_age_turns] if self.max_age_turns > 0 else len(messages)
+
+        result = None
+        for i in range(boundary):
+            message = messages[i]
+            parts = getattr(message, "parts", None)
+            if not parts:
+                continue
+            new_parts = None
+            for j, part in enumerate(parts):
+                content = getattr(part, "content", None)
+                if (getattr(part, "part_kind", None) != "tool-return" or not isinstance(content, str)
+                        or len(content) < min_chars or content.startswith(STUB_PREFIX)):
+                    continue
+                try:
+                    handle = self.store(content)
+                except OSError as e:
+                    logger.warning(f"Could not store tool output out of band: {e}")
+                    continue
+                stub = self.stub(handle, part.tool_name, content)
+                if new_parts is None:
+                    new_parts = list(parts)
+                new_parts[j] = dataclasses.replace(part, content=stub)
+                self.stats["stored"] += 1
+                self.stats["tokens_removed"] += (len(content) - len(stub)) // CHARS_PER_TOKEN
+            if new_parts is not None:
+                if result is None:
+                    result = list(messages)
+                result[i] = dataclasses.replace(message, parts=new_parts)
+        return messages if result is None else result
+
+    def recall(self, handle: str, start_line: int = 1, end_line: Optional[int] = None,
+               pattern: Optional[str] = None, max_chars: int = 32000) -> Tuple[Optional[RangeResult], int]:
+        """
+        Read a stored payload back.
+
+        Returns:
+            (RangeResult, matches shown) - the result is None for an unknown handle;
+            matches shown is 0 unless pattern was given
+        """
+        path = self.path_for(handle)
+        if path is None or not path.is_file():
+            return None, 0
+        self.stats["recalls"] += 1
+        if pattern:
+            return read_matches(str(path), pattern, max_chars=max_chars)
+        return read_lines(str(path), start_line, end_line, max_chars), 0
@@ -25,6 +25,15 @@ class BrowserAutomationTools:
         self.dom_extractor = DOMExtractor()
         self.page: Optional[Page] = None
 
+    def configure_dom_backend(self, backend: str) -> None:
+        """
+        Select the DOM extraction backend (Phase 1.6)
+
+        Args:
+            backend: "auto", "cdp" or "selectors" (see DOMExtractor)
+        """
+        self.dom_extractor = DOMExtractor(backend=backend)
+
     async def analyze_page_dom(
         self,
         ctx: RunContext[None],
@@ -46,62 +55,64 @@ class BrowserAutomationTools:
         Returns:
             Dict containing DOM analysis and recommendation
         """
-        try:
-            logger.info(f"Analyzing DOM for: {url}")
-
-            # Initialize unified browser if needed
-            await browser_manager.initialize(headless=not show_browser)
-
-            # Get or create page
-            self.page = await browser_manager.get_page("dom_analysis")
-
-            # Navigate to page
-            await self.page.goto(url)
-            await self.page.wait_for_load_state('networkidle')
-
-            # Extract DOM
-            dom_analysis = await self.dom_extractor.extract_dom(self.page)
-
-            # Format for LLM analysis
-            llm_input = format_dom_for_llm(dom_analysis, max_elements=15, include_content=True)
-
-            # Add task context if provided
-            if task_description:
-                llm_input = f"User Task: {task_description}\n\n{llm_input}"
-
-            # Generate result
-            result = {
-                'success': True,
-                'url': url,
-                'title': dom_analysis.title,
-                'confidence': dom_analysis.analysis_confidence,
-                'dom_analysis_text': llm_input,
-                'interactive_elements_count': len(dom_analysis.interactive_elements),
-                'forms_count': len(dom_analysis.forms),
-                'recommended_approach': self._determine_automation_approach(
-                    dom_analysis, confidence_threshold
-                ),
-                'raw_analysis': {
-                    'interactive_elements': [asdict(elem) for elem in dom_analysis.interactive_elements[:10]],
-                    'forms': dom_analysis.forms,
-                    'total_elements': dom_analysis.total_elements
+        # Hold the shared browser so idle shutdown cannot close it mid-call
+        with browser_manager.in_use():
+            try:
+                logger.info(f"Analyzing DOM for: {url}")
+
+                # Initialize unified browser if needed
+                await browser_manager.initialize(headless=not show_browser)
+
+                # Get or create page
+                self.page = await browser_manager.get_page("dom_analysis")
+
+                # Navigate to page
+                await self.page.goto(url)
+                await self.page.wait_for_load_state('networkidle')
+
+                # Extract DOM
+                dom_analysis = await self.dom_extractor.extract_dom(self.page)
+
+                # Format for LLM analysis
+                llm_input = format_dom_for_llm(dom_analysis, max_elements=15, include_content=True)
+
+                # Add task context if provided
+                if task_description:
+                    llm_input = f"User Task: {task_description}\n\n{llm_input}"
+
+                # Generate result
+                result = {
+                    'success': True,
+                    'url': url,
+                    'title': dom_analysis.title,
+                    'confidence': dom_analysis.analysis_confidence,
+                    'dom_analysis_text': llm_input,
+                    'interactive_elements_count': len(dom_analysis.interactive_elements),
+                    'forms_count': len(dom_analysis.forms),
+                    'recommended_approach': self._determine_automation_approach(
+                        dom_analysis, confidence_threshold
+                    ),
+                    'raw_analysis': {
+                        'interactive_elements': [asdict(elem) for elem in dom_analysis.interactive_elements[:10]],
+                        'forms': dom_analysis.forms,
+                        'total_elements': dom_analysis.total_elements
+                    }
                 }
-            }
 
-            logger.info(f"DOM analysis complete: {result['confidence']:.2f} confidence, "
-                       f"{result['interactive_elements_count']} interactive elements")
+                logger.info(f"DOM analysis complete: {result['confidence']:.2f} confidence, "
+                           f"{result['interactive_elements_count']} interactive elements")
 
-            return result
+                return result
 
-        except Exception as e:
-            logger.error(f"Error analyzing DOM: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'url': url,
-                'confidence': 0.0,
-                'recommended_approach': 'vision_fallback'
-            }
+            except Exception as e:
+                logger.error(f"Error analyzing DOM: {e}")
+                return {
+                    'success': False,
+                    'error': str(e),
+                    'url': url,
+                    'confidence': 0.0,
+                    'recommended_approach': 'vision_fallback'
+                }
 
     async def execute_dom_action(
         self,
@@ -128,78 +139,80 @@ class BrowserAutomationTools:
         Returns:
             Dict containing execution result
         """
-        try:
-            logger.info(f"Executing DOM action: {action} on {target_description} at {url}")
-
-            # First analyze the DOM
-            analysis_result = await self.analyze_page_dom(
-                ctx, url, f"{action} on {target_description}", confidence_threshold, show_browser
-            )
-
-            if not analysis_result['success']:
+        # Hold the shared browser so idle shutdown cannot close it mid-call
+        with browser_manager.in_use():
+            try:
+                logger.info(f"Executing DOM action: {action} on {target_description} at {url}")
+
+                # First analyze the DOM
+                analysis_result = await self.analyze_page_dom(
+                    ctx, url, f"{action} on {target_description}", confidence_threshold, show_browser
+                )
+
+                if not analysis_result['success']:
+                    return {
+                        'success': False,
+                        'error': 'DOM analysis failed',
+                        'recommendation': 'Use stagehand or vision fallback'
+                    }
+
+                # Check if DOM confidence is sufficient
+                if analysis_result['confidence'] < confidence_threshold:
+                    return {
+                        'success': False,
+                        'confidence': analysis_result['confidence'],
+                        'error': f'DOM confidence ({analysis_result["confidence"]:.2f}) below threshold ({confidence_threshold})',
+                        'recommendation': 'Use stagehand fallback',
+                        'dom_analysis': analysis_result['dom_analysis_text']
+                    }
+
+                # Try to find and interact with the target element
+                element_found = await self._find_element_by_description(target_description)
+
+                if not element_found:
+                    return {
+                        'success': False,
+                        'error': f'Could not find element: {target_description}',
+                        'recommendation': 'Use stagehand fallback with this DOM context',
+                        'dom_analysis': analysis_result['dom_analysis_text']
+                    }
+
+                # Execute the action
+                action_result = await self._execute_action_on_element(
+                    element_found, action, action_data
+                )
+
+                if action_result['success']:
+                    # Wait for any navigation or page updates
+                    try:
+                        await self.page.wait_for_load_state('networkidle', timeout=5000)
+                    except:
+                        pass  # Timeout is okay
+
+                    return {
+                        'success': True,
+                        'action': action,
+                        'target': target_description,
+                        'confidence': analysis_result['confidence'],
+                        'result': action_result['result'],
+                        'approach_used': 'dom_analysis'
+                    }
+                else:
+                    return {
+                        'success': False,
+                        'error': action_result['error'],
+                        'recommendation': 'Retry with stagehand or vision fallback',
+                        'dom_analysis': analysis_result['dom_analysis_text']
+                    }
+
+            except Exception as e:
+                logger.error(f"Error executing DOM action: {e}")
                 return {
                     'success': False,
-                    'error': 'DOM analysis failed',
+                    'error': str(e),
                     'recommendation': 'Use stagehand or vision fallback'
                 }
 
-            # Check if DOM confidence is sufficient
-            if analysis_result['confidence'] < confidence_threshold:
-                return {
-                    'success': False,
-                    'confidence': analysis_result['confidence'],
-                    'error': f'DOM confidence ({analysis_result["confidence"]:.2f}) below threshold ({confidence_threshold})',
-                    'recommendation': 'Use stagehand fallback',
-                    'dom_analysis': analysis_result['dom_analysis_text']
-                }
-
-            # Try to find and interact with the target element
-            element_found = await self._find_element_by_description(target_description)
-
-            if not element_found:
-                return {
-                    'success': False,
-                    'error': f'Could not find element: {target_description}',
-                    'recommendation': 'Use stagehand fallback with this DOM context',
-                    'dom_analysis': analysis_result['dom_analysis_text']
-                }
-
-            # Execute the action
-            action_result = await self._execute_action_on_element(
-                element_found, action, action_data
-            )
-
-            if action_result['success']:
-                # Wait for any navigation or page updates
-                try:
-                    await self.page.wait_for_load_state('networkidle', timeout=5000)
-                except:
-                    pass  # Timeout is okay
-
-                return {
-                    'success': True,
-                    'action': action,
-                    'target': target_description,
-                    'confidence': analysis_result['confidence'],
-                    'result': action_result['result'],
-                    'approach_used': 'dom_analysis'
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': action_result['error'],
-                    'recommendation': 'Retry with stagehand or vision fallback',
-                    'dom_analysis': analysis_result['dom_analysis_text']
-                }
-
-        except Exception as e:
-            logger.error(f"Error executing DOM action: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'recommendation': 'Use stagehand or vision fallback'
-            }
-
     async def close_browser(self):
         """Clean up browser resources"""
         try:
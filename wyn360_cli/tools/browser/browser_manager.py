@@ -6,13 +6,20 @@ instances across all automation approaches (DOM, Stagehand, Vision) to ensure
 consistent behavior and efficient resource usage.
 
 Phase 4.3: Unified Playwright browser instance management
+Phase 4.4: Warm browser pool, background pre-launch and idle shutdown
+Phase 4.5: Resource-blocking request interception on every context
 """
 
+import time
 import logging
 import asyncio
-from typing import Optional, Dict, Any
+from contextlib import contextmanager
+from typing import Iterator, Optional, Dict, Any, Set
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
 
+from .browser_pool import BrowserPool
+from .resource_blocker import ResourceBlocker
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,6 +52,22 @@ class UnifiedBrowserManager:
         self.viewport: Dict[str, int] = {'width': 1280, 'height': 720}
         self.user_agent: str = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         self.timeout: int = 30000
+
+        # Warm page pool (Phase 4.4)
+        self.pool: BrowserPool = BrowserPool()
+        self.idle_timeout: float = 300.0
+        self._pooled_page_keys: Set[str] = set()
+        # Pages handed out by acquire_page() and open in_use() blocks; while
+        # either is non-empty the idle watchdog leaves the browser running
+        self._held_pages: Set[int] = set()
+        self._in_use: int = 0
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._idle_task: Optional[asyncio.Task] = None
+
+        # Request interception (Phase 4.5), installed on contexts as they are created.
+        # Vision contexts (screenshots for a vision model) get their own policy.
+        self.resource_blocker: Optional[ResourceBlocker] = None
+        self.vision_resource_blocker: Optional[ResourceBlocker] = None
         self._initialized = True
 
         logger.info("UnifiedBrowserManager initialized")
@@ -105,7 +128,8 @@ class UnifiedBrowserManager:
         self,
         name: str = "default",
         viewport: Optional[Dict[str, int]] = None,
-        user_agent: Optional[str] = None
+        user_agent: Optional[str] = None,
+        vision: bool = False
     ) -> BrowserContext:
         """
         Get or create a browser context
@@ -114,6 +138,7 @@ class UnifiedBrowserManager:
             name: Context name for identification
             viewport: Custom viewport for this context
             user_agent: Custom user agent for this context
+            vision: Context is screenshotted for a vision model (keeps images)
 
         Returns:
             Browser context
@@ -121,18 +146,13 @@ class UnifiedBrowserManager:
         if self.browser is None:
             await self.initialize()
 
-        if name in self.contexts and not self.contexts[name].is_closed:
+        self.pool.touch()
+
+        if name in self.contexts and not self.contexts[name].is_closed():
             return self.contexts[name]
 
         try:
-            context = await self.browser.new_context(
-                viewport=viewport or self.viewport,
-                user_agent=user_agent or self.user_agent
-            )
-
-            # Set default timeout
-            context.set_default_timeout(self.timeout)
-
+            context = await self._new_context(viewport, user_agent, vision)
             self.contexts[name] = context
             logger.info(f"Created browser context: {name}")
 
@@ -142,33 +162,85 @@ class UnifiedBrowserManager:
             logger.error(f"Failed to create browser context '{name}': {e}")
             raise
 
+    async def _new_context(
+        self,
+        viewport: Optional[Dict[str, int]] = None,
+        user_agent: Optional[str] = None,
+        vision: bool = False
+    ) -> BrowserContext:
+        """Create a context with the manager's default settings"""
+        context = await self.browser.new_context(
+            viewport=viewport or self.viewport,
+            user_agent=user_agent or self.user_agent
+        )
+
+        # Set default timeout
+        context.set_default_timeout(self.timeout)
+
+        blocker = self.vision_resource_blocker if vision else self.resource_blocker
+        if blocker is not None:
+            await blocker.install(context)
+
+        return context
+
     async def get_page(
         self,
         name: str = "default",
-        context_name: str = "default"
+        context_name: str = "default",
+        vision: bool = False
     ) -> Page:
         """
         Get or create a page in the specified context
 
+        Pages requested in the "default" context are served from the warm pool
+        when one is available; each pooled page has its own isolated context.
+        Vision pages never come from the pool, whose contexts use the DOM
+        interception policy.
+
         Args:
             name: Page name for identification
             context_name: Context to create the page in
+            vision: Page is screenshotted for a vision model (keeps images)
 
         Returns:
             Page instance
         """
         page_key = f"{context_name}:{name}"
+        self.pool.touch()
 
-        if page_key in self.pages and not self.pages[page_key].is_closed:
-            return self.pages[page_key]
+        if page_key in self.pages:
+            if not self.pages[page_key].is_closed():
+                return self.pages[page_key]
+            # The page was closed behind our back; hand back its pool lease
+            # before taking a new one under the same name
+            await self.close_page(name, context_name)
 
         try:
-            context = await self.get_context(context_name)
-            page = await context.new_page()
+            start = time.perf_counter()
+
+            pooled = context_name == "default" and not vision
+            page = None
+            if pooled:
+                page = await self.pool.acquire()
+
+            if page is not None:
+                self._pooled_page_keys.add(page_key)
+                logger.info(f"Using pooled page: {page_key}")
+            elif pooled and self._pool_has_capacity():
+                if self.browser is None:
+                    await self.initialize()
+                page = await self.pool.lease_new(self._new_context)
+                self._pooled_page_keys.add(page_key)
+                self.pool.record_miss(time.perf_counter() - start)
+                logger.info(f"Created pooled page: {page_key}")
+            else:
+                context = await self.get_context(context_name, vision=vision)
+                page = await context.new_page()
+                self._pooled_page_keys.discard(page_key)
+                self.pool.record_miss(time.perf_counter() - start)
+                logger.info(f"Created page: {page_key}")
 
             self.pages[page_key] = page
-            logger.info(f"Created page: {page_key}")
-
             return page
 
         except Exception as e:
@@ -181,12 +253,28 @@ class UnifiedBrowserManager:
 
         if page_key in self.pages:
             try:
-                await self.pages[page_key].close()
-                del self.pages[page_key]
+                if page_key in self._pooled_page_keys:
+                    # Reset and hand back to the pool instead of closing
+                    self._pooled_page_keys.discard(page_key)
+                    page = self.pages.pop(page_key)
+                    self._forget_page(page)
+                    if await self.pool.release(page):
+                        logger.info(f"Returned page to pool: {page_key}")
+                    return
+
+                page = self.pages.pop(page_key)
+                self._forget_page(page)
+                await page.close()
                 logger.info(f"Closed page: {page_key}")
             except Exception as e:
                 logger.error(f"Error closing page '{page_key}': {e}")
 
+    def _forget_page(self, page: Page) -> None:
+        """Drop a page's per-navigation state from both resource blockers"""
+        for blocker in (self.resource_blocker, self.vision_resource_blocker):
+            if blocker is not None:
+                blocker.forget_page(page)
+
     async def close_context(self, name: str = "default") -> None:
         """Close a specific context and all its pages"""
         if name in self.contexts:
@@ -195,8 +283,13 @@ class UnifiedBrowserManager:
                 pages_to_close = [k for k in self.pages.keys() if k.startswith(f"{name}:")]
                 for page_key in pages_to_close:
                     try:
-                        await self.pages[page_key].close()
-                        del self.pages[page_key]
+                        page = self.pages.pop(page_key)
+                        self._forget_page(page)
+                        if page_key in self._pooled_page_keys:
+                            self._pooled_page_keys.discard(page_key)
+                            await self.pool.release(page)
+                            continue
+                        await page.close()
                     except:
                         pass
 
@@ -208,9 +301,209 @@ class UnifiedBrowserManager:
             except Exception as e:
                 logger.error(f"Error closing context '{name}': {e}")
 
+    async def acquire_page(self, vision: bool = False) -> Page:
+        """
+        Get an isolated page from the warm pool
+
+        Falls back to creating a fresh context/page when the pool is empty.
+        Pages obtained here must be handed back with release_page(); until
+        then the idle watchdog will not shut the browser down.
+
+        Args:
+            vision: Page is screenshotted for a vision model; it gets its own
+                context with the vision interception policy instead of a pooled one
+
+        Returns:
+            Page instance in its own context
+        """
+        if self.browser is None:
+            await self.initialize()
+
+        start = time.perf_counter()
+        page = None if vision else await self.pool.acquire()
+
+        if page is None:
+            # Pool empty: lease a fresh pooled page while under capacity,
+            # otherwise hand out a throwaway context that is closed on release
+            if not vision and self._pool_has_capacity():
+                page = await self.pool.lease_new(self._new_context)
+            else:
+                context = await self._new_context(vision=vision)
+                page = await context.new_page()
+            self.pool.record_miss(time.perf_counter() - start)
+
+        self._held_pages.add(id(page))
+        return page
+
+    def _pool_has_capacity(self) -> bool:
+        """Check whether the pool may create another page"""
+        return self.pool.idle_count() + self.pool.leased_count() < self.pool.size
+
+    async def release_page(self, page: Page) -> None:
+        """Return a page obtained from acquire_page()"""
+        self._held_pages.discard(id(page))
+        self.pool.touch()
+
+        self._forget_page(page)
+
+        if self.pool.owns(page):
+            await self.pool.release(page)
+            return
+
+        try:
+            await page.context.close()
+        except Exception as e:
+            logger.debug(f"Error closing unpooled page: {e}")
+
+    @contextmanager
+    def in_use(self) -> Iterator[None]:
+        """
+        Keep the browser alive for the duration of a block
+
+        Wrap work on pages from get_page() that may outlast idle_timeout
+        between calls into the manager.
+        """
+        self._in_use += 1
+        self.pool.touch()
+        try:
+            yield
+        finally:
+            self._in_use -= 1
+            self.pool.touch()
+
+    def is_busy(self) -> bool:
+        """Whether any acquired page or in_use() block is outstanding"""
+        return bool(self._held_pages) or self._in_use > 0
+
+    def configure_resource_blocking(
+        self,
+        blocker: Optional[ResourceBlocker],
+        vision_blocker: Optional[ResourceBlocker] = None
+    ) -> None:
+        """
+        Set the request interception policies for contexts created from now on
+
+        Already-open contexts keep their routing; the warm pool is normally
+        configured before warm-up so pooled contexts pick this up.
+
+        Args:
+            blocker: ResourceBlocker for DOM/text contexts, or None to disable interception
+            vision_blocker: ResourceBlocker for vision contexts (must not block images),
+                or None to disable interception there
+        """
+        self.resource_blocker = blocker
+        self.vision_resource_blocker = vision_blocker
+
+    def get_resource_stats(self, page: Optional[Page] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get request interception statistics
+
+        Args:
+            page: If given, return counters for this page's current navigation
+
+        Returns:
+            Statistics dict, or None when interception is disabled
+        """
+        if self.resource_blocker is None:
+            return None
+        if page is not None:
+            return self.resource_blocker.navigation_stats(page)
+        return self.resource_blocker.get_stats()
+
+    def configure_pool(self, size: Optional[int] = None, idle_timeout: Optional[float] = None) -> None:
+        """
+        Configure the warm page pool
+
+        Args:
+            size: Number of warm pages to keep ready (0 disables pooling)
+            idle_timeout: Seconds without activity before the browser is shut down (0 disables)
+        """
+        if size is not None:
+            self.pool.size = max(0, size)
+        if idle_timeout is not None:
+            self.idle_timeout = idle_timeout
+
+    async def warm_up(
+        self,
+        headless: bool = True,
+        pool_size: Optional[int] = None,
+        idle_timeout: Optional[float] = None
+    ) -> None:
+        """
+        Launch Chromium and pre-create pooled pages
+
+        Args:
+            headless: Run browser in headless mode
+            pool_size: Number of warm pages to keep ready
+            idle_timeout: Seconds without activity before the browser is shut down
+        """
+        self.configure_pool(pool_size, idle_timeout)
+
+        await self.initialize(headless=headless)
+        await self.pool.fill(self._new_context)
+        self._start_idle_watchdog()
+
+    def start_background_warmup(
+        self,
+        headless: bool = True,
+        pool_size: Optional[int] = None,
+        idle_timeout: Optional[float] = None
+    ) -> Optional[asyncio.Task]:
+        """
+        Schedule warm_up() on the running event loop without waiting for it
+
+        Returns:
+            The warm-up task, or None if no event loop is running
+        """
+        if self._warmup_task is not None and not self._warmup_task.done():
+            return self._warmup_task
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+        async def _warm():
+            try:
+                await self.warm_up(headless=headless, pool_size=pool_size, idle_timeout=idle_timeout)
+            except Exception as e:
+                # Warm-up is an optimization; tools will launch on demand instead
+                logger.warning(f"Background browser warm-up failed: {e}")
+
+        self._warmup_task = loop.create_task(_warm())
+        return self._warmup_task
+
+    def _start_idle_watchdog(self) -> None:
+        """Start the task that shuts the browser down after idle_timeout"""
+        if self.idle_timeout <= 0:
+            return
+        if self._idle_task is not None and not self._idle_task.done():
+            return
+        self._idle_task = asyncio.get_running_loop().create_task(self._idle_watchdog())
+
+    async def _idle_watchdog(self) -> None:
+        """Close the browser once nothing has used it for idle_timeout seconds"""
+        interval = min(self.idle_timeout, 30.0)
+        while self.browser is not None:
+            await asyncio.sleep(interval)
+            # Named pages from get_page() are re-created on demand; only pages
+            # held through acquire_page() or in_use() block shutdown
+            idle_for = time.time() - self.pool.last_activity
+            if not self.is_busy() and idle_for >= self.idle_timeout:
+                logger.info(f"Browser idle for {idle_for:.0f}s, shutting down")
+                self.pool.stats.idle_shutdowns += 1
+                self._idle_task = None
+                await self.close()
+                return
+
     async def close(self) -> None:
         """Close all browser resources"""
         try:
+            # Stop idle watchdog unless we are running inside it
+            if self._idle_task is not None and self._idle_task is not asyncio.current_task():
+                self._idle_task.cancel()
+            self._idle_task = None
+
             # Close all pages
             for page_name in list(self.pages.keys()):
                 try:
@@ -218,6 +511,11 @@ class UnifiedBrowserManager:
                 except:
                     pass
             self.pages.clear()
+            self._pooled_page_keys.clear()
+            self._held_pages.clear()
+
+            # Close pooled contexts
+            await self.pool.close()
 
             # Close all contexts
             for context_name in list(self.contexts.keys()):
@@ -257,7 +555,9 @@ class UnifiedBrowserManager:
             'contexts': list(self.contexts.keys()),
             'pages': list(self.pages.keys()),
             'contexts_count': len(self.contexts),
-            'pages_count': len(self.pages)
+            'pages_count': len(self.pages),
+            'pool': self.pool.get_stats(),
+            'resource_blocking': self.get_resource_stats()
         }
 
 
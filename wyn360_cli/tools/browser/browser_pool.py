@@ -0,0 +1,270 @@
+"""
+Warm Browser Pool for WYN360 CLI
+
+This module keeps a small number of pre-created browser contexts/pages ready on
+the unified Chromium instance so that automation tools don't pay context and
+page creation on every call. Pages are reset and returned to the pool instead of
+being closed and reopened.
+
+Phase 4.4: Warm browser pool with reset-on-return semantics
+"""
+
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Callable, Awaitable
+from playwright.async_api import BrowserContext, Page
+
+logger = logging.getLogger(__name__)
+
+
+# JavaScript used to wipe per-origin storage before a page goes back to the pool
+CLEAR_STORAGE_SCRIPT = """
+() => {
+    try { window.localStorage && window.localStorage.clear(); } catch (e) {}
+    try { window.sessionStorage && window.sessionStorage.clear(); } catch (e) {}
+}
+"""
+
+
+@dataclass
+class PooledPage:
+    """A pre-created context/page pair owned by the pool"""
+    context: BrowserContext
+    page: Page
+    created_at: float = field(default_factory=time.time)
+    uses: int = 0
+
+
+@dataclass
+class PoolStats:
+    """Counters describing pool effectiveness"""
+    acquisitions: int = 0
+    hits: int = 0
+    misses: int = 0
+    releases: int = 0
+    reset_failures: int = 0
+    recycled: int = 0
+    warmups: int = 0
+    idle_shutdowns: int = 0
+    total_time_to_page: float = 0.0
+    max_time_to_page: float = 0.0
+
+    def record_acquisition(self, hit: bool, elapsed: float) -> None:
+        """Record one page hand-out and how long it took"""
+        self.acquisitions += 1
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.total_time_to_page += elapsed
+        self.max_time_to_page = max(self.max_time_to_page, elapsed)
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.acquisitions if self.acquisitions else 0.0
+
+    @property
+    def avg_time_to_page(self) -> float:
+        return self.total_time_to_page / self.acquisitions if self.acquisitions else 0.0
+
+
+ContextFactory = Callable[[], Awaitable[BrowserContext]]
+
+
+class BrowserPool:
+    """
+    Pool of warm browser contexts/pages on a shared browser instance
+
+    Each pooled page lives in its own isolated context. Pages handed out by
+    acquire() are reset (storage cleared, navigated to about:blank) when they
+    are released, and recycled after max_uses hand-outs.
+    """
+
+    def __init__(self, size: int = 2, max_uses: int = 50):
+        """
+        Initialize the pool
+
+        Args:
+            size: Number of warm pages to keep ready
+            max_uses: Recycle a pooled page after this many hand-outs
+        """
+        self.size = size
+        self.max_uses = max_uses
+        self.idle: List[PooledPage] = []
+        self.leased: Dict[int, PooledPage] = {}
+        self.stats = PoolStats()
+        self.last_activity: float = time.time()
+
+    def touch(self) -> None:
+        """Mark the pool as recently used (used for idle shutdown)"""
+        self.last_activity = time.time()
+
+    def idle_count(self) -> int:
+        """Number of warm pages ready to hand out"""
+        return len(self.idle)
+
+    def leased_count(self) -> int:
+        """Number of pooled pages currently handed out"""
+        return len(self.leased)
+
+    def owns(self, page: Page) -> bool:
+        """Check whether a page was handed out by this pool"""
+        return id(page) in self.leased
+
+    async def _create_slot(self, context_factory: ContextFactory) -> PooledPage:
+        """Create a new context/page pair parked on about:blank"""
+        context = await context_factory()
+        page = await context.new_page()
+        return PooledPage(context=context, page=page)
+
+    async def fill(self, context_factory: ContextFactory) -> int:
+        """
+        Top up the pool to its configured size
+
+        Args:
+            context_factory: Coroutine function creating a configured context
+
+        Returns:
+            Number of pages created
+        """
+        created = 0
+        while len(self.idle) + len(self.leased) < self.size:
+            try:
+                self.idle.append(await self._create_slot(context_factory))
+                created += 1
+            except Exception as e:
+                logger.warning(f"Failed to pre-create pooled page: {e}")
+                break
+
+        if created:
+            self.stats.warmups += 1
+            logger.info(f"Browser pool warmed with {created} page(s) ({len(self.idle)} idle)")
+
+        return created
+
+    async def acquire(self) -> Optional[Page]:
+        """
+        Hand out a warm page if one is available
+
+        Returns:
+            A ready page, or None when the pool is empty (caller falls back to
+            creating a page and should report it with record_miss)
+        """
+        self.touch()
+        start = time.perf_counter()
+
+        while self.idle:
+            slot = self.idle.pop()
+            if slot.page.is_closed():
+                await self._discard(slot)
+                continue
+
+            slot.uses += 1
+            self.leased[id(slot.page)] = slot
+            self.stats.record_acquisition(True, time.perf_counter() - start)
+            return slot.page
+
+        return None
+
+    async def lease_new(self, context_factory: ContextFactory) -> Page:
+        """
+        Create a pooled page and hand it out immediately
+
+        Used when the pool is empty but still below its configured size; the
+        page joins the idle list on release like any pre-created one.
+        """
+        slot = await self._create_slot(context_factory)
+        slot.uses += 1
+        self.leased[id(slot.page)] = slot
+        return slot.page
+
+    def record_miss(self, elapsed: float) -> None:
+        """Record a page request the pool could not serve"""
+        self.touch()
+        self.stats.record_acquisition(False, elapsed)
+
+    async def release(self, page: Page) -> bool:
+        """
+        Reset a pooled page and return it to the idle list
+
+        Args:
+            page: Page previously returned by acquire()
+
+        Returns:
+            True if the page went back to the pool, False if it was discarded
+        """
+        self.touch()
+        slot = self.leased.pop(id(page), None)
+        if slot is None:
+            return False
+
+        self.stats.releases += 1
+
+        if slot.page.is_closed():
+            await self._discard(slot)
+            return False
+
+        if slot.uses >= self.max_uses:
+            self.stats.recycled += 1
+            await self._discard(slot)
+            return False
+
+        try:
+            await self._reset(slot)
+        except Exception as e:
+            logger.warning(f"Failed to reset pooled page, discarding: {e}")
+            self.stats.reset_failures += 1
+            await self._discard(slot)
+            return False
+
+        self.idle.append(slot)
+        return True
+
+    async def _reset(self, slot: PooledPage) -> None:
+        """Clear cookies, storage and extra tabs, then park on about:blank"""
+        # Storage is per-origin, so clear it before leaving the current page
+        if not slot.page.url.startswith('about:'):
+            await slot.page.evaluate(CLEAR_STORAGE_SCRIPT)
+
+        for extra_page in list(slot.context.pages):
+            if extra_page is not slot.page:
+                await extra_page.close()
+
+        await slot.context.clear_cookies()
+        await slot.context.clear_permissions()
+        await slot.page.goto('about:blank')
+
+    async def _discard(self, slot: PooledPage) -> None:
+        """Close a slot's context (and its page)"""
+        try:
+            await slot.context.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled context: {e}")
+
+    async def close(self) -> None:
+        """Close every pooled context, idle and leased"""
+        slots = self.idle + list(self.leased.values())
+        self.idle = []
+        self.leased = {}
+        for slot in slots:
+            await self._discard(slot)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        return {
+            'size': self.size,
+            'idle': len(self.idle),
+            'leased': len(self.leased),
+            'acquisitions': self.stats.acquisitions,
+            'hits': self.stats.hits,
+            'misses': self.stats.misses,
+            'hit_rate': self.stats.hit_rate,
+            'avg_time_to_page_ms': self.stats.avg_time_to_page * 1000,
+            'max_time_to_page_ms': self.stats.max_time_to_page * 1000,
+            'releases': self.stats.releases,
+            'reset_failures': self.stats.reset_failures,
+            'recycled': self.stats.recycled,
+            'warmups': self.stats.warmups,
+            'idle_shutdowns': self.stats.idle_shutdowns
+        }
@@ -3,13 +3,18 @@ Error Classification System for Browser Automation
 
 This module provides intelligent error analysis and classification for browser
 automation failures, enabling adaptive recovery strategies.
+
+The pattern library is compiled once into an Aho-Corasick automaton over the
+literal pieces of every regex and keyword, so all categories are scored in a
+single pass over the error text. Results are memoized by normalized error
+signature, since recovery loops tend to see the same failure repeatedly.
 """
 
 import re
+from collections import OrderedDict, deque
 from typing import Dict, List, Optional, Tuple, Any
 from enum import Enum
 from dataclasses import dataclass
-import traceback
 
 
 class ErrorCategory(Enum):
@@ -56,13 +61,211 @@ class ErrorAnalysis:
     context_info: Dict[str, Any]
 
 
+# Regex metacharacters; a pattern piece containing none of these is a literal
+_REGEX_META = set('.^$*+?{}[]\\|()')
+
+
+class CompiledPatternMatcher:
+    """
+    Single-pass matcher for a library of ErrorPatterns
+
+    Every regex of the form ``lit1.*lit2.*...`` and every keyword is reduced to
+    literal strings, which are loaded into one Aho-Corasick automaton. A scan
+    of the lowercased text yields each literal's occurrences; keyword hits are
+    a set lookup and regex hits are an in-order check of their literal pieces
+    on a single line (``.`` does not match newlines). Regexes that are not of
+    that form are kept as compiled fallbacks.
+    """
+
+    def __init__(self, error_patterns: List[ErrorPattern]):
+        self.error_patterns = error_patterns
+        self._literal_ids: Dict[str, int] = {}
+        self._literals: List[str] = []
+
+        # Per pattern: ([(regex, literal ids or None, compiled fallback)], [keyword literal ids])
+        self._compiled: List[Tuple[List[Tuple[str, Optional[Tuple[int, ...]], Optional[re.Pattern]]], List[int]]] = []
+        for pattern in error_patterns:
+            regexes = []
+            for regex in pattern.patterns:
+                pieces = self._literal_pieces(regex)
+                if pieces is None:
+                    regexes.append((regex, None, re.compile(regex, re.IGNORECASE)))
+                else:
+                    regexes.append((regex, tuple(self._add_literal(piece) for piece in pieces), None))
+            keywords = [self._add_literal(keyword.lower()) for keyword in pattern.keywords]
+            self._compiled.append((regexes, keywords))
+
+        self._exception_types: Dict[str, List[int]] = {}
+        for index, pattern in enumerate(error_patterns):
+            for name in pattern.exception_types:
+                self._exception_types.setdefault(name, []).append(index)
+
+        # Inverted indexes so a scan only evaluates patterns whose literals occurred
+        self._regexes_by_literal: Dict[int, List[Tuple[int, int]]] = {}
+        self._keywords_by_literal: Dict[int, List[int]] = {}
+        self._fallbacks: List[Tuple[int, int, re.Pattern]] = []
+        for pattern_index, (regexes, keywords) in enumerate(self._compiled):
+            for regex_index, (_, literal_ids, fallback) in enumerate(regexes):
+                if literal_ids is None:
+                    self._fallbacks.append((pattern_index, regex_index, fallback))
+                    continue
+                for literal_id in set(literal_ids):
+                    self._regexes_by_literal.setdefault(literal_id, []).append((pattern_index, regex_index))
+            for literal_id in keywords:
+                self._keywords_by_literal.setdefault(literal_id, []).append(pattern_index)
+
+        self._build_automaton()
+
+    @staticmethod
+    def _literal_pieces(regex: str) -> Optional[List[str]]:
+        """Split ``a.*b.*c`` into ["a", "b", "c"], or None if not of that form"""
+        pieces = [piece for piece in regex.lower().split('.*') if piece]
+        if not pieces or any(char in _REGEX_META for piece in pieces for char in piece):
+            return None
+        return pieces
+
+    def _add_literal(self, literal: str) -> int:
+        """Register a literal and return its id"""
+        if literal not in self._literal_ids:
+            self._literal_ids[literal] = len(self._literals)
+            self._literals.append(literal)
+        return self._literal_ids[literal]
+
+    def _build_automaton(self) -> None:
+        """Build goto/fail/output tables for all registered literals"""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[List[int]] = [[]]
+
+        for literal_id, literal in enumerate(self._literals):
+            state = 0
+            for char in literal:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(literal_id)
+
+        fail = [0] * len(self._goto)
+        order = []
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[fail[next_state]]
+
+        # Resolve failure links into a full transition table (a DFA) so the
+        # scan is one dict lookup per character; unknown characters go to root
+        self._delta: List[Dict[str, int]] = [dict(self._goto[0])] + [{} for _ in self._goto[1:]]
+        for state in order:
+            transitions = dict(self._delta[fail[state]])
+            transitions.update(self._goto[state])
+            self._delta[state] = transitions
+
+    def _scan(self, text: str) -> Dict[int, List[Tuple[int, int]]]:
+        """Find every (start, end) occurrence of every literal in one pass"""
+        delta, output, literals = self._delta, self._output, self._literals
+        occurrences: Dict[int, List[Tuple[int, int]]] = {}
+        state = 0
+        for end, char in enumerate(text, 1):
+            state = delta[state].get(char, 0)
+            if output[state]:
+                for literal_id in output[state]:
+                    occurrences.setdefault(literal_id, []).append((end - len(literals[literal_id]), end))
+        return occurrences
+
+    @staticmethod
+    def _matches_in_order(
+        literal_ids: Tuple[int, ...],
+        occurrences: Dict[int, List[Tuple[int, int]]],
+        text: str
+    ) -> bool:
+        """Check that the literals occur in order, non-overlapping, on one line"""
+        for first_start, first_end in occurrences[literal_ids[0]]:
+            line_end = text.find('\n', first_end)
+            if line_end == -1:
+                line_end = len(text)
+            cursor = first_end
+            for literal_id in literal_ids[1:]:
+                cursor = next(
+                    (end for start, end in occurrences[literal_id]
+                     if start >= cursor and end <= line_end),
+                    None
+                )
+                if cursor is None:
+                    break
+            else:
+                return True
+        return False
+
+    def score(self, text: str, error_type: str) -> List[Tuple[float, List[str]]]:
+        """
+        Score every pattern against the text in one pass.
+
+        Args:
+            text: Error text (any case)
+            error_type: Exception class name
+
+        Returns:
+            (confidence, matched regexes) for each pattern, in library order
+        """
+        text = text.lower()
+        occurrences = self._scan(text)
+
+        # Regexes whose literals all occurred, and keyword hits per pattern
+        literal_hits: Dict[Tuple[int, int], int] = {}
+        keyword_hits: Dict[int, int] = {}
+        for literal_id in occurrences:
+            for key in self._regexes_by_literal.get(literal_id, ()):
+                literal_hits[key] = literal_hits.get(key, 0) + 1
+            for pattern_index in self._keywords_by_literal.get(literal_id, ()):
+                keyword_hits[pattern_index] = keyword_hits.get(pattern_index, 0) + 1
+
+        matched: Dict[int, List[int]] = {}
+        for (pattern_index, regex_index), hits in literal_hits.items():
+            literal_ids = self._compiled[pattern_index][0][regex_index][1]
+            if hits == len(set(literal_ids)) and self._matches_in_order(literal_ids, occurrences, text):
+                matched.setdefault(pattern_index, []).append(regex_index)
+        for pattern_index, regex_index, fallback in self._fallbacks:
+            if fallback.search(text):
+                matched.setdefault(pattern_index, []).append(regex_index)
+
+        type_matches = self._exception_types.get(error_type, ())
+
+        results = []
+        for index, (regexes, keywords) in enumerate(self._compiled):
+            confidence = 0.6 if index in type_matches else 0.0
+
+            matched_regexes = [regexes[i][0] for i in sorted(matched.get(index, ()))]
+            if matched_regexes:
+                confidence += 0.5 * (len(matched_regexes) / len(regexes))
+
+            if index in keyword_hits:
+                confidence += 0.4 * (keyword_hits[index] / len(keywords))
+
+            results.append((min(confidence, 1.0), matched_regexes))
+        return results
+
 class ErrorClassifier:
     """
     Intelligent error classification system for browser automation
     """
 
-    def __init__(self):
+    def __init__(self, cache_size: int = 256):
         self.error_patterns = self._initialize_error_patterns()
+        self.matcher = CompiledPatternMatcher(self.error_patterns)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[Optional[int], float, List[str]]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def _initialize_error_patterns(self) -> List[ErrorPattern]:
         """Initialize error classification patterns"""
@@ -217,33 +420,18 @@ class ErrorClassifier:
         if error_context is None:
             error_context = {}
 
-        # Get full traceback for additional context
-        tb_str = traceback.format_exc()
-
-        best_match = None
-        highest_confidence = 0.0
-
-        # Try to match against each pattern
-        for pattern in self.error_patterns:
-            confidence = self._calculate_confidence(
-                error_str, error_type, tb_str, pattern
-            )
-
-            if confidence > highest_confidence:
-                highest_confidence = confidence
-                best_match = pattern
+        best_index, highest_confidence, matched_patterns = self._classify_text(
+            self._error_text(error), error_type
+        )
 
         # If no good match found, classify as unknown
-        if highest_confidence < 0.2 or best_match is None:
+        if best_index is None:
             category = ErrorCategory.UNKNOWN_ERROR
             severity = ErrorSeverity.MEDIUM
-            recovery_hint = "Try general error recovery strategies"
-            matched_patterns = []
         else:
+            best_match = self.error_patterns[best_index]
             category = best_match.category
             severity = best_match.severity
-            recovery_hint = best_match.recovery_hint
-            matched_patterns = self._get_matched_patterns(error_str, tb_str, best_match)
 
         # Generate recovery suggestions
         recovery_suggestions = self._generate_recovery_suggestions(
@@ -255,60 +443,79 @@ class ErrorClassifier:
             severity=severity,
             confidence=highest_confidence,
             original_error=error_str,
-            matched_patterns=matched_patterns,
+            matched_patterns=list(matched_patterns),
             recovery_suggestions=recovery_suggestions,
             context_info=error_context
         )
 
-    def _calculate_confidence(self,
-                            error_str: str,
-                            error_type: str,
-                            traceback_str: str,
-                            pattern: ErrorPattern) -> float:
-        """Calculate confidence score for a pattern match"""
-        confidence = 0.0
-
-        # Check exception type match
-        if error_type in pattern.exception_types:
-            confidence += 0.6  # High weight for exact type match
-
-        # Check regex patterns
-        pattern_matches = 0
-        for regex_pattern in pattern.patterns:
-            if re.search(regex_pattern, error_str, re.IGNORECASE) or \
-               re.search(regex_pattern, traceback_str, re.IGNORECASE):
-                pattern_matches += 1
-
-        if pattern_matches > 0:
-            # Give higher confidence for pattern matches
-            confidence += 0.5 * (pattern_matches / len(pattern.patterns))
-
-        # Check keywords
-        keyword_matches = 0
-        for keyword in pattern.keywords:
-            if keyword.lower() in error_str.lower() or \
-               keyword.lower() in traceback_str.lower():
-                keyword_matches += 1
-
-        if keyword_matches > 0:
-            # Give additional confidence for keyword matches
-            confidence += 0.4 * (keyword_matches / len(pattern.keywords))
-
-        return min(confidence, 1.0)  # Cap at 1.0
-
-    def _get_matched_patterns(self,
-                            error_str: str,
-                            traceback_str: str,
-                            pattern: ErrorPattern) -> List[str]:
-        """Get list of patterns that matched"""
-        matched = []
-
-        for regex_pattern in pattern.patterns:
-            if re.search(regex_pattern, error_str, re.IGNORECASE) or \
-               re.search(regex_pattern, traceback_str, re.IGNORECASE):
-                matched.append(regex_pattern)
-
-        return matched
+    @staticmethod
+    def _error_text(error: Exception) -> str:
+        """
+        Text to classify: the error message plus its chained causes.
+
+        The chained exceptions carry the underlying Playwright/network message
+        when a caller wraps it (``raise X(...) from e``).
+        """
+        parts = [str(error)]
+        seen = {id(error)}
+        current = error.__cause__ or error.__context__
+        while current is not None and id(current) not in seen and len(parts) < 5:
+            seen.add(id(current))
+            parts.append(f"{type(current).__name__}: {current}")
+            current = current.__cause__ or current.__context__
+        return "\n".join(parts)
+
+    @staticmethod
+    def normalize_signature(error_text: str) -> str:
+        """
+        Normalize error text for memoization.
+
+        Lowercases and collapses digit runs (timeouts, coordinates, ports), which
+        never affect pattern matches, so "Timeout 30000ms exceeded" and
+        "Timeout 5000ms exceeded" share a cache entry.
+        """
+        return re.sub(r'\d+', '0', error_text.lower())
+
+    def _classify_text(self, error_text: str, error_type: str) -> Tuple[Optional[int], float, List[str]]:
+        """Score all patterns (memoized by normalized signature)"""
+        key = (error_type, self.normalize_signature(error_text))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+
+        self.cache_misses += 1
+        best_index = None
+        highest_confidence = 0.0
+        matched_patterns: List[str] = []
+
+        for index, (confidence, matched) in enumerate(self.matcher.score(key[1], error_type)):
+            if confidence > highest_confidence:
+                highest_confidence = confidence
+                best_index = index
+                matched_patterns = matched
+
+        if highest_confidence < 0.2:
+            best_index = None
+            matched_patterns = []
+
+        result = (best_index, highest_confidence, matched_patterns)
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get memoization statistics"""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'size': len(self._cache),
+            'max_size': self.cache_size,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': self.cache_hits / lookups if lookups else 0.0
+        }
 
     def _generate_recovery_suggestions(self,
                                      category: ErrorCategory,
@@ -5,11 +5,12 @@ This module provides adaptive error recovery with code regeneration based on
 error analysis and context understanding.
 """
 
+import ast
 import asyncio
 import logging
 import re
 import time
-from typing import Dict, List, Optional, Any, Tuple, Union
+from typing import Dict, List, Optional, Any, Set, Tuple, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 
@@ -21,7 +22,13 @@ from .error_classification import (
     ErrorAnalysis
 )
 from .enhanced_code_generator import EnhancedCodeGenerator, CodeGenerationContext
-from .secure_python_sandbox import SecurePythonSandbox, SandboxConfig, SandboxError
+from .secure_python_sandbox import (
+    SecurePythonSandbox,
+    SandboxConfig,
+    SandboxError,
+    SandboxManager,
+    SecurityChecker
+)
 
 
 class RecoveryStrategy(Enum):
@@ -44,6 +51,25 @@ class RecoveryAttempt:
     execution_time: float
     generated_code: str
     confidence_score: float
+    # Tested in an isolated browser context or sandbox worker, not on the live page
+    isolated: bool = False
+
+
+@dataclass
+class RecoveryCandidate:
+    """A generated recovery attempt awaiting validation"""
+    strategy: RecoveryStrategy
+    code: str
+    modifications: List[str]
+    idempotent: bool = False
+    rejection: Optional[str] = None
+
+
+# Page actions that change state; code using them is not safe to run twice
+_MUTATING_ACTIONS = re.compile(
+    r'\.(click|dblclick|tap|fill|type|press|check|uncheck|select_option|'
+    r'set_input_files|drag_to|dispatch_event|set_checked)\s*\('
+)
 
 
 @dataclass
@@ -65,23 +91,32 @@ class IntelligentErrorRecovery:
 
     def __init__(self,
                  code_generator: Optional[EnhancedCodeGenerator] = None,
-                 sandbox_config: Optional[SandboxConfig] = None):
+                 sandbox_config: Optional[SandboxConfig] = None,
+                 sandbox_manager: Optional[SandboxManager] = None):
         self.code_generator = code_generator or EnhancedCodeGenerator()
         self.sandbox_config = sandbox_config or SandboxConfig()
+        # Optional manager with a worker pool; used for picklable contexts only
+        self.sandbox_manager = sandbox_manager
         self.error_classifier = ErrorClassifier()
         self.recovery_planner = ErrorRecoveryPlanner(self.error_classifier)
         self.logger = logging.getLogger(__name__)
 
+        # Static validation of candidates uses the same rules as the sandbox
+        self.security_checker = SecurityChecker(self.sandbox_config)
+
         # Recovery statistics and learning
         self.recovery_history: List[RecoverySession] = []
         self.strategy_success_rates: Dict[str, float] = {}
+        # [wins, trials] per "<category>_<strategy>", used to order strategies
+        self.strategy_outcomes: Dict[str, List[int]] = {}
 
     async def recover_from_error(self,
                                 error: Exception,
                                 original_code: str,
                                 context: CodeGenerationContext,
                                 browser_context: Dict[str, Any],
-                                max_attempts: int = 3) -> Tuple[bool, str, RecoverySession]:
+                                max_attempts: int = 3,
+                                speculative: bool = False) -> Tuple[bool, str, RecoverySession]:
         """
         Attempt to recover from automation error with adaptive strategies
 
@@ -91,6 +126,8 @@ class IntelligentErrorRecovery:
             context: Code generation context
             browser_context: Browser objects and state
             max_attempts: Maximum recovery attempts
+            speculative: Generate up to max_attempts candidates up front and
+                race them, falling back to one strategy at a time when none wins
 
         Returns:
             Tuple of (success, recovered_code, recovery_session)
@@ -122,20 +159,52 @@ class IntelligentErrorRecovery:
                 error, original_code, browser_context
             )
 
+            # Strategies the serial loop below should not try again
+            settled: Set[RecoveryStrategy] = set()
+            if speculative:
+                raced = set(self._rank_strategies(error_analysis)[:max_attempts])
+                winner = await self._race_recovery_candidates(
+                    error_analysis, recovery_plan, context, browser_context,
+                    original_code, max_attempts, recovery_session.attempts
+                )
+                if winner:
+                    recovery_session.final_success = True
+                    recovery_session.total_recovery_time = time.time() - session_start
+                    self.logger.info(f"Speculative recovery won by {winner.strategy.value}")
+
+                    self._learn_from_success(error_analysis, winner.strategy, winner)
+                    recovery_session.lessons_learned = self._extract_lessons(
+                        error_analysis, recovery_session.attempts
+                    )
+                    self.recovery_history.append(recovery_session)
+
+                    return True, winner.generated_code, recovery_session
+
+                # No candidate won: fall back to one strategy at a time on the
+                # live page. Candidates that only failed in an isolated copy
+                # get another chance there (the live page may hold state the
+                # copy lacks); ones already run on it, rejected or unchanged do not
+                settled = raced - {attempt.strategy for attempt in recovery_session.attempts if attempt.isolated}
+                self.logger.info("Speculative recovery found no winner; trying strategies serially")
+
             # Attempt recovery with different strategies
+            serial_history: List[RecoveryAttempt] = []
             for attempt_num in range(1, max_attempts + 1):
                 self.logger.info(f"Recovery attempt {attempt_num}/{max_attempts}")
 
                 # Choose strategy for this attempt
                 strategy = self._choose_recovery_strategy(
-                    error_analysis, recovery_plan, attempt_num, recovery_session.attempts
+                    error_analysis, recovery_plan, attempt_num, serial_history, settled
                 )
+                if speculative and strategy == RecoveryStrategy.MANUAL_INTERVENTION:
+                    break  # Every strategy has been tried
 
                 # Execute recovery attempt
                 attempt_result = await self._execute_recovery_attempt(
                     strategy, error_analysis, recovery_plan, context,
-                    browser_context, original_code, attempt_num
+                    browser_context, original_code, len(recovery_session.attempts) + 1
                 )
+                serial_history.append(attempt_result)
 
                 recovery_session.attempts.append(attempt_result)
 
@@ -158,6 +227,7 @@ class IntelligentErrorRecovery:
                     return True, attempt_result.generated_code, recovery_session
 
                 else:
+                    self._record_strategy_outcome(error_analysis, strategy, False)
                     self.logger.warning(f"Recovery attempt {attempt_num} failed: "
                                       f"{attempt_result.error_encountered}")
 
@@ -185,13 +255,32 @@ class IntelligentErrorRecovery:
                                  error_analysis: ErrorAnalysis,
                                  recovery_plan: Dict[str, Any],
                                  attempt_number: int,
-                                 previous_attempts: List[RecoveryAttempt]) -> RecoveryStrategy:
+                                 previous_attempts: List[RecoveryAttempt],
+                                 exclude: Optional[Set[RecoveryStrategy]] = None) -> RecoveryStrategy:
         """Choose the best recovery strategy for this attempt"""
 
         # Get strategies that haven't been tried yet
-        tried_strategies = {attempt.strategy for attempt in previous_attempts}
+        tried_strategies = {attempt.strategy for attempt in previous_attempts} | (exclude or set())
+
+        strategy_priority = self._rank_strategies(error_analysis)
 
-        # Strategy priority based on error category and attempt number
+        # Choose first strategy that hasn't been tried
+        for strategy in strategy_priority:
+            if strategy not in tried_strategies:
+                return strategy
+
+        # If all strategies tried, use manual intervention
+        return RecoveryStrategy.MANUAL_INTERVENTION
+
+    def _rank_strategies(self, error_analysis: ErrorAnalysis) -> List[RecoveryStrategy]:
+        """
+        Order strategies for an error category
+
+        Starts from the category's default priority and moves strategies with
+        a better observed win rate for this category to the front. Strategies
+        without history score 0.5, so the default order holds until there is
+        evidence against it.
+        """
         if error_analysis.category == ErrorCategory.TIMEOUT:
             strategy_priority = [
                 RecoveryStrategy.PARAMETER_ADJUSTMENT,
@@ -219,13 +308,253 @@ class IntelligentErrorRecovery:
                 RecoveryStrategy.FALLBACK_MODE
             ]
 
-        # Choose first strategy that hasn't been tried
-        for strategy in strategy_priority:
-            if strategy not in tried_strategies:
-                return strategy
+        # sorted() is stable, so ties keep the category's default order
+        return sorted(
+            strategy_priority,
+            key=lambda strategy: -self._strategy_win_rate(error_analysis, strategy)
+        )
 
-        # If all strategies tried, use manual intervention
-        return RecoveryStrategy.MANUAL_INTERVENTION
+    def _strategy_win_rate(self, error_analysis: ErrorAnalysis, strategy: RecoveryStrategy) -> float:
+        """Laplace-smoothed win rate of a strategy for this error category"""
+        wins, trials = self.strategy_outcomes.get(
+            f"{error_analysis.category.value}_{strategy.value}", (0, 0)
+        )
+        return (wins + 1) / (trials + 2)
+
+    def _record_strategy_outcome(self,
+                                 error_analysis: ErrorAnalysis,
+                                 strategy: RecoveryStrategy,
+                                 success: bool):
+        """Count a win or loss for a strategy against this error category"""
+        strategy_key = f"{error_analysis.category.value}_{strategy.value}"
+        outcome = self.strategy_outcomes.setdefault(strategy_key, [0, 0])
+        outcome[0] += int(success)
+        outcome[1] += 1
+
+    async def _generate_candidate_code(self,
+                                       strategy: RecoveryStrategy,
+                                       error_analysis: ErrorAnalysis,
+                                       recovery_plan: Dict[str, Any],
+                                       context: CodeGenerationContext,
+                                       original_code: str) -> Tuple[str, List[str]]:
+        """Produce the modified code for one strategy"""
+
+        if strategy == RecoveryStrategy.CODE_MODIFICATION:
+            return await self._apply_code_modifications(
+                original_code, error_analysis, recovery_plan
+            )
+
+        elif strategy == RecoveryStrategy.PARAMETER_ADJUSTMENT:
+            return await self._adjust_parameters(
+                original_code, error_analysis, recovery_plan
+            )
+
+        elif strategy == RecoveryStrategy.ALTERNATIVE_APPROACH:
+            return await self._generate_alternative_approach(
+                context, error_analysis, recovery_plan
+            )
+
+        elif strategy == RecoveryStrategy.FALLBACK_MODE:
+            return await self._generate_fallback_code(
+                context, error_analysis
+            )
+
+        # MANUAL_INTERVENTION
+        return original_code, ["Manual intervention required"]
+
+    def _validate_candidate(self, code: str) -> Optional[str]:
+        """Static checks before a candidate is executed; returns the reason it was rejected"""
+        try:
+            ast.parse(code)
+        except SyntaxError:
+            # Top-level await is valid in sandbox scripts
+            try:
+                compile(code, "<recovery-candidate>", "exec", flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT)
+            except SyntaxError as e:
+                return f"Syntax error: {e}"
+
+        is_safe, violations = self.security_checker.check_code_safety(code)
+        if not is_safe:
+            return f"Security violations: {violations}"
+        return None
+
+    @staticmethod
+    def is_idempotent(code: str) -> bool:
+        """Whether running the code twice leaves the site in the same state"""
+        return not _MUTATING_ACTIONS.search(code)
+
+    async def _build_candidates(self,
+                                error_analysis: ErrorAnalysis,
+                                recovery_plan: Dict[str, Any],
+                                context: CodeGenerationContext,
+                                original_code: str,
+                                max_candidates: int) -> List[RecoveryCandidate]:
+        """Generate and statically validate the top-N candidates concurrently"""
+
+        strategies = self._rank_strategies(error_analysis)[:max_candidates]
+        generated = await asyncio.gather(
+            *(self._generate_candidate_code(s, error_analysis, recovery_plan, context, original_code)
+              for s in strategies),
+            return_exceptions=True
+        )
+
+        candidates = []
+        seen_code = {original_code}
+        for strategy, outcome in zip(strategies, generated):
+            if isinstance(outcome, BaseException):
+                self.logger.debug(f"Candidate generation failed for {strategy.value}: {outcome}")
+                continue
+            code, modifications = outcome
+            if code in seen_code:
+                continue  # Nothing changed, or a duplicate of a better-ranked candidate
+            seen_code.add(code)
+            candidates.append(RecoveryCandidate(strategy, code, modifications, self.is_idempotent(code)))
+
+        rejections = await asyncio.gather(
+            *(asyncio.to_thread(self._validate_candidate, c.code) for c in candidates)
+        )
+        for candidate, rejection in zip(candidates, rejections):
+            candidate.rejection = rejection
+
+        return candidates
+
+    async def _isolated_context_options(self, browser_context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        new_context() options that reproduce the live context: cookies and
+        local storage (storage_state), viewport and user agent
+        """
+        page = browser_context.get('page')
+        live_context = browser_context.get('context') or getattr(page, 'context', None)
+        options: Dict[str, Any] = {}
+        try:
+            if live_context is not None:
+                options['storage_state'] = await live_context.storage_state()
+            viewport = getattr(page, 'viewport_size', None)
+            if isinstance(viewport, dict):
+                options['viewport'] = viewport
+            user_agent = await page.evaluate("navigator.userAgent")
+            if isinstance(user_agent, str):
+                options['user_agent'] = user_agent
+        except Exception as e:
+            self.logger.debug(f"Could not copy live browser context state: {e}")
+        return options
+
+    async def _test_in_isolated_context(self,
+                                        code: str,
+                                        browser_context: Dict[str, Any],
+                                        context_options: Optional[Dict[str, Any]] = None) -> Tuple[bool, Optional[str]]:
+        """Test code on a fresh page in a copy of the live browser context, at the current URL"""
+        browser = browser_context['browser']
+        isolated = await browser.new_context(**(context_options or {}))
+        try:
+            page = await isolated.new_page()
+            url = getattr(browser_context.get('page'), 'url', None)
+            if isinstance(url, str) and url.startswith(('http://', 'https://')):
+                await page.goto(url)
+            return await self._test_code_in_sandbox(
+                code, dict(browser_context, page=page, context=isolated)
+            )
+        finally:
+            await isolated.close()
+
+    def _can_race(self, browser_context: Dict[str, Any]) -> bool:
+        """Whether candidates can run concurrently without sharing the live page"""
+        browser = browser_context.get('browser')
+        if browser is not None and hasattr(browser, 'new_context'):
+            return True
+        return bool(self.sandbox_manager and self.sandbox_manager.can_use_pool(browser_context))
+
+    async def _race_recovery_candidates(self,
+                                        error_analysis: ErrorAnalysis,
+                                        recovery_plan: Dict[str, Any],
+                                        context: CodeGenerationContext,
+                                        browser_context: Dict[str, Any],
+                                        original_code: str,
+                                        max_candidates: int,
+                                        attempts: List[RecoveryAttempt]) -> Optional[RecoveryAttempt]:
+        """
+        Speculative recovery: race idempotent candidates, then try the rest in order
+
+        Idempotent candidates run concurrently, each in an isolated browser
+        context (or a sandbox worker when the context is picklable); the first
+        success wins and the others are cancelled. Candidates that mutate page
+        state run one at a time against the live page. Every finished attempt
+        is appended to `attempts` and counted towards the strategy win rates.
+        """
+        start = time.time()
+        candidates = await self._build_candidates(
+            error_analysis, recovery_plan, context, original_code, max_candidates
+        )
+
+        def record(candidate: RecoveryCandidate,
+                   success: bool,
+                   error_msg: Optional[str],
+                   isolated: bool = False) -> RecoveryAttempt:
+            attempt = RecoveryAttempt(
+                attempt_number=len(attempts) + 1,
+                strategy=candidate.strategy,
+                modifications_made=candidate.modifications,
+                success=success,
+                error_encountered=error_msg,
+                execution_time=time.time() - start,
+                generated_code=candidate.code,
+                confidence_score=self._calculate_attempt_confidence(
+                    candidate.strategy, error_analysis, candidate.modifications, success
+                ),
+                isolated=isolated
+            )
+            attempts.append(attempt)
+            if not success:
+                self._record_strategy_outcome(error_analysis, candidate.strategy, False)
+            return attempt
+
+        runnable = []
+        for candidate in candidates:
+            if candidate.rejection:
+                record(candidate, False, candidate.rejection)
+            else:
+                runnable.append(candidate)
+
+        can_race = self._can_race(browser_context)
+        racers = [c for c in runnable if c.idempotent and can_race]
+        serial = [c for c in runnable if c not in racers]
+
+        if racers:
+            isolated = browser_context.get('browser') is not None
+            if isolated:
+                context_options = await self._isolated_context_options(browser_context)
+
+            async def run(candidate: RecoveryCandidate) -> Tuple[bool, Optional[str]]:
+                if isolated:
+                    return await self._test_in_isolated_context(candidate.code, browser_context, context_options)
+                return await self._test_code_in_sandbox(candidate.code, browser_context)
+
+            tasks = {asyncio.ensure_future(run(c)): c for c in racers}
+            pending = set(tasks)
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        try:
+                            success, error_msg = task.result()
+                        except Exception as e:
+                            success, error_msg = False, str(e)
+                        attempt = record(tasks[task], success, error_msg, isolated=True)
+                        if success:
+                            return attempt
+            finally:
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+        for candidate in serial:
+            success, error_msg = await self._test_code_in_sandbox(candidate.code, browser_context)
+            attempt = record(candidate, success, error_msg)
+            if success:
+                return attempt
+
+        return None
 
     async def _execute_recovery_attempt(self,
                                        strategy: RecoveryStrategy,
@@ -240,29 +569,9 @@ class IntelligentErrorRecovery:
         attempt_start = time.time()
 
         try:
-            if strategy == RecoveryStrategy.CODE_MODIFICATION:
-                modified_code, modifications = await self._apply_code_modifications(
-                    original_code, error_analysis, recovery_plan
-                )
-
-            elif strategy == RecoveryStrategy.PARAMETER_ADJUSTMENT:
-                modified_code, modifications = await self._adjust_parameters(
-                    original_code, error_analysis, recovery_plan
-                )
-
-            elif strategy == RecoveryStrategy.ALTERNATIVE_APPROACH:
-                modified_code, modifications = await self._generate_alternative_approach(
-                    context, error_analysis, recovery_plan
-                )
-
-            elif strategy == RecoveryStrategy.FALLBACK_MODE:
-                modified_code, modifications = await self._generate_fallback_code(
-                    context, error_analysis
-                )
-
-            else:  # MANUAL_INTERVENTION
-                modified_code = original_code
-                modifications = ["Manual intervention required"]
+            modified_code, modifications = await self._generate_candidate_code(
+                strategy, error_analysis, recovery_plan, context, original_code
+            )
 
             # Test the modified code in sandbox
             success, error_msg = await self._test_code_in_sandbox(
@@ -476,6 +785,12 @@ except Exception as fallback_error:
         """Test modified code in secure sandbox"""
 
         try:
+            if self.sandbox_manager and self.sandbox_manager.can_use_pool(browser_context):
+                result = await self.sandbox_manager.pool.execute(code, browser_context)
+                if result['success']:
+                    return True, None
+                return False, result.get('errors', 'Unknown execution error')
+
             sandbox = SecurePythonSandbox(self.sandbox_config)
 
             # Execute code with timeout
@@ -489,6 +804,25 @@ except Exception as fallback_error:
         except Exception as e:
             return False, str(e)
 
+    async def _test_candidates_in_sandbox(self,
+                                        codes: List[str],
+                                        browser_context: Dict[str, Any]) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Test several candidate codes, in parallel when a worker pool can take the context
+
+        Live browser contexts cannot leave this process, so those candidates
+        are tested one at a time.
+        """
+        if self.sandbox_manager and self.sandbox_manager.can_use_pool(browser_context):
+            results = await self.sandbox_manager.pool.execute_many(codes, browser_context)
+            return [
+                (True, None) if result['success']
+                else (False, result.get('errors', 'Unknown execution error'))
+                for result in results
+            ]
+
+        return [await self._test_code_in_sandbox(code, browser_context) for code in codes]
+
     def _increase_timeouts(self, code: str) -> Tuple[str, bool]:
         """Increase timeout values in code"""
         original_code = code
@@ -671,6 +1005,7 @@ await page.wait_for_timeout(2000)  # Additional stabilization time
         # Simple learning rate adjustment
         current_rate = self.strategy_success_rates[strategy_key]
         self.strategy_success_rates[strategy_key] = current_rate * 0.9 + 0.1 * 1.0
+        self._record_strategy_outcome(error_analysis, strategy, True)
 
         self.logger.info(f"Updated success rate for {strategy_key}: "
                         f"{self.strategy_success_rates[strategy_key]:.2f}")
@@ -739,6 +1074,9 @@ await page.wait_for_timeout(2000)  # Additional stabilization time
             "average_attempts": avg_attempts,
             "average_recovery_time": avg_recovery_time,
             "strategy_success_rates": self.strategy_success_rates.copy(),
+            "strategy_win_rates": {
+                key: (wins + 1) / (trials + 2) for key, (wins, trials) in self.strategy_outcomes.items()
+            },
             "category_stats": category_stats
         }
 
@@ -747,6 +1085,7 @@ await page.wait_for_timeout(2000)  # Additional stabilization time
 __all__ = [
     'RecoveryStrategy',
     'RecoveryAttempt',
+    'RecoveryCandidate',
     'RecoverySession',
     'IntelligentErrorRecovery'
 ]
\ No newline at end of file
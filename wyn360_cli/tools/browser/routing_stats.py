@@ -0,0 +1,337 @@
+"""
+Persistent Routing Statistics for Browser Automation
+
+Keeps per-domain, per-action-type, per-approach outcome counters so the
+orchestrators can route a site straight to the approach that works there
+instead of relearning it every session. Counters decay exponentially with a
+configurable half-life, so a site redesign stops influencing decisions after
+a few weeks without any explicit bucketing. Every lookup is a dict access.
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+# Key part used for the domain-wide aggregate of an approach
+ANY_ACTION = "*"
+
+
+def routing_domain(url: str) -> str:
+    """Domain used to group routing statistics ('www.' is ignored)"""
+    try:
+        netloc = urlparse(url).netloc.lower()
+    except Exception:
+        return ""
+    host = netloc.rsplit('@', 1)[-1].split(':', 1)[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+@dataclass
+class ApproachStats:
+    """Decayed outcome counters for one (domain, action type, approach)"""
+    attempts: float = 0.0
+    successes: float = 0.0
+    latency_total: float = 0.0
+    updated_at: float = 0.0
+    last_success_at: float = 0.0
+    last_failure_at: float = 0.0
+    # Consecutive failures since the last success (not decayed)
+    failure_streak: int = 0
+
+    def decay(self, now: float, half_life: float) -> None:
+        """Age the counters to `now`"""
+        if self.updated_at and now > self.updated_at:
+            factor = 0.5 ** ((now - self.updated_at) / half_life)
+            self.attempts *= factor
+            self.successes *= factor
+            self.latency_total *= factor
+        self.updated_at = max(self.updated_at, now)
+
+    def has_attempts(self, minimum: float) -> bool:
+        """Whether there is enough data (1% slack so fresh outcomes count in full)"""
+        return self.attempts >= minimum * 0.99
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.attempts if self.attempts else 0.0
+
+    @property
+    def average_latency(self) -> float:
+        return self.latency_total / self.attempts if self.attempts else 0.0
+
+    def to_list(self) -> List[float]:
+        """Compact on-disk form"""
+        return [round(self.attempts, 4), round(self.successes, 4), round(self.latency_total, 3),
+                self.updated_at, self.last_success_at, self.last_failure_at, self.failure_streak]
+
+    @classmethod
+    def from_list(cls, values: List[float]) -> "ApproachStats":
+        return cls(*values[:7])
+
+
+class RoutingStatsStore:
+    """
+    Time-decayed routing statistics keyed by domain, action type and approach
+
+    Each outcome updates two counters: one for the exact action type and one
+    domain-wide aggregate, so a domain with little data for a given action can
+    still be routed by how the site behaves overall. A third, cross-domain
+    counter per approach backs the orchestrators' overall success rates.
+
+    Writes are batched: the file is rewritten once flush_every outcomes or
+    flush_interval seconds have accumulated, and on flush() at shutdown.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        half_life: float = 14 * 24 * 3600,
+        max_domains: int = 2000,
+        flush_every: int = 32,
+        flush_interval: float = 5.0
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            path: JSON file to persist to (None keeps statistics in memory only)
+            half_life: Seconds after which an outcome counts half as much
+            max_domains: Domains kept; the least recently used are dropped
+            flush_every: Pending outcomes that trigger a write
+            flush_interval: Seconds after which pending outcomes are written
+        """
+        self.path = path
+        self.half_life = half_life
+        self.max_domains = max_domains
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        # domain -> "action|approach" -> stats; dicts keep insertion order, and
+        # a domain is re-inserted on every update, so the first is the stalest
+        self._domains: Dict[str, Dict[str, ApproachStats]] = {}
+        # approach -> stats across all domains
+        self._totals: Dict[str, ApproachStats] = {}
+        self._loaded = path is None
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    @property
+    def domains(self) -> Dict[str, Dict[str, ApproachStats]]:
+        """Statistics by domain (loads the file on first access)"""
+        if not self._loaded:
+            self._load()
+        return self._domains
+
+    def _load(self) -> None:
+        """Read statistics from disk; a missing or corrupt file starts empty"""
+        self._loaded = True
+        if not self.path or not self.path.exists():
+            return
+
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            for domain, entries in data.get("domains", {}).items():
+                self._domains[domain] = {
+                    key: ApproachStats.from_list(values) for key, values in entries.items()
+                }
+            for approach, values in data.get("totals", {}).items():
+                self._totals[approach] = ApproachStats.from_list(values)
+            logger.debug(f"Loaded routing statistics for {len(self._domains)} domains from {self.path}")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable routing statistics {self.path}: {e}")
+
+    def save(self) -> bool:
+        """Write statistics to disk atomically"""
+        if not self.path or not self._loaded:
+            return False
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {
+                "version": 1,
+                "half_life": self.half_life,
+                "domains": {
+                    domain: {key: stats.to_list() for key, stats in entries.items()}
+                    for domain, entries in self._domains.items()
+                },
+                "totals": {approach: stats.to_list() for approach, stats in self._totals.items()},
+            }
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to save routing statistics to {self.path}: {e}")
+            return False
+
+    def mark_dirty(self) -> None:
+        """Queue a change and write once enough changes or time have accumulated"""
+        self._pending += 1
+        if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> bool:
+        """Write pending changes to disk now"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return False
+        self._pending = 0
+        return self.save()
+
+    def record(
+        self,
+        url: str,
+        action_type: str,
+        approach: str,
+        success: bool,
+        latency: float = 0.0,
+        now: Optional[float] = None
+    ) -> None:
+        """
+        Record one execution outcome.
+
+        Args:
+            url: Page URL the action ran on
+            action_type: Action type (click, type, extract, ...)
+            approach: Approach value (e.g. "dom_analysis")
+            success: Whether the action succeeded
+            latency: Execution time in seconds
+            now: Timestamp (defaults to the current time)
+        """
+        domain = routing_domain(url)
+        if not domain:
+            return
+
+        now = now or time.time()
+        domains = self.domains
+        entries = domains.pop(domain, {})
+        domains[domain] = entries
+
+        counters = [entries.setdefault(f"{action}|{approach}", ApproachStats())
+                    for action in {action_type or ANY_ACTION, ANY_ACTION}]
+        counters.append(self._totals.setdefault(approach, ApproachStats()))
+        for stats in counters:
+            stats.decay(now, self.half_life)
+            stats.attempts += 1
+            stats.latency_total += max(0.0, latency)
+            if success:
+                stats.successes += 1
+                stats.last_success_at = now
+                stats.failure_streak = 0
+            else:
+                stats.last_failure_at = now
+                stats.failure_streak += 1
+
+        while len(domains) > self.max_domains:
+            del domains[next(iter(domains))]
+
+        self.mark_dirty()
+
+    def get(self, url: str, action_type: str, approach: str, now: Optional[float] = None) -> Optional[ApproachStats]:
+        """
+        Decayed statistics for an approach on a domain.
+
+        Args:
+            url: Page URL
+            action_type: Action type, or ANY_ACTION for the domain-wide aggregate
+            approach: Approach value
+
+        Returns:
+            A decayed copy of the counters, or None if the approach was never used there
+        """
+        stats = self.domains.get(routing_domain(url), {}).get(f"{action_type or ANY_ACTION}|{approach}")
+        if stats is None:
+            return None
+        snapshot = ApproachStats(**vars(stats))
+        snapshot.decay(now or time.time(), self.half_life)
+        return snapshot
+
+    def overall(self, now: Optional[float] = None) -> Dict[str, ApproachStats]:
+        """Decayed copies of the cross-domain counters, by approach"""
+        if not self._loaded:
+            self._load()
+        now = now or time.time()
+        snapshots = {}
+        for approach, stats in self._totals.items():
+            snapshot = ApproachStats(**vars(stats))
+            snapshot.decay(now, self.half_life)
+            snapshots[approach] = snapshot
+        return snapshots
+
+    def recent_failures(self, url: str, approaches: Iterable[str], within: float = 3600) -> List[str]:
+        """
+        Approaches that failed on this domain within `within` seconds and have not
+        succeeded since, listed once per consecutive failure like the in-session
+        decision history.
+        """
+        entries = self.domains.get(routing_domain(url), {})
+        cutoff = time.time() - within
+        failures = []
+        for approach in approaches:
+            stats = entries.get(f"{ANY_ACTION}|{approach}")
+            if stats and stats.last_failure_at > cutoff and stats.last_failure_at > stats.last_success_at:
+                failures.extend([approach] * max(1, stats.failure_streak))
+        return failures
+
+    def best_approach(
+        self,
+        url: str,
+        action_type: str,
+        approaches: Iterable[str],
+        min_attempts: float = 3.0
+    ) -> Optional[Tuple[str, ApproachStats]]:
+        """
+        Approach with the best success rate on this domain.
+
+        Uses the action-type counters when they have at least `min_attempts`
+        (decayed) attempts, otherwise the domain-wide aggregate. Ties are broken
+        by lower average latency.
+
+        Returns:
+            (approach, stats) or None if no approach has enough data
+        """
+        now = time.time()
+        best = None
+        for approach in approaches:
+            stats = self.get(url, action_type, approach, now)
+            if stats is None or not stats.has_attempts(min_attempts):
+                stats = self.get(url, ANY_ACTION, approach, now)
+            if stats is None or not stats.has_attempts(min_attempts):
+                continue
+            key = (stats.success_rate, -stats.average_latency)
+            if best is None or key > best[0]:
+                best = (key, approach, stats)
+
+        return (best[1], best[2]) if best else None
+
+    def domain_summary(self, url: str) -> Dict[str, Dict[str, float]]:
+        """Domain-wide success rate, attempts and latency per approach"""
+        now = time.time()
+        summary = {}
+        for key in self.domains.get(routing_domain(url), {}):
+            action, approach = key.split("|", 1)
+            if action != ANY_ACTION:
+                continue
+            stats = self.get(url, ANY_ACTION, approach, now)
+            summary[approach] = {
+                "success_rate": stats.success_rate,
+                "attempts": stats.attempts,
+                "average_latency": stats.average_latency,
+            }
+        return summary
+
+    def clear(self) -> int:
+        """Remove all statistics (including the persisted file contents)"""
+        count = len(self.domains)
+        self._domains.clear()
+        self._totals.clear()
+        self._pending = 0
+        self.save()
+        return count
@@ -19,6 +19,7 @@ from .secure_python_sandbox import (
     ResourceLimitExceeded
 )
 from .enhanced_code_generator import EnhancedCodeGenerator, CodeGenerationContext
+from .intelligent_error_recovery import IntelligentErrorRecovery
 
 
 @dataclass
@@ -30,6 +31,8 @@ class ExecutionConfig:
     allow_browser_interaction: bool = True
     allow_network_access: bool = True
     sandbox_mode: str = "strict"  # strict, permissive, custom
+    recovery_attempts: int = 3  # Recovery strategies tried when generated code fails (0 disables)
+    speculative_recovery: bool = True  # Race idempotent recovery candidates in isolated contexts
 
 
 @dataclass
@@ -67,6 +70,7 @@ class SafeExecutionWrapper:
 
         # Setup sandbox configuration
         self.sandbox_config = self._create_sandbox_config()
+        self.error_recovery = IntelligentErrorRecovery(self.code_generator, self.sandbox_config)
 
     def _create_sandbox_config(self) -> SandboxConfig:
         """Create sandbox configuration from execution config"""
@@ -104,7 +108,11 @@ class SafeExecutionWrapper:
             automation_code = await self.code_generator.generate_automation_code(context)
 
             # Execute the generated code
-            return await self.execute_code_safely(automation_code, browser_context)
+            result = await self.execute_code_safely(automation_code, browser_context)
+            if result.success or result.security_violations or self.config.recovery_attempts <= 0:
+                return result
+
+            return await self._recover_generated_code(automation_code, result, context, browser_context)
 
         except Exception as e:
             self.logger.error(f"Code generation failed: {e}")
@@ -114,6 +122,37 @@ class SafeExecutionWrapper:
                 approach_used="generation_failed"
             )
 
+    async def _recover_generated_code(self,
+                                      code: str,
+                                      failed: ExecutionResult,
+                                      context: CodeGenerationContext,
+                                      browser_context: Dict[str, Any]) -> ExecutionResult:
+        """
+        Repair failed generated code with intelligent error recovery
+
+        Recovery proves a candidate either on the live page or, for idempotent
+        code, in an isolated copy. Idempotent code is run again on the live page
+        for its result; code that changes page state has already been applied
+        there and is not repeated.
+        """
+        recovered, recovered_code, session = await self.error_recovery.recover_from_error(
+            RuntimeError(failed.errors), code, context, browser_context,
+            max_attempts=self.config.recovery_attempts,
+            speculative=self.config.speculative_recovery
+        )
+        if not recovered:
+            return failed
+
+        self.logger.info(f"Generated code recovered after {len(session.attempts)} attempt(s)")
+        if self.error_recovery.is_idempotent(recovered_code):
+            result = await self.execute_code_safely(recovered_code, browser_context)
+            if not result.success:
+                return result
+        else:
+            result = ExecutionResult(success=True, execution_time=session.total_recovery_time)
+        result.approach_used = "recovered"
+        return result
+
     async def execute_code_safely(self,
                                 code: str,
                                 browser_context: Dict[str, Any]) -> ExecutionResult:
@@ -0,0 +1,433 @@
+"""
+Pre-forked Sandbox Worker Pool for Browser Automation
+
+This module runs sandboxed code in a pool of long-lived worker processes
+instead of threads of the calling process. Each worker builds its restricted
+globals (with the allowed modules already imported) once, runs under CPU and
+address-space rlimits, and is killed outright when an execution exceeds its
+time limit - something a thread-based timeout cannot do. Workers are recycled
+after a fixed number of executions so leaked state does not accumulate.
+
+Requests and results travel over a multiprocessing pipe, so only picklable
+contexts can be executed here; live Playwright objects stay in-process.
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import pickle
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .secure_python_sandbox import (
+    SandboxConfig,
+    SandboxError,
+    SecurePythonSandbox,
+    SecurityChecker,
+    SecurityViolation
+)
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:  # Windows
+    resource = None
+    HAS_RESOURCE = False
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a new worker to import this package and report ready
+WORKER_STARTUP_TIMEOUT = 60
+
+
+def _current_address_space() -> Optional[int]:
+    """Virtual memory size of this process in bytes (Linux only)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[0]) * resource.getpagesize()
+    except Exception:
+        return None
+
+
+def _apply_memory_limit(max_memory_usage: int) -> None:
+    """Cap address-space growth at max_memory_usage beyond the worker's baseline"""
+    if not HAS_RESOURCE:
+        return
+    baseline = _current_address_space()
+    if baseline is None:
+        return
+    try:
+        limit = baseline + max_memory_usage
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError) as e:
+        logger.debug(f"Could not set sandbox memory limit: {e}")
+
+
+def _apply_cpu_limit(seconds: int) -> None:
+    """Allow at most `seconds` more CPU time before the kernel kills the worker"""
+    if not HAS_RESOURCE:
+        return
+    try:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        used = int(usage.ru_utime + usage.ru_stime)
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        soft = used + seconds + 1
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError) as e:
+        logger.debug(f"Could not set sandbox CPU limit: {e}")
+
+
+def _make_transportable(execution_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Ensure a result can be pickled back to the parent"""
+    value = execution_result.get('result')
+    if value is not None:
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            execution_result['result'] = str(value)
+    return execution_result
+
+
+def _worker_main(conn, config: SandboxConfig) -> None:
+    """
+    Worker process loop: execute requests from the pipe until told to stop.
+
+    The sandbox (safe builtins and pre-imported allowed modules) is created
+    once per worker. The parent enforces wall-clock timeouts by killing the
+    process, so the in-worker thread timeout is disabled.
+    """
+    _apply_memory_limit(config.max_memory_usage)
+
+    worker_config = SandboxConfig(
+        max_execution_time=config.max_execution_time * 10,
+        max_memory_usage=config.max_memory_usage,
+        max_output_size=config.max_output_size,
+        allow_imports=list(config.allow_imports),
+        restricted_builtins=list(config.restricted_builtins),
+        enable_debugging=config.enable_debugging
+    )
+    sandbox = SecurePythonSandbox(worker_config)
+    loop = asyncio.new_event_loop()
+
+    try:
+        conn.send('ready')
+        while True:
+            try:
+                request = conn.recv()
+            except EOFError:
+                break
+            if request is None:
+                break
+
+            _apply_cpu_limit(config.max_execution_time)
+            try:
+                result = loop.run_until_complete(
+                    sandbox.execute_code(request['code'], request.get('context') or {})
+                )
+            except Exception as e:
+                result = {
+                    'success': False,
+                    'result': None,
+                    'output': '',
+                    'errors': f"Execution error: {e}",
+                    'execution_time': 0,
+                    'resource_usage': {}
+                }
+            conn.send(_make_transportable(result))
+    finally:
+        loop.close()
+        conn.close()
+
+
+@dataclass
+class _Worker:
+    """A worker process and the parent's end of its pipe"""
+    process: Any
+    conn: Any
+    executions: int = 0
+    started_at: float = field(default_factory=time.time)
+    cancelled: bool = False
+
+
+@dataclass
+class SandboxPoolStats:
+    """Counters for the worker pool"""
+    executions: int = 0
+    timeouts: int = 0
+    crashes: int = 0
+    cancellations: int = 0
+    recycled: int = 0
+    workers_started: int = 0
+    total_execution_time: float = 0.0
+
+
+class SandboxWorkerPool:
+    """
+    Pool of pre-forked sandbox worker processes
+
+    Workers are started by fill() (or lazily on first use), handed out one
+    execution at a time, killed on timeout, and replaced after
+    max_executions_per_worker runs.
+    """
+
+    def __init__(
+        self,
+        config: Optional[SandboxConfig] = None,
+        size: int = 2,
+        max_executions_per_worker: int = 50,
+        start_method: Optional[str] = None
+    ):
+        """
+        Initialize the pool (no processes are started yet)
+
+        Args:
+            config: Sandbox configuration applied in every worker
+            size: Number of worker processes
+            max_executions_per_worker: Executions before a worker is recycled
+            start_method: multiprocessing start method (default: forkserver
+                where available, so workers never inherit the parent's threads)
+        """
+        self.config = config or SandboxConfig()
+        self.size = max(1, size)
+        self.max_executions_per_worker = max(1, max_executions_per_worker)
+        self.security_checker = SecurityChecker(self.config)
+        self.stats = SandboxPoolStats()
+
+        available = multiprocessing.get_all_start_methods()
+        if start_method is None:
+            start_method = 'forkserver' if 'forkserver' in available else 'spawn'
+        self._mp = multiprocessing.get_context(start_method)
+        if start_method == 'forkserver':
+            # Import the sandbox once in the fork server; workers fork from it
+            self._mp.set_forkserver_preload([__name__])
+        self.start_method = start_method
+
+        self._idle: Optional[asyncio.Queue] = None
+        self._fill_lock: Optional[asyncio.Lock] = None
+        self._workers: List[_Worker] = []
+        self._closed = False
+
+    def _spawn_worker(self) -> _Worker:
+        """Start one worker process and wait until it is ready"""
+        parent_conn, child_conn = self._mp.Pipe()
+        process = self._mp.Process(
+            target=_worker_main,
+            args=(child_conn, self.config),
+            name="wyn360-sandbox-worker",
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+
+        worker = _Worker(process=process, conn=parent_conn)
+        try:
+            ready = parent_conn.poll(WORKER_STARTUP_TIMEOUT) and parent_conn.recv() == 'ready'
+        except (EOFError, OSError):
+            ready = False
+        if not ready:
+            process.kill()
+            process.join(timeout=1)
+            parent_conn.close()
+            raise SandboxError(f"Sandbox worker failed to start (exit code {process.exitcode})")
+
+        self._workers.append(worker)
+        self.stats.workers_started += 1
+        return worker
+
+    def _retire_worker(self, worker: _Worker, kill: bool = False) -> None:
+        """Stop a worker process and forget it"""
+        try:
+            if kill:
+                worker.process.kill()
+            else:
+                worker.conn.send(None)
+        except Exception:
+            worker.process.kill()
+        worker.process.join(timeout=1)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join(timeout=1)
+        worker.conn.close()
+        if worker in self._workers:
+            self._workers.remove(worker)
+
+    async def fill(self) -> int:
+        """
+        Start worker processes up to the pool size
+
+        Returns:
+            Number of workers started
+        """
+        if self._closed:
+            raise SandboxError("Sandbox pool is closed")
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            self._fill_lock = asyncio.Lock()
+
+        # Workers are only counted once started, so concurrent callers must
+        # wait for each other instead of all spawning towards the same size
+        started = 0
+        async with self._fill_lock:
+            while len(self._workers) < self.size:
+                worker = await asyncio.get_running_loop().run_in_executor(None, self._spawn_worker)
+                self._idle.put_nowait(worker)
+                started += 1
+        return started
+
+    @staticmethod
+    def is_transportable(context: Optional[Dict[str, Any]]) -> bool:
+        """Whether a context can be sent to a worker process"""
+        if not context:
+            return True
+        try:
+            pickle.dumps(context)
+            return True
+        except Exception:
+            return False
+
+    async def execute(self, code: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Execute code in a worker process
+
+        Args:
+            code: Python code to execute
+            context: Picklable context variables
+
+        Returns:
+            Execution result in the same shape as SecurePythonSandbox.execute_code
+
+        Raises:
+            SecurityViolation: If the code fails the safety check
+            SandboxError: If the context cannot be sent to a worker
+        """
+        is_safe, violations = self.security_checker.check_code_safety(code)
+        if not is_safe:
+            raise SecurityViolation(f"Code safety violations: {violations}")
+
+        if not self.is_transportable(context):
+            raise SandboxError("Context cannot be sent to a sandbox worker process")
+
+        await self.fill()
+        worker = await self._idle.get()
+        start_time = time.time()
+
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                None, self._round_trip, worker, code, context
+            )
+        except BaseException as e:
+            # Includes cancellation (e.g. a losing speculative candidate):
+            # the worker is still busy, so it cannot go back to the idle queue
+            if isinstance(e, asyncio.CancelledError):
+                worker.cancelled = True
+                self.stats.cancellations += 1
+            self._retire_worker(worker, kill=True)
+            raise
+
+        worker.executions += 1
+        self.stats.executions += 1
+        self.stats.total_execution_time += time.time() - start_time
+
+        if result.pop('timed_out', False) | result.pop('crashed', False):
+            self._retire_worker(worker, kill=True)
+        elif worker.executions >= self.max_executions_per_worker:
+            self.stats.recycled += 1
+            self._retire_worker(worker)
+        else:
+            self._idle.put_nowait(worker)
+            return result
+
+        if not self._closed:
+            await self.fill()
+        return result
+
+    def _round_trip(self, worker: _Worker, code: str, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Send one request and wait for its result (runs in an executor thread)"""
+        timeout = self.config.max_execution_time
+        try:
+            worker.conn.send({'code': code, 'context': context or {}})
+            ready = worker.conn.poll(timeout)
+        except (EOFError, OSError):
+            ready = True  # Worker gone; recv below reports the crash
+
+        if not ready:
+            self.stats.timeouts += 1
+            return {
+                'success': False,
+                'result': None,
+                'output': '',
+                'errors': f"Execution timeout after {timeout} seconds",
+                'execution_time': timeout,
+                'resource_usage': {},
+                'timed_out': True
+            }
+
+        try:
+            return worker.conn.recv()
+        except (EOFError, OSError):
+            # Worker died mid-execution (CPU/memory rlimit or crash), unless
+            # it was killed because its caller was cancelled
+            if not worker.cancelled:
+                self.stats.crashes += 1
+            worker.process.join(timeout=1)
+            return {
+                'success': False,
+                'result': None,
+                'output': '',
+                'errors': f"Sandbox worker exited (exit code {worker.process.exitcode}); "
+                          "resource limit exceeded or crash",
+                'execution_time': 0,
+                'resource_usage': {},
+                'crashed': True
+            }
+
+    async def execute_many(
+        self,
+        codes: List[str],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute several code candidates in parallel across the pool
+
+        Security violations are reported as failed results rather than raised.
+        """
+        async def run(code: str) -> Dict[str, Any]:
+            try:
+                return await self.execute(code, context)
+            except SecurityViolation as e:
+                return {'success': False, 'result': None, 'output': '',
+                        'errors': f"Security violation: {e}", 'execution_time': 0,
+                        'resource_usage': {}}
+
+        return await asyncio.gather(*(run(code) for code in codes))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        executions = self.stats.executions
+        return {
+            'size': self.size,
+            'workers_alive': sum(1 for w in self._workers if w.process.is_alive()),
+            'start_method': self.start_method,
+            'executions': executions,
+            'timeouts': self.stats.timeouts,
+            'crashes': self.stats.crashes,
+            'cancellations': self.stats.cancellations,
+            'recycled': self.stats.recycled,
+            'workers_started': self.stats.workers_started,
+            'avg_execution_time': self.stats.total_execution_time / executions if executions else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        """Stop all worker processes"""
+        self._closed = True
+        for worker in list(self._workers):
+            self._retire_worker(worker)
+        self._idle = None
+        self._fill_lock = None
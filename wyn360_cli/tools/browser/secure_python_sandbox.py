@@ -228,6 +228,14 @@ class SecurePythonSandbox:
         self.safe_builtins['__import__'] = __import__
         self.safe_builtins['__builtins__'] = self.safe_builtins
 
+        # Import allowed modules once rather than on every execution
+        self._allowed_modules = {}
+        for module_name in self.config.allow_imports:
+            try:
+                self._allowed_modules[module_name] = __import__(module_name)
+            except ImportError:
+                pass  # Module not available, skip
+
     def _create_safe_globals(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Create a safe global environment for code execution"""
         safe_globals = {
@@ -236,13 +244,8 @@ class SecurePythonSandbox:
             '__doc__': None,
         }
 
-        # Add allowed modules
-        for module_name in self.config.allow_imports:
-            try:
-                module = __import__(module_name)
-                safe_globals[module_name] = module
-            except ImportError:
-                pass  # Module not available, skip
+        # Add allowed modules (imported once in _setup_restricted_environment)
+        safe_globals.update(self._allowed_modules)
 
         # Add context variables (browser objects, etc.)
         safe_globals.update(context)
@@ -338,6 +341,7 @@ class SecurePythonSandbox:
                                    error_buffer: io.StringIO) -> Any:
         """Execute code with timeout control"""
 
+        loop = asyncio.get_running_loop()
         execution_complete = asyncio.Event()
         execution_result = {'value': None, 'exception': None}
 
@@ -386,7 +390,8 @@ result = _result_holder
                 execution_result['exception'] = e
 
             finally:
-                execution_complete.set()
+                # Event.set() is not thread-safe; wake the waiting loop explicitly
+                loop.call_soon_threadsafe(execution_complete.set)
 
         # Start execution in thread
         thread = threading.Thread(target=execute_in_thread, daemon=True)
@@ -467,12 +472,44 @@ result = _result_holder
 class SandboxManager:
     """
     Manager for multiple sandbox instances
+
+    Optionally backed by a pool of pre-forked worker processes (see
+    sandbox_pool.SandboxWorkerPool). Pooled execution is used for code whose
+    context can be pickled; anything holding live browser objects runs in an
+    in-process sandbox as before.
     """
 
-    def __init__(self, default_config: Optional[SandboxConfig] = None):
+    def __init__(self,
+                 default_config: Optional[SandboxConfig] = None,
+                 pool_size: int = 0,
+                 max_executions_per_worker: int = 50):
         self.default_config = default_config or SandboxConfig()
         self._sandboxes = {}
         self._sandbox_counter = 0
+        self.pool = None
+        if pool_size > 0:
+            self.enable_process_pool(pool_size, max_executions_per_worker)
+
+    def enable_process_pool(self, size: int = 2, max_executions_per_worker: int = 50):
+        """
+        Back pooled executions with pre-forked worker processes
+
+        Workers start lazily on first use (or via warm_pool()).
+        """
+        from .sandbox_pool import SandboxWorkerPool
+
+        if self.pool is not None:
+            self.pool.shutdown()
+        self.pool = SandboxWorkerPool(
+            self.default_config, size=size, max_executions_per_worker=max_executions_per_worker
+        )
+        return self.pool
+
+    async def warm_pool(self) -> int:
+        """Start pool workers ahead of the first execution"""
+        if self.pool is None:
+            return 0
+        return await self.pool.fill()
 
     def create_sandbox(self, config: Optional[SandboxConfig] = None) -> str:
         """Create a new sandbox instance and return its ID"""
@@ -499,15 +536,28 @@ class SandboxManager:
         return False
 
     def cleanup_all(self):
-        """Cleanup all sandboxes"""
+        """Cleanup all sandboxes and stop pool workers"""
         for sandbox_id in list(self._sandboxes.keys()):
             self.remove_sandbox(sandbox_id)
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def can_use_pool(self, context: Optional[Dict[str, Any]] = None) -> bool:
+        """Whether code with this context can run in a worker process"""
+        if self.pool is None:
+            return False
+        from .sandbox_pool import SandboxWorkerPool
+        return SandboxWorkerPool.is_transportable(context)
 
     async def execute_in_new_sandbox(self,
                                     code: str,
                                     context: Optional[Dict[str, Any]] = None,
                                     config: Optional[SandboxConfig] = None) -> Dict[str, Any]:
-        """Execute code in a new sandbox instance"""
+        """Execute code in a new sandbox instance (or a pool worker when enabled)"""
+        if config is None and self.can_use_pool(context):
+            return await self.pool.execute(code, context)
+
         sandbox_id = self.create_sandbox(config)
 
         try:
@@ -518,6 +568,33 @@ class SandboxManager:
         finally:
             self.remove_sandbox(sandbox_id)
 
+    async def execute_many(self,
+                           codes: List[str],
+                           context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Execute several code candidates, in parallel when the pool can be used
+
+        Without a usable pool the candidates run one after another in-process,
+        since they may share live browser objects. Security violations are
+        reported as failed results.
+        """
+        if self.can_use_pool(context):
+            return await self.pool.execute_many(codes, context)
+
+        results = []
+        for code in codes:
+            try:
+                results.append(await self.execute_in_new_sandbox(code, context))
+            except SecurityViolation as e:
+                results.append({'success': False, 'result': None, 'output': '',
+                                'errors': f"Security violation: {e}", 'execution_time': 0,
+                                'resource_usage': {}})
+        return results
+
+    def get_pool_stats(self) -> Optional[Dict[str, Any]]:
+        """Get worker pool statistics, or None if the pool is disabled"""
+        return self.pool.get_stats() if self.pool is not None else None
+
 
 # Global sandbox manager instance
 sandbox_manager = SandboxManager()
@@ -3,14 +3,22 @@ Stagehand Code Generation System for WYN360 CLI
 
 This module provides dynamic Stagehand code generation for complex browser automation
 scenarios where DOM analysis confidence is medium but not sufficient for direct DOM manipulation.
+
+Generated action sequences are cached per (domain, page structure, action signature)
+and can be persisted under ~/.wyn360 so repeat tasks skip action generation.
 """
 
 import os
+import re
+import time
+import hashlib
 import logging
 import asyncio
+from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, Union
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from enum import Enum
+from urllib.parse import urlparse
 import json
 
 try:
@@ -43,8 +51,11 @@ class StagehandPattern:
     success_count: int = 0
     failure_count: int = 0
     confidence_score: float = 0.0
-    created_at: float = field(default_factory=lambda: asyncio.get_event_loop().time())
+    created_at: float = field(default_factory=time.time)
     last_used: Optional[float] = None
+    domain: str = ""
+    structure_hash: str = ""
+    action_signature: str = ""
 
     @property
     def success_rate(self) -> float:
@@ -54,6 +65,159 @@ class StagehandPattern:
             return 0.0
         return self.success_count / total
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for the persistent pattern store"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StagehandPattern":
+        """Deserialize from the persistent pattern store, ignoring unknown keys"""
+        known = {name: data[name] for name in cls.__dataclass_fields__ if name in data}
+        return cls(**known)
+
+
+class PatternStore:
+    """
+    Persistent store for Stagehand patterns.
+
+    Patterns are kept in a JSON file and loaded lazily on first access. When the
+    store is full, the pattern with the lowest success-rate x recency score is
+    evicted, so patterns that keep working survive and stale ones age out.
+
+    Changes are batched: the file is rewritten once flush_every changes or
+    flush_interval seconds have accumulated, and on flush() at shutdown.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_patterns: int = 500,
+        recency_half_life: float = 7 * 24 * 3600,
+        flush_every: int = 32,
+        flush_interval: float = 5.0
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            path: JSON file to persist to (None keeps patterns in memory only)
+            max_patterns: Maximum number of patterns kept before eviction
+            recency_half_life: Seconds after which an unused pattern's score halves
+            flush_every: Pending changes that trigger a write
+            flush_interval: Seconds after which pending changes are written
+        """
+        self.path = path
+        self.max_patterns = max_patterns
+        self.recency_half_life = recency_half_life
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._patterns: Dict[str, StagehandPattern] = {}
+        self._loaded = path is None
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self.evictions = 0
+
+    @property
+    def patterns(self) -> Dict[str, StagehandPattern]:
+        """Patterns keyed by pattern_id (loads the file on first access)"""
+        if not self._loaded:
+            self._load()
+        return self._patterns
+
+    def _load(self) -> None:
+        """Read patterns from disk; a missing or corrupt file starts empty"""
+        self._loaded = True
+        if not self.path or not self.path.exists():
+            return
+
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            for entry in data.get("patterns", []):
+                pattern = StagehandPattern.from_dict(entry)
+                self._patterns[pattern.pattern_id] = pattern
+            logger.debug(f"Loaded {len(self._patterns)} Stagehand patterns from {self.path}")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable Stagehand pattern store {self.path}: {e}")
+
+    def save(self) -> bool:
+        """Write patterns to disk atomically"""
+        if not self.path or not self._loaded:
+            return False
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {
+                "version": 1,
+                "patterns": [pattern.to_dict() for pattern in self._patterns.values()],
+            }
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to save Stagehand patterns to {self.path}: {e}")
+            return False
+
+    def mark_dirty(self) -> None:
+        """Queue a change and write once enough changes or time have accumulated"""
+        self._pending += 1
+        if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> bool:
+        """Write pending changes to disk now"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return False
+        self._pending = 0
+        return self.save()
+
+    def score(self, pattern: StagehandPattern, now: Optional[float] = None) -> float:
+        """
+        Retention score: smoothed success rate weighted by recency of use.
+
+        Untried patterns score 0.5 on success, so a fresh pattern is not
+        evicted ahead of one that has proven to fail.
+        """
+        now = now or time.time()
+        success = (pattern.success_count + 1) / (pattern.success_count + pattern.failure_count + 2)
+        age = max(0.0, now - (pattern.last_used or pattern.created_at))
+        recency = 0.5 ** (age / self.recency_half_life)
+        return success * recency
+
+    def put(self, pattern: StagehandPattern) -> List[str]:
+        """
+        Add a pattern, evicting the lowest-scoring ones if the store is full.
+
+        Returns:
+            IDs of evicted patterns
+        """
+        patterns = self.patterns
+        patterns[pattern.pattern_id] = pattern
+
+        evicted = []
+        if len(patterns) > self.max_patterns:
+            now = time.time()
+            candidates = sorted(
+                (p for p in patterns.values() if p.pattern_id != pattern.pattern_id),
+                key=lambda p: self.score(p, now)
+            )
+            for victim in candidates[:len(patterns) - self.max_patterns]:
+                del patterns[victim.pattern_id]
+                evicted.append(victim.pattern_id)
+            self.evictions += len(evicted)
+
+        self.mark_dirty()
+        return evicted
+
+    def clear(self) -> int:
+        """Remove all patterns (including the persisted file contents)"""
+        count = len(self.patterns)
+        self._patterns.clear()
+        self._pending = 0
+        self.save()
+        return count
+
 
 @dataclass
 class StagehandExecutionResult:
@@ -76,9 +240,22 @@ class StagehandCodeGenerator:
     selectors but more cost-effective than vision-based approaches.
     """
 
-    def __init__(self):
+    # Cached patterns that have been tried this many times and succeed less often
+    # than MIN_PATTERN_SUCCESS_RATE are regenerated instead of reused
+    MIN_PATTERN_ATTEMPTS = 3
+    MIN_PATTERN_SUCCESS_RATE = 0.5
+
+    def __init__(self, pattern_store: Optional[PatternStore] = None):
+        """
+        Initialize the generator.
+
+        Args:
+            pattern_store: Store for generated patterns (default: in-memory only)
+        """
         self.availability_status = self._check_availability()
-        self.pattern_cache: Dict[str, StagehandPattern] = {}
+        self.pattern_store = pattern_store or PatternStore()
+        self.pattern_hits = 0
+        self.pattern_misses = 0
         self.stagehand_instance: Optional[Stagehand] = None
         self.current_page: Optional[StagehandPage] = None
         self.is_configured = False
@@ -121,6 +298,11 @@ class StagehandCodeGenerator:
             logger.error(f"Failed to initialize Stagehand: {e}")
             self.availability_status = StagehandAvailability.CONFIGURATION_ERROR
 
+    @property
+    def pattern_cache(self) -> Dict[str, StagehandPattern]:
+        """Cached patterns keyed by pattern ID (loaded lazily from the store)"""
+        return self.pattern_store.patterns
+
     def is_available(self) -> bool:
         """Check if Stagehand is available for use"""
         return self.availability_status == StagehandAvailability.AVAILABLE and self.is_configured
@@ -162,17 +344,53 @@ class StagehandCodeGenerator:
         Returns:
             Tuple of (success, actions_or_error_message)
         """
+        success, result = await self.get_or_generate_pattern(
+            url, task_description, dom_context, target_description, action_type, action_data
+        )
+        return success, result.stagehand_actions if success else result
+
+    async def get_or_generate_pattern(
+        self,
+        url: str,
+        task_description: str,
+        dom_context: str,
+        target_description: str,
+        action_type: str,
+        action_data: Optional[Dict[str, Any]] = None
+    ) -> Tuple[bool, Union[StagehandPattern, str]]:
+        """
+        Reuse a cached pattern for the task, or generate and cache a new one.
+
+        Pass the returned pattern's pattern_id to execute_stagehand_actions()
+        so its outcome is counted against the pattern.
+
+        Args:
+            url: Target URL
+            task_description: High-level description of what to accomplish
+            dom_context: DOM analysis context from previous analysis
+            target_description: Description of element to interact with
+            action_type: Type of action (click, type, select, etc.)
+            action_data: Additional data for the action
+
+        Returns:
+            Tuple of (success, pattern_or_error_message)
+        """
         if not self.is_available():
             return False, f"Stagehand not available: {self.availability_status.value}"
 
         try:
             # Check pattern cache first
-            pattern_key = self._generate_pattern_key(task_description, action_type, target_description)
-            if pattern_key in self.pattern_cache:
-                pattern = self.pattern_cache[pattern_key]
+            pattern_key = self._generate_pattern_key(
+                task_description, action_type, target_description, url=url, dom_context=dom_context
+            )
+            pattern = self.pattern_cache.get(pattern_key)
+            if pattern is not None and self._is_reusable(pattern):
+                self.pattern_hits += 1
                 logger.info(f"Using cached Stagehand pattern: {pattern.pattern_id}")
-                pattern.last_used = asyncio.get_event_loop().time()
-                return True, pattern.stagehand_actions
+                pattern.last_used = time.time()
+                return True, pattern
+
+            self.pattern_misses += 1
 
             # Generate new Stagehand actions based on the task
             actions = await self._generate_new_actions(
@@ -183,17 +401,29 @@ class StagehandCodeGenerator:
             pattern = StagehandPattern(
                 pattern_id=pattern_key,
                 description=f"{action_type} on {target_description}",
-                stagehand_actions=actions
+                stagehand_actions=actions,
+                domain=self._get_domain(url),
+                structure_hash=self._structure_hash(dom_context),
+                action_signature=self._action_signature(task_description, action_type, target_description)
             )
-            self.pattern_cache[pattern_key] = pattern
+            evicted = self.pattern_store.put(pattern)
+            if evicted:
+                logger.debug(f"Evicted {len(evicted)} Stagehand patterns")
 
             logger.info(f"Generated new Stagehand pattern: {pattern_key}")
-            return True, actions
+            return True, pattern
 
         except Exception as e:
             logger.error(f"Error generating Stagehand code: {e}")
             return False, str(e)
 
+    def _is_reusable(self, pattern: StagehandPattern) -> bool:
+        """Whether a cached pattern is trustworthy enough to skip generation"""
+        attempts = pattern.success_count + pattern.failure_count
+        if attempts < self.MIN_PATTERN_ATTEMPTS:
+            return True
+        return pattern.success_rate >= self.MIN_PATTERN_SUCCESS_RATE
+
     async def _generate_new_actions(
         self,
         url: str,
@@ -273,7 +503,8 @@ class StagehandCodeGenerator:
         self,
         url: str,
         actions: List[Dict[str, Any]],
-        show_browser: bool = False
+        show_browser: bool = False,
+        pattern_id: Optional[str] = None
     ) -> StagehandExecutionResult:
         """
         Execute a sequence of Stagehand actions.
@@ -282,6 +513,8 @@ class StagehandCodeGenerator:
             url: URL to navigate to
             actions: List of Stagehand actions to execute
             show_browser: Whether to show the browser window
+            pattern_id: Cached pattern the actions came from, reported back
+                as pattern_used for success tracking
 
         Returns:
             StagehandExecutionResult with execution details
@@ -297,6 +530,8 @@ class StagehandCodeGenerator:
             )
 
         start_time = asyncio.get_event_loop().time()
+        # Resolved up front so failed executions are counted against the pattern too
+        pattern = self.pattern_cache.get(pattern_id) if pattern_id else None
 
         try:
             # For now, simulate Stagehand execution
@@ -320,7 +555,7 @@ class StagehandCodeGenerator:
 
             return StagehandExecutionResult(
                 success=True,
-                pattern_used=None,
+                pattern_used=pattern,
                 actions_performed=actions,
                 execution_time=execution_time,
                 result_data=result_data,
@@ -333,23 +568,71 @@ class StagehandCodeGenerator:
 
             return StagehandExecutionResult(
                 success=False,
-                pattern_used=None,
+                pattern_used=pattern,
                 actions_performed=[],
                 execution_time=execution_time,
                 result_data={},
                 error_message=str(e)
             )
 
+    @staticmethod
+    def _get_domain(url: str) -> str:
+        """Hostname without a leading www."""
+        host = (urlparse(url).hostname or "").lower() if url else ""
+        return host[4:] if host.startswith("www.") else host
+
+    @staticmethod
+    def _structure_hash(dom_context: str) -> str:
+        """
+        Hash the page structure, ignoring text, counts and other volatile content.
+
+        Uses tag/attribute names for HTML, or the element types, IDs, names and
+        selectors from format_dom_for_llm() output. Digits are normalized so
+        result counts and generated IDs do not change the hash.
+        """
+        if not dom_context:
+            return ""
+
+        features = set()
+        for tag, attrs in re.findall(r"<\s*([a-zA-Z][\w-]*)([^>]*)>", dom_context):
+            attr_names = sorted(set(re.findall(r"([\w-]+)\s*=", attrs)))
+            features.add(f"{tag.lower()}[{','.join(attr_names)}]")
+
+        if not features:
+            for line in dom_context.splitlines():
+                line = line.strip()
+                numbered = re.match(r"\d+\.\s+([A-Z_]+):", line)
+                if numbered:
+                    features.add(numbered.group(1))
+                elif line.startswith(("ID:", "Name:", "Selector:", "- ", "Form (")):
+                    features.add(line)
+
+        if not features:
+            features.add(" ".join(dom_context.lower().split()))
+
+        normalized = "\n".join(sorted(re.sub(r"\d+", "#", f) for f in features))
+        return hashlib.md5(normalized.encode()).hexdigest()[:12]
+
+    @staticmethod
+    def _action_signature(task_description: str, action_type: str, target_description: str) -> str:
+        """Normalized task/action/target description"""
+        parts = (task_description, action_type, target_description)
+        return "|".join(" ".join(part.lower().split()) for part in parts)
+
     def _generate_pattern_key(
         self,
         task_description: str,
         action_type: str,
-        target_description: str
+        target_description: str,
+        url: str = "",
+        dom_context: str = ""
     ) -> str:
-        """Generate a unique key for caching patterns"""
-        # Create a simple hash-like key from the task components
-        import hashlib
-        key_components = f"{task_description}|{action_type}|{target_description}".lower()
+        """Generate a unique key from (domain, page-structure hash, action signature)"""
+        key_components = "|".join((
+            self._get_domain(url),
+            self._structure_hash(dom_context),
+            self._action_signature(task_description, action_type, target_description),
+        ))
         return hashlib.md5(key_components.encode()).hexdigest()[:16]
 
     def update_pattern_success(self, pattern_key: str, success: bool) -> None:
@@ -363,38 +646,56 @@ class StagehandCodeGenerator:
 
             # Update confidence score based on success rate
             pattern.confidence_score = pattern.success_rate
+            self.pattern_store.mark_dirty()
             logger.info(f"Updated pattern {pattern_key}: success_rate={pattern.success_rate:.2f}")
 
     def get_pattern_statistics(self) -> Dict[str, Any]:
-        """Get statistics about cached patterns"""
+        """Get statistics about cached patterns and the pattern store"""
+        lookups = self.pattern_hits + self.pattern_misses
+        store_stats = {
+            "persistent": self.pattern_store.path is not None,
+            "path": str(self.pattern_store.path) if self.pattern_store.path else None,
+            "max_patterns": self.pattern_store.max_patterns,
+            "hits": self.pattern_hits,
+            "misses": self.pattern_misses,
+            "hit_rate": self.pattern_hits / lookups if lookups else 0.0,
+            "evictions": self.pattern_store.evictions,
+        }
+
         if not self.pattern_cache:
-            return {"total_patterns": 0, "patterns": []}
+            return {"total_patterns": 0, "patterns": [], "domains": {}, "store": store_stats}
 
         pattern_stats = []
+        domains: Dict[str, int] = {}
         for pattern in self.pattern_cache.values():
             pattern_stats.append({
                 "pattern_id": pattern.pattern_id,
                 "description": pattern.description,
+                "domain": pattern.domain,
                 "success_count": pattern.success_count,
                 "failure_count": pattern.failure_count,
                 "success_rate": pattern.success_rate,
-                "confidence_score": pattern.confidence_score
+                "confidence_score": pattern.confidence_score,
+                "last_used": pattern.last_used
             })
+            domains[pattern.domain or "unknown"] = domains.get(pattern.domain or "unknown", 0) + 1
 
         return {
             "total_patterns": len(self.pattern_cache),
-            "patterns": sorted(pattern_stats, key=lambda x: x["success_rate"], reverse=True)
+            "patterns": sorted(pattern_stats, key=lambda x: x["success_rate"], reverse=True),
+            "domains": domains,
+            "store": store_stats
         }
 
     def clear_pattern_cache(self) -> int:
         """Clear the pattern cache and return number of patterns removed"""
-        count = len(self.pattern_cache)
-        self.pattern_cache.clear()
+        count = self.pattern_store.clear()
         logger.info(f"Cleared {count} patterns from cache")
         return count
 
     async def close(self) -> None:
-        """Clean up Stagehand resources"""
+        """Clean up Stagehand resources and write pending pattern changes"""
+        self.pattern_store.flush()
         try:
             if self.current_page:
                 # In real implementation, close the page
@@ -410,5 +711,7 @@ class StagehandCodeGenerator:
             logger.warning(f"Error cleaning up Stagehand resources: {e}")
 
 
-# Global Stagehand generator instance
-stagehand_generator = StagehandCodeGenerator()
\ No newline at end of file
+# Global Stagehand generator instance (patterns persist across sessions)
+stagehand_generator = StagehandCodeGenerator(
+    pattern_store=PatternStore(Path.home() / ".wyn360" / "cache" / "stagehand_patterns.json")
+)
\ No newline at end of file
@@ -6,6 +6,8 @@ import subprocess
 from pathlib import Path
 from typing import List, Dict, Tuple
 
+from .file_index import get_file_index
+
 
 def extract_code_blocks(text: str) -> List[Dict[str, str]]:
     """
@@ -35,16 +37,18 @@ def scan_directory(path: str = ".", ignore_patterns: List[str] = None) -> Dict[s
     """
     Scan directory and categorize files.
 
+    Backed by the shared project file index (see file_index.py): dependency
+    and VCS directories are never walked, .gitignore is honoured, and
+    repeated scans only re-list directories that changed.
+
     Args:
         path: Directory path to scan (default: current directory)
-        ignore_patterns: List of patterns to ignore (e.g., '__pycache__', '.git')
+        ignore_patterns: Extra substrings; files whose path contains one are
+            skipped (dependency/VCS directories are always skipped)
 
     Returns:
         Dictionary with file categories and their paths
     """
-    if ignore_patterns is None:
-        ignore_patterns = ['__pycache__', '.git', '.pyc', 'node_modules', '.venv', 'venv']
-
     directory = Path(path)
     files = {
         'python': [],
@@ -53,22 +57,22 @@ def scan_directory(path: str = ".", ignore_patterns: List[str] = None) -> Dict[s
         'other': []
     }
 
-    for item in directory.rglob('*'):
-        if item.is_file():
-            # Check if should ignore
-            if any(pattern in str(item) for pattern in ignore_patterns):
-                continue
-
-            # Categorize by extension
-            suffix = item.suffix.lower()
-            if suffix == '.py':
-                files['python'].append(str(item))
-            elif suffix in ['.txt', '.md', '.rst']:
-                files['text'].append(str(item))
-            elif suffix in ['.json', '.yaml', '.yml', '.toml', '.ini', '.cfg']:
-                files['config'].append(str(item))
-            else:
-                files['other'].append(str(item))
+    for relative_path in get_file_index(path).files():
+        item = str(directory / relative_path)
+        # Check if should ignore
+        if ignore_patterns and any(pattern in item for pattern in ignore_patterns):
+            continue
+
+        # Categorize by extension
+        suffix = os.path.splitext(relative_path)[1].lower()
+        if suffix == '.py':
+            files['python'].append(item)
+        elif suffix in ['.txt', '.md', '.rst']:
+            files['text'].append(item)
+        elif suffix in ['.json', '.yaml', '.yml', '.toml', '.ini', '.cfg']:
+            files['config'].append(item)
+        else:
+            files['other'].append(item)
 
     return files
 
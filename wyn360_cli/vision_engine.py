@@ -6,10 +6,12 @@ and make intelligent navigation decisions.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 from pydantic_ai import Agent
 from pydantic_ai.messages import BinaryContent
 
+from .screenshot_utils import estimate_image_tokens, detect_media_type
+
 logger = logging.getLogger(__name__)
 
 
@@ -231,7 +233,7 @@ Provide your decision as a JSON object with:
         Uses pydantic-ai's BinaryContent to send screenshot to Claude Vision API.
 
         Args:
-            screenshot: Screenshot bytes (PNG format)
+            screenshot: Screenshot bytes (PNG or JPEG)
             prompt: Analysis prompt
 
         Returns:
@@ -244,13 +246,14 @@ Provide your decision as a JSON object with:
             # Import BinaryContent for vision
             from pydantic_ai import BinaryContent
 
-            logger.debug(f"Calling Claude Vision API with {len(screenshot)} byte screenshot")
+            media_type = detect_media_type(screenshot)
+            logger.debug(f"Calling Claude Vision API with {len(screenshot)} byte screenshot ({media_type})")
 
             # Call agent with vision (screenshot + text prompt)
             result = await self.agent.run(
                 user_prompt=[
                     prompt,
-                    BinaryContent(data=screenshot, media_type='image/png'),
+                    BinaryContent(data=screenshot, media_type=media_type),
                 ]
             )
 
@@ -383,12 +386,34 @@ Provide your decision as a JSON object with:
 
         return False
 
-    def estimate_cost(self, screenshot_bytes: int, history_length: int) -> float:
+    def estimate_input_tokens(
+        self,
+        screenshot: bytes,
+        goal: str,
+        history: List[Dict[str, Any]],
+        page_state: Dict[str, Any]
+    ) -> int:
+        """
+        Estimate input tokens an analyze_and_decide() call would send.
+
+        Args:
+            screenshot: Screenshot bytes
+            goal: Task goal/description
+            history: List of previous actions taken
+            page_state: Current page state
+
+        Returns:
+            Approximate image + prompt input tokens
+        """
+        prompt = self._build_analysis_prompt(goal, history, page_state)
+        return estimate_image_tokens(screenshot) + len(prompt) // 4
+
+    def estimate_cost(self, screenshot_bytes: Union[bytes, int], history_length: int) -> float:
         """
         Estimate API cost for vision analysis.
 
         Args:
-            screenshot_bytes: Size of screenshot in bytes
+            screenshot_bytes: Encoded screenshot (preferred) or its size in bytes
             history_length: Number of previous actions
 
         Returns:
@@ -396,17 +421,24 @@ Provide your decision as a JSON object with:
 
         Note:
             This is a rough estimate based on Claude Vision API pricing.
-            Actual costs may vary.
+            Actual costs may vary. When the encoded screenshot is passed, the
+            image cost comes from its actual dimensions (the API bills by
+            pixels, not bytes); a bare size falls back to a flat per-image rate.
         """
         # Rough estimates (update based on actual pricing):
-        # - Vision API: ~$0.01 per image
-        # - Text tokens: ~$0.000003 per token
+        # - Vision API: ~$0.01 per image (flat fallback)
+        # - Input tokens: ~$0.000003 per token
         # - Typical prompt: ~500-1000 tokens
+        token_cost = 0.000003
+
+        if isinstance(screenshot_bytes, (bytes, bytearray)):
+            vision_cost = estimate_image_tokens(bytes(screenshot_bytes)) * token_cost
+        else:
+            vision_cost = 0.01  # Per screenshot
 
-        base_vision_cost = 0.01  # Per screenshot
         text_tokens = 500 + (history_length * 50)  # Base + history
-        text_cost = text_tokens * 0.000003
+        text_cost = text_tokens * token_cost
 
-        total_cost = base_vision_cost + text_cost
+        total_cost = vision_cost + text_cost
 
         return total_cost